@@ -0,0 +1,24 @@
+USE ROLE SPACEX_DATA_DEV_SYSADMIN;
+
+USE DATABASE SPACEX_DATA_DEV;
+
+USE SCHEMA STG_SPACEX_DATA;
+
+-- Content-addressed store of the RAW_DATA payloads, used when the tap config
+-- sets "raw_data_store": "blob". Staging rows then carry the SHA-256 of the
+-- payload in RAW_DATA and each distinct payload is stored once here.
+CREATE TABLE
+    IF NOT EXISTS STG_SPACEX_DATA_RAW_BLOBS (
+        RAW_DATA_HASH VARCHAR(64) NOT NULL,
+        STREAM_NAME VARCHAR(16777216),
+        RAW_DATA VARCHAR(16777216),
+        CREATED_AT VARCHAR(16777216),
+        _SDC_EXTRACTED_AT TIMESTAMP_NTZ (9),
+        _SDC_RECEIVED_AT TIMESTAMP_NTZ (9),
+        _SDC_BATCHED_AT TIMESTAMP_NTZ (9),
+        _SDC_DELETED_AT TIMESTAMP_NTZ (9),
+        _SDC_SEQUENCE NUMBER (38, 0),
+        _SDC_TABLE_VERSION NUMBER (38, 0),
+        _SDC_SYNC_STARTED_AT NUMBER (38, 0),
+        primary key (RAW_DATA_HASH)
+    );
@@ -0,0 +1,17 @@
+USE ROLE SPACEX_DATA_DEV_SYSADMIN;
+
+USE DATABASE SPACEX_DATA_DEV;
+
+USE SCHEMA STG_SPACEX_DATA;
+
+-- Orbital elements derived by the tap from MEAN_MOTION, ECCENTRICITY and EPOCH
+-- of all the Starlink satellites at once (include/orbital_elements.py)
+ALTER TABLE STG_SPACEX_DATA_STARLINK ADD COLUMN IF NOT EXISTS DERIVED_SEMI_MAJOR_AXIS_KM FLOAT;
+
+ALTER TABLE STG_SPACEX_DATA_STARLINK ADD COLUMN IF NOT EXISTS APOGEE_ALTITUDE_KM FLOAT;
+
+ALTER TABLE STG_SPACEX_DATA_STARLINK ADD COLUMN IF NOT EXISTS PERIGEE_ALTITUDE_KM FLOAT;
+
+ALTER TABLE STG_SPACEX_DATA_STARLINK ADD COLUMN IF NOT EXISTS ORBITAL_PERIOD_MIN FLOAT;
+
+ALTER TABLE STG_SPACEX_DATA_STARLINK ADD COLUMN IF NOT EXISTS EPOCH_AGE_DAYS FLOAT;
@@ -0,0 +1,28 @@
+USE ROLE SPACEX_DATA_DEV_SYSADMIN;
+
+USE DATABASE SPACEX_DATA_DEV;
+
+USE SCHEMA STG_SPACEX_DATA;
+
+-- SGP4 positions of the Starlink constellation, written when the tap config
+-- sets "propagation_steps". One row per satellite and propagation run, the
+-- positions are JSON arrays over the grid START_TIME + i * STEP_SECONDS.
+CREATE TABLE
+    IF NOT EXISTS STG_SPACEX_DATA_STARLINK_POSITIONS (
+        STARLINK_ID VARCHAR(16777216) NOT NULL,
+        START_TIME TIMESTAMP_NTZ (9) NOT NULL,
+        STEP_SECONDS NUMBER (38, 0),
+        STEPS NUMBER (38, 0),
+        LATITUDE VARCHAR(16777216),
+        LONGITUDE VARCHAR(16777216),
+        HEIGHT_KM VARCHAR(16777216),
+        CREATED_AT TIMESTAMP_NTZ (9),
+        _SDC_EXTRACTED_AT TIMESTAMP_NTZ (9),
+        _SDC_RECEIVED_AT TIMESTAMP_NTZ (9),
+        _SDC_BATCHED_AT TIMESTAMP_NTZ (9),
+        _SDC_DELETED_AT TIMESTAMP_NTZ (9),
+        _SDC_SEQUENCE NUMBER (38, 0),
+        _SDC_TABLE_VERSION NUMBER (38, 0),
+        _SDC_SYNC_STARTED_AT NUMBER (38, 0),
+        primary key (STARLINK_ID, START_TIME)
+    );
@@ -0,0 +1,82 @@
+USE ROLE SPACEX_DATA_DEV_SYSADMIN;
+
+USE DATABASE SPACEX_DATA_DEV;
+
+USE SCHEMA STG_SPACEX_DATA;
+
+-- Bridge rows written by LaunchesTap, one per core, crew member, ship and
+-- payload of a launch, so the cmp_bridge models no longer flatten the JSON
+-- columns of STG_SPACEX_DATA_LAUNCHES. The keys are the md5 surrogate keys
+-- dbt_utils.generate_surrogate_key gives for (LAUNCH_ID, related ID).
+CREATE TABLE
+    IF NOT EXISTS STG_SPACEX_DATA_LAUNCH_CORES (
+        LAUNCH_CORE_ID VARCHAR(32) NOT NULL,
+        LAUNCH_ID VARCHAR(16777216),
+        CORE_ID VARCHAR(16777216),
+        FLIGHT NUMBER (38, 0),
+        GRIDFINS BOOLEAN,
+        LEGS BOOLEAN,
+        REUSED BOOLEAN,
+        LANDING_ATTEMPT BOOLEAN,
+        LANDING_SUCCESS BOOLEAN,
+        LANDING_TYPE VARCHAR(16777216),
+        LANDPAD VARCHAR(16777216),
+        CREATED_AT VARCHAR(16777216),
+        _SDC_EXTRACTED_AT TIMESTAMP_NTZ (9),
+        _SDC_RECEIVED_AT TIMESTAMP_NTZ (9),
+        _SDC_BATCHED_AT TIMESTAMP_NTZ (9),
+        _SDC_DELETED_AT TIMESTAMP_NTZ (9),
+        _SDC_SEQUENCE NUMBER (38, 0),
+        _SDC_TABLE_VERSION NUMBER (38, 0),
+        _SDC_SYNC_STARTED_AT NUMBER (38, 0),
+        primary key (LAUNCH_CORE_ID)
+    );
+
+CREATE TABLE
+    IF NOT EXISTS STG_SPACEX_DATA_LAUNCH_CREW (
+        LAUNCH_CREW_ID VARCHAR(32) NOT NULL,
+        LAUNCH_ID VARCHAR(16777216),
+        CREW_ID VARCHAR(16777216),
+        ROLE VARCHAR(16777216),
+        CREATED_AT VARCHAR(16777216),
+        _SDC_EXTRACTED_AT TIMESTAMP_NTZ (9),
+        _SDC_RECEIVED_AT TIMESTAMP_NTZ (9),
+        _SDC_BATCHED_AT TIMESTAMP_NTZ (9),
+        _SDC_DELETED_AT TIMESTAMP_NTZ (9),
+        _SDC_SEQUENCE NUMBER (38, 0),
+        _SDC_TABLE_VERSION NUMBER (38, 0),
+        _SDC_SYNC_STARTED_AT NUMBER (38, 0),
+        primary key (LAUNCH_CREW_ID)
+    );
+
+CREATE TABLE
+    IF NOT EXISTS STG_SPACEX_DATA_LAUNCH_SHIPS (
+        LAUNCH_SHIP_ID VARCHAR(32) NOT NULL,
+        LAUNCH_ID VARCHAR(16777216),
+        SHIP_ID VARCHAR(16777216),
+        CREATED_AT VARCHAR(16777216),
+        _SDC_EXTRACTED_AT TIMESTAMP_NTZ (9),
+        _SDC_RECEIVED_AT TIMESTAMP_NTZ (9),
+        _SDC_BATCHED_AT TIMESTAMP_NTZ (9),
+        _SDC_DELETED_AT TIMESTAMP_NTZ (9),
+        _SDC_SEQUENCE NUMBER (38, 0),
+        _SDC_TABLE_VERSION NUMBER (38, 0),
+        _SDC_SYNC_STARTED_AT NUMBER (38, 0),
+        primary key (LAUNCH_SHIP_ID)
+    );
+
+CREATE TABLE
+    IF NOT EXISTS STG_SPACEX_DATA_LAUNCH_PAYLOADS (
+        LAUNCH_PAYLOAD_ID VARCHAR(32) NOT NULL,
+        LAUNCH_ID VARCHAR(16777216),
+        PAYLOAD_ID VARCHAR(16777216),
+        CREATED_AT VARCHAR(16777216),
+        _SDC_EXTRACTED_AT TIMESTAMP_NTZ (9),
+        _SDC_RECEIVED_AT TIMESTAMP_NTZ (9),
+        _SDC_BATCHED_AT TIMESTAMP_NTZ (9),
+        _SDC_DELETED_AT TIMESTAMP_NTZ (9),
+        _SDC_SEQUENCE NUMBER (38, 0),
+        _SDC_TABLE_VERSION NUMBER (38, 0),
+        _SDC_SYNC_STARTED_AT NUMBER (38, 0),
+        primary key (LAUNCH_PAYLOAD_ID)
+    );
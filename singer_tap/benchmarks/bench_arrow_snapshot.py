@@ -0,0 +1,97 @@
+"""
+Benchmark opening the Arrow snapshot of a stream against re-reading its Singer messages or a DuckDB table.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_arrow_snapshot --records 200000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import duckdb                               # type: ignore
+import numpy as np                          # type: ignore
+import pandas as pd                         # type: ignore
+from include.arrow_snapshot import SnapshotWriter, open_snapshot
+from include.fetch_starlink import STARLINK_SCHEMA
+
+STREAM = "STG_SPACEX_DATA_STARLINK"
+
+
+def synthetic_records(count: int, seed: int = 1):
+    """Starlink-like records filled for every numeric column of the schema."""
+    rng = np.random.default_rng(seed)
+    properties = STARLINK_SCHEMA.schema["properties"]
+    columns = {}
+    for name, prop in properties.items():
+        types = prop["type"] if isinstance(prop["type"], list) else [prop["type"]]
+        if "number" in types:
+            columns[name] = rng.normal(size=count).tolist()
+        elif "integer" in types:
+            columns[name] = rng.integers(0, 10 ** 6, count).tolist()
+        elif "boolean" in types:
+            columns[name] = (rng.random(count) < 0.5).tolist()
+        else:
+            columns[name] = [f"{name.lower()}_{i}" for i in range(count)]
+    columns["STARLINK_ID"] = [f"{i:024x}" for i in range(count)]
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    records = synthetic_records(args.records)
+    with tempfile.TemporaryDirectory() as directory:
+        singer_path = os.path.join(directory, "singer.jsonl")
+        with open(singer_path, "w") as f:
+            for record in records:
+                f.write(json.dumps({"type": "RECORD", "stream": STREAM, "record": record}) + "\n")
+
+        start = time.perf_counter()
+        writer = SnapshotWriter(os.path.join(directory, "snapshot"))
+        writer.add_schema(STREAM, STARLINK_SCHEMA.schema, STARLINK_SCHEMA.key_properties)
+        for record in records:
+            writer.add_record(STREAM, record)
+        writer.write()
+        write_seconds = time.perf_counter() - start
+        size = os.path.getsize(os.path.join(directory, "snapshot", STREAM + ".arrow"))
+
+        database = os.path.join(directory, "extract.duckdb")
+        conn = duckdb.connect(database)
+        conn.execute(f"CREATE TABLE {STREAM} AS SELECT * FROM read_json_auto('{singer_path}')")
+        conn.close()
+
+        timings = []
+        start = time.perf_counter()
+        table = open_snapshot(os.path.join(directory, "snapshot")).table(STREAM)
+        latitude_mean = table.column("LATITUDE").to_numpy().mean()
+        timings.append(("arrow snapshot, mmap", time.perf_counter() - start))
+
+        # Same DataFrame as the other readers, this one copies
+        start = time.perf_counter()
+        open_snapshot(os.path.join(directory, "snapshot")).table(STREAM).to_pandas()
+        timings.append(("arrow snapshot to pandas", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        with open(singer_path) as f:
+            frame = pd.DataFrame([json.loads(line)["record"] for line in f])
+        assert np.isclose(frame["LATITUDE"].mean(), latitude_mean)
+        timings.append(("singer jsonl + pandas", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        conn = duckdb.connect(database, read_only=True)
+        frame = conn.execute(f"SELECT * FROM {STREAM}").df()
+        conn.close()
+        timings.append(("duckdb table to pandas", time.perf_counter() - start))
+
+    print(f"{args.records} records, snapshot written in {write_seconds:.3f}s ({size / 2 ** 20:.1f} MiB)")
+    print(f"{'open the stream':<28}{'seconds':>10}")
+    for name, seconds in timings:
+        print(f"{name:<28}{seconds:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark emitting the launch bridge rows from the tap against flattening the launch JSON in SQL.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_bridge_streams --launches 50000
+"""
+import argparse
+import json
+import time
+import duckdb                               # type: ignore
+import pandas as pd                         # type: ignore
+from benchmarks.bench_relationship_graph import synthetic_launches
+from include.bridge_streams import LAUNCH_CORES_SCHEMA, launch_bridge_records
+
+# cmp_bridge__launch_cores before the bridge streams, as compiled for duckdb
+FLATTEN_SQL = """
+select
+    md5(cast(concat_ws('-',
+        coalesce(cast(launch_id as varchar), '_dbt_utils_surrogate_key_null_'),
+        coalesce(cast(cast(json_extract_string(launch_core.value, '$.core') as string) as varchar),
+                 '_dbt_utils_surrogate_key_null_')
+    ) as varchar)) as launch_core_id,
+    launch_id,
+    cast(json_extract_string(launch_core.value, '$.core') as string) as core_id
+from launches, unnest(cast(try_cast(cores as json) as json[])) as launch_core(value)
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--launches", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    records = list(synthetic_launches(args.launches))
+    # The tap holds the decoded API payload, the warehouse the JSON strings
+    payloads = [
+        {"id": record["LAUNCH_ID"], "cores": json.loads(record["CORES"]), "crew": json.loads(record["CREW"]),
+         "ships": json.loads(record["SHIPS"]), "payloads": json.loads(record["PAYLOADS"])}
+        for record in records
+    ]
+
+    start = time.perf_counter()
+    bridge_rows = [launch_bridge_records(payload, "2024-01-01T00:00:00+00:00") for payload in payloads]
+    python_seconds = time.perf_counter() - start
+    row_count = sum(len(rows) for launch_rows in bridge_rows for rows in launch_rows.values())
+
+    conn = duckdb.connect()
+    launches = pd.DataFrame({"launch_id": [r["LAUNCH_ID"] for r in records], "cores": [r["CORES"] for r in records]})
+    conn.register("launches", launches)
+    start = time.perf_counter()
+    flattened = conn.execute(FLATTEN_SQL).fetchall()
+    sql_seconds = time.perf_counter() - start
+
+    tap_keys = sorted(
+        (row["LAUNCH_CORE_ID"], row["LAUNCH_ID"], row["CORE_ID"])
+        for launch_rows in bridge_rows for row in launch_rows[LAUNCH_CORES_SCHEMA.stream_name]
+    )
+    assert tap_keys == sorted(flattened)
+
+    print(f"{args.launches} launches, {row_count} bridge rows ({len(flattened)} launch cores)")
+    print(f"{'tap: all four bridge streams':<36}{python_seconds:>10.3f}s")
+    print(f"{'duckdb: flatten launch cores':<36}{sql_seconds:>10.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark holding Starlink records as dicts against slotted compact records between transform and output.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_compact_records --records 44000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime
+import pytz                                 # type: ignore
+from benchmarks.bench_arrow_snapshot import synthetic_records
+from include.fetch_starlink import STARLINK_SCHEMA
+from include.orbital_elements import ORBITAL_ELEMENT_COLUMNS, add_orbital_elements
+
+AS_OF = datetime(2020, 1, 2, tzinfo=pytz.UTC)
+
+
+def transform_stage(sources, build):
+    """Records of the StarlinkTap transform, with the orbital elements added in one pass."""
+    records = [build(source) for source in sources]
+    add_orbital_elements(records, AS_OF)
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=44000)
+    args = parser.parse_args(argv)
+
+    # The transform output, before the orbital elements are added
+    columns = [c for c in STARLINK_SCHEMA.schema["properties"] if c not in ORBITAL_ELEMENT_COLUMNS]
+    sources = [{c: record[c] for c in columns} for record in synthetic_records(args.records)]
+    for source in sources:
+        source.update(MEAN_MOTION=15.06, ECCENTRICITY=0.0001, EPOCH="2020-01-01T00:00:00")
+    StarlinkRecord = STARLINK_SCHEMA.record_class
+
+    representations = [
+        ("dict", lambda source: dict(source), lambda record: record),
+        ("compact record", lambda source: StarlinkRecord(**source), lambda record: record.to_dict()),
+    ]
+    print(f"{args.records} Starlink records, {len(StarlinkRecord.fields)} columns")
+    print(f"{'representation':<18}{'held bytes/record':>20}{'transform':>12}{'output':>10}")
+    for name, build, to_output in representations:
+        # Memory held by the records between the stages, values are shared with the sources
+        gc.collect()
+        tracemalloc.start()
+        records = transform_stage(sources, build)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del records
+
+        gc.collect()
+        start = time.perf_counter()
+        records = transform_stage(sources, build)
+        transform_seconds = time.perf_counter() - start
+
+        # The output stage serializes every record, as singer.write_record does
+        start = time.perf_counter()
+        for record in records:
+            json.dumps(to_output(record))
+        output_seconds = time.perf_counter() - start
+        del records
+
+        print(
+            f"{name:<18}{held / args.records:>20.0f}"
+            f"{transform_seconds * 1000:>10.0f}ms{output_seconds * 1000:>8.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
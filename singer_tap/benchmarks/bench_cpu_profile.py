@@ -0,0 +1,50 @@
+"""
+Benchmark the overhead of --profile-cpu (cProfile with the stack sampler, or the sampler alone) on a Starlink-sized stream.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_cpu_profile --records 44000
+"""
+import argparse
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+from benchmarks.bench_memory_profile import run_stream
+from include.cpu_profile import CpuProfiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=44000)
+    parser.add_argument("--interval", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    timings = []
+    with open(os.devnull, "w") as devnull, tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        with redirect_stdout(devnull):
+            run_stream(args.records)
+        timings.append(("plain run", time.perf_counter() - start, None))
+
+        for name, deterministic in (("cProfile + sampler", True), ("sampler only", False)):
+            profiler = CpuProfiler(os.path.join(directory, name), args.interval, deterministic)
+            start = time.perf_counter()
+            with redirect_stdout(devnull), profiler.profile("fetch_starlink"):
+                run_stream(args.records)
+            timings.append((name, time.perf_counter() - start, profiler.streams[0]))
+
+    plain_seconds = timings[0][1]
+    print(f"{args.records} Starlink records, sampling every {args.interval * 1000:g}ms")
+    for name, seconds, stream in timings:
+        samples = f"{stream['samples']:>6} samples" if stream else ""
+        print(f"  {name:<20}{seconds:8.2f}s  ({seconds / plain_seconds:.2f}x) {samples}")
+
+    packages = timings[1][2]["seconds_by_package"]
+    print("  cProfile time by package:")
+    for package, seconds in list(packages.items())[:6]:
+        print(f"    {package:<32}{seconds:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark --target files against writing Singer messages to a pipe-like stdout, by codec and compression level.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_file_sink --records 44000
+"""
+import argparse
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+from benchmarks.bench_memory_profile import run_stream
+from include.file_sink import COMPRESSION_LEVELS, FileSink, replay_lines, zstandard_available
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=44000)
+    parser.add_argument("--max-records", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    with open(os.devnull, "w") as devnull:
+        start = time.perf_counter()
+        with redirect_stdout(devnull):
+            run_stream(args.records)
+        plain_seconds = time.perf_counter() - start
+
+    print(f"{args.records} Starlink records, {args.max_records} records per part")
+    print(f"  stdout (devnull)  {plain_seconds:8.2f}s")
+    codecs = ["gzip", "zstd"] if zstandard_available() else ["gzip"]
+    with tempfile.TemporaryDirectory() as directory:
+        for codec in codecs:
+            for level in sorted({1, COMPRESSION_LEVELS[codec], 6}):
+                COMPRESSION_LEVELS[codec], default_level = level, COMPRESSION_LEVELS[codec]
+                run_dir = os.path.join(directory, f"{codec}-{level}")
+                sink = FileSink(run_dir, codec=codec, max_records=args.max_records)
+                start = time.perf_counter()
+                with redirect_stdout(sink):
+                    run_stream(args.records)
+                manifest = sink.close()
+                seconds = time.perf_counter() - start
+                COMPRESSION_LEVELS[codec] = default_level
+
+                start = time.perf_counter()
+                replayed = sum(1 for _ in replay_lines(run_dir))
+                replay_seconds = time.perf_counter() - start
+                [stream] = manifest["streams"].values()
+                size = sum(part["bytes"] for part in stream["parts"])
+                compressed = sum(part["compressed_bytes"] for part in stream["parts"])
+                print(f"  {codec} level {level:<6}{seconds:8.2f}s  ({seconds / plain_seconds:.2f}x)  "
+                      f"{len(stream['parts'])} parts, {compressed / 2 ** 20:6.1f} MiB "
+                      f"({size / compressed:.1f}x smaller), replay {replayed} lines in {replay_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
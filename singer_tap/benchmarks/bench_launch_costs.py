@@ -0,0 +1,235 @@
+"""
+Benchmark the vectorized launch cost engine against SQL computing the same metrics.
+
+The "sql" rows time an ad-hoc DuckDB query over the raw tap records (the cost
+formula documented for pbl_spacex_data_fct__launch_costs), not the dbt model.
+With --dbt-project the records are also loaded into a DuckDB staging schema and
+the model is built with dbt run on the local target, and its core counts and
+payload masses, the inputs of the cost formula, are checked against the engine.
+The model does not compute the costs themselves, and the dbt timing includes
+the upstream staging and bridge models and the dbt start-up.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_launch_costs --launches 20000 --scenarios 50
+    python -m benchmarks.bench_launch_costs --launches 20000 --dbt-project ../spacex_project
+
+--dbt-project needs dbt-duckdb and the packages of the project (dbt deps).
+"""
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+import duckdb                               # type: ignore
+import numpy as np                          # type: ignore
+import pandas as pd                         # type: ignore
+import pytz                                 # type: ignore
+import singer                               # type: ignore
+from include.bridge_streams import launch_bridge_records
+from include.connections import STAGING_DDL_PATH, STAGING_MIGRATION_DDL_PATHS
+from include.launch_costs import DEFAULT_REUSE_DISCOUNT, LaunchCostEngine
+from include.local_duckdb import DuckDBConnection, DuckDBTarget, SingerMessageSink, create_staging_tables
+
+FCT_LAUNCH_COSTS = "pbl_spacex_data_fct__launch_costs"
+EXTRACTED_AT = datetime(2024, 1, 1, 12, 0, 0, tzinfo=pytz.UTC)
+
+ROCKET_COSTS = {"falcon1": 6700000, "falcon9": 50000000, "falconheavy": 90000000, "starship": 7000000}
+
+# Aggregations of cmp_bridge__launch_cores / cmp_bridge__launch_payloads and
+# the cost formula, on the tap records loaded as tables
+LAUNCH_COSTS_SQL = """
+with launch_cores as (
+    select
+        launches.LAUNCH_ID as launch_id,
+        count(distinct core.value ->> 'core') as core_count,
+        sum(case when cast(core.value ->> 'reused' as boolean) then 1 else 0 end) as reused_core_count
+    from launches, json_each(launches.CORES) as core
+    where core.value ->> 'core' is not null
+    group by 1
+),
+
+launch_payloads as (
+    select launches.LAUNCH_ID as launch_id, sum(payloads.MASS_KG) as total_payload_mass_kg
+    from launches, json_each(launches.PAYLOADS) as payload
+        inner join payloads on payload.value ->> '$' = payloads.PAYLOAD_ID
+    group by 1
+)
+
+select
+    launches.LAUNCH_ID as launch_id,
+    rockets.COST_PER_LAUNCH as base_launch_cost,
+    rockets.COST_PER_LAUNCH * (1 - ? * coalesce(launch_cores.reused_core_count / nullif(launch_cores.core_count, 0), 0))
+        as estimated_launch_cost,
+    estimated_launch_cost / nullif(launch_payloads.total_payload_mass_kg, 0) as cost_per_kg
+from launches
+    left join rockets on launches.ROCKET = rockets.ROCKET_ID
+    left join launch_cores on launches.LAUNCH_ID = launch_cores.launch_id
+    left join launch_payloads on launches.LAUNCH_ID = launch_payloads.launch_id
+order by launches.LAUNCH_ID
+"""
+
+
+def synthetic_records(launch_count: int):
+    """Deterministic launches, rockets and payloads shaped like the tap output."""
+    rockets = [{"ROCKET_ID": rocket_id, "COST_PER_LAUNCH": cost} for rocket_id, cost in ROCKET_COSTS.items()]
+    rocket_ids = list(ROCKET_COSTS)
+    launches = []
+    payloads = []
+    for i in range(launch_count):
+        launch_id = f"{i:024x}"
+        payload_ids = [f"{launch_id}-{p}" for p in range(i % 4)]
+        launches.append({
+            "LAUNCH_ID": launch_id,
+            "ROCKET": rocket_ids[i % len(rocket_ids)],
+            "CORES": json.dumps([
+                {"core": f"core{i}-{c}", "reused": (i + c) % 3 != 0, "landing_success": True}
+                for c in range(1 + i % 3)
+            ]),
+            "PAYLOADS": json.dumps(payload_ids)
+        })
+        for p, payload_id in enumerate(payload_ids):
+            payloads.append({"PAYLOAD_ID": payload_id, "LAUNCH": launch_id, "MASS_KG": 500.0 + (i * 37 + p) % 5000})
+    return launches, rockets, payloads
+
+
+def load_staging_tables(database: str, launches, payloads) -> None:
+    """Load the records, with the cores and the launch bridge rows the model joins, as the taps would."""
+    conn = DuckDBConnection(database, "STG_SPACEX_DATA")
+    create_staging_tables(conn.raw, STAGING_DDL_PATH)
+    for ddl_path in STAGING_MIGRATION_DDL_PATHS:
+        create_staging_tables(conn.raw, ddl_path)
+
+    streams = {
+        "STG_SPACEX_DATA_LAUNCHES": ("LAUNCH_ID", launches),
+        "STG_SPACEX_DATA_PAYLOADS": ("PAYLOAD_ID", payloads),
+        "STG_SPACEX_DATA_CORES": ("CORE_ID", [
+            {"CORE_ID": core["core"]} for launch in launches for core in json.loads(launch["CORES"])
+        ]),
+    }
+    for launch in launches:
+        api_launch = {
+            "id": launch["LAUNCH_ID"],
+            "cores": json.loads(launch["CORES"]),
+            "payloads": json.loads(launch["PAYLOADS"]),
+        }
+        for stream_name, records in launch_bridge_records(api_launch, EXTRACTED_AT.isoformat()).items():
+            key = next(iter(records[0])) if records else None
+            streams.setdefault(stream_name, (key, []))[1].extend(records)
+
+    sink = SingerMessageSink(DuckDBTarget(conn.raw))
+    with contextlib.redirect_stdout(sink):
+        for stream_name, (key, records) in streams.items():
+            singer.write_schema(stream_name, {"type": "object"}, [key])
+            for record in records:
+                singer.write_record(stream_name, record, time_extracted=EXTRACTED_AT)
+    sink.close()
+    conn.close()
+
+
+def build_dbt_model(project_dir: str, launches, payloads, directory: str):
+    """Build the model and its upstream models with dbt, return the wall and model seconds and its rows."""
+    database = os.path.join(directory, "spacex_data_dev.duckdb")
+    load_staging_tables(database, launches, payloads)
+    with open(os.path.join(directory, "profiles.yml"), "w") as f:
+        json.dump({"spacex_project": {"target": "local", "outputs": {"local": {
+            "type": "duckdb", "path": database, "schema": "STG_SPACEX_DATA", "threads": 4
+        }}}}, f)
+
+    target_path = os.path.join(directory, "target")
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            "dbt", "run", "--project-dir", project_dir, "--profiles-dir", directory, "--target", "local",
+            "--target-path", target_path, "--log-path", directory, "--select", f"+{FCT_LAUNCH_COSTS}",
+        ],
+        check=True, stdout=subprocess.DEVNULL
+    )
+    dbt_seconds = time.perf_counter() - start
+
+    with open(os.path.join(target_path, "run_results.json")) as f:
+        results = json.load(f)["results"]
+    model_seconds = next(
+        result["execution_time"] for result in results if result["unique_id"].endswith("." + FCT_LAUNCH_COSTS)
+    )
+    conn = duckdb.connect(database, read_only=True)
+    [(schema, table)] = conn.execute(
+        "SELECT table_schema, table_name FROM information_schema.tables WHERE table_name = ?",
+        ["pbl_spacex_data_fct_launch_costs"]
+    ).fetchall()
+    rows = conn.execute(
+        f'SELECT launch_id, core_count, reused_core_count, total_payload_mass_kg FROM "{schema}"."{table}" '
+        "ORDER BY launch_id"
+    ).fetchnumpy()
+    conn.close()
+    return dbt_seconds, model_seconds, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--launches", type=int, default=20000)
+    parser.add_argument("--scenarios", type=int, default=50)
+    parser.add_argument("--dbt-project", help="dbt project to also build pbl_spacex_data_fct__launch_costs from")
+    args = parser.parse_args(argv)
+
+    launches, rockets, payloads = synthetic_records(args.launches)
+    discounts = np.linspace(0, 0.6, args.scenarios)
+
+    start = time.perf_counter()
+    engine = LaunchCostEngine.from_records(launches, rockets, payloads)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    costs = engine.compute()
+    compute_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.scenarios(discounts)
+    scenario_seconds = time.perf_counter() - start
+
+    conn = duckdb.connect()
+    conn.register("launches", pd.DataFrame(launches))
+    conn.register("rockets", pd.DataFrame(rockets))
+    conn.register("payloads", pd.DataFrame(payloads))
+
+    start = time.perf_counter()
+    sql_costs = conn.execute(LAUNCH_COSTS_SQL, [DEFAULT_REUSE_DISCOUNT]).fetchnumpy()
+    sql_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for discount in discounts:
+        conn.execute(LAUNCH_COSTS_SQL, [float(discount)]).fetchnumpy()
+    sql_scenario_seconds = time.perf_counter() - start
+    conn.close()
+
+    order = np.argsort(costs["launch_id"])
+    for column in ("estimated_launch_cost", "cost_per_kg"):
+        expected = np.ma.filled(np.ma.asarray(sql_costs[column], dtype=np.float64), np.nan)
+        np.testing.assert_allclose(costs[column][order], expected, equal_nan=True)
+
+    timings = [
+        ("numpy build arrays", build_seconds),
+        ("numpy compute", compute_seconds),
+        (f"numpy {args.scenarios} scenarios", scenario_seconds),
+        ("sql (ad-hoc query)", sql_seconds),
+        (f"sql {args.scenarios} scenarios", sql_scenario_seconds),
+    ]
+    if args.dbt_project:
+        with tempfile.TemporaryDirectory() as directory:
+            dbt_seconds, model_seconds, rows = build_dbt_model(
+                os.path.abspath(args.dbt_project), launches, payloads, directory
+            )
+        for column in ("core_count", "reused_core_count", "total_payload_mass_kg"):
+            np.testing.assert_allclose(costs[column][order], rows[column].astype(np.float64))
+        timings += [("dbt run (with upstream)", dbt_seconds), ("dbt fct model only", model_seconds)]
+
+    print(f"{'path':<24}{'launches':>10}{'seconds':>12}")
+    for name, seconds in timings:
+        print(f"{name:<24}{args.launches:>10}{seconds:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark the load, MERGE and error-logging paths against the in-process stand-in.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_load_paths --records 5000 --errors 1000
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+from datetime import datetime
+import pytz                                 # type: ignore
+import singer                               # type: ignore
+from include.connections import create_stand_in_connection, use_connection_factory
+from include.local_duckdb import DuckDBTarget, SingerMessageSink
+from include.spacex_tap_base import SpaceXTapBase
+
+STREAM_NAME = "STG_SPACEX_DATA_STARLINK"
+EXTRACTED_AT = datetime(2024, 1, 1, 12, 0, 0, tzinfo=pytz.UTC)
+
+
+def synthetic_starlink_records(count: int):
+    """Deterministic Starlink records shaped like StarlinkTap output."""
+    for i in range(count):
+        yield {
+            "STARLINK_ID": f"{i:024x}",
+            "VERSION": "v1.5",
+            "LAUNCH": f"{i % 60:024x}",
+            "LONGITUDE": (i * 7.3) % 360 - 180,
+            "LATITUDE": (i * 3.1) % 106 - 53,
+            "HEIGHT_KM": 540 + i % 30,
+            "VELOCITY_KMS": 7.6,
+            "SPACETRACK": json.dumps({"OBJECT_NAME": f"STARLINK-{i}", "MEAN_MOTION": 15.06}),
+            "OBJECT_NAME": f"STARLINK-{i}",
+            "EPOCH": "2024-01-01T10:00:00",
+            "MEAN_MOTION": 15.06,
+            "ECCENTRICITY": 0.0001,
+            "CREATED_AT": EXTRACTED_AT.isoformat(),
+            "UPDATED_AT": EXTRACTED_AT.isoformat(),
+            "RAW_DATA": json.dumps({"id": f"{i:024x}"})
+        }
+
+
+def singer_lines(records):
+    """Format records as the Singer messages a tap writes to stdout."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        singer.write_schema(STREAM_NAME, {"type": "object", "properties": {}}, ["STARLINK_ID"])
+        for record in records:
+            singer.write_record(STREAM_NAME, record, time_extracted=EXTRACTED_AT)
+    return buffer.getvalue()
+
+
+def time_load(conn, lines: str) -> float:
+    target = DuckDBTarget(conn.raw)
+    sink = SingerMessageSink(target)
+    start = time.perf_counter()
+    sink.write(lines)
+    sink.close()
+    return time.perf_counter() - start
+
+
+def time_log_errors(tap, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        tap.log_error(
+            table_name=STREAM_NAME,
+            error_message="Data transformation error: benchmark",
+            error_data={"id": f"{i:024x}"}
+        )
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--errors", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    lines = singer_lines(synthetic_starlink_records(args.records))
+
+    with use_connection_factory(create_stand_in_connection):
+        tap = SpaceXTapBase(base_url="https://api.spacexdata.com/v4/", config_path="config_snowflake.json")
+        try:
+            insert_seconds = time_load(tap.conn, lines)
+            # Same keys again: every row goes through the upsert (MERGE) path
+            merge_seconds = time_load(tap.conn, lines)
+            error_seconds = time_log_errors(tap, args.errors)
+        finally:
+            tap.close_connection()
+
+    print(f"{'path':<12}{'rows':>10}{'seconds':>12}{'rows/s':>14}")
+    for name, rows, seconds in [
+        ("insert", args.records, insert_seconds),
+        ("merge", args.records, merge_seconds),
+        ("log_error", args.errors, error_seconds),
+    ]:
+        print(f"{name:<12}{rows:>10}{seconds:>12.3f}{rows / seconds:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark the overhead of --profile-memory on a Starlink-sized stream and print what it reports.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_memory_profile --records 44000
+"""
+import argparse
+import os
+import time
+from contextlib import redirect_stdout
+import singer                               # type: ignore
+from benchmarks.bench_arrow_snapshot import synthetic_records
+from include.fetch_starlink import STARLINK_SCHEMA
+from include.memory_profile import MemoryProfiler
+
+STREAM = "STG_SPACEX_DATA_STARLINK"
+
+
+def run_stream(count: int) -> None:
+    """Hold the records of the stream, then write them, like StarlinkTap does."""
+    records = [STARLINK_SCHEMA.record_class.from_dict(record) for record in synthetic_records(count)]
+    singer.write_schema(STREAM, STARLINK_SCHEMA.schema, STARLINK_SCHEMA.key_properties)
+    for record in records:
+        singer.write_record(STREAM, record.to_dict())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=44000)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with open(os.devnull, "w") as devnull:
+        start = time.perf_counter()
+        with redirect_stdout(devnull):
+            run_stream(args.records)
+        plain_seconds = time.perf_counter() - start
+
+        profiler = MemoryProfiler(devnull, top=args.top)
+        start = time.perf_counter()
+        with redirect_stdout(profiler), profiler.profile("fetch_starlink"):
+            run_stream(args.records)
+        profiled_seconds = time.perf_counter() - start
+
+    stream = profiler.report()["streams"][0]
+    print(f"{args.records} Starlink records")
+    print(f"  plain run        {plain_seconds:8.2f}s")
+    print(f"  --profile-memory {profiled_seconds:8.2f}s  ({profiled_seconds / plain_seconds:.1f}x)")
+    print(f"  traced peak      {stream['traced_peak_bytes'] / 2 ** 20:8.1f} MiB, "
+          f"{stream['bytes_per_record']} bytes/record")
+    print(f"  peak RSS         {(stream['peak_rss_bytes'] or 0) / 2 ** 20:8.1f} MiB")
+    print("  top allocation sites at the peak:")
+    for site in stream["top_allocations"]:
+        print(f"    {site['size_bytes'] / 2 ** 20:8.2f} MiB {site['count']:>8} blocks  {site['site']}")
+
+
+if __name__ == "__main__":
+    main()
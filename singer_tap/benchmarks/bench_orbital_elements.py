@@ -0,0 +1,79 @@
+"""
+Benchmark the orbital elements of the Starlink stream: per record in Python against arrays at once.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_orbital_elements --records 44000
+"""
+import argparse
+import math
+import time
+from datetime import datetime
+import numpy as np                          # type: ignore
+import pytz                                 # type: ignore
+from benchmarks.bench_load_paths import synthetic_starlink_records
+from include.orbital_elements import (
+    EARTH_MU_KM3_S2, EARTH_RADIUS_KM, ORBITAL_ELEMENT_COLUMNS, SECONDS_PER_DAY,
+    add_orbital_elements, derive_orbital_elements
+)
+
+AS_OF = datetime(2024, 1, 2, 12, 0, 0, tzinfo=pytz.UTC)
+
+
+def orbital_elements_per_record(records, as_of: datetime):
+    """Reference implementation, one satellite at a time with math."""
+    for record in records:
+        mean_motion = float(record["MEAN_MOTION"])
+        eccentricity = float(record["ECCENTRICITY"])
+        n_rad_s = mean_motion * 2 * math.pi / SECONDS_PER_DAY
+        semi_major_axis = (EARTH_MU_KM3_S2 / (n_rad_s * n_rad_s)) ** (1 / 3)
+        epoch = pytz.UTC.localize(datetime.fromisoformat(record["EPOCH"]))
+
+        record["DERIVED_SEMI_MAJOR_AXIS_KM"] = semi_major_axis
+        record["APOGEE_ALTITUDE_KM"] = semi_major_axis * (1 + eccentricity) - EARTH_RADIUS_KM
+        record["PERIGEE_ALTITUDE_KM"] = semi_major_axis * (1 - eccentricity) - EARTH_RADIUS_KM
+        record["ORBITAL_PERIOD_MIN"] = 1440.0 / mean_motion
+        record["EPOCH_AGE_DAYS"] = (as_of - epoch).total_seconds() / SECONDS_PER_DAY
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    # The starlink endpoint returns about 4,400 satellites, the default is 10x
+    parser.add_argument("--records", type=int, default=44000)
+    args = parser.parse_args(argv)
+
+    per_record = list(synthetic_starlink_records(args.records))
+    vectorized = [dict(record) for record in per_record]
+
+    start = time.perf_counter()
+    orbital_elements_per_record(per_record, AS_OF)
+    per_record_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    add_orbital_elements(vectorized, AS_OF)
+    vectorized_seconds = time.perf_counter() - start
+
+    # The math alone, on columns already extracted from the records
+    columns = [[record[key] for record in per_record] for key in ("MEAN_MOTION", "ECCENTRICITY", "EPOCH")]
+    start = time.perf_counter()
+    derive_orbital_elements(*columns, AS_OF)
+    derive_seconds = time.perf_counter() - start
+
+    for column in ORBITAL_ELEMENT_COLUMNS:
+        np.testing.assert_allclose(
+            [record[column] for record in vectorized],
+            [record[column] for record in per_record]
+        )
+
+    print(f"{'mode':<16}{'records':>10}{'seconds':>12}{'records/s':>14}")
+    for name, seconds in [
+        ("per record", per_record_seconds),
+        ("arrays", vectorized_seconds),
+        ("arrays, math", derive_seconds),
+    ]:
+        print(f"{name:<16}{args.records:>10}{seconds:>12.3f}{args.records / seconds:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
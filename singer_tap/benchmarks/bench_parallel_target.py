@@ -0,0 +1,77 @@
+"""
+Benchmark loading interleaved streams with the serial DuckDBTarget against the per-stream workers of ParallelTarget.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_parallel_target --records 20000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import singer                               # type: ignore
+from benchmarks.bench_load_paths import EXTRACTED_AT, synthetic_starlink_records
+from include.local_duckdb import DuckDBConnection, DuckDBTarget, SingerMessageSink, create_staging_tables
+from include.parallel_target import ParallelTarget
+
+STAGING_DDL_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "db_setup", "V2_0", "V2_0__01_create_staging_tables_structure.sql"
+)
+STREAM_KEYS = {
+    "STG_SPACEX_DATA_STARLINK": "STARLINK_ID",
+    "STG_SPACEX_DATA_CAPSULES": "CAPSULE_ID",
+    "STG_SPACEX_DATA_CORES": "CORE_ID",
+    "STG_SPACEX_DATA_CREW": "CREW_ID",
+}
+
+
+def interleaved_lines(count: int) -> str:
+    """Singer messages of the streams interleaved record by record, like taps writing at once."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        for stream_name, key in STREAM_KEYS.items():
+            singer.write_schema(stream_name, {"type": "object", "properties": {}}, [key])
+        for record in synthetic_starlink_records(count):
+            for stream_name, key in STREAM_KEYS.items():
+                singer.write_record(stream_name, dict(record, **{key: record["STARLINK_ID"]}),
+                                    time_extracted=EXTRACTED_AT)
+    return buffer.getvalue()
+
+
+def time_load(directory: str, name: str, make_target, lines: str) -> float:
+    conn = DuckDBConnection(os.path.join(directory, f"{name}.duckdb"), "STG_SPACEX_DATA")
+    create_staging_tables(conn.raw, STAGING_DDL_PATH)
+    sink = SingerMessageSink(make_target(conn.raw))
+    start = time.perf_counter()
+    sink.write(lines)
+    sink.close()
+    seconds = time.perf_counter() - start
+    conn.close()
+    return seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000, help="Records per stream")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    lines = interleaved_lines(args.records)
+    with tempfile.TemporaryDirectory() as directory:
+        serial = time_load(directory, "serial", lambda conn: DuckDBTarget(conn, batch_size=args.batch_size), lines)
+        parallel = time_load(
+            directory, "parallel", lambda conn: ParallelTarget(conn, batch_size=args.batch_size), lines
+        )
+
+    total = args.records * len(STREAM_KEYS)
+    # The workers only overlap on several CPUs, and only in DuckDB (the GIL holds the parsing)
+    print(f"{len(STREAM_KEYS)} streams x {args.records} records, batches of {args.batch_size}, "
+          f"{os.cpu_count()} CPUs")
+    print(f"  DuckDBTarget   {serial:8.2f}s  {total / serial:10.0f} records/s")
+    print(f"  ParallelTarget {parallel:8.2f}s  {total / parallel:10.0f} records/s  ({serial / parallel:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
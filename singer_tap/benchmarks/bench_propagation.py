@@ -0,0 +1,65 @@
+"""
+Benchmark the batched SGP4 propagation of the Starlink constellation.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_propagation --satellites 5000 --steps 500
+"""
+import argparse
+import time
+from datetime import datetime
+import pytz                                 # type: ignore
+from include.propagation import ConstellationPropagator
+
+START = datetime(2024, 1, 1, 12, 0, 0, tzinfo=pytz.UTC)
+
+
+def tle_checksum(line: str) -> str:
+    total = sum(int(c) if c.isdigit() else 1 if c == "-" else 0 for c in line)
+    return line + str(total % 10)
+
+
+def synthetic_satellites(count: int):
+    """Deterministic API satellites with TLEs spread over the Starlink shells."""
+    for i in range(count):
+        inclination = (53.0, 53.2, 70.0, 97.6)[i % 4]
+        raan = (i * 7.2) % 360
+        anomaly = (i * 13.7) % 360
+        line1 = f"1 {44000 + i % 50000:05d}U 20001A   24001.41666667  .00001000  00000-0  10000-3 0  999"
+        line2 = f"2 {44000 + i % 50000:05d} {inclination:8.4f} {raan:8.4f} 0001500  90.0000 {anomaly:8.4f} 15.06000000 1234"
+        yield {
+            "id": f"{i:024x}",
+            "spaceTrack": {"TLE_LINE1": tle_checksum(line1), "TLE_LINE2": tle_checksum(line2)}
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--satellites", type=int, default=5000)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--step-seconds", type=int, default=60)
+    args = parser.parse_args(argv)
+
+    satellites = list(synthetic_satellites(args.satellites))
+    propagator = ConstellationPropagator(START, args.steps, args.step_seconds)
+
+    start = time.perf_counter()
+    positions = propagator.propagate(satellites)
+    propagate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    records = list(propagator.records(satellites, START.isoformat()))
+    records_seconds = time.perf_counter() - start
+
+    points = len(positions["STARLINK_ID"]) * args.steps
+    print(f"{'stage':<24}{'positions':>12}{'seconds':>12}{'positions/s':>14}")
+    for name, seconds in [
+        ("propagate", propagate_seconds),
+        ("propagate + records", records_seconds),
+    ]:
+        print(f"{name:<24}{points:>12}{seconds:>12.3f}{points / seconds:>14.0f}")
+    print(f"{len(records)} records, {sum(len(r['LATITUDE']) + len(r['LONGITUDE']) + len(r['HEIGHT_KM']) for r in records) / 1e6:.1f} MB of positions")
+
+
+if __name__ == "__main__":
+    main()
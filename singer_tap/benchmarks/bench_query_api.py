@@ -0,0 +1,115 @@
+"""
+Benchmark query API reads: uncached, cached, revalidated (304) and over HTTP, against a DuckDB query per request.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_query_api --satellites 5000 --requests 2000
+"""
+import argparse
+import http.client
+import os
+import tempfile
+import threading
+import time
+import duckdb                               # type: ignore
+from include.connections import STAGING_DDL_PATH
+from include.local_duckdb import create_staging_tables
+from include.query_api import ExtractStore, QueryAPI, ResponseCache
+
+
+def write_extract(database: str, satellites: int) -> None:
+    conn = duckdb.connect(database)
+    create_staging_tables(conn, STAGING_DDL_PATH)
+    conn.execute(f"""
+        INSERT INTO STG_SPACEX_DATA_STARLINK (STARLINK_ID, VERSION, LAUNCH, LATITUDE, LONGITUDE, HEIGHT_KM, VELOCITY_KMS, RAW_DATA)
+        SELECT printf('%024x', i), 'v1.0', printf('launch_%d', i % 100), random() * 180 - 90, random() * 360 - 180,
+               540 + random() * 20, 7.6, repeat('x', 2000)
+        FROM range({satellites}) t(i)
+    """)
+    conn.close()
+
+
+def http_reads(api: QueryAPI, targets, concurrency: int = 8) -> float:
+    server = api.server("127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def client(chunk):
+        connection = http.client.HTTPConnection(*server.server_address)
+        for target in chunk:
+            connection.request("GET", target, headers={"Host": "bench"})
+            connection.getresponse().read()
+        connection.close()
+
+    clients = [threading.Thread(target=client, args=(targets[i::concurrency],)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    seconds = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+    return seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--satellites", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "spacex_data_dev.duckdb")
+        write_extract(database, args.satellites)
+
+        start = time.perf_counter()
+        store = ExtractStore(database=database)
+        store.load()
+        load_seconds = time.perf_counter() - start
+
+        pages = max(args.satellites // args.page_size, 1)
+        targets = [f"/starlink?limit={args.page_size}&offset={(i % pages) * args.page_size}"
+                   for i in range(args.requests)]
+        timings = []
+
+        # Every request renders its page
+        api = QueryAPI(store, ResponseCache(ttl_seconds=0))
+        start = time.perf_counter()
+        for target in targets:
+            api.respond("GET", target)
+        timings.append(("uncached", time.perf_counter() - start))
+
+        api = QueryAPI(store, ResponseCache(max_entries=pages, ttl_seconds=60))
+        etags = {target: api.respond("GET", target).headers["ETag"] for target in set(targets)}
+        start = time.perf_counter()
+        for target in targets:
+            api.respond("GET", target)
+        timings.append(("cached", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        for target in targets:
+            api.respond("GET", target, {"if-none-match": etags[target]})
+        timings.append(("cached, 304", time.perf_counter() - start))
+
+        timings.append(("cached, HTTP keep-alive", http_reads(api, targets)))
+
+        # What a dashboard does without the service: a query per request
+        conn = duckdb.connect(database, read_only=True)
+        start = time.perf_counter()
+        for i in range(args.requests):
+            conn.execute(
+                "SELECT * EXCLUDE (RAW_DATA) FROM STG_SPACEX_DATA.STG_SPACEX_DATA_STARLINK "
+                "ORDER BY STARLINK_ID LIMIT ? OFFSET ?", [args.page_size, (i % pages) * args.page_size]
+            ).fetchall()
+        timings.append(("duckdb query per request", time.perf_counter() - start))
+        conn.close()
+
+    print(f"load extract: {load_seconds:.3f}s, {args.requests} requests of {args.page_size} records")
+    print(f"{'read':<28}{'seconds':>10}{'us/request':>12}")
+    for name, seconds in timings:
+        print(f"{name:<28}{seconds:>10.3f}{seconds / args.requests * 1e6:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
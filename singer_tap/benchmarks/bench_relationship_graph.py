@@ -0,0 +1,88 @@
+"""
+Benchmark relationship traversals on the graph index against scanning the launch records.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_relationship_graph --launches 20000 --queries 1000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import numpy as np                          # type: ignore
+from include.relationship_graph import RelationshipGraph, RelationshipGraphBuilder
+
+
+def synthetic_launches(count: int, seed: int = 1):
+    """Launch records with 1-3 cores flown up to ~15 times, payloads, crew and ships."""
+    rng = np.random.default_rng(seed)
+    cores = max(count // 8, 1)
+    for i in range(count):
+        yield {
+            "LAUNCH_ID": f"launch_{i}",
+            "CORES": json.dumps([{"core": f"core_{c}"} for c in rng.integers(0, cores, rng.integers(1, 4))]),
+            "PAYLOADS": json.dumps([f"payload_{i}_{p}" for p in range(rng.integers(1, 3))]),
+            "CREW": json.dumps([{"crew": f"crew_{c}"} for c in rng.integers(0, 300, rng.integers(0, 2) * 4)]),
+            "SHIPS": json.dumps([f"ship_{s}" for s in rng.integers(0, 40, rng.integers(0, 3))]),
+            "CAPSULES": json.dumps([]),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--launches", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    launches = list(synthetic_launches(args.launches))
+    core_ids = [f"core_{i}" for i in np.random.default_rng(2).integers(0, max(args.launches // 8, 1), args.queries)]
+
+    start = time.perf_counter()
+    builder = RelationshipGraphBuilder()
+    for record in launches:
+        builder.add_record("STG_SPACEX_DATA_LAUNCHES", record)
+    graph = builder.build()
+    build_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "graph.npz")
+        start = time.perf_counter()
+        graph.save(path)
+        save_seconds = time.perf_counter() - start
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        graph = RelationshipGraph.load(path)
+        load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [graph.launches_of("core", core_id) for core_id in core_ids]
+    graph_seconds = time.perf_counter() - start
+
+    # Scan: the launch records with their lists already decoded, every
+    # query visits every launch
+    decoded = [
+        (record["LAUNCH_ID"], [core["core"] for core in json.loads(record["CORES"])],
+         json.loads(record["PAYLOADS"]), json.loads(record["SHIPS"]))
+        for record in launches
+    ]
+    start = time.perf_counter()
+    scanned = [
+        {launch_id: (payloads, ships) for launch_id, cores, payloads, ships in decoded if core_id in cores}
+        for core_id in core_ids
+    ]
+    scan_seconds = time.perf_counter() - start
+
+    for found, expected in zip(indexed, scanned):
+        assert {launch_id: (details["payload"], sorted(set(details["ship"]))) for launch_id, details in found.items()} == \
+            {launch_id: (payloads, sorted(set(ships))) for launch_id, (payloads, ships) in expected.items()}
+
+    print(f"nodes: {graph.node_counts()}")
+    print(f"build {build_seconds:.3f}s, save {save_seconds:.3f}s ({size / 1024:.0f} KiB), load {load_seconds:.3f}s")
+    print(f"{'core -> launches, payloads, ships':<36}{'queries':>10}{'seconds':>12}{'us/query':>12}")
+    for name, seconds in [("graph index", graph_seconds), ("scan decoded records", scan_seconds)]:
+        print(f"{name:<36}{args.queries:>10}{seconds:>12.3f}{seconds / args.queries * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark record validation of the Starlink stream: jsonschema, precompiled and sampled.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_schema_validation --records 20000 --sample-rate 0.01
+"""
+import argparse
+import time
+from jsonschema import Draft4Validator      # type: ignore
+from benchmarks.bench_load_paths import synthetic_starlink_records
+from include.fetch_starlink import STARLINK_SCHEMA
+from include.schema_registry import RecordValidator
+
+
+def time_validation(validate, records) -> float:
+    start = time.perf_counter()
+    for record in records:
+        validate(record)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--sample-rate", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    records = list(synthetic_starlink_records(args.records))
+
+    results = [
+        # What a per-record jsonschema.validate call costs
+        ("jsonschema", time_validation(
+            lambda record: Draft4Validator(STARLINK_SCHEMA.schema).validate(record), records)),
+        ("precompiled", time_validation(STARLINK_SCHEMA.validate, records)),
+        (f"sampled {args.sample_rate:g}", time_validation(
+            RecordValidator(STARLINK_SCHEMA, args.sample_rate).validate, records)),
+    ]
+
+    print(f"{'mode':<16}{'records':>10}{'seconds':>12}{'records/s':>14}")
+    for name, seconds in results:
+        print(f"{name:<16}{args.records:>10}{seconds:>12.3f}{args.records / seconds:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark radius and nearest-neighbour queries of the spatial index against brute force.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_spatial_index --points 44000 --queries 500 --radius-km 500
+"""
+import argparse
+import time
+import numpy as np                          # type: ignore
+from include.spatial_index import SphericalGridIndex, great_circle_km, unit_vectors
+
+
+def synthetic_points(count: int, seed: int = 1):
+    """Points spread uniformly over the sphere."""
+    rng = np.random.default_rng(seed)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, count)))
+    longitudes = rng.uniform(-180, 180, count)
+    return latitudes, longitudes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    # About 10x the satellites returned by the starlink endpoint
+    parser.add_argument("--points", type=int, default=44000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--radius-km", type=float, default=500.0)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--cell-km", type=float, default=200.0)
+    args = parser.parse_args(argv)
+
+    latitudes, longitudes = synthetic_points(args.points)
+    ids = [f"{i:024x}" for i in range(args.points)]
+    query_latitudes, query_longitudes = synthetic_points(args.queries, seed=2)
+    queries = list(zip(query_latitudes.tolist(), query_longitudes.tolist()))
+
+    start = time.perf_counter()
+    index = SphericalGridIndex(ids, latitudes, longitudes, cell_km=args.cell_km)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [index.within(latitude, longitude, args.radius_km) for latitude, longitude in queries]
+    within_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for latitude, longitude in queries:
+        index.nearest(latitude, longitude, args.k)
+    nearest_seconds = time.perf_counter() - start
+
+    # Brute force: the distance to every point for every query (O(N*M)),
+    # already vectorized over the points
+    vectors = unit_vectors(latitudes, longitudes)
+    id_array = np.asarray(ids, dtype=object)
+    start = time.perf_counter()
+    brute_within = []
+    for latitude, longitude in queries:
+        distances = great_circle_km(vectors, unit_vectors([latitude], [longitude])[0])
+        brute_within.append(id_array[distances <= args.radius_km])
+    brute_within_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for latitude, longitude in queries:
+        distances = great_circle_km(vectors, unit_vectors([latitude], [longitude])[0])
+        id_array[np.argpartition(distances, args.k)[:args.k]]
+    brute_nearest_seconds = time.perf_counter() - start
+
+    for found, expected in zip(indexed, brute_within):
+        assert sorted(point_id for point_id, _ in found) == sorted(expected)
+
+    print(f"{'operation':<24}{'queries':>10}{'seconds':>12}{'us/query':>12}")
+    print(f"{'build index':<24}{'':>10}{build_seconds:>12.3f}{'':>12}")
+    for name, seconds in [
+        (f"index within {args.radius_km:g} km", within_seconds),
+        (f"brute within {args.radius_km:g} km", brute_within_seconds),
+        (f"index nearest {args.k}", nearest_seconds),
+        (f"brute nearest {args.k}", brute_nearest_seconds),
+    ]:
+        print(f"{name:<24}{args.queries:>10}{seconds:>12.3f}{seconds / args.queries * 1e6:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
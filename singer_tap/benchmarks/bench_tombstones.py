@@ -0,0 +1,65 @@
+"""
+Benchmark the tombstone diff of a Starlink-sized key set against a JSON list diffed with Python sets.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_tombstones --keys 44000 --removed 500
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from include.tombstones import KeySetStore, key_array, vanished_keys
+
+STREAM = "STG_SPACEX_DATA_STARLINK"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=44000)
+    parser.add_argument("--removed", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    previous_keys = [f"{i * 7919:024x}" for i in range(args.keys)]
+    # Every run loses some satellites and gains as many
+    current_keys = previous_keys[args.removed:] + [f"{i:024x}f" for i in range(args.removed)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = KeySetStore(directory)
+        store.save(STREAM, key_array(previous_keys))
+        json_path = os.path.join(directory, STREAM + ".json")
+        with open(json_path, "w") as f:
+            json.dump(previous_keys, f)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            vanished = vanished_keys(store.load(STREAM), key_array(current_keys))
+        array_seconds = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            with open(json_path) as f:
+                vanished_set = set(json.load(f)) - set(current_keys)
+        set_seconds = (time.perf_counter() - start) / args.repeat
+
+        npy_bytes = os.path.getsize(os.path.join(directory, STREAM + ".npy"))
+        json_bytes = os.path.getsize(json_path)
+        # Memory the previous keys take once loaded
+        array_held = store.load(STREAM).nbytes
+        previous_set = set(previous_keys)
+        set_held = sys.getsizeof(previous_set) + sum(sys.getsizeof(key) for key in previous_set)
+
+    assert sorted(key.decode() for key in vanished) == sorted(vanished_set)
+    print(f"{args.keys} keys, {args.removed} removed")
+    print("                       diff        file      held")
+    print(f"  sorted arrays (.npy) {array_seconds * 1000:6.2f}ms  {npy_bytes / 2 ** 20:6.2f} MiB  "
+          f"{array_held / 2 ** 20:6.2f} MiB")
+    print(f"  JSON + Python sets   {set_seconds * 1000:6.2f}ms  {json_bytes / 2 ** 20:6.2f} MiB  "
+          f"{set_held / 2 ** 20:6.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
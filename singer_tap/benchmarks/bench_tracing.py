@@ -0,0 +1,56 @@
+"""
+Benchmark the overhead of --trace-file on a Starlink-sized stream and print the time of its stages.
+
+Run from the singer_tap directory:
+
+    python -m benchmarks.bench_tracing --records 44000
+"""
+import argparse
+import os
+import time
+from contextlib import redirect_stdout
+import singer                               # type: ignore
+from benchmarks.bench_arrow_snapshot import synthetic_records
+from benchmarks.bench_memory_profile import STREAM
+from include.fetch_starlink import STARLINK_SCHEMA
+from include.tracing import NOOP_STAGE_TIMER, TracedOutput, Tracer
+
+
+def run_stream(count: int, stages=NOOP_STAGE_TIMER) -> None:
+    """Transform and write the records of the stream, timing the stages like the taps do."""
+    singer.write_schema(STREAM, STARLINK_SCHEMA.schema, STARLINK_SCHEMA.key_properties)
+    for record in synthetic_records(count):
+        stages.start()
+        record = STARLINK_SCHEMA.record_class.from_dict(record)
+        stages.lap("transform")
+        singer.write_record(STREAM, record.to_dict())
+        stages.lap_output()
+    stages.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=44000)
+    args = parser.parse_args(argv)
+
+    tracer = Tracer()
+    with open(os.devnull, "w") as devnull:
+        start = time.perf_counter()
+        with redirect_stdout(devnull):
+            run_stream(args.records)
+        plain_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with redirect_stdout(TracedOutput(devnull, tracer)), tracer.span("stream", fetch="fetch_starlink"):
+            run_stream(args.records, tracer.stages(STREAM))
+        traced_seconds = time.perf_counter() - start
+
+    print(f"{args.records} Starlink records")
+    print(f"  plain run    {plain_seconds:8.2f}s")
+    print(f"  traced run   {traced_seconds:8.2f}s  ({traced_seconds / plain_seconds:.2f}x)")
+    for span in tracer.finished:
+        print(f"    {span.name:<14}{span.duration_ms / 1000:8.2f}s  {span.attributes}")
+
+
+if __name__ == "__main__":
+    main()
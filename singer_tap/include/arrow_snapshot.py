@@ -0,0 +1,223 @@
+import singer                               # type: ignore
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+import pytz                                 # type: ignore
+from include.compact_records import CompactRecord, record_class
+from include.tombstones import is_delete_marker
+
+try:
+    import pyarrow as pa                    # type: ignore
+    import pyarrow.feather as feather       # type: ignore
+except ImportError:
+    pa = feather = None
+
+
+LOGGER = singer.get_logger()
+
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_SUFFIX = ".arrow"
+
+
+def pyarrow_available() -> bool:
+    return pa is not None
+
+
+def _require_pyarrow() -> None:
+    if not pyarrow_available():
+        raise ImportError("Arrow snapshots require the pyarrow package (pip install pyarrow)")
+
+
+def _json_type(property_schema: Dict[str, Any]) -> str:
+    """Non-null JSON schema type of a property, e.g. "integer" for ["integer", "null"]."""
+    types = property_schema.get("type", "string")
+    if isinstance(types, str):
+        types = [types]
+    return next((t for t in types if t != "null"), "string")
+
+
+def arrow_schema(schema: Dict[str, Any]):
+    """
+    Arrow schema of a Singer stream schema. Arrays and objects are stored as
+    their JSON text, like the JSON string columns the taps already write, and
+    date-time strings are kept as written.
+    """
+    _require_pyarrow()
+    types = {"integer": pa.int64(), "number": pa.float64(), "boolean": pa.bool_()}
+    return pa.schema([
+        (name, types.get(_json_type(property_schema), pa.string()))
+        for name, property_schema in schema.get("properties", {}).items()
+    ])
+
+
+def _column(values: List[Any], arrow_type) -> Any:
+    if pa.types.is_string(arrow_type):
+        values = [
+            value if value is None or isinstance(value, str) else json.dumps(value)
+            for value in values
+        ]
+    return pa.array(values, type=arrow_type)
+
+
+class SnapshotWriter:
+    """
+    Write the latest record of each key of the Singer streams of a run as one
+    uncompressed Arrow IPC (Feather v2) file per stream, plus a manifest.
+
+    Files are written next to their final name and renamed into place, so a
+    process that has the previous snapshot memory-mapped keeps reading it.
+    The manifest is written last: it lists the streams of a complete snapshot.
+    """
+
+    def __init__(self, directory: str):
+        _require_pyarrow()
+        self.directory = directory
+        self.schemas: Dict[str, Dict[str, Any]] = {}
+        self.key_properties: Dict[str, List[str]] = {}
+        # Slotted record class of each stream with a SCHEMA message, the
+        # records of a run are held until write() so they are kept compact
+        self.record_classes: Dict[str, Type[CompactRecord]] = {}
+        # Records keyed on their key properties, the last one of a key wins
+        self.records: Dict[str, Dict[Tuple, Any]] = {}
+
+    def add_schema(self, stream_name: str, schema: Dict[str, Any], key_properties: Optional[List[str]]) -> None:
+        self.schemas[stream_name] = schema
+        self.key_properties[stream_name] = key_properties or []
+        self.record_classes.pop(stream_name, None)
+        if schema.get("properties"):
+            try:
+                self.record_classes[stream_name] = record_class(stream_name, list(schema["properties"]))
+            except ValueError:
+                # Column names that are not attribute names, keep the dicts
+                pass
+        self.records.setdefault(stream_name, {})
+
+    def add_record(self, stream_name: str, record: Dict[str, Any]) -> None:
+        records = self.records.setdefault(stream_name, {})
+        keys = self.key_properties.get(stream_name)
+        key = tuple(record.get(k) for k in keys) if keys else len(records)
+        if keys and is_delete_marker(record, keys):
+            # The key was removed from the API, it has no latest record
+            records.pop(key, None)
+            return
+        cls = self.record_classes.get(stream_name)
+        records[key] = cls.from_dict(record) if cls is not None else record
+
+    def table(self, stream_name: str):
+        """Arrow table of the records of a stream, columns in schema order."""
+        schema = self.schemas.get(stream_name, {})
+        records = list(self.records.get(stream_name, {}).values())
+        if not schema.get("properties"):
+            # No SCHEMA message: columns of the records, as text
+            columns = list(dict.fromkeys(k for record in records for k in record))
+            schema = {"properties": {column: {"type": "string"} for column in columns}}
+        target = arrow_schema(schema)
+        return pa.Table.from_arrays(
+            [_column([record.get(field.name) for record in records], field.type) for field in target],
+            schema=target
+        )
+
+    def write(self) -> Dict[str, Any]:
+        """Write the snapshot files and return the manifest."""
+        os.makedirs(self.directory, exist_ok=True)
+        streams = {}
+        for stream_name in sorted(self.records):
+            table = self.table(stream_name)
+            path = os.path.join(self.directory, stream_name + SNAPSHOT_SUFFIX)
+            # Uncompressed so readers can map the buffers without decoding them
+            feather.write_feather(table, path + ".tmp", compression="uncompressed")
+            os.replace(path + ".tmp", path)
+            streams[stream_name] = {
+                "file": stream_name + SNAPSHOT_SUFFIX,
+                "rows": table.num_rows,
+                "key_properties": self.key_properties.get(stream_name, []),
+            }
+
+        manifest = {"created_at": datetime.now(pytz.UTC).isoformat(), "streams": streams}
+        manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_path + ".tmp", manifest_path)
+        LOGGER.info(f"Wrote Arrow snapshot of {len(streams)} streams to {self.directory}")
+        return manifest
+
+
+class SnapshotTee:
+    """
+    File-like object wrapping the output of the taps (sys.stdout or a
+    SingerMessageSink) that passes every Singer message through and collects
+    the SCHEMA and RECORD messages into a SnapshotWriter.
+    """
+
+    def __init__(self, output, writer: SnapshotWriter):
+        self.output = output
+        self.writer = writer
+        self._pending = ""
+
+    def write(self, text: str) -> int:
+        self.output.write(text)
+        self._pending += text
+        if "\n" in text:
+            *lines, self._pending = self._pending.split("\n")
+            for line in lines:
+                self._add_line(line)
+        return len(text)
+
+    def flush(self) -> None:
+        self.output.flush()
+
+    def _add_line(self, line: str) -> None:
+        if '"RECORD"' not in line and '"SCHEMA"' not in line:
+            return
+        message = json.loads(line)
+        if message.get("type") == "RECORD":
+            self.writer.add_record(message["stream"], message["record"])
+        elif message.get("type") == "SCHEMA":
+            self.writer.add_schema(message["stream"], message["schema"], message.get("key_properties"))
+
+    def write_snapshot(self) -> Dict[str, Any]:
+        if self._pending:
+            self._add_line(self._pending)
+            self._pending = ""
+        return self.writer.write()
+
+
+class ArrowSnapshot:
+    """
+    Read-only access to a snapshot written by SnapshotWriter.
+
+    Tables are memory-mapped, not read: opening one costs the same whatever
+    its size, the columns point straight into the mapped file and processes
+    opening the same snapshot share its pages through the OS page cache.
+    """
+
+    def __init__(self, directory: str):
+        _require_pyarrow()
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f)
+        self._tables: Dict[str, Any] = {}
+
+    @property
+    def streams(self) -> List[str]:
+        return list(self.manifest["streams"])
+
+    def table(self, stream_name: str):
+        """Zero-copy Arrow table of a stream."""
+        if stream_name not in self._tables:
+            try:
+                entry = self.manifest["streams"][stream_name]
+            except KeyError:
+                raise ValueError(f"Stream '{stream_name}' is not in the snapshot of {self.directory}")
+            source = pa.memory_map(os.path.join(self.directory, entry["file"]), "r")
+            self._tables[stream_name] = pa.ipc.open_file(source).read_all()
+        return self._tables[stream_name]
+
+    def records(self, stream_name: str) -> List[Dict[str, Any]]:
+        """Records of a stream as dicts (copied out of the mapped file)."""
+        return self.table(stream_name).to_pylist()
+
+
+def open_snapshot(directory: str) -> ArrowSnapshot:
+    return ArrowSnapshot(directory)
@@ -0,0 +1,130 @@
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional
+from include.schema_registry import register_schema
+
+
+# Same placeholder and separator as dbt_utils.generate_surrogate_key
+SURROGATE_KEY_NULL = "_dbt_utils_surrogate_key_null_"
+SURROGATE_KEY_SEPARATOR = "-"
+
+
+def generate_surrogate_key(values: Iterable[Any]) -> str:
+    """
+    Python equivalent of dbt_utils.generate_surrogate_key:
+
+        md5(coalesce(cast(a as varchar), '_dbt_utils_surrogate_key_null_') || '-' || ...)
+
+    The values are strings (the API IDs), so the cast is str().
+    """
+    text = SURROGATE_KEY_SEPARATOR.join(
+        SURROGATE_KEY_NULL if value is None else str(value) for value in values
+    )
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def _bridge_schema(stream_name: str, key: str, related_id: str, properties: Dict,
+                   source_paths: Optional[List[str]] = None):
+    return register_schema(
+        stream_name=stream_name,
+        schema={
+            "type": "object",
+            "properties": {
+                key: {
+                    "type": ["string", "null"],
+                    "description": "generate_surrogate_key of LAUNCH_ID and " + related_id
+                },
+                "LAUNCH_ID": {"type": ["string", "null"]},
+                related_id: {"type": ["string", "null"]},
+                **properties,
+                "CREATED_AT": {"type": ["string", "null"]}
+            }
+        },
+        key_properties=[key],
+        source_paths=source_paths
+    )
+
+
+LAUNCH_CORES_SCHEMA = _bridge_schema(
+    "STG_SPACEX_DATA_LAUNCH_CORES", "LAUNCH_CORE_ID", "CORE_ID",
+    {
+        "FLIGHT": {"type": ["integer", "null"]},
+        "GRIDFINS": {"type": ["boolean", "null"]},
+        "LEGS": {"type": ["boolean", "null"]},
+        "REUSED": {"type": ["boolean", "null"]},
+        "LANDING_ATTEMPT": {"type": ["boolean", "null"]},
+        "LANDING_SUCCESS": {"type": ["boolean", "null"]},
+        "LANDING_TYPE": {"type": ["string", "null"]},
+        "LANDPAD": {"type": ["string", "null"]}
+    },
+    ["core", "flight", "gridfins", "legs", "reused", "landing_attempt",
+     "landing_success", "landing_type", "landpad"]
+)
+
+LAUNCH_CREW_SCHEMA = _bridge_schema(
+    "STG_SPACEX_DATA_LAUNCH_CREW", "LAUNCH_CREW_ID", "CREW_ID",
+    {"ROLE": {"type": ["string", "null"]}},
+    ["crew", "role"]
+)
+
+LAUNCH_SHIPS_SCHEMA = _bridge_schema("STG_SPACEX_DATA_LAUNCH_SHIPS", "LAUNCH_SHIP_ID", "SHIP_ID", {})
+
+LAUNCH_PAYLOADS_SCHEMA = _bridge_schema(
+    "STG_SPACEX_DATA_LAUNCH_PAYLOADS", "LAUNCH_PAYLOAD_ID", "PAYLOAD_ID", {}
+)
+
+BRIDGE_SCHEMAS = [LAUNCH_CORES_SCHEMA, LAUNCH_CREW_SCHEMA, LAUNCH_SHIPS_SCHEMA, LAUNCH_PAYLOADS_SCHEMA]
+
+
+def _bridge_record(key: str, related_id: str, launch_id: Optional[str], related: Optional[str],
+                   created_at: str, **fields: Any) -> Dict[str, Any]:
+    return {
+        key: generate_surrogate_key([launch_id, related]),
+        "LAUNCH_ID": launch_id,
+        related_id: related,
+        **fields,
+        "CREATED_AT": created_at
+    }
+
+
+def launch_bridge_records(launch: Dict[str, Any], created_at: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Bridge rows of a launch from the API, by stream: one row per core, crew
+    member, ship and payload of the launch, the rows the cmp_bridge models
+    used to get by flattening the JSON columns of STG_SPACEX_DATA_LAUNCHES.
+    Crew is either a list of {"crew", "role"} objects or of crew IDs.
+    """
+    launch_id = launch.get("id")
+    crew = [member if isinstance(member, dict) else {"crew": member} for member in launch.get("crew") or []]
+    return {
+        LAUNCH_CORES_SCHEMA.stream_name: [
+            _bridge_record(
+                "LAUNCH_CORE_ID", "CORE_ID", launch_id, core.get("core"), created_at,
+                FLIGHT=core.get("flight"),
+                GRIDFINS=core.get("gridfins"),
+                LEGS=core.get("legs"),
+                REUSED=core.get("reused"),
+                LANDING_ATTEMPT=core.get("landing_attempt"),
+                LANDING_SUCCESS=core.get("landing_success"),
+                LANDING_TYPE=core.get("landing_type"),
+                LANDPAD=core.get("landpad")
+            )
+            for core in launch.get("cores") or []
+            if core.get("core") is not None
+        ],
+        LAUNCH_CREW_SCHEMA.stream_name: [
+            _bridge_record(
+                "LAUNCH_CREW_ID", "CREW_ID", launch_id, member.get("crew"), created_at,
+                ROLE=member.get("role")
+            )
+            for member in crew
+            if member.get("crew") is not None
+        ],
+        LAUNCH_SHIPS_SCHEMA.stream_name: [
+            _bridge_record("LAUNCH_SHIP_ID", "SHIP_ID", launch_id, ship, created_at)
+            for ship in launch.get("ships") or []
+        ],
+        LAUNCH_PAYLOADS_SCHEMA.stream_name: [
+            _bridge_record("LAUNCH_PAYLOAD_ID", "PAYLOAD_ID", launch_id, payload, created_at)
+            for payload in launch.get("payloads") or []
+        ],
+    }
@@ -0,0 +1,143 @@
+import singer                               # type: ignore
+import snowflake.connector                  # type: ignore
+import contextlib
+import os
+from typing import Any, Callable, Dict
+from snowflake.connector.errors import DatabaseError          # type: ignore
+
+
+LOGGER = singer.get_logger()
+
+STAGING_DDL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "..", "db_setup", "V2_0", "V2_0__01_create_staging_tables_structure.sql"
+)
+
+RAW_BLOBS_DDL_PATH = os.path.join(
+    os.path.dirname(STAGING_DDL_PATH), "V2_0__03_create_raw_data_blob_store.sql"
+)
+
+STARLINK_ORBITS_DDL_PATH = os.path.join(
+    os.path.dirname(STAGING_DDL_PATH), "V2_0__04_add_starlink_orbital_elements.sql"
+)
+
+STARLINK_POSITIONS_DDL_PATH = os.path.join(
+    os.path.dirname(STAGING_DDL_PATH), "V2_0__05_create_starlink_positions.sql"
+)
+
+LAUNCH_BRIDGES_DDL_PATH = os.path.join(
+    os.path.dirname(STAGING_DDL_PATH), "V2_0__06_create_launch_bridge_tables.sql"
+)
+
+# Scripts applied in order after the staging DDL
+STAGING_MIGRATION_DDL_PATHS = [
+    RAW_BLOBS_DDL_PATH, STARLINK_ORBITS_DDL_PATH, STARLINK_POSITIONS_DDL_PATH, LAUNCH_BRIDGES_DDL_PATH
+]
+
+ConnectionFactory = Callable[[Dict], Any]
+
+# Connection factories keyed on the "type" of the connection config
+CONNECTION_FACTORIES: Dict[str, ConnectionFactory] = {}
+
+
+def register_connection_factory(connection_type: str, factory: ConnectionFactory) -> None:
+    """Register a factory building a connection from a config of the given type."""
+    CONNECTION_FACTORIES[connection_type] = factory
+
+
+def get_connection_factory(config: Dict) -> ConnectionFactory:
+    """Return the factory for a connection config, "snowflake" when no type is set."""
+    connection_type = config.get('type', 'snowflake')
+    try:
+        return CONNECTION_FACTORIES[connection_type]
+    except KeyError:
+        raise ValueError(
+            f"Unknown connection type '{connection_type}'. "
+            f"Expected one of: {', '.join(sorted(CONNECTION_FACTORIES))}"
+        )
+
+
+@contextlib.contextmanager
+def use_connection_factory(factory: ConnectionFactory, connection_type: str = 'snowflake'):
+    """
+    Temporarily replace the factory of a connection type.
+
+    Typically used by tests and benchmarks to swap Snowflake for
+    create_stand_in_connection without touching the config files.
+    """
+    previous = CONNECTION_FACTORIES.get(connection_type)
+    register_connection_factory(connection_type, factory)
+    try:
+        yield factory
+    finally:
+        if previous is None:
+            CONNECTION_FACTORIES.pop(connection_type, None)
+        else:
+            register_connection_factory(connection_type, previous)
+
+
+def create_snowflake_connection(config: Dict):
+    """
+    Create Snowflake connection.
+    """
+    try:
+        # Establish connection
+        conn = snowflake.connector.connect(
+            user=config['user'],
+            password=config['password'],
+            account=config['account'],
+            warehouse=config['warehouse'],
+            database=config['database'],
+            schema=config['schema'],
+            ocsp_response_cache_filename=None,
+            validate_default_parameters=True
+        )
+
+        # Test connection with a simple query
+        cursor = conn.cursor()
+        cursor.execute('SELECT current_version()')
+        version = cursor.fetchone()[0]
+
+        return conn if version is not None else conn.close()
+
+    except DatabaseError as e:
+        # stdout carries the Singer messages, report on the logger
+        LOGGER.error(f"Failed to connect to Snowflake. Error: {str(e)}")
+        return False
+
+
+def create_duckdb_connection(config: Dict):
+    """
+    Connect to the local DuckDB mirror of the staging schema.
+    """
+    from include.local_duckdb import DuckDBConnection
+    return DuckDBConnection(
+        database=config['database'],
+        schema=config.get('schema')
+    )
+
+
+def create_stand_in_connection(config: Dict):
+    """
+    In-process Snowflake stand-in for tests and benchmarks.
+
+    Each connection gets a private in-memory DuckDB database holding the
+    staging tables of db_setup/V2_0 with its migrations. It accepts the pyformat
+    queries, raises snowflake.connector errors and answers the
+    SELECT current_version() connection check.
+    """
+    from include.local_duckdb import DuckDBConnection, create_staging_tables
+
+    schema = config.get('schema', 'STG_SPACEX_DATA')
+
+    conn = DuckDBConnection(database=":memory:", schema=schema)
+    create_staging_tables(conn.raw, config.get('staging_ddl', STAGING_DDL_PATH))
+    for ddl_path in STAGING_MIGRATION_DDL_PATHS:
+        create_staging_tables(conn.raw, ddl_path)
+    conn.raw.execute("CREATE MACRO IF NOT EXISTS current_version() AS version()")
+    return conn
+
+
+register_connection_factory('snowflake', create_snowflake_connection)
+register_connection_factory('duckdb', create_duckdb_connection)
+register_connection_factory('stand_in', create_stand_in_connection)
@@ -0,0 +1,212 @@
+import singer                               # type: ignore
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+import pytz                                 # type: ignore
+
+
+LOGGER = singer.get_logger()
+
+SUMMARY_NAME = "summary.json"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Module of the C functions in cProfile entries, e.g. "<method 'recv_into' of '_socket.socket' objects>"
+BUILTIN_MODULE_PATTERN = re.compile(r"(?:of '|built-in method )([A-Za-z_]\w*)\.")
+
+
+def _search_paths() -> List[str]:
+    """sys.path entries, longest first so site-packages wins over the prefix holding it."""
+    return sorted((os.path.abspath(path) + os.sep for path in sys.path if path), key=len, reverse=True)
+
+
+def _module_path(filename: str, search_paths: List[str]) -> str:
+    """File name relative to the sys.path entry holding it, e.g. simplejson/encoder.py."""
+    for path in search_paths:
+        if filename.startswith(path):
+            return filename[len(path):]
+    return os.path.basename(filename)
+
+
+def _package(filename: str, function_name: str, search_paths: List[str]) -> str:
+    """Top-level package of a cProfile entry: include, singer, simplejson, _socket, ..."""
+    if filename == "~":
+        match = BUILTIN_MODULE_PATTERN.search(function_name)
+        return match.group(1) if match else "builtins"
+    if filename.startswith("<frozen "):
+        return filename[len("<frozen "):-1].split(".", 1)[0]
+    module = _module_path(filename, search_paths)
+    return module.split(os.sep, 1)[0].split(".", 1)[0]
+
+
+class StackSampler:
+    """
+    Sampling profiler of one thread: a daemon thread reads the stack of the
+    profiled thread every interval and counts each distinct stack. Unlike
+    cProfile it adds no cost per call, so the sampled time of call-heavy code
+    such as the record transform is not inflated.
+    """
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_SAMPLE_INTERVAL, base_depth: int = 0):
+        self.thread_id = thread_id
+        self.interval = interval
+        # Frames of the thread above the profiled block, left out of the stacks
+        self.base_depth = base_depth
+        self.stacks: Counter = Counter()
+        self._labels: Dict[Any, str] = {}
+        self._search_paths = _search_paths()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            # ";" separates the frames of a collapsed stack
+            module = _module_path(code.co_filename, self._search_paths).replace(";", "_")
+            label = self._labels[code] = f"{code.co_name} ({module}:{code.co_firstlineno})"
+        return label
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack = stack[::-1][self.base_depth:]
+        if stack:
+            self.stacks[tuple(stack)] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self, root: str) -> List[str]:
+        """Stacks in the collapsed format of flamegraph.pl and speedscope: "root;frame;frame count"."""
+        return [";".join((root,) + stack) + f" {count}" for stack, count in sorted(self.stacks.items())]
+
+
+def _block_depth() -> int:
+    """Depth of the frame running the body of a profile() block (below contextlib and this module)."""
+    frame = sys._getframe(1)
+    while frame.f_code.co_filename in (contextlib.__file__, __file__):
+        frame = frame.f_back
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+class CpuProfiler:
+    """
+    Profile the CPU time of each stream run inside profile(name) and write to
+    the output directory, per stream:
+
+    - <name>.pstats: cProfile statistics (python -m pstats, snakeviz)
+    - <name>.collapsed: sampled stacks for flame graphs (flamegraph.pl, speedscope)
+
+    and summary.json with the time of each stream by top-level package, which
+    separates e.g. json/simplejson serialization, singer, the transform code
+    of include and the network (requests, urllib3, _socket, _ssl). With
+    deterministic=False cProfile is skipped and only the sampler runs.
+    """
+
+    def __init__(self, directory: str, interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 deterministic: bool = True, top: int = 10):
+        self.directory = directory
+        self.interval = interval
+        self.deterministic = deterministic
+        self.top = top
+        self.streams: List[Dict[str, Any]] = []
+
+    def _path(self, name: str, suffix: str) -> str:
+        return os.path.join(self.directory, name + suffix)
+
+    def _package_seconds(self, stats: pstats.Stats) -> Dict[str, float]:
+        search_paths = _search_paths()
+        seconds: Counter = Counter()
+        for (filename, _, function_name), (_, _, tottime, _, _) in stats.stats.items():
+            seconds[_package(filename, function_name, search_paths)] += tottime
+        return {
+            package: round(value, 4) for package, value in seconds.most_common() if round(value, 4) > 0
+        }
+
+    def _top_functions(self, stats: pstats.Stats) -> List[Dict[str, Any]]:
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:self.top]
+        return [
+            {
+                "function": f"{function_name} ({filename}:{line})",
+                "calls": calls,
+                "tottime": round(tottime, 4),
+                "cumtime": round(cumtime, 4),
+            }
+            for (filename, line, function_name), (_, calls, tottime, cumtime, _) in entries
+        ]
+
+    @contextlib.contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        """Profile the stream run in the block."""
+        os.makedirs(self.directory, exist_ok=True)
+        sampler = StackSampler(threading.get_ident(), self.interval, _block_depth())
+        profiler = cProfile.Profile() if self.deterministic else None
+        start = time.perf_counter()
+        sampler.start()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            sampler.stop()
+            seconds = time.perf_counter() - start
+
+            collapsed = sampler.collapsed(name)
+            with open(self._path(name, ".collapsed"), "w") as f:
+                f.writelines(line + "\n" for line in collapsed)
+            stream: Dict[str, Any] = {
+                "stream": name,
+                "seconds": round(seconds, 3),
+                "samples": sum(sampler.stacks.values()),
+                "collapsed": name + ".collapsed",
+            }
+            if profiler:
+                profiler.dump_stats(self._path(name, ".pstats"))
+                stats = pstats.Stats(profiler, stream=io.StringIO())
+                stream.update({
+                    "pstats": name + ".pstats",
+                    "seconds_by_package": self._package_seconds(stats),
+                    "top_functions": self._top_functions(stats),
+                })
+            self.streams.append(stream)
+
+    def write_summary(self) -> Dict[str, Any]:
+        summary = {
+            "created_at": datetime.now(pytz.UTC).isoformat(),
+            "sample_interval": self.interval,
+            "deterministic": self.deterministic,
+            "streams": self.streams,
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, SUMMARY_NAME), "w") as f:
+            json.dump(summary, f, indent=2)
+        LOGGER.info(f"Wrote CPU profiles of {len(self.streams)} streams to {self.directory}")
+        return summary
@@ -1,7 +1,34 @@
 import singer                                           # type: ignore
 import requests                                         # type: ignore
-import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+
+CAPSULES_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_CAPSULES",
+    schema={
+        "type": "object",
+        "properties": {
+            "CAPSULE_ID": {"type": ["string", "null"]},
+            "SERIAL": {"type": ["string", "null"]},
+            "STATUS": {"type": ["string", "null"]},
+            "DRAGON": {"type": ["string", "null"]},
+            "REUSE_COUNT": {"type": ["integer", "null"]},
+            "WATER_LANDINGS": {"type": ["integer", "null"]},
+            "LAND_LANDINGS": {"type": ["integer", "null"]},
+            "LAST_UPDATE": {"type": ["string", "null"]},
+            "LAUNCHES": {"type": ["array", "null"]},
+            "CREATED_AT": {"type": ["string", "null"]},
+            "UPDATED_AT": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["CAPSULE_ID"],
+    source_paths=[
+        "id", "serial", "status", "dragon", "reuse_count", "water_landings",
+        "land_landings", "last_update", "launches"
+    ]
+)
 
 
 class CapsulesTap(SpaceXTapBase):
@@ -17,34 +44,13 @@ class CapsulesTap(SpaceXTapBase):
         
         try:
             # Fetch data from API
-            response = requests.get(self.base_url + "capsules")
-            response.raise_for_status()
-            capsules_data = response.json()
-
-            # Schema definition for capsules data
-            schema = {
-                "type": "object",
-                "properties": {
-                    "CAPSULE_ID": {"type": ["string", "null"]},
-                    "SERIAL": {"type": ["string", "null"]},
-                    "STATUS": {"type": ["string", "null"]},
-                    "DRAGON": {"type": ["string", "null"]},
-                    "REUSE_COUNT": {"type": ["integer", "null"]},
-                    "WATER_LANDINGS": {"type": ["integer", "null"]},
-                    "LAND_LANDINGS": {"type": ["integer", "null"]},
-                    "LAST_UPDATE": {"type": ["string", "null"]},
-                    "LAUNCHES": {"type": ["array", "null"]},
-                    "CREATED_AT": {"type": ["string", "null"]},
-                    "UPDATED_AT": {"type": ["string", "null"]},
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            capsules_data = self.fetch_json(stream_name, "capsules")
 
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["CAPSULE_ID"]
+                schema=CAPSULES_SCHEMA.schema,
+                key_properties=CAPSULES_SCHEMA.key_properties
             )
 
             # Process each capsule
@@ -52,8 +58,10 @@ class CapsulesTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
             
             # Process and write each capsule record
+            stages = self.tracer.stages(stream_name)
             for capsule in capsules_data:
                 try:
+                    stages.start()
                     transformed_capsule = {
                         "CAPSULE_ID": capsule.get("id"),
                         "SERIAL": capsule.get("serial"),
@@ -66,15 +74,23 @@ class CapsulesTap(SpaceXTapBase):
                         "LAUNCHES": capsule.get("launches", []),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(capsule)
+                        "RAW_DATA": self.raw_data(stream_name, capsule)
                     }
 
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(CAPSULES_SCHEMA, capsule)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(CAPSULES_SCHEMA, transformed_capsule)
+                    stages.lap("transform")
+
                     # Write record
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_capsule,
                         time_extracted=current_time
                     )
+                    stages.lap_output()
 
                 except Exception as transform_error:
                     self.log_error(
@@ -84,6 +100,14 @@ class CapsulesTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other capsules
             
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(CAPSULES_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(CAPSULES_SCHEMA, (capsule.get("id") for capsule in capsules_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_CAPSULES": {
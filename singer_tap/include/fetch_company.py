@@ -2,9 +2,44 @@
 import singer                                           # type: ignore
 import requests                                         # type: ignore
 import pytz                                             # type: ignore
-import json
 from datetime import datetime
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+
+COMPANY_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_COMPANY",
+    schema={
+        "type": "object",
+        "properties": {
+            "ID": {"type": ["string", "null"]},
+            "NAME": {"type": ["string", "null"]},
+            "FOUNDER": {"type": ["string", "null"]},
+            "FOUNDED": {"type": ["integer", "null"]},
+            "EMPLOYEES": {"type": ["integer", "null"]},
+            "VEHICLES": {"type": ["integer", "null"]},
+            "LAUNCH_SITES": {"type": ["integer", "null"]},
+            "TEST_SITES": {"type": ["integer", "null"]},
+            "CEO": {"type": ["string", "null"]},
+            "CTO": {"type": ["string", "null"]},
+            "COO": {"type": ["string", "null"]},
+            "CTO_PROPULSION": {"type": ["string", "null"]},
+            "VALUATION": {"type": ["number", "null"]},
+            "HEADQUARTERS": {"type": ["object", "null"]},
+            "LINKS": {"type": ["object", "null"]},
+            "SUMMARY": {"type": ["string", "null"]},
+            "CREATED_AT": {"type": ["string", "null"]},
+            "UPDATED_AT": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["ID"],
+    source_paths=[
+        "id", "name", "founder", "founded", "employees", "vehicles", "launch_sites",
+        "test_sites", "ceo", "cto", "coo", "cto_propulsion", "valuation", "headquarters",
+        "links", "summary"
+    ]
+)
 
 
 class CompanyTap(SpaceXTapBase):
@@ -21,41 +56,13 @@ class CompanyTap(SpaceXTapBase):
         
         try:
             # Fetch data from API
-            response = requests.get(self.base_url + "company")
-            response.raise_for_status()
-            company_data = response.json()
-
-            # Schema definition for company data
-            schema = {
-                "type": "object",
-                "properties": {
-                    "ID": {"type": ["string", "null"]},
-                    "NAME": {"type": ["string", "null"]},
-                    "FOUNDER": {"type": ["string", "null"]},
-                    "FOUNDED": {"type": ["integer", "null"]},
-                    "EMPLOYEES": {"type": ["integer", "null"]},
-                    "VEHICLES": {"type": ["integer", "null"]},
-                    "LAUNCH_SITES": {"type": ["integer", "null"]},
-                    "TEST_SITES": {"type": ["integer", "null"]},
-                    "CEO": {"type": ["string", "null"]},
-                    "CTO": {"type": ["string", "null"]},
-                    "COO": {"type": ["string", "null"]},
-                    "CTO_PROPULSION": {"type": ["string", "null"]},
-                    "VALUATION": {"type": ["number", "null"]},
-                    "HEADQUARTERS": {"type": ["object", "null"]},
-                    "LINKS": {"type": ["object", "null"]},
-                    "SUMMARY": {"type": ["string", "null"]},
-                    "CREATED_AT": {"type": ["string", "null"]},
-                    "UPDATED_AT": {"type": ["string", "null"]},
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            company_data = self.fetch_json(stream_name, "company")
 
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["ID"]
+                schema=COMPANY_SCHEMA.schema,
+                key_properties=COMPANY_SCHEMA.key_properties
             )
             
             # Process each capsule
@@ -63,8 +70,10 @@ class CompanyTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
 
             
+            stages = self.tracer.stages(stream_name)
             try:
                 # Transform and write record
+                stages.start()
                 transformed_company = {
                     "ID": company_data.get("id"),
                     "NAME": company_data.get("name"),
@@ -84,14 +93,22 @@ class CompanyTap(SpaceXTapBase):
                     "SUMMARY": company_data.get("summary"),
                     "CREATED_AT": current_time_str,
                     "UPDATED_AT": current_time_str,
-                    "RAW_DATA": json.dumps(company_data)
+                    "RAW_DATA": self.raw_data(stream_name, company_data)
                 }
 
+                # Compare the payload keys with the mapped source paths
+                self.track_schema_drift(COMPANY_SCHEMA, company_data)
+
+                # Validate a sample of the records against the registered schema
+                self.validate_record(COMPANY_SCHEMA, transformed_company)
+                stages.lap("transform")
+
                 # Write record
                 singer.write_record(
                     stream_name=stream_name,
                     record=transformed_company
                 )
+                stages.lap_output()
 
             except Exception as transform_error:
                 self.log_error(
@@ -100,7 +117,11 @@ class CompanyTap(SpaceXTapBase):
                     error_data=company_data
                 )
                 raise
+            stages.close()
             
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(COMPANY_SCHEMA)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_CAPSULES": {
@@ -2,6 +2,62 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+
+CORES_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_CORES",
+    schema={
+        "type": "object",
+        "properties": {
+            "CORE_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the core"
+            },
+            "SERIAL": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "BLOCK": {
+                "type": ["integer", "null"]
+            },
+            "STATUS": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "REUSE_COUNT": {
+                "type": ["integer", "null"]
+            },
+            "RTLS_ATTEMPTS": {
+                "type": ["integer", "null"]
+            },
+            "RTLS_LANDINGS": {
+                "type": ["integer", "null"]
+            },
+            "ASDS_ATTEMPTS": {
+                "type": ["integer", "null"]
+            },
+            "ASDS_LANDINGS": {
+                "type": ["integer", "null"]
+            },
+            "LAST_UPDATE": {
+                "type": ["string", "null"]
+            },
+            "LAUNCHES": {
+                "type": ["string", "null"],
+                "description": "Array of launch IDs stored as JSON string"
+            },
+            "CREATED_AT": {"type": ["string", "null"]},
+            "UPDATED_AT": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["CORE_ID"],
+    source_paths=[
+        "id", "serial", "block", "status", "reuse_count", "rtls_attempts", "rtls_landings",
+        "asds_attempts", "asds_landings", "last_update", "launches"
+    ]
+)
 
 
 class CoresTap(SpaceXTapBase):
@@ -17,62 +73,13 @@ class CoresTap(SpaceXTapBase):
         
         try:
             # Fetch data from the cores endpoint
-            response = requests.get(self.base_url + "cores")
-            response.raise_for_status()
-            cores_data = response.json()
-        
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "CORE_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the core"
-                    },
-                    "SERIAL": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "BLOCK": {
-                        "type": ["integer", "null"]
-                    },
-                    "STATUS": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "REUSE_COUNT": {
-                        "type": ["integer", "null"]
-                    },
-                    "RTLS_ATTEMPTS": {
-                        "type": ["integer", "null"]
-                    },
-                    "RTLS_LANDINGS": {
-                        "type": ["integer", "null"]
-                    },
-                    "ASDS_ATTEMPTS": {
-                        "type": ["integer", "null"]
-                    },
-                    "ASDS_LANDINGS": {
-                        "type": ["integer", "null"]
-                    },
-                    "LAST_UPDATE": {
-                        "type": ["string", "null"]
-                    },
-                    "LAUNCHES": {
-                        "type": ["string", "null"],
-                        "description": "Array of launch IDs stored as JSON string"
-                    },
-                    "CREATED_AT": {"type": ["string", "null"]},
-                    "UPDATED_AT": {"type": ["string", "null"]},
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            cores_data = self.fetch_json(stream_name, "cores")
         
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["CORE_ID"]
+                schema=CORES_SCHEMA.schema,
+                key_properties=CORES_SCHEMA.key_properties
             )
         
             # Get current time with timezone
@@ -80,9 +87,11 @@ class CoresTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
         
             # Process and write each core record
+            stages = self.tracer.stages(stream_name)
             for core in cores_data:
                 # Transform data for Snowflake compatibility
                 try:
+                    stages.start()
                     transformed_core = {
                         "CORE_ID": core.get("id"),
                         "SERIAL": core.get("serial"),
@@ -97,14 +106,22 @@ class CoresTap(SpaceXTapBase):
                         "LAUNCHES": json.dumps(core.get("launches", [])),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(core)
+                        "RAW_DATA": self.raw_data(stream_name, core)
                     }
             
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(CORES_SCHEMA, core)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(CORES_SCHEMA, transformed_core)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_core,
                     )
+                    stages.lap_output()
                 
                 except Exception as transform_error:
                     self.log_error(
@@ -114,6 +131,14 @@ class CoresTap(SpaceXTapBase):
                 )
                 continue  # Continue processing other capsules
         
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(CORES_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(CORES_SCHEMA, (core.get("id") for core in cores_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_CORES": {
@@ -2,6 +2,52 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+
+CREW_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_CREW",
+    schema={
+        "type": "object",
+        "properties": {
+            "CREW_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the crew member"
+            },
+            "NAME": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "AGENCY": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "IMAGE": {
+                "type": ["string", "null"],
+                "description": "URL of crew member's image"
+            },
+            "WIKIPEDIA": {
+                "type": ["string", "null"],
+                "description": "URL of Wikipedia page"
+            },
+            "STATUS": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "LAUNCHES": {
+                "type": ["string", "null"],
+                "description": "Array of launch IDs stored as JSON string"
+            },
+            "CREATED_AT": {"type": ["string", "null"]},
+            "UPDATED_AT": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["CREW_ID"],
+    source_paths=[
+        "id", "name", "agency", "image", "wikipedia", "status", "launches"
+    ]
+)
 
 
 class CrewTap(SpaceXTapBase):
@@ -17,53 +63,13 @@ class CrewTap(SpaceXTapBase):
         # Fetch data from the crew endpoint
         
         try:
-            response = requests.get(self.base_url + "crew")
-            response.raise_for_status()
-            crew_data = response.json()
-        
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "CREW_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the crew member"
-                    },
-                    "NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "AGENCY": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "IMAGE": {
-                        "type": ["string", "null"],
-                        "description": "URL of crew member's image"
-                    },
-                    "WIKIPEDIA": {
-                        "type": ["string", "null"],
-                        "description": "URL of Wikipedia page"
-                    },
-                    "STATUS": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "LAUNCHES": {
-                        "type": ["string", "null"],
-                        "description": "Array of launch IDs stored as JSON string"
-                    },
-                    "CREATED_AT": {"type": ["string", "null"]},
-                    "UPDATED_AT": {"type": ["string", "null"]},
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            crew_data = self.fetch_json(stream_name, "crew")
         
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["CREW_ID"]
+                schema=CREW_SCHEMA.schema,
+                key_properties=CREW_SCHEMA.key_properties
             )
         
             # Get current time with timezone
@@ -71,8 +77,10 @@ class CrewTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
         
             # Process and write each crew record
+            stages = self.tracer.stages(stream_name)
             for crew_member in crew_data:
                 try :
+                    stages.start()
                     # Transform data for Snowflake compatibility
                     transformed_crew = {
                         "CREW_ID": crew_member.get("id"),
@@ -84,14 +92,22 @@ class CrewTap(SpaceXTapBase):
                         "LAUNCHES": json.dumps(crew_member.get("launches", [])),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(crew_member)
+                        "RAW_DATA": self.raw_data(stream_name, crew_member)
                     }
             
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(CREW_SCHEMA, crew_member)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(CREW_SCHEMA, transformed_crew)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_crew,
                     )
+                    stages.lap_output()
                 
                 except Exception as transform_error:
                     self.log_error(
@@ -101,6 +117,14 @@ class CrewTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other capsules
         
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(CREW_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(CREW_SCHEMA, (crew_member.get("id") for crew_member in crew_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_CREW": {
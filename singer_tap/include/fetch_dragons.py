@@ -2,6 +2,112 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+DRAGONS_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_DRAGONS",
+    schema={
+        "type": "object",
+        "properties": {
+            "DRAGON_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the dragon"
+            },
+            "NAME": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "TYPE": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "ACTIVE": {
+                "type": ["boolean", "null"]
+            },
+            "CREW_CAPACITY": {
+                "type": ["integer", "null"]
+            },
+            "SIDEWALL_ANGLE_DEG": {
+                "type": ["number", "null"]
+            },
+            "ORBIT_DURATION_YR": {
+                "type": ["integer", "null"]
+            },
+            "DRY_MASS_KG": {
+                "type": ["integer", "null"]
+            },
+            "DRY_MASS_LB": {
+                "type": ["integer", "null"]
+            },
+            "FIRST_FLIGHT": {
+                "type": ["string", "null"],
+                "format": "date"
+            },
+            "HEAT_SHIELD": {
+                "type": ["string", "null"],
+                "description": "Heat shield details stored as JSON string"
+            },
+            "THRUSTERS": {
+                "type": ["string", "null"],
+                "description": "Thrusters details stored as JSON string"
+            },
+            "LAUNCH_PAYLOAD_MASS": {
+                "type": ["string", "null"],
+                "description": "Launch payload mass details as JSON string"
+            },
+            "LAUNCH_PAYLOAD_VOL": {
+                "type": ["string", "null"],
+                "description": "Launch payload volume details as JSON string"
+            },
+            "RETURN_PAYLOAD_MASS": {
+                "type": ["string", "null"],
+                "description": "Return payload mass details as JSON string"
+            },
+            "RETURN_PAYLOAD_VOL": {
+                "type": ["string", "null"],
+                "description": "Return payload volume details as JSON string"
+            },
+            "PRESSURIZED_CAPSULE": {
+                "type": ["string", "null"],
+                "description": "Pressurized capsule details as JSON string"
+            },
+            "TRUNK": {
+                "type": ["string", "null"],
+                "description": "Trunk details as JSON string"
+            },
+            "HEIGHT_W_TRUNK": {
+                "type": ["string", "null"],
+                "description": "Height with trunk details as JSON string"
+            },
+            "DIAMETER": {
+                "type": ["string", "null"],
+                "description": "Diameter details as JSON string"
+            },
+            "WIKIPEDIA": {
+                "type": ["string", "null"]
+            },
+            "DESCRIPTION": {
+                "type": ["string", "null"]
+            },
+            "FLICKR_IMAGES": {
+                "type": ["string", "null"],
+                "description": "Array of image URLs stored as JSON string"
+            },
+            "CREATED_AT": {"type": ["string", "null"]},
+            "UPDATED_AT": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["DRAGON_ID"],
+    source_paths=[
+        "id", "name", "type", "active", "crew_capacity", "sidewall_angle_deg",
+        "orbit_duration_yr", "dry_mass_kg", "dry_mass_lb", "first_flight", "heat_shield",
+        "thrusters", "launch_payload_mass", "launch_payload_vol", "return_payload_mass",
+        "return_payload_vol", "pressurized_capsule", "trunk", "height_w_trunk", "diameter",
+        "wikipedia", "description", "flickr_images"
+    ]
+)
+
 
 class DragonsTap(SpaceXTapBase):
     def __init__(self, base_url: str, config_path: str):
@@ -16,109 +122,13 @@ class DragonsTap(SpaceXTapBase):
         
         try :
             # Fetch data from the dragons endpoint
-            response = requests.get(self.base_url + "dragons")
-            response.raise_for_status()
-            dragons_data = response.json()
-        
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "DRAGON_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the dragon"
-                    },
-                    "NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "TYPE": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "ACTIVE": {
-                        "type": ["boolean", "null"]
-                    },
-                    "CREW_CAPACITY": {
-                        "type": ["integer", "null"]
-                    },
-                    "SIDEWALL_ANGLE_DEG": {
-                        "type": ["number", "null"]
-                    },
-                    "ORBIT_DURATION_YR": {
-                        "type": ["integer", "null"]
-                    },
-                    "DRY_MASS_KG": {
-                        "type": ["integer", "null"]
-                    },
-                    "DRY_MASS_LB": {
-                        "type": ["integer", "null"]
-                    },
-                    "FIRST_FLIGHT": {
-                        "type": ["string", "null"],
-                        "format": "date"
-                    },
-                    "HEAT_SHIELD": {
-                        "type": ["string", "null"],
-                        "description": "Heat shield details stored as JSON string"
-                    },
-                    "THRUSTERS": {
-                        "type": ["string", "null"],
-                        "description": "Thrusters details stored as JSON string"
-                    },
-                    "LAUNCH_PAYLOAD_MASS": {
-                        "type": ["string", "null"],
-                        "description": "Launch payload mass details as JSON string"
-                    },
-                    "LAUNCH_PAYLOAD_VOL": {
-                        "type": ["string", "null"],
-                        "description": "Launch payload volume details as JSON string"
-                    },
-                    "RETURN_PAYLOAD_MASS": {
-                        "type": ["string", "null"],
-                        "description": "Return payload mass details as JSON string"
-                    },
-                    "RETURN_PAYLOAD_VOL": {
-                        "type": ["string", "null"],
-                        "description": "Return payload volume details as JSON string"
-                    },
-                    "PRESSURIZED_CAPSULE": {
-                        "type": ["string", "null"],
-                        "description": "Pressurized capsule details as JSON string"
-                    },
-                    "TRUNK": {
-                        "type": ["string", "null"],
-                        "description": "Trunk details as JSON string"
-                    },
-                    "HEIGHT_W_TRUNK": {
-                        "type": ["string", "null"],
-                        "description": "Height with trunk details as JSON string"
-                    },
-                    "DIAMETER": {
-                        "type": ["string", "null"],
-                        "description": "Diameter details as JSON string"
-                    },
-                    "WIKIPEDIA": {
-                        "type": ["string", "null"]
-                    },
-                    "DESCRIPTION": {
-                        "type": ["string", "null"]
-                    },
-                    "FLICKR_IMAGES": {
-                        "type": ["string", "null"],
-                        "description": "Array of image URLs stored as JSON string"
-                    },
-                    "CREATED_AT": {"type": ["string", "null"]},
-                    "UPDATED_AT": {"type": ["string", "null"]},
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            dragons_data = self.fetch_json(stream_name, "dragons")
         
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["DRAGON_ID"]
+                schema=DRAGONS_SCHEMA.schema,
+                key_properties=DRAGONS_SCHEMA.key_properties
             )
         
             # Get current time with timezone
@@ -126,8 +136,10 @@ class DragonsTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
         
             # Process and write each dragon record
+            stages = self.tracer.stages(stream_name)
             for dragon in dragons_data:
                 try:
+                    stages.start()
                     # Transform data for Snowflake compatibility
                     transformed_dragon = {
                         "DRAGON_ID": dragon.get("id"),
@@ -155,14 +167,22 @@ class DragonsTap(SpaceXTapBase):
                         "FLICKR_IMAGES": json.dumps(dragon.get("flickr_images", [])),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(dragon)
+                        "RAW_DATA": self.raw_data(stream_name, dragon)
                     }
             
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(DRAGONS_SCHEMA, dragon)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(DRAGONS_SCHEMA, transformed_dragon)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_dragon,
                     )
+                    stages.lap_output()
                 
                 except Exception as transform_error:
                     self.log_error(
@@ -173,6 +193,14 @@ class DragonsTap(SpaceXTapBase):
                     continue  # Continue processing other capsules 
                 
         
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(DRAGONS_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(DRAGONS_SCHEMA, (dragon.get("id") for dragon in dragons_data), current_time)
+
             # Write state
             state = {
                 "DRAGONS": {
@@ -2,6 +2,60 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+HISTORY_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_HISTORY",
+    schema={
+        "type": "object",
+        "properties": {
+            "HISTORY_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the historical event"
+            },
+            "TITLE": {
+                "type": ["string", "null"],
+                "maxLength": 512
+            },
+            "EVENT_DATE_UTC": {
+                "type": ["string", "null"],
+                "format": "date-time",
+                "description": "Date of the historical event"
+            },
+            "EVENT_DATE_UNIX": {
+                "type": ["integer", "null"],
+                "description": "Unix timestamp of the event"
+            },
+            "DETAILS": {
+                "type": ["string", "null"],
+                "description": "Detailed description of the event"
+            },
+            "LINKS": {
+                "type": ["string", "null"],
+                "description": "Related links stored as JSON string"
+            },
+            "FLIGHT_NUMBER": {
+                "type": ["integer", "null"],
+                "description": "Associated flight number if applicable"
+            },
+            "CREATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "UPDATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["HISTORY_ID"],
+    source_paths=[
+        "links", "id", "title", "event_date_utc", "event_date_unix", "details",
+        "flight_number"
+    ]
+)
+
 
 class HistoryTap(SpaceXTapBase):
     
@@ -14,60 +68,13 @@ class HistoryTap(SpaceXTapBase):
         
         try:
             # Fetch data from the history endpoint
-            response = requests.get(self.base_url + "history")
-            response.raise_for_status()
-            history_data = response.json()
-        
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "HISTORY_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the historical event"
-                    },
-                    "TITLE": {
-                        "type": ["string", "null"],
-                        "maxLength": 512
-                    },
-                    "EVENT_DATE_UTC": {
-                        "type": ["string", "null"],
-                        "format": "date-time",
-                        "description": "Date of the historical event"
-                    },
-                    "EVENT_DATE_UNIX": {
-                        "type": ["integer", "null"],
-                        "description": "Unix timestamp of the event"
-                    },
-                    "DETAILS": {
-                        "type": ["string", "null"],
-                        "description": "Detailed description of the event"
-                    },
-                    "LINKS": {
-                        "type": ["string", "null"],
-                        "description": "Related links stored as JSON string"
-                    },
-                    "FLIGHT_NUMBER": {
-                        "type": ["integer", "null"],
-                        "description": "Associated flight number if applicable"
-                    },
-                    "CREATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "UPDATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            history_data = self.fetch_json(stream_name, "history")
         
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["HISTORY_ID"]
+                schema=HISTORY_SCHEMA.schema,
+                key_properties=HISTORY_SCHEMA.key_properties
             )
         
             # Get current time with timezone
@@ -75,8 +82,10 @@ class HistoryTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
         
             # Process and write each history record
+            stages = self.tracer.stages(stream_name)
             for event in history_data:
                 try:
+                    stages.start()
                     # Transform links object to JSON string if it exists
                     links = json.dumps(event.get("links", {})) if event.get("links") else None
                     
@@ -91,15 +100,23 @@ class HistoryTap(SpaceXTapBase):
                         "FLIGHT_NUMBER": event.get("flight_number"),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(event)
+                        "RAW_DATA": self.raw_data(stream_name, event)
                     }
             
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(HISTORY_SCHEMA, event)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(HISTORY_SCHEMA, transformed_event)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_event,
                         time_extracted=current_time
                     )
+                    stages.lap_output()
                 except Exception as transform_error:
                     self.log_error(
                         table_name=stream_name,
@@ -108,6 +125,14 @@ class HistoryTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other history
         
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(HISTORY_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(HISTORY_SCHEMA, (event.get("id") for event in history_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_HISTORY": {
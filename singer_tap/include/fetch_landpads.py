@@ -2,6 +2,86 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+
+LANDPADS_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_LANDPADS",
+    schema={
+        "type": "object",
+        "properties": {
+            "LANDPAD_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the landing pad"
+            },
+            "NAME": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "FULL_NAME": {
+                "type": ["string", "null"],
+                "maxLength": 512
+            },
+            "STATUS": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "TYPE": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "LOCALITY": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "REGION": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "LATITUDE": {
+                "type": ["number", "null"]
+            },
+            "LONGITUDE": {
+                "type": ["number", "null"]
+            },
+            "LANDING_ATTEMPTS": {
+                "type": ["integer", "null"]
+            },
+            "LANDING_SUCCESSES": {
+                "type": ["integer", "null"]
+            },
+            "WIKIPEDIA": {
+                "type": ["string", "null"]
+            },
+            "DETAILS": {
+                "type": ["string", "null"]
+            },
+            "LAUNCHES": {
+                "type": ["string", "null"],
+                "description": "Array of launch IDs stored as JSON string"
+            },
+            "IMAGES": {
+                "type": ["string", "null"],
+                "description": "Image URLs stored as JSON string"
+            },
+            "CREATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "UPDATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["LANDPAD_ID"],
+    source_paths=[
+        "id", "name", "full_name", "status", "type", "locality", "region", "latitude",
+        "longitude", "landing_attempts", "landing_successes", "wikipedia", "details",
+        "launches", "images.large", "images.small"
+    ]
+)
 
 
 class LandpadsTap(SpaceXTapBase):
@@ -15,85 +95,13 @@ class LandpadsTap(SpaceXTapBase):
         
         try:
             # Fetch data from the landpads endpoint
-            response = requests.get(self.base_url + "landpads")
-            response.raise_for_status()
-            landpads_data = response.json()
-        
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "LANDPAD_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the landing pad"
-                    },
-                    "NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "FULL_NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 512
-                    },
-                    "STATUS": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "TYPE": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "LOCALITY": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "REGION": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "LATITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "LONGITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "LANDING_ATTEMPTS": {
-                        "type": ["integer", "null"]
-                    },
-                    "LANDING_SUCCESSES": {
-                        "type": ["integer", "null"]
-                    },
-                    "WIKIPEDIA": {
-                        "type": ["string", "null"]
-                    },
-                    "DETAILS": {
-                        "type": ["string", "null"]
-                    },
-                    "LAUNCHES": {
-                        "type": ["string", "null"],
-                        "description": "Array of launch IDs stored as JSON string"
-                    },
-                    "IMAGES": {
-                        "type": ["string", "null"],
-                        "description": "Image URLs stored as JSON string"
-                    },
-                    "CREATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "UPDATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            landpads_data = self.fetch_json(stream_name, "landpads")
         
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["LANDPAD_ID"]
+                schema=LANDPADS_SCHEMA.schema,
+                key_properties=LANDPADS_SCHEMA.key_properties
             )
         
             # Get current time with timezone
@@ -101,8 +109,10 @@ class LandpadsTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
         
             # Process and write each landpad record
+            stages = self.tracer.stages(stream_name)
             for landpad in landpads_data:
                 try:
+                    stages.start()
                     # Handle images object specifically
                     images = {}
                     if "images" in landpad:
@@ -130,15 +140,23 @@ class LandpadsTap(SpaceXTapBase):
                         "IMAGES": json.dumps(images),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(landpad)
+                        "RAW_DATA": self.raw_data(stream_name, landpad)
                     }
             
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(LANDPADS_SCHEMA, landpad)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(LANDPADS_SCHEMA, transformed_landpad)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_landpad,
                         time_extracted=current_time
                     )
+                    stages.lap_output()
                 except Exception as transform_error:
                     self.log_error(
                         table_name=stream_name,
@@ -147,6 +165,14 @@ class LandpadsTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other landpad
         
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(LANDPADS_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(LANDPADS_SCHEMA, (landpad.get("id") for landpad in landpads_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_LANDPADS": {
@@ -2,6 +2,119 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+from include.bridge_streams import BRIDGE_SCHEMAS, launch_bridge_records
+
+
+LAUNCHES_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_LAUNCHES",
+    schema={
+        "type": "object",
+        "properties": {
+            "LAUNCH_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the launch"
+            },
+            "FLIGHT_NUMBER": {
+                "type": ["integer", "null"]
+            },
+            "NAME": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "DATE_UTC": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "DATE_UNIX": {
+                "type": ["integer", "null"]
+            },
+            "DATE_LOCAL": {
+                "type": ["string", "null"]
+            },
+            "DATE_PRECISION": {
+                "type": ["string", "null"]
+            },
+            "STATIC_FIRE_DATE_UTC": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "STATIC_FIRE_DATE_UNIX": {
+                "type": ["integer", "null"]
+            },
+            "NET": {
+                "type": ["boolean", "null"]
+            },
+            "WINDOW": {
+                "type": ["integer", "null"]
+            },
+            "ROCKET": {
+                "type": ["string", "null"]
+            },
+            "SUCCESS": {
+                "type": ["boolean", "null"]
+            },
+            "FAILURES": {
+                "type": ["string", "null"],
+                "description": "Array of failure details stored as JSON string"
+            },
+            "UPCOMING": {
+                "type": ["boolean", "null"]
+            },
+            "DETAILS": {
+                "type": ["string", "null"]
+            },
+            "FAIRINGS": {
+                "type": ["string", "null"],
+                "description": "Fairings details stored as JSON string"
+            },
+            "CREW": {
+                "type": ["string", "null"],
+                "description": "Array of crew details stored as JSON string"
+            },
+            "SHIPS": {
+                "type": ["string", "null"],
+                "description": "Array of ship IDs stored as JSON string"
+            },
+            "CAPSULES": {
+                "type": ["string", "null"],
+                "description": "Array of capsule IDs stored as JSON string"
+            },
+            "PAYLOADS": {
+                "type": ["string", "null"],
+                "description": "Array of payload IDs stored as JSON string"
+            },
+            "LAUNCHPAD": {
+                "type": ["string", "null"]
+            },
+            "CORES": {
+                "type": ["string", "null"],
+                "description": "Array of core details stored as JSON string"
+            },
+            "LINKS": {
+                "type": ["string", "null"],
+                "description": "Related links stored as JSON string"
+            },
+            "AUTO_UPDATE": {
+                "type": ["boolean", "null"]
+            },
+            "LAUNCH_LIBRARY_ID": {
+                "type": ["string", "null"]
+            },
+            "CREATED_AT": {"type": ["string", "null"]},
+            "UPDATED_AT": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["LAUNCH_ID"],
+    source_paths=[
+        "id", "flight_number", "name", "date_utc", "date_unix", "date_local",
+        "date_precision", "static_fire_date_utc", "static_fire_date_unix", "net", "window",
+        "rocket", "success", "failures", "upcoming", "details", "fairings", "crew", "ships",
+        "capsules", "payloads", "launchpad", "cores", "links", "auto_update",
+        "launch_library_id"
+    ]
+)
 
 
 class LaunchesTap(SpaceXTapBase):
@@ -18,124 +131,33 @@ class LaunchesTap(SpaceXTapBase):
         try:
             
             # Fetch data from the launches endpoint
-            response = requests.get(self.base_url + "launches")
-            response.raise_for_status()
-            launches_data = response.json()
-        
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "LAUNCH_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the launch"
-                    },
-                    "FLIGHT_NUMBER": {
-                        "type": ["integer", "null"]
-                    },
-                    "NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "DATE_UTC": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "DATE_UNIX": {
-                        "type": ["integer", "null"]
-                    },
-                    "DATE_LOCAL": {
-                        "type": ["string", "null"]
-                    },
-                    "DATE_PRECISION": {
-                        "type": ["string", "null"]
-                    },
-                    "STATIC_FIRE_DATE_UTC": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "STATIC_FIRE_DATE_UNIX": {
-                        "type": ["integer", "null"]
-                    },
-                    "NET": {
-                        "type": ["boolean", "null"]
-                    },
-                    "WINDOW": {
-                        "type": ["integer", "null"]
-                    },
-                    "ROCKET": {
-                        "type": ["string", "null"]
-                    },
-                    "SUCCESS": {
-                        "type": ["boolean", "null"]
-                    },
-                    "FAILURES": {
-                        "type": ["string", "null"],
-                        "description": "Array of failure details stored as JSON string"
-                    },
-                    "UPCOMING": {
-                        "type": ["boolean", "null"]
-                    },
-                    "DETAILS": {
-                        "type": ["string", "null"]
-                    },
-                    "FAIRINGS": {
-                        "type": ["string", "null"],
-                        "description": "Fairings details stored as JSON string"
-                    },
-                    "CREW": {
-                        "type": ["string", "null"],
-                        "description": "Array of crew details stored as JSON string"
-                    },
-                    "SHIPS": {
-                        "type": ["string", "null"],
-                        "description": "Array of ship IDs stored as JSON string"
-                    },
-                    "CAPSULES": {
-                        "type": ["string", "null"],
-                        "description": "Array of capsule IDs stored as JSON string"
-                    },
-                    "PAYLOADS": {
-                        "type": ["string", "null"],
-                        "description": "Array of payload IDs stored as JSON string"
-                    },
-                    "LAUNCHPAD": {
-                        "type": ["string", "null"]
-                    },
-                    "CORES": {
-                        "type": ["string", "null"],
-                        "description": "Array of core details stored as JSON string"
-                    },
-                    "LINKS": {
-                        "type": ["string", "null"],
-                        "description": "Related links stored as JSON string"
-                    },
-                    "AUTO_UPDATE": {
-                        "type": ["boolean", "null"]
-                    },
-                    "LAUNCH_LIBRARY_ID": {
-                        "type": ["string", "null"]
-                    },
-                    "CREATED_AT": {"type": ["string", "null"]},
-                    "UPDATED_AT": {"type": ["string", "null"]},
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            launches_data = self.fetch_json(stream_name, "launches")
         
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["LAUNCH_ID"]
+                schema=LAUNCHES_SCHEMA.schema,
+                key_properties=LAUNCHES_SCHEMA.key_properties
             )
+
+            # Bridge streams of the cores, crew, ships and payloads of each launch,
+            # so the warehouse does not have to flatten the JSON columns
+            for bridge_schema in BRIDGE_SCHEMAS:
+                singer.write_schema(
+                    stream_name=bridge_schema.stream_name,
+                    schema=bridge_schema.schema,
+                    key_properties=bridge_schema.key_properties
+                )
         
             # Get current time with timezone
             current_time = self.get_current_time()
             current_time_str = current_time.isoformat()
         
             # Process and write each launch record
+            stages = self.tracer.stages(stream_name)
             for launch in launches_data:
                 try:
+                    stages.start()
                     # Transform data for Snowflake compatibility
                     transformed_launch = {
                         "LAUNCH_ID": launch.get("id"),
@@ -166,14 +188,27 @@ class LaunchesTap(SpaceXTapBase):
                         "LAUNCH_LIBRARY_ID": launch.get("launch_library_id"),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(launch)
+                        "RAW_DATA": self.raw_data(stream_name, launch)
                     }
             
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(LAUNCHES_SCHEMA, launch)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(LAUNCHES_SCHEMA, transformed_launch)
+                    bridges = launch_bridge_records(launch, current_time_str)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_launch
                     )
+
+                    for bridge_stream, bridge_records in bridges.items():
+                        for bridge_record in bridge_records:
+                            singer.write_record(stream_name=bridge_stream, record=bridge_record)
+                    stages.lap_output()
                 except Exception as transform_error:
                     self.log_error(
                         table_name=stream_name,
@@ -182,7 +217,14 @@ class LaunchesTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other launches
                 
+            stages.close()
         
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(LAUNCHES_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(LAUNCHES_SCHEMA, (launch.get("id") for launch in launches_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_LAUNCHES": {
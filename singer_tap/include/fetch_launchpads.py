@@ -2,6 +2,81 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+LAUNCHPADS_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_LAUNCHPADS",
+    schema={
+        "type": "object",
+        "properties": {
+            "LAUNCHPAD_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the launch pad"
+            },
+            "NAME": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "FULL_NAME": {
+                "type": ["string", "null"],
+                "maxLength": 512
+            },
+            "STATUS": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "LOCALITY": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "REGION": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "TIMEZONE": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "LATITUDE": {
+                "type": ["number", "null"]
+            },
+            "LONGITUDE": {
+                "type": ["number", "null"]
+            },
+            "LAUNCH_ATTEMPTS": {
+                "type": ["integer", "null"]
+            },
+            "LAUNCH_SUCCESSES": {
+                "type": ["integer", "null"]
+            },
+            "ROCKETS": {
+                "type": ["string", "null"],
+                "description": "Array of rocket IDs stored as JSON string"
+            },
+            "LAUNCHES": {
+                "type": ["string", "null"],
+                "description": "Array of launch IDs stored as JSON string"
+            },
+            "DETAILS": {
+                "type": ["string", "null"]
+            },
+            "IMAGES": {
+                "type": ["string", "null"],
+                "description": "Image URLs stored as JSON string"
+            },
+            "CREATED_AT": {"type": ["string", "null"]},
+            "UPDATED_AT": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["LAUNCHPAD_ID"],
+    source_paths=[
+        "id", "name", "full_name", "status", "locality", "region", "timezone", "latitude",
+        "longitude", "launch_attempts", "launch_successes", "rockets", "launches",
+        "details", "images.large", "images.small"
+    ]
+)
+
 
 class LaunchpadsTap(SpaceXTapBase):
     def __init__(self, base_url: str, config_path: str):
@@ -16,80 +91,13 @@ class LaunchpadsTap(SpaceXTapBase):
         
         try:
             # Fetch data from the launchpads endpoint
-            response = requests.get(self.base_url + "launchpads")
-            response.raise_for_status()
-            launchpads_data = response.json()
-
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "LAUNCHPAD_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the launch pad"
-                    },
-                    "NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "FULL_NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 512
-                    },
-                    "STATUS": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "LOCALITY": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "REGION": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "TIMEZONE": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "LATITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "LONGITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "LAUNCH_ATTEMPTS": {
-                        "type": ["integer", "null"]
-                    },
-                    "LAUNCH_SUCCESSES": {
-                        "type": ["integer", "null"]
-                    },
-                    "ROCKETS": {
-                        "type": ["string", "null"],
-                        "description": "Array of rocket IDs stored as JSON string"
-                    },
-                    "LAUNCHES": {
-                        "type": ["string", "null"],
-                        "description": "Array of launch IDs stored as JSON string"
-                    },
-                    "DETAILS": {
-                        "type": ["string", "null"]
-                    },
-                    "IMAGES": {
-                        "type": ["string", "null"],
-                        "description": "Image URLs stored as JSON string"
-                    },
-                    "CREATED_AT": {"type": ["string", "null"]},
-                    "UPDATED_AT": {"type": ["string", "null"]},
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            launchpads_data = self.fetch_json(stream_name, "launchpads")
 
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["LAUNCHPAD_ID"]
+                schema=LAUNCHPADS_SCHEMA.schema,
+                key_properties=LAUNCHPADS_SCHEMA.key_properties
             )
 
             # Get current time with timezone
@@ -97,8 +105,10 @@ class LaunchpadsTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
 
             # Process and write each launchpad record
+            stages = self.tracer.stages(stream_name)
             for launchpad in launchpads_data:
                 try:
+                    stages.start()
                     # Handle images object specifically
                     images = {}
                     if "images" in launchpad:
@@ -126,14 +136,22 @@ class LaunchpadsTap(SpaceXTapBase):
                         "IMAGES": json.dumps(images),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(launchpad)
+                        "RAW_DATA": self.raw_data(stream_name, launchpad)
                     }
 
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(LAUNCHPADS_SCHEMA, launchpad)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(LAUNCHPADS_SCHEMA, transformed_launchpad)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_launchpad
                     )
+                    stages.lap_output()
                 
                 except Exception as transform_error:
                     self.log_error(
@@ -143,6 +161,14 @@ class LaunchpadsTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other launchpad
 
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(LAUNCHPADS_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(LAUNCHPADS_SCHEMA, (launchpad.get("id") for launchpad in launchpads_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_LAUNCHPADS": {
@@ -2,6 +2,125 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+PAYLOADS_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_PAYLOADS",
+    schema={
+        "type": "object",
+        "properties": {
+            "PAYLOAD_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the payload"
+            },
+            "NAME": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "TYPE": {
+                "type": ["string", "null"],
+                "maxLength": 100
+            },
+            "REUSED": {
+                "type": ["boolean", "null"]
+            },
+            "LAUNCH": {
+                "type": ["string", "null"],
+                "description": "Associated launch ID"
+            },
+            "CUSTOMERS": {
+                "type": ["string", "null"],
+                "description": "Array of customer names stored as JSON string"
+            },
+            "NORAD_IDS": {
+                "type": ["string", "null"],
+                "description": "Array of NORAD IDs stored as JSON string"
+            },
+            "NATIONALITIES": {
+                "type": ["string", "null"],
+                "description": "Array of nationality strings stored as JSON string"
+            },
+            "MANUFACTURERS": {
+                "type": ["string", "null"],
+                "description": "Array of manufacturer names stored as JSON string"
+            },
+            "MASS_KG": {
+                "type": ["number", "null"]
+            },
+            "MASS_LBS": {
+                "type": ["number", "null"]
+            },
+            "ORBIT": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "REFERENCE_SYSTEM": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "REGIME": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "LONGITUDE": {
+                "type": ["number", "null"]
+            },
+            "SEMI_MAJOR_AXIS_KM": {
+                "type": ["number", "null"]
+            },
+            "ECCENTRICITY": {
+                "type": ["number", "null"]
+            },
+            "PERIAPSIS_KM": {
+                "type": ["number", "null"]
+            },
+            "APOAPSIS_KM": {
+                "type": ["number", "null"]
+            },
+            "INCLINATION_DEG": {
+                "type": ["number", "null"]
+            },
+            "PERIOD_MIN": {
+                "type": ["number", "null"]
+            },
+            "LIFESPAN_YEARS": {
+                "type": ["number", "null"]
+            },
+            "EPOCH": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "MEAN_MOTION": {
+                "type": ["number", "null"]
+            },
+            "RAAN": {
+                "type": ["number", "null"]
+            },
+            "ARG_OF_PERICENTER": {
+                "type": ["number", "null"]
+            },
+            "MEAN_ANOMALY": {
+                "type": ["number", "null"]
+            },
+            "DRAGON": {
+                "type": ["string", "null"],
+                "description": "Dragon capsule details stored as JSON string"
+            },
+            "CREATED_AT": {"type": ["string", "null"]},
+            "UPDATED_AT": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["PAYLOAD_ID"],
+    source_paths=[
+        "id", "name", "type", "reused", "launch", "customers", "norad_ids", "nationalities",
+        "manufacturers", "mass_kg", "mass_lbs", "orbit", "reference_system", "regime",
+        "longitude", "semi_major_axis_km", "eccentricity", "periapsis_km", "apoapsis_km",
+        "inclination_deg", "period_min", "lifespan_years", "epoch", "mean_motion", "raan",
+        "arg_of_pericenter", "mean_anomaly", "dragon"
+    ]
+)
+
 
 class PayloadsTap(SpaceXTapBase):
     
@@ -14,122 +133,13 @@ class PayloadsTap(SpaceXTapBase):
         
         try:
             # Fetch data from the payloads endpoint
-            response = requests.get(self.base_url + "payloads")
-            response.raise_for_status()
-            payloads_data = response.json()
-
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "PAYLOAD_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the payload"
-                    },
-                    "NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "TYPE": {
-                        "type": ["string", "null"],
-                        "maxLength": 100
-                    },
-                    "REUSED": {
-                        "type": ["boolean", "null"]
-                    },
-                    "LAUNCH": {
-                        "type": ["string", "null"],
-                        "description": "Associated launch ID"
-                    },
-                    "CUSTOMERS": {
-                        "type": ["string", "null"],
-                        "description": "Array of customer names stored as JSON string"
-                    },
-                    "NORAD_IDS": {
-                        "type": ["string", "null"],
-                        "description": "Array of NORAD IDs stored as JSON string"
-                    },
-                    "NATIONALITIES": {
-                        "type": ["string", "null"],
-                        "description": "Array of nationality strings stored as JSON string"
-                    },
-                    "MANUFACTURERS": {
-                        "type": ["string", "null"],
-                        "description": "Array of manufacturer names stored as JSON string"
-                    },
-                    "MASS_KG": {
-                        "type": ["number", "null"]
-                    },
-                    "MASS_LBS": {
-                        "type": ["number", "null"]
-                    },
-                    "ORBIT": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "REFERENCE_SYSTEM": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "REGIME": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "LONGITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "SEMI_MAJOR_AXIS_KM": {
-                        "type": ["number", "null"]
-                    },
-                    "ECCENTRICITY": {
-                        "type": ["number", "null"]
-                    },
-                    "PERIAPSIS_KM": {
-                        "type": ["number", "null"]
-                    },
-                    "APOAPSIS_KM": {
-                        "type": ["number", "null"]
-                    },
-                    "INCLINATION_DEG": {
-                        "type": ["number", "null"]
-                    },
-                    "PERIOD_MIN": {
-                        "type": ["number", "null"]
-                    },
-                    "LIFESPAN_YEARS": {
-                        "type": ["number", "null"]
-                    },
-                    "EPOCH": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "MEAN_MOTION": {
-                        "type": ["number", "null"]
-                    },
-                    "RAAN": {
-                        "type": ["number", "null"]
-                    },
-                    "ARG_OF_PERICENTER": {
-                        "type": ["number", "null"]
-                    },
-                    "MEAN_ANOMALY": {
-                        "type": ["number", "null"]
-                    },
-                    "DRAGON": {
-                        "type": ["string", "null"],
-                        "description": "Dragon capsule details stored as JSON string"
-                    },
-                    "CREATED_AT": {"type": ["string", "null"]},
-                    "UPDATED_AT": {"type": ["string", "null"]},
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            payloads_data = self.fetch_json(stream_name, "payloads")
 
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["PAYLOAD_ID"]
+                schema=PAYLOADS_SCHEMA.schema,
+                key_properties=PAYLOADS_SCHEMA.key_properties
             )
 
             # Get current time with timezone
@@ -137,8 +147,10 @@ class PayloadsTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
 
             # Process and write each payload record
+            stages = self.tracer.stages(stream_name)
             for payload in payloads_data:
                 try:
+                    stages.start()
                     # Transform data for Snowflake compatibility
                     transformed_payload = {
                         "PAYLOAD_ID": payload.get("id"),
@@ -171,14 +183,22 @@ class PayloadsTap(SpaceXTapBase):
                         "DRAGON": json.dumps(payload.get("dragon", {})) if payload.get("dragon") else None,
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(payload)
+                        "RAW_DATA": self.raw_data(stream_name, payload)
                     }
 
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(PAYLOADS_SCHEMA, payload)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(PAYLOADS_SCHEMA, transformed_payload)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_payload,
                     )
+                    stages.lap_output()
                 
                 except Exception as transform_error:
                     self.log_error(
@@ -188,6 +208,14 @@ class PayloadsTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other payload
 
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(PAYLOADS_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(PAYLOADS_SCHEMA, (payload.get("id") for payload in payloads_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_PAYLOADS": {
@@ -3,6 +3,113 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+
+ROADSTER_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_ROADSTER",
+    schema={
+        "type": "object",
+        "properties": {
+            "ROADSTER_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the roadster"
+            },
+            "NAME": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "LAUNCH_DATE_UTC": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "LAUNCH_DATE_UNIX": {
+                "type": ["integer", "null"]
+            },
+            "LAUNCH_MASS_KG": {
+                "type": ["number", "null"]
+            },
+            "LAUNCH_MASS_LBS": {
+                "type": ["number", "null"]
+            },
+            "NORAD_ID": {
+                "type": ["integer", "null"]
+            },
+            "EPOCH_JD": {
+                "type": ["number", "null"],
+                "description": "Julian Date of epoch"
+            },
+            "ORBIT_TYPE": {
+                "type": ["string", "null"]
+            },
+            "APOAPSIS_AU": {
+                "type": ["number", "null"]
+            },
+            "PERIAPSIS_AU": {
+                "type": ["number", "null"]
+            },
+            "SEMI_MAJOR_AXIS_AU": {
+                "type": ["number", "null"]
+            },
+            "ECCENTRICITY": {
+                "type": ["number", "null"]
+            },
+            "INCLINATION": {
+                "type": ["number", "null"]
+            },
+            "LONGITUDE": {
+                "type": ["number", "null"]
+            },
+            "PERIOD_DAYS": {
+                "type": ["number", "null"]
+            },
+            "SPEED_KPH": {
+                "type": ["number", "null"]
+            },
+            "SPEED_MPH": {
+                "type": ["number", "null"]
+            },
+            "EARTH_DISTANCE_KM": {
+                "type": ["number", "null"]
+            },
+            "EARTH_DISTANCE_MI": {
+                "type": ["number", "null"]
+            },
+            "MARS_DISTANCE_KM": {
+                "type": ["number", "null"]
+            },
+            "MARS_DISTANCE_MI": {
+                "type": ["number", "null"]
+            },
+            "WIKIPEDIA": {
+                "type": ["string", "null"]
+            },
+            "DETAILS": {
+                "type": ["string", "null"]
+            },
+            "VIDEO": {
+                "type": ["string", "null"],
+                "description": "URL of video"
+            },
+            "FLICKR_IMAGES": {
+                "type": ["string", "null"],
+                "description": "Array of image URLs stored as JSON string"
+            },
+            "CREATED_AT": {"type": ["string", "null"]},
+            "UPDATED_AT": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["ROADSTER_ID"],
+    source_paths=[
+        "id", "name", "launch_date_utc", "launch_date_unix", "launch_mass_kg",
+        "launch_mass_lbs", "norad_id", "epoch_jd", "orbit_type", "apoapsis_au",
+        "periapsis_au", "semi_major_axis_au", "eccentricity", "inclination", "longitude",
+        "period_days", "speed_kph", "speed_mph", "earth_distance_km", "earth_distance_mi",
+        "mars_distance_km", "mars_distance_mi", "wikipedia", "details", "video",
+        "flickr_images"
+    ]
+)
 
 
 class RoadsterTap(SpaceXTapBase):
@@ -16,109 +123,13 @@ class RoadsterTap(SpaceXTapBase):
         
         try:
             # Fetch data from the roadster endpoint
-            response = requests.get(self.base_url + "roadster")
-            response.raise_for_status()
-            roadster_data = response.json()
-
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "ROADSTER_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the roadster"
-                    },
-                    "NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "LAUNCH_DATE_UTC": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "LAUNCH_DATE_UNIX": {
-                        "type": ["integer", "null"]
-                    },
-                    "LAUNCH_MASS_KG": {
-                        "type": ["number", "null"]
-                    },
-                    "LAUNCH_MASS_LBS": {
-                        "type": ["number", "null"]
-                    },
-                    "NORAD_ID": {
-                        "type": ["integer", "null"]
-                    },
-                    "EPOCH_JD": {
-                        "type": ["number", "null"],
-                        "description": "Julian Date of epoch"
-                    },
-                    "ORBIT_TYPE": {
-                        "type": ["string", "null"]
-                    },
-                    "APOAPSIS_AU": {
-                        "type": ["number", "null"]
-                    },
-                    "PERIAPSIS_AU": {
-                        "type": ["number", "null"]
-                    },
-                    "SEMI_MAJOR_AXIS_AU": {
-                        "type": ["number", "null"]
-                    },
-                    "ECCENTRICITY": {
-                        "type": ["number", "null"]
-                    },
-                    "INCLINATION": {
-                        "type": ["number", "null"]
-                    },
-                    "LONGITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "PERIOD_DAYS": {
-                        "type": ["number", "null"]
-                    },
-                    "SPEED_KPH": {
-                        "type": ["number", "null"]
-                    },
-                    "SPEED_MPH": {
-                        "type": ["number", "null"]
-                    },
-                    "EARTH_DISTANCE_KM": {
-                        "type": ["number", "null"]
-                    },
-                    "EARTH_DISTANCE_MI": {
-                        "type": ["number", "null"]
-                    },
-                    "MARS_DISTANCE_KM": {
-                        "type": ["number", "null"]
-                    },
-                    "MARS_DISTANCE_MI": {
-                        "type": ["number", "null"]
-                    },
-                    "WIKIPEDIA": {
-                        "type": ["string", "null"]
-                    },
-                    "DETAILS": {
-                        "type": ["string", "null"]
-                    },
-                    "VIDEO": {
-                        "type": ["string", "null"],
-                        "description": "URL of video"
-                    },
-                    "FLICKR_IMAGES": {
-                        "type": ["string", "null"],
-                        "description": "Array of image URLs stored as JSON string"
-                    },
-                    "CREATED_AT": {"type": ["string", "null"]},
-                    "UPDATED_AT": {"type": ["string", "null"]},
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            roadster_data = self.fetch_json(stream_name, "roadster")
 
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["ROADSTER_ID"]
+                schema=ROADSTER_SCHEMA.schema,
+                key_properties=ROADSTER_SCHEMA.key_properties
             )
 
             # Get current time with timezone
@@ -126,6 +137,8 @@ class RoadsterTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
 
             # Transform data for Snowflake compatibility
+            stages = self.tracer.stages(stream_name)
+            stages.start()
             transformed_roadster = {
                 "ROADSTER_ID": roadster_data.get("id"),
                 "NAME": roadster_data.get("name"),
@@ -155,15 +168,27 @@ class RoadsterTap(SpaceXTapBase):
                 "FLICKR_IMAGES": json.dumps(roadster_data.get("flickr_images", [])),
                 "CREATED_AT": current_time_str,
                 "UPDATED_AT": current_time_str,
-                "RAW_DATA": json.dumps(roadster_data)
+                "RAW_DATA": self.raw_data(stream_name, roadster_data)
             }
 
+            # Compare the payload keys with the mapped source paths
+            self.track_schema_drift(ROADSTER_SCHEMA, roadster_data)
+
+            # Validate a sample of the records against the registered schema
+            self.validate_record(ROADSTER_SCHEMA, transformed_roadster)
+            stages.lap("transform")
+
             # Write record with timezone-aware timestamp
             singer.write_record(
                 stream_name=stream_name,
                 record=transformed_roadster,
                 time_extracted=current_time
             )
+            stages.lap_output()
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(ROADSTER_SCHEMA)
 
             # Write state
             state = {
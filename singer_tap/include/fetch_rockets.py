@@ -2,6 +2,121 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+ROCKETS_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_ROCKETS",
+    schema={
+        "type": "object",
+        "properties": {
+            "ROCKET_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the rocket"
+            },
+            "NAME": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "TYPE": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "ACTIVE": {
+                "type": ["boolean", "null"]
+            },
+            "STAGES": {
+                "type": ["integer", "null"]
+            },
+            "BOOSTERS": {
+                "type": ["integer", "null"]
+            },
+            "COST_PER_LAUNCH": {
+                "type": ["integer", "null"]
+            },
+            "SUCCESS_RATE_PCT": {
+                "type": ["integer", "null"]
+            },
+            "FIRST_FLIGHT": {
+                "type": ["string", "null"],
+                "format": "date"
+            },
+            "COUNTRY": {
+                "type": ["string", "null"],
+                "maxLength": 100
+            },
+            "COMPANY": {
+                "type": ["string", "null"],
+                "maxLength": 100
+            },
+            "HEIGHT_METERS": {
+                "type": ["number", "null"]
+            },
+            "HEIGHT_FEET": {
+                "type": ["number", "null"]
+            },
+            "DIAMETER_METERS": {
+                "type": ["number", "null"]
+            },
+            "DIAMETER_FEET": {
+                "type": ["number", "null"]
+            },
+            "MASS_KG": {
+                "type": ["number", "null"]
+            },
+            "MASS_LBS": {
+                "type": ["number", "null"]
+            },
+            "PAYLOAD_WEIGHTS": {
+                "type": ["string", "null"],
+                "description": "Array of payload weight info stored as JSON string"
+            },
+            "FIRST_STAGE": {
+                "type": ["string", "null"],
+                "description": "First stage details stored as JSON string"
+            },
+            "SECOND_STAGE": {
+                "type": ["string", "null"],
+                "description": "Second stage details stored as JSON string"
+            },
+            "ENGINES": {
+                "type": ["string", "null"],
+                "description": "Engine details stored as JSON string"
+            },
+            "LANDING_LEGS": {
+                "type": ["string", "null"],
+                "description": "Landing legs details stored as JSON string"
+            },
+            "FLICKR_IMAGES": {
+                "type": ["string", "null"],
+                "description": "Array of image URLs stored as JSON string"
+            },
+            "WIKIPEDIA": {
+                "type": ["string", "null"]
+            },
+            "DESCRIPTION": {
+                "type": ["string", "null"]
+            },
+            "CREATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "UPDATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["ROCKET_ID"],
+    source_paths=[
+        "id", "name", "type", "active", "stages", "boosters", "cost_per_launch",
+        "success_rate_pct", "first_flight", "country", "company", "height.meters",
+        "height.feet", "diameter.meters", "diameter.feet", "mass.kg", "mass.lb",
+        "payload_weights", "first_stage", "second_stage", "engines", "landing_legs",
+        "flickr_images", "wikipedia", "description"
+    ]
+)
+
 
 class RocketsTap(SpaceXTapBase):
     
@@ -14,118 +129,13 @@ class RocketsTap(SpaceXTapBase):
         
         try:
             # Fetch data from the rockets endpoint
-            response = requests.get(self.base_url + "rockets")
-            response.raise_for_status()
-            rockets_data = response.json()
-
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "ROCKET_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the rocket"
-                    },
-                    "NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "TYPE": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "ACTIVE": {
-                        "type": ["boolean", "null"]
-                    },
-                    "STAGES": {
-                        "type": ["integer", "null"]
-                    },
-                    "BOOSTERS": {
-                        "type": ["integer", "null"]
-                    },
-                    "COST_PER_LAUNCH": {
-                        "type": ["integer", "null"]
-                    },
-                    "SUCCESS_RATE_PCT": {
-                        "type": ["integer", "null"]
-                    },
-                    "FIRST_FLIGHT": {
-                        "type": ["string", "null"],
-                        "format": "date"
-                    },
-                    "COUNTRY": {
-                        "type": ["string", "null"],
-                        "maxLength": 100
-                    },
-                    "COMPANY": {
-                        "type": ["string", "null"],
-                        "maxLength": 100
-                    },
-                    "HEIGHT_METERS": {
-                        "type": ["number", "null"]
-                    },
-                    "HEIGHT_FEET": {
-                        "type": ["number", "null"]
-                    },
-                    "DIAMETER_METERS": {
-                        "type": ["number", "null"]
-                    },
-                    "DIAMETER_FEET": {
-                        "type": ["number", "null"]
-                    },
-                    "MASS_KG": {
-                        "type": ["number", "null"]
-                    },
-                    "MASS_LBS": {
-                        "type": ["number", "null"]
-                    },
-                    "PAYLOAD_WEIGHTS": {
-                        "type": ["string", "null"],
-                        "description": "Array of payload weight info stored as JSON string"
-                    },
-                    "FIRST_STAGE": {
-                        "type": ["string", "null"],
-                        "description": "First stage details stored as JSON string"
-                    },
-                    "SECOND_STAGE": {
-                        "type": ["string", "null"],
-                        "description": "Second stage details stored as JSON string"
-                    },
-                    "ENGINES": {
-                        "type": ["string", "null"],
-                        "description": "Engine details stored as JSON string"
-                    },
-                    "LANDING_LEGS": {
-                        "type": ["string", "null"],
-                        "description": "Landing legs details stored as JSON string"
-                    },
-                    "FLICKR_IMAGES": {
-                        "type": ["string", "null"],
-                        "description": "Array of image URLs stored as JSON string"
-                    },
-                    "WIKIPEDIA": {
-                        "type": ["string", "null"]
-                    },
-                    "DESCRIPTION": {
-                        "type": ["string", "null"]
-                    },
-                    "CREATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "UPDATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            rockets_data = self.fetch_json(stream_name, "rockets")
 
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["ROCKET_ID"]
+                schema=ROCKETS_SCHEMA.schema,
+                key_properties=ROCKETS_SCHEMA.key_properties
             )
 
             # Get current time with timezone
@@ -133,8 +143,10 @@ class RocketsTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
 
             # Process and write each rocket record
+            stages = self.tracer.stages(stream_name)
             for rocket in rockets_data:
                 try:
+                    stages.start()
                     # Extract height and diameter from nested objects
                     height = rocket.get("height", {})
                     diameter = rocket.get("diameter", {})
@@ -169,15 +181,23 @@ class RocketsTap(SpaceXTapBase):
                         "DESCRIPTION": rocket.get("description"),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(rocket)
+                        "RAW_DATA": self.raw_data(stream_name, rocket)
                     }
 
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(ROCKETS_SCHEMA, rocket)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(ROCKETS_SCHEMA, transformed_rocket)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_rocket,
                         time_extracted=current_time
                     )
+                    stages.lap_output()
                 
                 except Exception as transform_error:
                     self.log_error(
@@ -187,6 +207,14 @@ class RocketsTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other rocket
 
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(ROCKETS_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(ROCKETS_SCHEMA, (rocket.get("id") for rocket in rockets_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_ROCKETS": {
@@ -2,6 +2,123 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.schema_registry import register_schema
+
+SHIPS_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_SHIPS",
+    schema={
+        "type": "object",
+        "properties": {
+            "SHIP_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the ship"
+            },
+            "NAME": {
+                "type": ["string", "null"],
+                "maxLength": 256
+            },
+            "LEGACY_ID": {
+                "type": ["string", "null"],
+                "description": "Legacy identifier if exists"
+            },
+            "MODEL": {
+                "type": ["string", "null"],
+                "maxLength": 100
+            },
+            "TYPE": {
+                "type": ["string", "null"],
+                "maxLength": 100
+            },
+            "ACTIVE": {
+                "type": ["boolean", "null"]
+            },
+            "IMO": {
+                "type": ["integer", "null"],
+                "description": "International Maritime Organization number"
+            },
+            "MMSI": {
+                "type": ["integer", "null"],
+                "description": "Maritime Mobile Service Identity number"
+            },
+            "ABS": {
+                "type": ["integer", "null"],
+                "description": "American Bureau of Shipping identification"
+            },
+            "CLASS": {
+                "type": ["integer", "null"]
+            },
+            "MASS_KG": {
+                "type": ["integer", "null"]
+            },
+            "MASS_LBS": {
+                "type": ["integer", "null"]
+            },
+            "YEAR_BUILT": {
+                "type": ["integer", "null"]
+            },
+            "HOME_PORT": {
+                "type": ["string", "null"],
+                "maxLength": 100
+            },
+            "STATUS": {
+                "type": ["string", "null"],
+                "maxLength": 100
+            },
+            "SPEED_KN": {
+                "type": ["number", "null"],
+                "description": "Speed in knots"
+            },
+            "COURSE_DEG": {
+                "type": ["number", "null"],
+                "description": "Course in degrees"
+            },
+            "LATITUDE": {
+                "type": ["number", "null"]
+            },
+            "LONGITUDE": {
+                "type": ["number", "null"]
+            },
+            "LAST_AIS_UPDATE": {
+                "type": ["string", "null"],
+                "format": "date-time",
+                "description": "Last AIS update timestamp"
+            },
+            "LINK": {
+                "type": ["string", "null"],
+                "description": "URL to Marine Traffic page"
+            },
+            "IMAGE": {
+                "type": ["string", "null"],
+                "description": "URL to ship image"
+            },
+            "LAUNCHES": {
+                "type": ["string", "null"],
+                "description": "Array of launch IDs stored as JSON string"
+            },
+            "ROLES": {
+                "type": ["string", "null"],
+                "description": "Array of roles stored as JSON string"
+            },
+            "CREATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "UPDATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["SHIP_ID"],
+    source_paths=[
+        "id", "name", "legacy_id", "model", "type", "active", "imo", "mmsi", "abs", "class",
+        "mass_kg", "mass_lbs", "year_built", "home_port", "status", "speed_kn",
+        "course_deg", "latitude", "longitude", "last_ais_update", "link", "image",
+        "launches", "roles"
+    ]
+)
+
 
 class shipsTap(SpaceXTapBase):
     
@@ -14,121 +131,13 @@ class shipsTap(SpaceXTapBase):
         
         try:
             # Fetch data from the ships endpoint
-            response = requests.get(self.base_url + "ships")
-            response.raise_for_status()
-            ships_data = response.json()
-
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "SHIP_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the ship"
-                    },
-                    "NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 256
-                    },
-                    "LEGACY_ID": {
-                        "type": ["string", "null"],
-                        "description": "Legacy identifier if exists"
-                    },
-                    "MODEL": {
-                        "type": ["string", "null"],
-                        "maxLength": 100
-                    },
-                    "TYPE": {
-                        "type": ["string", "null"],
-                        "maxLength": 100
-                    },
-                    "ACTIVE": {
-                        "type": ["boolean", "null"]
-                    },
-                    "IMO": {
-                        "type": ["integer", "null"],
-                        "description": "International Maritime Organization number"
-                    },
-                    "MMSI": {
-                        "type": ["integer", "null"],
-                        "description": "Maritime Mobile Service Identity number"
-                    },
-                    "ABS": {
-                        "type": ["integer", "null"],
-                        "description": "American Bureau of Shipping identification"
-                    },
-                    "CLASS": {
-                        "type": ["integer", "null"]
-                    },
-                    "MASS_KG": {
-                        "type": ["integer", "null"]
-                    },
-                    "MASS_LBS": {
-                        "type": ["integer", "null"]
-                    },
-                    "YEAR_BUILT": {
-                        "type": ["integer", "null"]
-                    },
-                    "HOME_PORT": {
-                        "type": ["string", "null"],
-                        "maxLength": 100
-                    },
-                    "STATUS": {
-                        "type": ["string", "null"],
-                        "maxLength": 100
-                    },
-                    "SPEED_KN": {
-                        "type": ["number", "null"],
-                        "description": "Speed in knots"
-                    },
-                    "COURSE_DEG": {
-                        "type": ["number", "null"],
-                        "description": "Course in degrees"
-                    },
-                    "LATITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "LONGITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "LAST_AIS_UPDATE": {
-                        "type": ["string", "null"],
-                        "format": "date-time",
-                        "description": "Last AIS update timestamp"
-                    },
-                    "LINK": {
-                        "type": ["string", "null"],
-                        "description": "URL to Marine Traffic page"
-                    },
-                    "IMAGE": {
-                        "type": ["string", "null"],
-                        "description": "URL to ship image"
-                    },
-                    "LAUNCHES": {
-                        "type": ["string", "null"],
-                        "description": "Array of launch IDs stored as JSON string"
-                    },
-                    "ROLES": {
-                        "type": ["string", "null"],
-                        "description": "Array of roles stored as JSON string"
-                    },
-                    "CREATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "UPDATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            ships_data = self.fetch_json(stream_name, "ships")
 
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["SHIP_ID"]
+                schema=SHIPS_SCHEMA.schema,
+                key_properties=SHIPS_SCHEMA.key_properties
             )
 
             # Get current time with timezone
@@ -136,8 +145,10 @@ class shipsTap(SpaceXTapBase):
             current_time_str = current_time.isoformat()
 
             # Process and write each ship record
+            stages = self.tracer.stages(stream_name)
             for ship in ships_data:
                 try:
+                    stages.start()
                     # Transform data for Snowflake compatibility
                     transformed_ship = {
                         "SHIP_ID": ship.get("id"),
@@ -166,15 +177,23 @@ class shipsTap(SpaceXTapBase):
                         "ROLES": json.dumps(ship.get("roles", [])),
                         "CREATED_AT": current_time_str,
                         "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(ship)
+                        "RAW_DATA": self.raw_data(stream_name, ship)
                     }
 
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(SHIPS_SCHEMA, ship)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(SHIPS_SCHEMA, transformed_ship)
+                    stages.lap("transform")
+
                     # Write record with timezone-aware timestamp
                     singer.write_record(
                         stream_name=stream_name,
                         record=transformed_ship,
                         time_extracted=current_time
                     )
+                    stages.lap_output()
                     
                 except Exception as transform_error:
                     self.log_error(
@@ -184,6 +203,14 @@ class shipsTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other ship
 
+            stages.close()
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(SHIPS_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(SHIPS_SCHEMA, (ship.get("id") for ship in ships_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_SHIPS": {
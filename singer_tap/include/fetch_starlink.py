@@ -2,9 +2,164 @@ import singer                                           # type: ignore
 import requests                                         # type: ignore
 import json
 from include.spacex_tap_base import SpaceXTapBase
+from include.orbital_elements import add_orbital_elements
+from include.schema_registry import register_schema
+
+STARLINK_SCHEMA = register_schema(
+    stream_name="STG_SPACEX_DATA_STARLINK",
+    schema={
+        "type": "object",
+        "properties": {
+            "STARLINK_ID": {
+                "type": ["string", "null"],
+                "description": "Unique identifier for the Starlink satellite"
+            },
+            "VERSION": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "LAUNCH": {
+                "type": ["string", "null"],
+                "description": "Associated launch ID"
+            },
+            "LONGITUDE": {
+                "type": ["number", "null"]
+            },
+            "LATITUDE": {
+                "type": ["number", "null"]
+            },
+            "HEIGHT_KM": {
+                "type": ["number", "null"]
+            },
+            "VELOCITY_KMS": {
+                "type": ["number", "null"]
+            },
+            "SPACETRACK": {
+                "type": ["string", "null"],
+                "description": "Space-Track.org data stored as JSON string"
+            },
+            "LAUNCH_DATE": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "OBJECT_NAME": {
+                "type": ["string", "null"],
+                "maxLength": 100
+            },
+            "OBJECT_ID": {
+                "type": ["string", "null"],
+                "maxLength": 50
+            },
+            "EPOCH": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "PERIOD_MIN": {
+                "type": ["number", "null"]
+            },
+            "INCLINATION_DEG": {
+                "type": ["number", "null"]
+            },
+            "APOAPSIS_KM": {
+                "type": ["number", "null"]
+            },
+            "PERIAPSIS_KM": {
+                "type": ["number", "null"]
+            },
+            "ECCENTRICITY": {
+                "type": ["number", "null"]
+            },
+            "MEAN_MOTION": {
+                "type": ["number", "null"]
+            },
+            "MEAN_ANOMALY": {
+                "type": ["number", "null"]
+            },
+            "ARG_OF_PERICENTER": {
+                "type": ["number", "null"]
+            },
+            "RAAN": {
+                "type": ["number", "null"],
+                "description": "Right Ascension of the Ascending Node"
+            },
+            "SEMI_MAJOR_AXIS_KM": {
+                "type": ["number", "null"]
+            },
+            "DERIVED_SEMI_MAJOR_AXIS_KM": {
+                "type": ["number", "null"],
+                "description": "Semi-major axis computed from MEAN_MOTION"
+            },
+            "APOGEE_ALTITUDE_KM": {
+                "type": ["number", "null"]
+            },
+            "PERIGEE_ALTITUDE_KM": {
+                "type": ["number", "null"]
+            },
+            "ORBITAL_PERIOD_MIN": {
+                "type": ["number", "null"]
+            },
+            "EPOCH_AGE_DAYS": {
+                "type": ["number", "null"],
+                "description": "Days between EPOCH and the extraction"
+            },
+            "CREATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "UPDATED_AT": {
+                "type": ["string", "null"],
+                "format": "date-time"
+            },
+            "RAW_DATA": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["STARLINK_ID"],
+    source_paths=[
+        "spaceTrack", "id", "version", "launch", "longitude", "latitude", "height_km",
+        "velocity_kms"
+    ]
+)
+
 
 class StarlinkTap(SpaceXTapBase):
     
+    def write_propagated_positions(self, starlink_data, current_time) -> None:
+        """
+        Write the SGP4 positions of the constellation to the
+        STG_SPACEX_DATA_STARLINK_POSITIONS stream, one record per satellite.
+
+        Off unless the config sets propagation_steps; the grid starts at the
+        extraction time with one position every propagation_step_seconds
+        (default 60). Requires the sgp4 package.
+        """
+        steps = self.snowflake_config.get('propagation_steps', 0)
+        if not steps:
+            return
+        # Only loaded with propagation enabled
+        from include.propagation import POSITIONS_SCHEMA, POSITIONS_STREAM, ConstellationPropagator
+
+        propagator = ConstellationPropagator(
+            start=current_time,
+            steps=steps,
+            step_seconds=self.snowflake_config.get('propagation_step_seconds', 60)
+        )
+        singer.write_schema(
+            stream_name=POSITIONS_STREAM,
+            schema=POSITIONS_SCHEMA.schema,
+            key_properties=POSITIONS_SCHEMA.key_properties
+        )
+        for record in propagator.records(starlink_data, current_time.isoformat()):
+            singer.write_record(
+                stream_name=POSITIONS_STREAM,
+                record=record,
+                time_extracted=current_time
+            )
+
+        if propagator.skipped:
+            singer.get_logger().warning(
+                f"{len(propagator.skipped)} Starlink satellites without usable TLE or OMM elements were not propagated"
+            )
+
     def fetch_starlink(self) -> None:
         """
         Fetch and process Starlink satellites data from SpaceX API with Snowflake-compatible schema.
@@ -14,153 +169,68 @@ class StarlinkTap(SpaceXTapBase):
         
         try:
             # Fetch data from the starlink endpoint
-            response = requests.get(self.base_url + "starlink")
-            response.raise_for_status()
-            starlink_data = response.json()
-
-            # Schema definition with Snowflake-compatible types
-            schema = {
-                "type": "object",
-                "properties": {
-                    "STARLINK_ID": {
-                        "type": ["string", "null"],
-                        "description": "Unique identifier for the Starlink satellite"
-                    },
-                    "VERSION": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "LAUNCH": {
-                        "type": ["string", "null"],
-                        "description": "Associated launch ID"
-                    },
-                    "LONGITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "LATITUDE": {
-                        "type": ["number", "null"]
-                    },
-                    "HEIGHT_KM": {
-                        "type": ["number", "null"]
-                    },
-                    "VELOCITY_KMS": {
-                        "type": ["number", "null"]
-                    },
-                    "SPACETRACK": {
-                        "type": ["string", "null"],
-                        "description": "Space-Track.org data stored as JSON string"
-                    },
-                    "LAUNCH_DATE": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "OBJECT_NAME": {
-                        "type": ["string", "null"],
-                        "maxLength": 100
-                    },
-                    "OBJECT_ID": {
-                        "type": ["string", "null"],
-                        "maxLength": 50
-                    },
-                    "EPOCH": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "PERIOD_MIN": {
-                        "type": ["number", "null"]
-                    },
-                    "INCLINATION_DEG": {
-                        "type": ["number", "null"]
-                    },
-                    "APOAPSIS_KM": {
-                        "type": ["number", "null"]
-                    },
-                    "PERIAPSIS_KM": {
-                        "type": ["number", "null"]
-                    },
-                    "ECCENTRICITY": {
-                        "type": ["number", "null"]
-                    },
-                    "MEAN_MOTION": {
-                        "type": ["number", "null"]
-                    },
-                    "MEAN_ANOMALY": {
-                        "type": ["number", "null"]
-                    },
-                    "ARG_OF_PERICENTER": {
-                        "type": ["number", "null"]
-                    },
-                    "RAAN": {
-                        "type": ["number", "null"],
-                        "description": "Right Ascension of the Ascending Node"
-                    },
-                    "SEMI_MAJOR_AXIS_KM": {
-                        "type": ["number", "null"]
-                    },
-                    "CREATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "UPDATED_AT": {
-                        "type": ["string", "null"],
-                        "format": "date-time"
-                    },
-                    "RAW_DATA": {"type": ["string", "null"]}
-                }
-            }
+            starlink_data = self.fetch_json(stream_name, "starlink")
 
             # Write schema
             singer.write_schema(
                 stream_name=stream_name,
-                schema=schema,
-                key_properties=["STARLINK_ID"]
+                schema=STARLINK_SCHEMA.schema,
+                key_properties=STARLINK_SCHEMA.key_properties
             )
 
             # Get current time with timezone
             current_time = self.get_current_time()
             current_time_str = current_time.isoformat()
 
-            # Process and write each Starlink satellite record
+            # Transform each Starlink satellite record, written once the
+            # orbital elements are added. The records are held as slotted
+            # StarlinkRecord instances until then, not one dict per satellite
+            StarlinkRecord = STARLINK_SCHEMA.record_class
+            transformed_satellites = []
+            stages = self.tracer.stages(stream_name)
             for satellite in starlink_data:
                 try:
+                    stages.start()
                     # Extract spacetrack data if available
                     spacetrack = satellite.get("spaceTrack", {})
                     
                     # Transform data for Snowflake compatibility
-                    transformed_satellite = {
-                        "STARLINK_ID": satellite.get("id"),
-                        "VERSION": satellite.get("version"),
-                        "LAUNCH": satellite.get("launch"),
-                        "LONGITUDE": satellite.get("longitude"),
-                        "LATITUDE": satellite.get("latitude"),
-                        "HEIGHT_KM": satellite.get("height_km"),
-                        "VELOCITY_KMS": satellite.get("velocity_kms"),
-                        "SPACETRACK": json.dumps(spacetrack),
-                        "LAUNCH_DATE": spacetrack.get("LAUNCH_DATE"),
-                        "OBJECT_NAME": spacetrack.get("OBJECT_NAME"),
-                        "OBJECT_ID": spacetrack.get("OBJECT_ID"),
-                        "EPOCH": spacetrack.get("EPOCH"),
-                        "PERIOD_MIN": spacetrack.get("PERIOD"),
-                        "INCLINATION_DEG": spacetrack.get("INCLINATION"),
-                        "APOAPSIS_KM": spacetrack.get("APOAPSIS"),
-                        "PERIAPSIS_KM": spacetrack.get("PERIAPSIS"),
-                        "ECCENTRICITY": spacetrack.get("ECCENTRICITY"),
-                        "MEAN_MOTION": spacetrack.get("MEAN_MOTION"),
-                        "MEAN_ANOMALY": spacetrack.get("MEAN_ANOMALY"),
-                        "ARG_OF_PERICENTER": spacetrack.get("ARG_OF_PERICENTER"),
-                        "RAAN": spacetrack.get("RAAN"),
-                        "SEMI_MAJOR_AXIS_KM": spacetrack.get("SEMI_MAJOR_AXIS"),
-                        "CREATED_AT": current_time_str,
-                        "UPDATED_AT": current_time_str,
-                        "RAW_DATA": json.dumps(satellite)
-                    }
-
-                    # Write record with timezone-aware timestamp
-                    singer.write_record(
-                        stream_name=stream_name,
-                        record=transformed_satellite,
-                        time_extracted=current_time
+                    transformed_satellite = StarlinkRecord(
+                        STARLINK_ID=satellite.get("id"),
+                        VERSION=satellite.get("version"),
+                        LAUNCH=satellite.get("launch"),
+                        LONGITUDE=satellite.get("longitude"),
+                        LATITUDE=satellite.get("latitude"),
+                        HEIGHT_KM=satellite.get("height_km"),
+                        VELOCITY_KMS=satellite.get("velocity_kms"),
+                        SPACETRACK=json.dumps(spacetrack),
+                        LAUNCH_DATE=spacetrack.get("LAUNCH_DATE"),
+                        OBJECT_NAME=spacetrack.get("OBJECT_NAME"),
+                        OBJECT_ID=spacetrack.get("OBJECT_ID"),
+                        EPOCH=spacetrack.get("EPOCH"),
+                        PERIOD_MIN=spacetrack.get("PERIOD"),
+                        INCLINATION_DEG=spacetrack.get("INCLINATION"),
+                        APOAPSIS_KM=spacetrack.get("APOAPSIS"),
+                        PERIAPSIS_KM=spacetrack.get("PERIAPSIS"),
+                        ECCENTRICITY=spacetrack.get("ECCENTRICITY"),
+                        MEAN_MOTION=spacetrack.get("MEAN_MOTION"),
+                        MEAN_ANOMALY=spacetrack.get("MEAN_ANOMALY"),
+                        ARG_OF_PERICENTER=spacetrack.get("ARG_OF_PERICENTER"),
+                        RAAN=spacetrack.get("RAAN"),
+                        SEMI_MAJOR_AXIS_KM=spacetrack.get("SEMI_MAJOR_AXIS"),
+                        CREATED_AT=current_time_str,
+                        UPDATED_AT=current_time_str,
+                        RAW_DATA=self.raw_data(stream_name, satellite)
                     )
+
+                    # Compare the payload keys with the mapped source paths
+                    self.track_schema_drift(STARLINK_SCHEMA, satellite)
+
+                    # Validate a sample of the records against the registered schema
+                    self.validate_record(STARLINK_SCHEMA, transformed_satellite)
+
+                    transformed_satellites.append(transformed_satellite)
+                    stages.lap("transform")
                     
                 except Exception as transform_error:
                     self.log_error(
@@ -170,6 +240,31 @@ class StarlinkTap(SpaceXTapBase):
                     )
                     continue  # Continue processing other satellite
 
+            # Derive the orbital elements of all the satellites in one pass
+            with self.tracer.span("orbital_elements", stream=stream_name, records=len(transformed_satellites)):
+                add_orbital_elements(transformed_satellites, current_time)
+
+            for transformed_satellite in transformed_satellites:
+                stages.start()
+                # Write record with timezone-aware timestamp
+                singer.write_record(
+                    stream_name=stream_name,
+                    record=transformed_satellite.to_dict(),
+                    time_extracted=current_time
+                )
+                stages.lap_output()
+            stages.close()
+
+            # Propagate the constellation positions when the config asks for it
+            with self.tracer.span("propagation", stream=stream_name):
+                self.write_propagated_positions(starlink_data, current_time)
+
+            # Report API fields added, removed or renamed since the mapping was written
+            self.log_schema_drift(STARLINK_SCHEMA)
+
+            # Mark the records removed from the API since the previous run as deleted
+            self.write_tombstones(STARLINK_SCHEMA, (satellite.get("id") for satellite in starlink_data), current_time)
+
             # Write state
             state = {
                 "STG_SPACEX_DATA_STARLINK": {
@@ -0,0 +1,270 @@
+import singer                               # type: ignore
+import argparse
+import gzip
+import io
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+import pytz                                 # type: ignore
+
+try:
+    import zstandard                        # type: ignore
+except ImportError:
+    zstandard = None
+
+
+LOGGER = singer.get_logger()
+
+MANIFEST_NAME = "manifest.json"
+CODEC_EXTENSIONS = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz"}
+DEFAULT_MAX_RECORDS = 100000
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+# Fast levels: the files exist to let the taps run at full speed
+COMPRESSION_LEVELS = {"zstd": 3, "gzip": 1}
+
+# Leading keys of the messages singer.write_message formats, parsed as JSON otherwise
+MESSAGE_PATTERN = re.compile(r'\{"type": "([A-Z_]+)"(?:, "stream": "([^"]*)")?')
+
+
+def zstandard_available() -> bool:
+    return zstandard is not None
+
+
+def default_codec() -> str:
+    """zstd when the zstandard package is installed, gzip otherwise."""
+    return "zstd" if zstandard_available() else "gzip"
+
+
+def _check_codec(codec: str) -> None:
+    if codec not in CODEC_EXTENSIONS:
+        raise ValueError(f"Unknown codec {codec}, expected one of {', '.join(CODEC_EXTENSIONS)}")
+    if codec == "zstd" and not zstandard_available():
+        raise ImportError("zstd compressed Singer files require the zstandard package (pip install zstandard)")
+
+
+def run_directory(root: str, started_at: Optional[datetime] = None) -> str:
+    """Directory of a run under root, named after its start time in UTC."""
+    started_at = started_at or datetime.now(pytz.UTC)
+    return os.path.join(root, started_at.strftime("%Y%m%dT%H%M%S%fZ"))
+
+
+def open_part(path: str, mode: str = "rt", level: Optional[int] = None):
+    """Open a part file as text, compressed according to its extension."""
+    if path.endswith(CODEC_EXTENSIONS["zstd"]):
+        _check_codec("zstd")
+        if mode.startswith("w"):
+            compressor = zstandard.ZstdCompressor(level=level or COMPRESSION_LEVELS["zstd"])
+            return io.TextIOWrapper(compressor.stream_writer(open(path, "wb")), encoding="utf-8")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")), encoding="utf-8")
+    if mode.startswith("w"):
+        return gzip.open(path, "wt", compresslevel=level or COMPRESSION_LEVELS["gzip"], encoding="utf-8")
+    return gzip.open(path, "rt", encoding="utf-8")
+
+
+class _StreamFiles:
+    """Rotating part files of one stream."""
+
+    def __init__(self, sink: "FileSink", stream_name: str):
+        self.sink = sink
+        self.stream_name = stream_name
+        self.schema_line: Optional[str] = None
+        self.parts: List[Dict[str, Any]] = []
+        self._file = None
+        self._part: Optional[Dict[str, Any]] = None
+
+    def _open(self) -> None:
+        directory = os.path.join(self.sink.directory, self.stream_name)
+        os.makedirs(directory, exist_ok=True)
+        relative_path = os.path.join(
+            self.stream_name, f"part-{len(self.parts):05d}{CODEC_EXTENSIONS[self.sink.codec]}"
+        )
+        self._file = open_part(os.path.join(self.sink.directory, relative_path), "wt")
+        self._part = {"path": relative_path, "records": 0, "messages": 0, "bytes": 0}
+        self.parts.append(self._part)
+        # Every part starts with the schema so it can be loaded on its own
+        if self.schema_line is not None:
+            self._write(self.schema_line)
+
+    def _write(self, line: str) -> None:
+        self._file.write(line)
+        self._part["messages"] += 1
+        self._part["bytes"] += len(line)
+
+    def write(self, message_type: str, line: str) -> None:
+        if message_type == "SCHEMA":
+            self.schema_line = line
+        part = self._part
+        if self._file is None or (
+            message_type == "RECORD"
+            and (part["records"] >= self.sink.max_records or part["bytes"] >= self.sink.max_bytes)
+        ):
+            self.close()
+            self._open()
+            if message_type == "SCHEMA":
+                return
+        self._write(line)
+        if message_type == "RECORD":
+            self._part["records"] += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self._part["compressed_bytes"] = os.path.getsize(os.path.join(self.sink.directory, self._part["path"]))
+
+    def manifest(self) -> Dict[str, Any]:
+        return {
+            "records": sum(part["records"] for part in self.parts),
+            "parts": self.parts,
+        }
+
+
+class FileSink:
+    """
+    File-like object that can replace sys.stdout so that the Singer messages of
+    the taps are written to compressed files instead of a pipe, and the taps
+    run at full speed whatever the speed of the target.
+
+    The messages of each stream go to rotating part files in the run directory,
+    <STREAM>/part-00000.jsonl.zst (or .jsonl.gz without zstandard), a new part
+    starting after max_records records or max_bytes of uncompressed messages.
+    Each part starts with the SCHEMA message of its stream, so the parts can be
+    replayed in parallel and independently (see replay_lines). close() writes
+    manifest.json, listing the parts of every stream in order and the state of
+    the run (the STATE messages merged); a run directory without a manifest is
+    incomplete.
+    """
+
+    def __init__(self, directory: str, codec: Optional[str] = None,
+                 max_records: int = DEFAULT_MAX_RECORDS, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.codec = codec or default_codec()
+        _check_codec(self.codec)
+        if max_records <= 0 or max_bytes <= 0:
+            raise ValueError("max_records and max_bytes must be positive")
+        self.directory = directory
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.streams: Dict[str, _StreamFiles] = {}
+        self.state: Optional[Dict] = None
+        self.created_at = datetime.now(pytz.UTC)
+        self._pending = ""
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, text: str) -> int:
+        self._pending += text
+        if "\n" in text:
+            *lines, self._pending = self._pending.split("\n")
+            for line in lines:
+                self.write_line(line)
+        return len(text)
+
+    def write_line(self, line: str) -> None:
+        """Route one Singer message line to the files of its stream."""
+        if not line.strip():
+            return
+        match = MESSAGE_PATTERN.match(line)
+        if match:
+            message_type, stream_name = match.groups()
+        else:
+            message = json.loads(line)
+            message_type, stream_name = message.get("type"), message.get("stream")
+
+        if message_type == "STATE":
+            value = (json.loads(line) if match else message)["value"]
+            # Each tap writes the state of its own stream, kept side by side
+            if isinstance(value, dict) and isinstance(self.state, dict):
+                self.state.update(value)
+            else:
+                self.state = value
+            return
+        if stream_name is None:
+            raise ValueError(f"Singer {message_type} message without a stream: {line[:200]}")
+
+        stream_files = self.streams.get(stream_name)
+        if stream_files is None:
+            stream_files = self.streams[stream_name] = _StreamFiles(self, stream_name)
+        stream_files.write(message_type, line + "\n")
+
+    def flush(self) -> None:
+        pass
+
+    def manifest(self) -> Dict[str, Any]:
+        return {
+            "created_at": self.created_at.isoformat(),
+            "completed_at": datetime.now(pytz.UTC).isoformat(),
+            "codec": self.codec,
+            "max_records": self.max_records,
+            "max_bytes": self.max_bytes,
+            "streams": {name: stream_files.manifest() for name, stream_files in self.streams.items()},
+            "state": self.state,
+        }
+
+    def close(self) -> Dict[str, Any]:
+        if self._pending:
+            self.write_line(self._pending)
+            self._pending = ""
+        for stream_files in self.streams.values():
+            stream_files.close()
+
+        manifest = self.manifest()
+        # Written last and renamed into place: the manifest marks a complete run
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+        for stream_name, stream in manifest["streams"].items():
+            LOGGER.info(f"Wrote {stream['records']} records of {stream_name} to {len(stream['parts'])} files")
+        LOGGER.info(f"Wrote the Singer files manifest to {path}")
+        return manifest
+
+    def abort(self) -> None:
+        """Close the part files of a failed run, without a manifest the run stays incomplete."""
+        self._pending = ""
+        for stream_files in self.streams.values():
+            stream_files.close()
+
+
+def load_manifest(directory: str) -> Dict[str, Any]:
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No {MANIFEST_NAME} in {directory}, the run is incomplete or not a file sink run")
+    with open(path) as f:
+        return json.load(f)
+
+
+def replay_lines(directory: str, streams: Optional[List[str]] = None, include_state: bool = True) -> Iterator[str]:
+    """
+    Singer message lines of a run directory, the parts of each stream in order,
+    followed by a STATE message with the state of the run. streams selects a subset,
+    so that the streams can be loaded by separate target processes.
+    """
+    manifest = load_manifest(directory)
+    for stream_name in streams or list(manifest["streams"]):
+        if stream_name not in manifest["streams"]:
+            raise KeyError(f"Stream {stream_name} is not in the manifest of {directory}")
+        for part in manifest["streams"][stream_name]["parts"]:
+            with open_part(os.path.join(directory, part["path"])) as f:
+                yield from f
+    if include_state and manifest["state"] is not None:
+        yield singer.format_message(singer.StateMessage(value=manifest["state"])) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the Singer files of a run to stdout, e.g. into a target.")
+    parser.add_argument("directory", help="Run directory holding manifest.json")
+    parser.add_argument("--stream", action="append", dest="streams", help="Stream to replay, repeatable (default all)")
+    parser.add_argument("--no-state", action="store_true", help="Leave out the final STATE message")
+    args = parser.parse_args(argv)
+
+    for line in replay_lines(args.directory, args.streams, include_state=not args.no_state):
+        sys.stdout.write(line)
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import numpy as np                          # type: ignore
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Union
+
+
+# Share of the launch cost saved per reused core, as in FCT_LAUNCH_COSTS
+DEFAULT_REUSE_DISCOUNT = 0.3
+
+ReuseDiscount = Union[float, Mapping[str, float]]
+
+
+class LaunchCostEngine:
+    """
+    In-process version of the launch cost metrics of FCT_LAUNCH_COSTS.
+
+    The records of LaunchesTap, RocketsTap and PayloadsTap are turned once
+    into one array per column (one row per launch), then the metrics are
+    computed for all launches at once:
+
+        estimated_launch_cost = cost_per_launch * (1 - reuse_discount * reused_core_count / core_count)
+        cost_per_kg = estimated_launch_cost / total_payload_mass_kg
+
+    so what-if analysis on the reuse discount takes milliseconds instead of a
+    dbt run. As in the warehouse, cores are counted once per launch, payloads
+    are the IDs of the launch PAYLOADS array (the rows of the launch payload
+    bridge) with their MASS_KG looked up in the payload records, and a launch
+    without cores gets no discount. cost_per_kg is NaN without payload mass, costs are NaN when the
+    rocket has no cost.
+    """
+
+    def __init__(
+        self,
+        launch_ids: Sequence[str],
+        rocket_ids: Sequence[str],
+        cost_per_launch: np.ndarray,
+        core_count: np.ndarray,
+        reused_core_count: np.ndarray,
+        total_payload_mass_kg: np.ndarray
+    ):
+        self.launch_ids = np.asarray(launch_ids, dtype=object)
+        self.rocket_ids = np.asarray(rocket_ids, dtype=object)
+        self.cost_per_launch = np.asarray(cost_per_launch, dtype=np.float64)
+        self.core_count = np.asarray(core_count, dtype=np.int64)
+        self.reused_core_count = np.asarray(reused_core_count, dtype=np.int64)
+        self.total_payload_mass_kg = np.asarray(total_payload_mass_kg, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.launch_ids)
+
+    @classmethod
+    def from_records(
+        cls,
+        launches: Iterable[Dict[str, Any]],
+        rockets: Iterable[Dict[str, Any]],
+        payloads: Iterable[Dict[str, Any]]
+    ) -> "LaunchCostEngine":
+        """Build the launch arrays from the records written by the taps."""
+        rocket_costs = {
+            rocket["ROCKET_ID"]: rocket.get("COST_PER_LAUNCH")
+            for rocket in rockets
+        }
+
+        launch_ids: List[str] = []
+        rocket_ids: List[str] = []
+        core_count: List[int] = []
+        reused_core_count: List[int] = []
+        payload_ids: List[List[str]] = []
+        for launch in launches:
+            launch_ids.append(launch["LAUNCH_ID"])
+            rocket_ids.append(launch.get("ROCKET"))
+
+            reused_by_core: Dict[str, bool] = {}
+            for core in json.loads(launch.get("CORES") or "[]"):
+                if core.get("core") is not None:
+                    reused_by_core[core["core"]] = reused_by_core.get(core["core"], False) or bool(core.get("reused"))
+            core_count.append(len(reused_by_core))
+            reused_core_count.append(sum(reused_by_core.values()))
+            payload_ids.append(json.loads(launch.get("PAYLOADS") or "[]"))
+
+        cost_per_launch = np.array(
+            [rocket_costs.get(rocket_id) for rocket_id in rocket_ids], dtype=np.float64
+        )
+
+        # Sum the masses of the payloads listed by each launch, once per
+        # payload ID like the bridge rows; payloads without a record weigh 0
+        payload_mass = {
+            payload["PAYLOAD_ID"]: payload.get("MASS_KG") or 0.0
+            for payload in payloads
+        }
+        total_payload_mass_kg = np.array(
+            [sum(payload_mass.get(payload_id, 0.0) for payload_id in dict.fromkeys(ids)) for ids in payload_ids],
+            dtype=np.float64
+        )
+
+        return cls(
+            launch_ids, rocket_ids, cost_per_launch,
+            np.array(core_count), np.array(reused_core_count), total_payload_mass_kg
+        )
+
+    def reuse_discounts(self, reuse_discount: ReuseDiscount = DEFAULT_REUSE_DISCOUNT) -> np.ndarray:
+        """
+        Discount of each launch: one factor for all launches, or a factor per
+        rocket ID (rockets missing from the mapping use DEFAULT_REUSE_DISCOUNT).
+        """
+        if isinstance(reuse_discount, Mapping):
+            rockets, rocket_index = np.unique(self.rocket_ids.astype(str), return_inverse=True)
+            factors = np.array(
+                [reuse_discount.get(rocket, DEFAULT_REUSE_DISCOUNT) for rocket in rockets],
+                dtype=np.float64
+            )
+            return factors[rocket_index]
+        return np.full(len(self), reuse_discount, dtype=np.float64)
+
+    def reused_share(self) -> np.ndarray:
+        """Reused cores over cores of each launch, 0 for launches without cores."""
+        share = np.zeros(len(self), dtype=np.float64)
+        np.divide(self.reused_core_count, self.core_count, out=share, where=self.core_count > 0)
+        return share
+
+    def compute(self, reuse_discount: ReuseDiscount = DEFAULT_REUSE_DISCOUNT) -> Dict[str, np.ndarray]:
+        """Cost metrics of every launch, one array per column of FCT_LAUNCH_COSTS."""
+        estimated = self.cost_per_launch * (1 - self.reuse_discounts(reuse_discount) * self.reused_share())
+        return {
+            "launch_id": self.launch_ids,
+            "core_count": self.core_count,
+            "reused_core_count": self.reused_core_count,
+            "total_payload_mass_kg": self.total_payload_mass_kg,
+            "base_launch_cost": self.cost_per_launch,
+            "estimated_launch_cost": estimated,
+            "cost_per_kg": self._cost_per_kg(estimated),
+        }
+
+    def scenarios(self, reuse_discounts: Sequence[float]) -> np.ndarray:
+        """
+        Estimated launch costs for several discount factors at once, shape
+        (len(reuse_discounts), launches).
+        """
+        factors = np.asarray(reuse_discounts, dtype=np.float64)[:, np.newaxis]
+        return self.cost_per_launch * (1 - factors * self.reused_share())
+
+    def _cost_per_kg(self, estimated: np.ndarray) -> np.ndarray:
+        cost_per_kg = np.full(estimated.shape, np.nan)
+        np.divide(estimated, self.total_payload_mass_kg, out=cost_per_kg, where=self.total_payload_mass_kg > 0)
+        return cost_per_kg
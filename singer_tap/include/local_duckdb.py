@@ -0,0 +1,407 @@
+import singer                               # type: ignore
+import duckdb                               # type: ignore
+import pandas as pd                         # type: ignore
+import json
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+import pytz                                 # type: ignore
+from snowflake.connector.errors import DatabaseError          # type: ignore
+from include.tombstones import is_delete_marker
+
+
+LOGGER = singer.get_logger()
+
+# Snowflake column types used in db_setup/V2_0 and their DuckDB equivalents
+SNOWFLAKE_TYPE_MAP = [
+    (re.compile(r"VARCHAR\s*\(\s*16777216\s*\)", re.IGNORECASE), "VARCHAR"),
+    (re.compile(r"NUMBER\s*\(\s*38\s*,\s*0\s*\)", re.IGNORECASE), "BIGINT"),
+    (re.compile(r"TIMESTAMP_NTZ\s*\(\s*9\s*\)", re.IGNORECASE), "TIMESTAMP"),
+    (re.compile(r"\bVARIANT\b", re.IGNORECASE), "JSON"),
+    (re.compile(r"\bFLOAT\b", re.IGNORECASE), "DOUBLE"),
+    (re.compile(r"CURRENT_TIMESTAMP\s*\(\s*\)", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+]
+
+
+def translate_snowflake_ddl(ddl: str, reserved_words: List[str]) -> List[str]:
+    """
+    Translate a Snowflake DDL script into DuckDB statements.
+
+    Role and database switches and Snowflake-only objects (file formats) are
+    dropped, USE SCHEMA becomes CREATE SCHEMA + USE, and column names that are
+    reserved words in DuckDB (e.g. WINDOW) are quoted.
+    """
+    # Table constraints share the column position but must stay unquoted
+    reserved = {word.upper() for word in reserved_words} - {"PRIMARY", "UNIQUE", "FOREIGN", "CONSTRAINT", "CHECK"}
+    statements = []
+
+    for raw_statement in ddl.split(";"):
+        # Strip SQL comments before looking at the statement
+        lines = [line.split("--", 1)[0] for line in raw_statement.splitlines()]
+        statement = "\n".join(lines).strip()
+        if not statement:
+            continue
+
+        normalized = " ".join(statement.split()).upper()
+        if normalized.startswith("USE ROLE") or normalized.startswith("USE DATABASE"):
+            continue
+        if "FILE FORMAT" in normalized:
+            continue
+        if normalized.startswith("USE SCHEMA"):
+            schema_name = statement.split()[-1]
+            statements.append(f"CREATE SCHEMA IF NOT EXISTS {schema_name}")
+            statements.append(f"USE {schema_name}")
+            continue
+
+        for pattern, replacement in SNOWFLAKE_TYPE_MAP:
+            statement = pattern.sub(replacement, statement)
+
+        # Quote column names that DuckDB reserves, e.g. the launches WINDOW column
+        statement = re.sub(
+            r"([(,]\s*)([A-Za-z_][A-Za-z0-9_]*)(\s+[A-Za-z])",
+            lambda m: (
+                f'{m.group(1)}"{m.group(2)}"{m.group(3)}'
+                if m.group(2).upper() in reserved else m.group(0)
+            ),
+            statement
+        )
+        statements.append(statement)
+
+    return statements
+
+
+def create_staging_tables(conn, ddl_path: str) -> None:
+    """
+    Create the STG_SPACEX_DATA_* tables in a DuckDB database from the Snowflake DDL.
+    """
+    with open(ddl_path, 'r') as f:
+        ddl = f.read()
+
+    reserved_words = [
+        row[0] for row in conn.execute(
+            "SELECT keyword_name FROM duckdb_keywords() WHERE keyword_category = 'reserved'"
+        ).fetchall()
+    ]
+
+    for statement in translate_snowflake_ddl(ddl, reserved_words):
+        conn.execute(statement)
+
+
+class DuckDBConnection:
+    """
+    Thin wrapper giving a DuckDB connection the Snowflake connector calling convention.
+
+    The taps write queries with the pyformat (%s) placeholders of
+    snowflake.connector; DuckDB expects qmark (?) placeholders.
+    """
+
+    def __init__(self, database: str, schema: Optional[str] = None):
+        self.database = database
+        self.schema = schema
+        self._conn = duckdb.connect(database)
+        if schema:
+            self._conn.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+            self._conn.execute(f"USE {schema}")
+
+    @property
+    def raw(self):
+        """Underlying duckdb connection."""
+        return self._conn
+
+    def cursor(self):
+        # duckdb cursors are separate connections and do not inherit USE
+        cursor = self._conn.cursor()
+        if self.schema:
+            cursor.execute(f"USE {self.schema}")
+        return DuckDBCursor(cursor)
+
+    def execute(self, query: str, params=None):
+        return self._conn.execute(query.replace("%s", "?"), params)
+
+    def commit(self):
+        # DuckDB runs in autocommit mode unless a transaction is opened explicitly
+        pass
+
+    def close(self):
+        self._conn.close()
+
+
+class DuckDBCursor:
+    """
+    Cursor wrapper raising snowflake.connector errors so the taps' error handling applies.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query: str, params=None):
+        try:
+            self._cursor.execute(query.replace("%s", "?"), params)
+        except duckdb.Error as e:
+            raise DatabaseError(msg=str(e), query=query)
+        return self
+
+    def executemany(self, query: str, seq_of_params):
+        try:
+            self._cursor.executemany(query.replace("%s", "?"), seq_of_params)
+        except duckdb.Error as e:
+            raise DatabaseError(msg=str(e), query=query)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+
+class DuckDBTarget:
+    """
+    Minimal Singer target loading SCHEMA/RECORD/STATE messages into DuckDB.
+
+    Records are upserted on the stream key properties and stamped with the
+    same _SDC_* metadata columns target-snowflake adds, so the dbt models
+    see identical staging tables locally.
+    """
+
+    def __init__(self, conn, schema: str = "STG_SPACEX_DATA", batch_size: int = 1000):
+        self.conn = conn
+        self.schema = schema
+        self.batch_size = batch_size
+        self.streams: Dict[str, Dict] = {}
+        self.buffers: Dict[str, List[Dict]] = {}
+        self.deletes: Dict[str, List[Dict]] = {}
+        self.row_counts: Dict[str, int] = {}
+        self.state: Optional[Dict] = None
+        self._sequence = 0
+
+    def _table_columns(self, table_name: str) -> Dict[str, str]:
+        rows = self.conn.execute(
+            """
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE upper(table_schema) = upper(?) AND upper(table_name) = upper(?)
+            ORDER BY ordinal_position
+            """,
+            [self.schema, table_name]
+        ).fetchall()
+        return {name.upper(): data_type for name, data_type in rows}
+
+    def process_line(self, line: str) -> None:
+        """Parse and handle one Singer message line."""
+        line = line.strip()
+        if not line:
+            return
+
+        message = singer.parse_message(line)
+
+        if isinstance(message, singer.SchemaMessage):
+            self._handle_schema(message)
+        elif isinstance(message, singer.RecordMessage):
+            self._handle_record(message)
+        elif isinstance(message, singer.StateMessage):
+            self.flush_all()
+            self.state = message.value
+
+    def _handle_schema(self, message) -> None:
+        columns = self._table_columns(message.stream)
+        if not columns:
+            raise ValueError(
+                f"Table {self.schema}.{message.stream} does not exist. "
+                "Create the staging tables with create_staging_tables first."
+            )
+
+        # Flush any pending rows before the stream definition changes
+        self.flush(message.stream)
+        self.streams[message.stream] = {
+            "columns": columns,
+            "key_properties": message.key_properties,
+        }
+        self.buffers.setdefault(message.stream, [])
+        self.deletes.setdefault(message.stream, [])
+        self.row_counts.setdefault(message.stream, 0)
+
+    def _handle_record(self, message) -> None:
+        if message.stream not in self.streams:
+            raise ValueError(f"Received RECORD for stream {message.stream} before its SCHEMA")
+
+        # Strictly increasing across runs, like target-snowflake's time based sequence
+        self._sequence = max(self._sequence + 1, time.time_ns())
+        key_properties = self.streams[message.stream]["key_properties"]
+        if is_delete_marker(message.record, key_properties):
+            # A delete marker (see include.tombstones) only stamps the row it keys
+            self.deletes[message.stream].append({
+                **{key: message.record.get(key) for key in key_properties},
+                "_SDC_DELETED_AT": message.record["_sdc_deleted_at"],
+                "_SDC_EXTRACTED_AT": message.time_extracted,
+                "_SDC_SEQUENCE": self._sequence,
+            })
+            if len(self.deletes[message.stream]) >= self.batch_size:
+                self.flush(message.stream)
+            return
+
+        record = dict(message.record)
+        record["_SDC_EXTRACTED_AT"] = message.time_extracted
+        record["_SDC_RECEIVED_AT"] = datetime.now(pytz.UTC)
+        record["_SDC_DELETED_AT"] = record.pop("_sdc_deleted_at", None)
+        record["_SDC_SEQUENCE"] = self._sequence
+        record["_SDC_TABLE_VERSION"] = message.version
+
+        buffer = self.buffers[message.stream]
+        buffer.append(record)
+        if len(buffer) >= self.batch_size:
+            self.flush(message.stream)
+
+    def flush(self, stream_name: str) -> None:
+        """Write buffered records of one stream to its staging table, then its delete markers."""
+        self._insert(stream_name)
+        self._mark_deleted(stream_name)
+
+    def _insert(self, stream_name: str) -> None:
+        buffer = self.buffers.get(stream_name)
+        if not buffer:
+            return
+
+        columns = self.streams[stream_name]["columns"]
+        batched_at = datetime.now(pytz.UTC)
+
+        insert_columns = list(columns)
+        casts = ", ".join(
+            f'TRY_CAST("{column}" AS {columns[column]})' for column in insert_columns
+        )
+        column_list = ", ".join(f'"{column}"' for column in insert_columns)
+
+        rows = []
+        for record in buffer:
+            record["_SDC_BATCHED_AT"] = batched_at
+            rows.append([self._to_db_value(record.get(column)) for column in insert_columns])
+
+        # Scanning a registered frame is orders of magnitude faster than executemany
+        batch = pd.DataFrame(rows, columns=insert_columns, dtype=object)
+        self.conn.register("singer_batch", batch)
+        try:
+            self._check_casts(stream_name, columns)
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {self.schema}.{stream_name} ({column_list}) "
+                f"SELECT {casts} FROM singer_batch"
+            )
+        finally:
+            self.conn.unregister("singer_batch")
+
+        self.row_counts[stream_name] += len(rows)
+        buffer.clear()
+
+    def _check_casts(self, stream_name: str, columns: Dict[str, str]) -> None:
+        """
+        Raise for values of singer_batch that do not fit their column type,
+        which TRY_CAST would load as NULL where target-snowflake rejects the record.
+        """
+        failed = " OR ".join(
+            f'("{column}" IS NOT NULL AND TRY_CAST("{column}" AS {data_type}) IS NULL)'
+            for column, data_type in columns.items()
+        )
+        counts = ", ".join(
+            f'count_if("{column}" IS NOT NULL AND TRY_CAST("{column}" AS {data_type}) IS NULL)'
+            for column, data_type in columns.items()
+        )
+        row = self.conn.execute(f"SELECT {counts} FROM singer_batch WHERE {failed}").fetchone()
+        errors = [
+            f"{count} values of {column} are not {data_type}"
+            for (column, data_type), count in zip(columns.items(), row or []) if count
+        ]
+        if errors:
+            raise ValueError(f"Records of {stream_name} do not fit {self.schema}.{stream_name}: {'; '.join(errors)}")
+
+    def _mark_deleted(self, stream_name: str) -> None:
+        deletes = self.deletes.get(stream_name)
+        if not deletes:
+            return
+
+        key_properties = self.streams[stream_name]["key_properties"]
+        batch = pd.DataFrame(
+            [[self._to_db_value(value) for value in delete.values()] for delete in deletes],
+            columns=list(deletes[0]), dtype=object
+        )
+        join = " AND ".join(f'CAST(target."{key}" AS VARCHAR) = singer_deletes."{key}"' for key in key_properties)
+        self.conn.register("singer_deletes", batch)
+        try:
+            self.conn.execute(
+                f"UPDATE {self.schema}.{stream_name} AS target SET "
+                "_SDC_DELETED_AT = TRY_CAST(singer_deletes._SDC_DELETED_AT AS TIMESTAMP), "
+                # Past the watermark of the incremental staging models, so dbt picks the marker up
+                "_SDC_EXTRACTED_AT = TRY_CAST(singer_deletes._SDC_EXTRACTED_AT AS TIMESTAMP), "
+                "_SDC_SEQUENCE = TRY_CAST(singer_deletes._SDC_SEQUENCE AS BIGINT), "
+                "_SDC_BATCHED_AT = ? "
+                f"FROM singer_deletes WHERE {join}",
+                [datetime.now(pytz.UTC).replace(tzinfo=None)]
+            )
+        finally:
+            self.conn.unregister("singer_deletes")
+        deletes.clear()
+
+    def flush_all(self) -> None:
+        for stream_name in list(self.buffers):
+            self.flush(stream_name)
+
+    def close(self) -> None:
+        self.flush_all()
+
+    def abort(self) -> None:
+        """Drop the buffered records of a failed run instead of loading them."""
+        self.buffers.clear()
+        self.deletes.clear()
+
+    @staticmethod
+    def _to_db_value(value):
+        """Render a record value as text, converted to the column type by TRY_CAST (see _check_casts)."""
+        if value is None:
+            return None
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, datetime):
+            # Staging timestamps are TIMESTAMP_NTZ in UTC
+            if value.tzinfo is not None:
+                value = value.astimezone(pytz.UTC).replace(tzinfo=None)
+            return value.isoformat()
+        return str(value)
+
+
+class SingerMessageSink:
+    """
+    File-like object that can replace sys.stdout so that Singer messages written
+    by the taps are loaded in-process by a DuckDBTarget instead of piped.
+    """
+
+    def __init__(self, target: DuckDBTarget):
+        self.target = target
+        self._pending = ""
+
+    def write(self, text: str) -> int:
+        self._pending += text
+        if "\n" in text:
+            *lines, self._pending = self._pending.split("\n")
+            for line in lines:
+                self.target.process_line(line)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._pending:
+            self.target.process_line(self._pending)
+            self._pending = ""
+        self.target.close()
+
+        for stream_name, row_count in self.target.row_counts.items():
+            LOGGER.info(f"Loaded {row_count} rows into {self.target.schema}.{stream_name}")
+
+    def abort(self) -> None:
+        self._pending = ""
+        self.target.abort()
@@ -0,0 +1,168 @@
+import singer                               # type: ignore
+import contextlib
+import json
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+import pytz                                 # type: ignore
+
+try:
+    import resource                         # type: ignore
+except ImportError:                         # pragma: no cover - not available on Windows
+    resource = None
+
+
+LOGGER = singer.get_logger()
+
+STREAM_PATTERN = re.compile(r'"stream": "([^"]*)"')
+
+# A snapshot of the peak is taken when the traced memory grows by this share
+# since the last one, a few snapshots per stream whatever its size
+PEAK_SNAPSHOT_GROWTH = 1.25
+PEAK_SNAPSHOT_MIN_BYTES = 1 << 20
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water resident set size of the process, None where getrusage is missing."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryProfiler:
+    """
+    File-like object wrapping the output of the taps that profiles the memory
+    of each stream run inside profile(name) with tracemalloc.
+
+    Every Singer message passes through unchanged; the RECORD messages are
+    counted per stream and, when the traced memory has grown enough since the
+    last check, a snapshot is taken so the allocation sites reported are the
+    ones of the peak of the stream, not what is left once it returns.
+    """
+
+    def __init__(self, output, top: int = 10, frames: int = 1):
+        self.output = output
+        self.top = top
+        self.frames = frames
+        self.streams: List[Dict[str, Any]] = []
+        self._records: Dict[str, int] = {}
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._peak_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._peak_snapshot_bytes = 0
+        # Traced bytes held by the peak snapshot itself, left out of the figures
+        self._snapshot_bytes = 0
+
+    def write(self, text: str) -> int:
+        self.output.write(text)
+        if '"RECORD"' in text:
+            for stream_name in STREAM_PATTERN.findall(text):
+                self._records[stream_name] = self._records.get(stream_name, 0) + 1
+            self._check_peak()
+        return len(text)
+
+    def flush(self) -> None:
+        self.output.flush()
+
+    def _check_peak(self) -> None:
+        if self._baseline is None:
+            return
+        current = tracemalloc.get_traced_memory()[0] - self._snapshot_bytes
+        if current >= max(self._peak_snapshot_bytes * PEAK_SNAPSHOT_GROWTH, PEAK_SNAPSHOT_MIN_BYTES):
+            self._peak_snapshot = tracemalloc.take_snapshot()
+            self._peak_snapshot_bytes = current
+            self._snapshot_bytes = tracemalloc.get_traced_memory()[0] - current
+
+    def _top_allocations(self, snapshot: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        # Grouped first, filtering the traces one by one costs more than the snapshot
+        statistics = [
+            stat for stat in snapshot.compare_to(self._baseline, "lineno")
+            if stat.size_diff > 0 and stat.traceback[0].filename != tracemalloc.__file__
+        ]
+        return [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_bytes": stat.size_diff,
+                "count": stat.count_diff,
+            }
+            for stat in statistics[:self.top]
+        ]
+
+    @contextlib.contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        """Profile the memory of the stream run in the block."""
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        self._records = {}
+        self._baseline = tracemalloc.take_snapshot()
+        baseline_bytes, _ = tracemalloc.get_traced_memory()
+        self._peak_snapshot, self._peak_snapshot_bytes, self._snapshot_bytes = None, baseline_bytes, 0
+        rss_before = peak_rss_bytes()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            current -= self._snapshot_bytes
+            peak = max(peak - self._snapshot_bytes, self._peak_snapshot_bytes)
+            # Nothing was written at the peak (e.g. a stream failing before its
+            # records): the allocations still held at the end are all there is
+            snapshot = self._peak_snapshot or tracemalloc.take_snapshot()
+            records = sum(self._records.values())
+            rss_after = peak_rss_bytes()
+            self.streams.append({
+                "stream": name,
+                "seconds": round(seconds, 3),
+                "records": records,
+                "records_by_stream": dict(self._records),
+                "traced_peak_bytes": peak - baseline_bytes,
+                "traced_retained_bytes": current - baseline_bytes,
+                "bytes_per_record": round((peak - baseline_bytes) / records) if records else None,
+                "peak_rss_bytes": rss_after,
+                "peak_rss_increase_bytes": (
+                    rss_after - rss_before if rss_after is not None and rss_before is not None else None
+                ),
+                "top_allocations": self._top_allocations(snapshot),
+                "error": error,
+            })
+            self._baseline = self._peak_snapshot = None
+            self._snapshot_bytes = 0
+            if started_tracing:
+                tracemalloc.stop()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Report of the streams profiled so far, in run order. bytes_per_record
+        is the traced peak of a stream over the RECORD messages it wrote.
+        """
+        return {
+            "created_at": datetime.now(pytz.UTC).isoformat(),
+            "python": platform.python_version(),
+            "tracemalloc_frames": self.frames,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "streams": self.streams,
+        }
+
+    def write_report(self, path: str) -> Dict[str, Any]:
+        report = self.report()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        peak = max(self.streams, key=lambda stream: stream["traced_peak_bytes"], default=None)
+        if peak:
+            LOGGER.info(
+                f"Wrote memory profile of {len(self.streams)} streams to {path}, "
+                f"highest traced peak {peak['traced_peak_bytes'] / 2 ** 20:.1f} MiB in {peak['stream']}"
+            )
+        return report
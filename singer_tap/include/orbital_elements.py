@@ -0,0 +1,78 @@
+import numpy as np                          # type: ignore
+import pandas as pd                         # type: ignore
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+
+# WGS 84 values used by Space-Track for the derived elements
+EARTH_MU_KM3_S2 = 398600.4418
+EARTH_RADIUS_KM = 6378.137
+SECONDS_PER_DAY = 86400.0
+
+ORBITAL_ELEMENT_COLUMNS = [
+    "DERIVED_SEMI_MAJOR_AXIS_KM",
+    "APOGEE_ALTITUDE_KM",
+    "PERIGEE_ALTITUDE_KM",
+    "ORBITAL_PERIOD_MIN",
+    "EPOCH_AGE_DAYS",
+]
+
+
+def derive_orbital_elements(
+    mean_motion: Sequence[Any],
+    eccentricity: Sequence[Any],
+    epoch: Sequence[Any],
+    as_of: datetime
+) -> Dict[str, np.ndarray]:
+    """
+    Orbital elements of all satellites at once from their mean elements.
+
+    mean_motion is in revolutions per day and epoch an ISO timestamp (UTC
+    when naive), as in the Space-Track data of the API. Values arrive as
+    numbers or strings; missing or invalid ones give NaN in every element
+    depending on them.
+    """
+    n_rev_day = pd.to_numeric(pd.Series(mean_motion, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    e = pd.to_numeric(pd.Series(eccentricity, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    n_rev_day = np.where(n_rev_day > 0, n_rev_day, np.nan)
+
+    # Kepler's third law, a = (mu / n^2)^(1/3) with n in rad/s
+    n_rad_s = n_rev_day * (2 * np.pi / SECONDS_PER_DAY)
+    semi_major_axis = np.cbrt(EARTH_MU_KM3_S2 / (n_rad_s * n_rad_s))
+
+    as_of_utc = pd.Timestamp(as_of)
+    as_of_utc = as_of_utc.tz_convert("UTC") if as_of_utc.tzinfo else as_of_utc.tz_localize("UTC")
+    epochs = pd.to_datetime(pd.Series(epoch, dtype=object), utc=True, errors="coerce", format="ISO8601")
+    epoch_age = as_of_utc - epochs
+
+    return {
+        "DERIVED_SEMI_MAJOR_AXIS_KM": semi_major_axis,
+        "APOGEE_ALTITUDE_KM": semi_major_axis * (1 + e) - EARTH_RADIUS_KM,
+        "PERIGEE_ALTITUDE_KM": semi_major_axis * (1 - e) - EARTH_RADIUS_KM,
+        "ORBITAL_PERIOD_MIN": 1440.0 / n_rev_day,
+        "EPOCH_AGE_DAYS": (epoch_age.dt.total_seconds() / SECONDS_PER_DAY).to_numpy(dtype=np.float64),
+    }
+
+
+def add_orbital_elements(records: List[Dict[str, Any]], as_of: datetime) -> List[Dict[str, Any]]:
+    """
+    Add the ORBITAL_ELEMENT_COLUMNS to StarlinkTap records, in place.
+
+    The elements are derived from MEAN_MOTION, ECCENTRICITY and EPOCH of all
+    the records in one vectorized pass. NaN values are written as None.
+    """
+    if not records:
+        return records
+
+    elements = derive_orbital_elements(
+        [record.get("MEAN_MOTION") for record in records],
+        [record.get("ECCENTRICITY") for record in records],
+        [record.get("EPOCH") for record in records],
+        as_of
+    )
+    for column in ORBITAL_ELEMENT_COLUMNS:
+        values = elements[column]
+        column_values = np.where(np.isnan(values), None, values).tolist()
+        for record, value in zip(records, column_values):
+            record[column] = value
+    return records
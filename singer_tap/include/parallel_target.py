@@ -0,0 +1,160 @@
+import singer                               # type: ignore
+import json
+import queue
+import threading
+import time
+from typing import Dict, Optional
+from include.file_sink import MESSAGE_PATTERN
+from include.local_duckdb import DuckDBTarget
+
+
+LOGGER = singer.get_logger()
+
+DEFAULT_QUEUE_SIZE = 10000
+
+# Queue items other than message lines
+_FLUSH = object()
+_STOP = object()
+
+
+class _StreamWorker:
+    """Worker thread loading the messages of one stream from its bounded queue."""
+
+    def __init__(self, stream_name: str, target: DuckDBTarget, queue_size: int):
+        self.stream_name = stream_name
+        self.target = target
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.error: Optional[BaseException] = None
+        self.aborted = False
+        # Time the taps were held back by the full queue of the stream
+        self.wait_seconds = 0.0
+        self.thread = threading.Thread(target=self._run, name=f"target-{stream_name}", daemon=True)
+        self.thread.start()
+
+    def put(self, item) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            start = time.perf_counter()
+            self.queue.put(item)
+            self.wait_seconds += time.perf_counter() - start
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                # After an error or an abort the queue is still drained so the taps never block on it
+                if self.error is None and not self.aborted:
+                    if item is _FLUSH:
+                        self.target.flush_all()
+                    else:
+                        self.target.process_line(item)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+
+class ParallelTarget:
+    """
+    Singer target loading each stream into its STG_SPACEX_DATA table in a
+    worker thread of its own, a drop-in replacement of DuckDBTarget.
+
+    The interleaved messages are routed by stream name to a bounded queue per
+    stream, and each worker batches its queue into a DuckDBTarget on its own
+    DuckDB cursor, so streams load in parallel (DuckDB releases the GIL while
+    inserting). A full queue blocks process_line, and with it the write of the
+    tap, until the worker catches up: the taps are held back instead of
+    buffering a slow stream in memory.
+
+    A STATE message is a barrier: it is kept only once every queue is drained
+    and flushed, so the state never runs ahead of the loaded records. The
+    error of a worker is raised by the next process_line, flush_all or close.
+    """
+
+    def __init__(self, conn, schema: str = "STG_SPACEX_DATA", batch_size: int = 1000,
+                 queue_size: int = DEFAULT_QUEUE_SIZE):
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive")
+        self.conn = conn
+        self.schema = schema
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.workers: Dict[str, _StreamWorker] = {}
+        self.state: Optional[Dict] = None
+
+    def _worker(self, stream_name: str) -> _StreamWorker:
+        worker = self.workers.get(stream_name)
+        if worker is None:
+            # duckdb cursors are separate connections to the database, one per thread
+            target = DuckDBTarget(self.conn.cursor(), self.schema, self.batch_size)
+            worker = self.workers[stream_name] = _StreamWorker(stream_name, target, self.queue_size)
+        return worker
+
+    def _raise_errors(self) -> None:
+        for worker in self.workers.values():
+            if worker.error is not None:
+                raise worker.error
+
+    def process_line(self, line: str) -> None:
+        """Route one Singer message line to the queue of its stream."""
+        line = line.strip()
+        if not line:
+            return
+
+        match = MESSAGE_PATTERN.match(line)
+        if match:
+            message_type, stream_name = match.groups()
+        else:
+            message = json.loads(line)
+            message_type, stream_name = message.get("type"), message.get("stream")
+
+        if message_type == "STATE":
+            self.flush_all()
+            self.state = singer.parse_message(line).value
+        elif stream_name is not None:
+            worker = self._worker(stream_name)
+            if worker.error is not None:
+                raise worker.error
+            worker.put(line)
+
+    def flush_all(self) -> None:
+        """Wait until every queue is loaded and flushed."""
+        for worker in self.workers.values():
+            worker.put(_FLUSH)
+        for worker in self.workers.values():
+            worker.queue.join()
+        self._raise_errors()
+
+    def close(self) -> None:
+        try:
+            self.flush_all()
+        finally:
+            for worker in self.workers.values():
+                worker.put(_STOP)
+            for worker in self.workers.values():
+                worker.thread.join()
+                worker.target.conn.close()
+        for stream_name, worker in self.workers.items():
+            if worker.wait_seconds:
+                LOGGER.info(f"The taps waited {worker.wait_seconds:.2f}s on the full queue of {stream_name}")
+
+    def abort(self) -> None:
+        """Stop the workers of a failed run, dropping the messages still queued or buffered."""
+        for worker in self.workers.values():
+            worker.aborted = True
+            worker.put(_STOP)
+        for worker in self.workers.values():
+            worker.thread.join()
+            worker.target.abort()
+            worker.target.conn.close()
+
+    @property
+    def row_counts(self) -> Dict[str, int]:
+        return {
+            stream_name: row_count
+            for worker in self.workers.values()
+            for stream_name, row_count in worker.target.row_counts.items()
+        }
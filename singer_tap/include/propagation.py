@@ -0,0 +1,199 @@
+import numpy as np                          # type: ignore
+import pandas as pd                         # type: ignore
+import pytz                                 # type: ignore
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple
+from include.schema_registry import register_schema
+
+try:
+    from sgp4.api import Satrec, SatrecArray                    # type: ignore
+    from sgp4 import omm                                        # type: ignore
+except ImportError:
+    Satrec = SatrecArray = omm = None
+
+POSITIONS_STREAM = "STG_SPACEX_DATA_STARLINK_POSITIONS"
+
+POSITIONS_SCHEMA = register_schema(
+    stream_name=POSITIONS_STREAM,
+    schema={
+        "type": "object",
+        "properties": {
+            "STARLINK_ID": {"type": ["string"]},
+            "START_TIME": {
+                "type": ["string"],
+                "format": "date-time",
+                "description": "Time of the first position, the others follow every STEP_SECONDS"
+            },
+            "STEP_SECONDS": {"type": ["integer", "null"]},
+            "STEPS": {"type": ["integer", "null"]},
+            "LATITUDE": {
+                "type": ["string", "null"],
+                "description": "JSON array of geodetic latitudes in degrees, null where SGP4 failed"
+            },
+            "LONGITUDE": {
+                "type": ["string", "null"],
+                "description": "JSON array of longitudes in degrees"
+            },
+            "HEIGHT_KM": {
+                "type": ["string", "null"],
+                "description": "JSON array of heights above the WGS 84 ellipsoid"
+            },
+            "CREATED_AT": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["STARLINK_ID", "START_TIME"]
+)
+
+# WGS 84 ellipsoid
+WGS84_A_KM = 6378.137
+WGS84_E2 = 6.69437999014e-3
+
+
+def sgp4_available() -> bool:
+    return Satrec is not None
+
+
+def satrec_from_spacetrack(spacetrack: Dict[str, Any]):
+    """
+    SGP4 satellite record from the spaceTrack data of the API: the TLE lines,
+    or the OMM mean elements when they are missing. None when neither parses.
+    """
+    line1, line2 = spacetrack.get("TLE_LINE1"), spacetrack.get("TLE_LINE2")
+    try:
+        if line1 and line2:
+            satrec = Satrec.twoline2rv(line1, line2)
+        else:
+            satrec = Satrec()
+            omm.initialize(satrec, spacetrack)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return None if satrec.error else satrec
+
+
+def time_grid(start: datetime, steps: int, step_seconds: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Julian dates of the grid split in day and fraction, as SGP4 expects."""
+    if start.tzinfo:
+        start = start.astimezone(pytz.UTC)
+    # Julian date of the start at midnight, then day fractions from there
+    midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    jd_midnight = midnight.toordinal() + 1721424.5
+    start_fraction = (start - midnight).total_seconds() / 86400.0
+    fr = start_fraction + np.arange(steps) * (step_seconds / 86400.0)
+    return np.full(steps, jd_midnight), fr
+
+
+def gmst_radians(jd: np.ndarray, fr: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal time (IAU 1982), the TEME to Earth-fixed angle."""
+    t_ut1 = ((jd - 2451545.0) + fr) / 36525.0
+    seconds = (
+        -6.2e-6 * t_ut1 ** 3 + 0.093104 * t_ut1 ** 2
+        + (876600.0 * 3600 + 8640184.812866) * t_ut1 + 67310.54841
+    )
+    return np.mod(np.radians(seconds / 240.0), 2 * np.pi)
+
+
+def teme_to_geodetic(r: np.ndarray, jd: np.ndarray, fr: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Latitude, longitude (degrees) and height (km) of TEME positions of shape
+    (satellites, times, 3). Polar motion is ignored (a few meters).
+    """
+    theta = gmst_radians(jd, fr)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    x = cos_t * r[..., 0] + sin_t * r[..., 1]
+    y = -sin_t * r[..., 0] + cos_t * r[..., 1]
+    z = r[..., 2]
+
+    longitude = np.arctan2(y, x)
+    p = np.hypot(x, y)
+    latitude = np.arctan2(z, p * (1 - WGS84_E2))
+    # Converges to well under a meter in three iterations for LEO
+    for _ in range(3):
+        sin_lat = np.sin(latitude)
+        n = WGS84_A_KM / np.sqrt(1 - WGS84_E2 * sin_lat * sin_lat)
+        latitude = np.arctan2(z + WGS84_E2 * n * sin_lat, p)
+
+    # Height form that stays defined over the poles
+    sin_lat, cos_lat = np.sin(latitude), np.cos(latitude)
+    height = p * cos_lat + z * sin_lat - WGS84_A_KM * np.sqrt(1 - WGS84_E2 * sin_lat * sin_lat)
+
+    return np.degrees(latitude), np.degrees(longitude), height
+
+
+class ConstellationPropagator:
+    """
+    Propagate the whole Starlink constellation over a grid of timestamps.
+
+    Positions are computed with the batched SGP4 of the sgp4 package
+    (SatrecArray, satellites x times in one C call) and converted to
+    geodetic coordinates with NumPy. Each satellite then gives one record
+    holding its positions as JSON arrays; the timestamps are implied by
+    START_TIME and STEP_SECONDS, so the time series stays compact.
+    """
+
+    def __init__(self, start: datetime, steps: int, step_seconds: int = 60):
+        if not sgp4_available():
+            raise ImportError("Position propagation requires the sgp4 package (pip install sgp4)")
+        if steps <= 0 or step_seconds <= 0:
+            raise ValueError("steps and step_seconds must be positive")
+        self.start = start
+        self.steps = steps
+        self.step_seconds = step_seconds
+        self.jd, self.fr = time_grid(start, steps, step_seconds)
+        self.skipped: List[str] = []
+
+    def propagate(self, satellites: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Positions of the API satellites, one row per satellite with usable
+        elements. Satellites without them are listed in self.skipped.
+        """
+        satellite_ids: List[str] = []
+        satrecs = []
+        for satellite in satellites:
+            satrec = satrec_from_spacetrack(satellite.get("spaceTrack") or {})
+            if satrec is None:
+                self.skipped.append(satellite.get("id"))
+                continue
+            satellite_ids.append(satellite.get("id"))
+            satrecs.append(satrec)
+
+        if not satrecs:
+            empty = np.empty((0, self.steps))
+            return {"STARLINK_ID": [], "LATITUDE": empty, "LONGITUDE": empty, "HEIGHT_KM": empty}
+
+        errors, positions, _ = SatrecArray(satrecs).sgp4(self.jd, self.fr)
+        latitude, longitude, height = teme_to_geodetic(positions, self.jd, self.fr)
+
+        failed = errors != 0
+        for values in (latitude, longitude, height):
+            values[failed] = np.nan
+
+        return {"STARLINK_ID": satellite_ids, "LATITUDE": latitude, "LONGITUDE": longitude, "HEIGHT_KM": height}
+
+    def records(self, satellites: List[Dict[str, Any]], created_at: str) -> Iterator[Dict[str, Any]]:
+        """Records of the STG_SPACEX_DATA_STARLINK_POSITIONS stream."""
+        positions = self.propagate(satellites)
+        start_time = self.start.isoformat()
+        columns = {
+            column: _json_rows(positions[column])
+            for column in ("LATITUDE", "LONGITUDE", "HEIGHT_KM")
+        }
+
+        for i, satellite_id in enumerate(positions["STARLINK_ID"]):
+            yield {
+                "STARLINK_ID": satellite_id,
+                "START_TIME": start_time,
+                "STEP_SECONDS": self.step_seconds,
+                "STEPS": self.steps,
+                **{column: values[i] for column, values in columns.items()},
+                "CREATED_AT": created_at
+            }
+
+
+def _json_rows(values: np.ndarray) -> List[str]:
+    """One JSON array per row with 4 decimals, NaN written as null."""
+    if len(values) == 0:
+        return []
+    # Serializing the whole matrix at once and splitting it is several times
+    # faster than json.dumps per row
+    matrix = pd.DataFrame(values).to_json(orient="values", double_precision=4)
+    return [f"[{row}]" for row in matrix[2:-2].split("],[")]
@@ -0,0 +1,455 @@
+import singer                               # type: ignore
+import duckdb                               # type: ignore
+import argparse
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from include.launch_costs import LaunchCostEngine
+
+
+LOGGER = singer.get_logger()
+
+# Served resources: staging table and key column
+RESOURCES = {
+    "launches": ("STG_SPACEX_DATA_LAUNCHES", "LAUNCH_ID"),
+    "rockets": ("STG_SPACEX_DATA_ROCKETS", "ROCKET_ID"),
+    "cores": ("STG_SPACEX_DATA_CORES", "CORE_ID"),
+    "starlink": ("STG_SPACEX_DATA_STARLINK", "STARLINK_ID"),
+}
+# Computed from the launches, rockets and payloads with the LaunchCostEngine
+LAUNCH_COSTS_RESOURCE = "launch_costs"
+PAYLOADS_TABLE = "STG_SPACEX_DATA_PAYLOADS"
+
+# Columns left out of the responses: the full API payload and the Singer metadata
+EXCLUDED_COLUMNS = {"RAW_DATA"}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Seconds a connection may stay idle or take to send a request
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _filter_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=_json_default)
+
+
+def _clean(value: Any) -> Any:
+    # NaN is not valid JSON
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class ExtractStore:
+    """
+    In-memory copy of the latest local extract, one list of records per resource.
+
+    The extract is either the DuckDB database the taps load with --target
+    duckdb, or a directory of <STAGING_TABLE>.parquet files. Only the latest
+    version of each key is kept (the latest_record ordering of the dbt
+    models) and deleted rows are dropped. refresh() reloads when the files
+    changed, a database locked by a running load keeps the previous data.
+    """
+
+    def __init__(self, database: Optional[str] = None, schema: str = "STG_SPACEX_DATA",
+                 parquet_dir: Optional[str] = None):
+        if (database is None) == (parquet_dir is None):
+            raise ValueError("Set exactly one of database or parquet_dir")
+        self.database = database
+        self.schema = schema
+        self.parquet_dir = parquet_dir
+        self.version: Optional[float] = None
+        self.records: Dict[str, List[Dict[str, Any]]] = {}
+        self.index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.keys: Dict[str, str] = {}
+
+    def _source_version(self) -> float:
+        if self.database:
+            return os.path.getmtime(self.database)
+        return max(
+            (os.path.getmtime(os.path.join(self.parquet_dir, name))
+             for name in os.listdir(self.parquet_dir) if name.endswith(".parquet")),
+            default=0.0
+        )
+
+    def _relation(self, table: str) -> Optional[str]:
+        if self.database:
+            return f"{self.schema}.{table}"
+        path = os.path.join(self.parquet_dir, f"{table}.parquet")
+        return f"read_parquet('{path}')" if os.path.exists(path) else None
+
+    def _read_table(self, conn, table: str, key: str) -> List[Dict[str, Any]]:
+        relation = self._relation(table)
+        if relation is None:
+            return []
+        try:
+            columns = [row[0] for row in conn.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()]
+        except duckdb.CatalogException:
+            return []
+
+        served = [c for c in columns if c not in EXCLUDED_COLUMNS and not c.upper().startswith("_SDC_")]
+        order = ", ".join(
+            f"{column} DESC NULLS LAST" for column in ("_SDC_TABLE_VERSION", "_SDC_SEQUENCE") if column in columns
+        ) or key
+        deleted = "WHERE _SDC_DELETED_AT IS NULL" if "_SDC_DELETED_AT" in columns else ""
+        # Deleted keys are dropped after picking the latest version, not before
+        query = f"""
+            SELECT {", ".join(f'"{column}"' for column in served)}
+            FROM (
+                SELECT * FROM {relation}
+                QUALIFY row_number() OVER (PARTITION BY {key} ORDER BY {order}) = 1
+            )
+            {deleted}
+            ORDER BY {key}
+        """
+        result = conn.execute(query)
+        names = [d[0] for d in result.description]
+        return [dict(zip(names, map(_clean, row))) for row in result.fetchall()]
+
+    def load(self) -> None:
+        version = self._source_version()
+        conn = duckdb.connect(self.database, read_only=True) if self.database else duckdb.connect()
+        try:
+            records = {
+                resource: self._read_table(conn, table, key)
+                for resource, (table, key) in RESOURCES.items()
+            }
+            payloads = self._read_table(conn, PAYLOADS_TABLE, "PAYLOAD_ID")
+        finally:
+            conn.close()
+
+        keys = {resource: key for resource, (_, key) in RESOURCES.items()}
+        records[LAUNCH_COSTS_RESOURCE] = launch_cost_records(records["launches"], records["rockets"], payloads)
+        keys[LAUNCH_COSTS_RESOURCE] = "launch_id"
+
+        # Swap everything at once, requests never see a half loaded extract
+        self.records, self.keys, self.version = records, keys, version
+        self.index = {
+            resource: {record[keys[resource]]: record for record in resource_records}
+            for resource, resource_records in records.items()
+        }
+        LOGGER.info(f"Loaded extract {self.database or self.parquet_dir}: "
+                    + ", ".join(f"{len(v)} {k}" for k, v in records.items()))
+
+    def refresh(self) -> bool:
+        """Reload when the extract changed, True when it was reloaded."""
+        if self.version is not None and self._source_version() == self.version:
+            return False
+        try:
+            self.load()
+        except duckdb.IOException as e:
+            # Locked by a running load, retried on the next refresh
+            LOGGER.warning(f"Extract not reloaded: {str(e)}")
+            return False
+        return True
+
+
+def launch_cost_records(launches, rockets, payloads) -> List[Dict[str, Any]]:
+    """FCT_LAUNCH_COSTS rows of the extracted launches, one dict per launch."""
+    if not launches:
+        return []
+    engine = LaunchCostEngine.from_records(launches, rockets, payloads)
+    columns = {name: values.tolist() for name, values in engine.compute().items()}
+    columns["rocket_id"] = engine.rocket_ids.tolist()
+    return [
+        {name: _clean(values[i]) for name, values in columns.items()}
+        for i in range(len(engine))
+    ]
+
+
+class ResponseCache:
+    """
+    LRU cache of response bodies with a time to live.
+
+    Entries are keyed on the request path and query and tagged with the
+    extract version, so a reload makes the previous entries miss. Safe to
+    share between the request threads of the server.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class Response:
+    def __init__(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+def _error(status: int, message: str) -> Response:
+    return Response(status, json.dumps({"error": message}).encode(), {"Content-Type": "application/json"})
+
+
+class QueryAPI:
+    """
+    Read-only HTTP API over an ExtractStore:
+
+        GET /                       resources and record counts
+        GET /<resource>             a page of records, ?limit=&offset= and
+                                    equality filters on columns (?ROCKET=...)
+        GET /<resource>/<id>        one record
+
+    Responses carry a strong ETag (md5 of the body) and are kept in a
+    ResponseCache; a request with a matching If-None-Match gets a 304.
+    respond() only touches memory, server() runs it behind the threading
+    HTTP server of the standard library.
+    """
+
+    def __init__(self, store: ExtractStore, cache: Optional[ResponseCache] = None):
+        self.store = store
+        self.cache = cache or ResponseCache()
+
+    def respond(self, method: str, target: str, headers: Optional[Mapping[str, str]] = None) -> Response:
+        if method not in ("GET", "HEAD"):
+            return _error(405, f"Method {method} not allowed")
+
+        cache_key = (self.store.version, target)
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            try:
+                cached = self._render(target)
+            except ValueError as e:
+                return _error(400, str(e))
+            if cached.status == 200:
+                cached.headers["ETag"] = '"' + hashlib.md5(cached.body).hexdigest() + '"'
+                cached.headers["Cache-Control"] = f"max-age={int(self.cache.ttl_seconds)}"
+                self.cache.put(cache_key, cached)
+
+        if_none_match = {
+            tag.strip() for tag in (headers or {}).get("if-none-match", "").split(",") if tag.strip()
+        }
+        etag = cached.headers.get("ETag")
+        if etag and (etag in if_none_match or "*" in if_none_match):
+            return Response(304, b"", {"ETag": etag, "Cache-Control": cached.headers["Cache-Control"]})
+        return cached
+
+    def _render(self, target: str) -> Response:
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = dict(parse_qsl(url.query))
+
+        if not parts:
+            body = {
+                "resources": {
+                    resource: {"count": len(records), "key": self.store.keys[resource]}
+                    for resource, records in self.store.records.items()
+                }
+            }
+            return self._json(body)
+
+        resource = parts[0]
+        if resource not in self.store.records or len(parts) > 2:
+            return _error(404, f"Unknown resource {url.path}")
+
+        if len(parts) == 2:
+            record = self.store.index[resource].get(parts[1])
+            if record is None:
+                return _error(404, f"No {resource} record with key {parts[1]}")
+            return self._json(record)
+
+        return self._json(self._page(resource, url.path, query))
+
+    def _page(self, resource: str, path: str, query: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            limit = int(query.pop("limit", DEFAULT_PAGE_SIZE))
+            offset = int(query.pop("offset", 0))
+        except ValueError:
+            raise ValueError("limit and offset must be integers")
+        if not 0 < limit <= MAX_PAGE_SIZE or offset < 0:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE} and offset positive")
+
+        records = self.store.records[resource]
+        if query:
+            columns = set(records[0]) if records else set()
+            unknown = set(query) - columns
+            if unknown:
+                raise ValueError(f"Unknown filter column(s): {', '.join(sorted(unknown))}")
+            # Compare with the value as written in the JSON response: true, null, 12.5
+            records = [
+                record for record in records
+                if all(_filter_text(record[column]) == value for column, value in query.items())
+            ]
+
+        next_page = None
+        if offset + limit < len(records):
+            next_page = path + "?" + urlencode({**query, "limit": limit, "offset": offset + limit})
+        return {
+            "data": records[offset:offset + limit],
+            "total": len(records),
+            "limit": limit,
+            "offset": offset,
+            "next": next_page,
+        }
+
+    @staticmethod
+    def _json(body: Any) -> Response:
+        return Response(
+            200,
+            json.dumps(body, default=_json_default, separators=(",", ":")).encode(),
+            {"Content-Type": "application/json"}
+        )
+
+    def server(self, host: str = "127.0.0.1", port: int = 8080,
+               timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS) -> ThreadingHTTPServer:
+        """HTTP/1.1 server of the API, one thread per connection, not started."""
+        handler = type("QueryAPIRequestHandler", (_RequestHandler,), {"api": self, "timeout": timeout_seconds})
+        return ThreadingHTTPServer((host, port), handler)
+
+    def refresh_periodically(self, interval_seconds: float, stopped: threading.Event) -> None:
+        while not stopped.wait(interval_seconds):
+            if self.store.refresh():
+                self.cache.clear()
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8080, refresh_seconds: float = 30.0,
+              timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS) -> None:
+        if self.store.version is None:
+            self.store.load()
+        server = self.server(host, port, timeout_seconds)
+        stopped = threading.Event()
+        refresher = threading.Thread(
+            target=self.refresh_periodically, args=(refresh_seconds, stopped), name="extract-refresh", daemon=True
+        )
+        refresher.start()
+        LOGGER.info(f"Serving the SpaceX extract on http://{host}:{port}/")
+        try:
+            server.serve_forever()
+        finally:
+            stopped.set()
+            server.server_close()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of QueryAPI.server(). Connections are kept alive, a request
+    line or headers the parser rejects get a 400 and a connection idle for
+    longer than timeout is closed. The API is read-only: a request with a
+    body gets a 400 and the connection is closed, as the body is not read.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # HTTP/0.9 responses have no status line, a request line without a version is a 400
+    default_request_version = "HTTP/1.0"
+    # The head and the body are written separately, Nagle would hold the body back
+    disable_nagle_algorithm = True
+    api: QueryAPI
+
+    def _handle(self) -> None:
+        if self.headers.get("Transfer-Encoding") or self.headers.get("Content-Length", "0").strip() != "0":
+            self.send_error(400, "Requests with a body are not supported")
+            return
+        try:
+            response = self.api.respond(self.command, self.path, {
+                name.lower(): value for name, value in self.headers.items()
+            })
+        except Exception as e:
+            LOGGER.error(f"Query API error on {self.path}: {str(e)}")
+            response = _error(500, "Internal error")
+        self._send(response)
+
+    def _send(self, response: Response) -> None:
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response.body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(response.body)
+
+    def send_error(self, code: int, message: Optional[str] = None, explain: Optional[str] = None) -> None:
+        """JSON errors like those of the API, the connection is closed after them."""
+        self.close_connection = True
+        self._send(_error(code, message or self.responses.get(code, ("Error",))[0]))
+
+    do_GET = do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        LOGGER.debug("Query API %s - " + format, self.address_string(), *args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the latest local SpaceX extract over HTTP.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--config", help="duckdb connection config of the extract (config_duckdb.json)")
+    source.add_argument("--parquet-dir", help="Directory of <STAGING_TABLE>.parquet files")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-ttl", type=float, default=60.0, help="Seconds a response is cached")
+    parser.add_argument("--cache-size", type=int, default=512, help="Responses kept in the LRU cache")
+    parser.add_argument("--refresh", type=float, default=30.0, help="Seconds between checks for a new extract")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help="Seconds a connection may stay idle or take to send a request")
+    args = parser.parse_args(argv)
+
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+        if config.get("type") != "duckdb":
+            raise ValueError(f"--config requires a duckdb config, got {args.config}")
+        store = ExtractStore(database=config["database"], schema=config.get("schema", "STG_SPACEX_DATA"))
+    else:
+        store = ExtractStore(parquet_dir=args.parquet_dir)
+
+    api = QueryAPI(store, ResponseCache(args.cache_size, args.cache_ttl))
+    api.serve(args.host, args.port, args.refresh, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import singer                               # type: ignore
+import pytz                                 # type: ignore
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Optional, Set
+from snowflake.connector.errors import Error as SnowflakeError          # type: ignore
+from include.schema_registry import register_schema
+
+
+RAW_BLOBS_STREAM = "STG_SPACEX_DATA_RAW_BLOBS"
+
+RAW_BLOBS_SCHEMA = register_schema(
+    stream_name=RAW_BLOBS_STREAM,
+    schema={
+        "type": "object",
+        "properties": {
+            "RAW_DATA_HASH": {
+                "type": ["string"],
+                "description": "SHA-256 of the canonical JSON of the payload"
+            },
+            "STREAM_NAME": {"type": ["string", "null"]},
+            "RAW_DATA": {"type": ["string", "null"]},
+            "CREATED_AT": {"type": ["string", "null"]}
+        }
+    },
+    key_properties=["RAW_DATA_HASH"]
+)
+
+RAW_DATA_STORE_MODES = ("inline", "blob")
+
+
+def raw_data_hash(payload: Any) -> str:
+    """SHA-256 of the payload serialized with sorted keys, stable across key order."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RawDataStore:
+    """
+    Produce the RAW_DATA value of the staging records.
+
+    inline (default) keeps the full JSON payload in RAW_DATA. blob stores the
+    payload hash in RAW_DATA and writes each distinct payload once to the
+    STG_SPACEX_DATA_RAW_BLOBS stream: hashes already in the blob table (previous
+    runs) or emitted earlier in the run are not written again, so unchanged
+    collections only load their hashes.
+    """
+
+    def __init__(self, conn, mode: str = "inline"):
+        if mode not in RAW_DATA_STORE_MODES:
+            raise ValueError(
+                f"Unknown raw_data_store '{mode}'. Expected one of: {', '.join(RAW_DATA_STORE_MODES)}"
+            )
+        self.conn = conn
+        self.mode = mode
+        self.known_hashes: Optional[Set[str]] = None
+        self.created_at = datetime.now(pytz.UTC).isoformat()
+        self.schema_written = False
+        self.blobs_written = 0
+        self.blobs_skipped = 0
+
+    def raw_data(self, stream_name: str, payload: Any) -> str:
+        """Return the RAW_DATA column value of the payload."""
+        if self.mode == "inline":
+            return json.dumps(payload)
+
+        if self.known_hashes is None:
+            self.known_hashes = self._load_known_hashes()
+
+        digest = raw_data_hash(payload)
+        if digest in self.known_hashes:
+            self.blobs_skipped += 1
+            return digest
+
+        if not self.schema_written:
+            singer.write_schema(
+                stream_name=RAW_BLOBS_STREAM,
+                schema=RAW_BLOBS_SCHEMA.schema,
+                key_properties=RAW_BLOBS_SCHEMA.key_properties
+            )
+            self.schema_written = True
+
+        singer.write_record(
+            stream_name=RAW_BLOBS_STREAM,
+            record={
+                "RAW_DATA_HASH": digest,
+                "STREAM_NAME": stream_name,
+                "RAW_DATA": json.dumps(payload),
+                "CREATED_AT": self.created_at
+            }
+        )
+        self.known_hashes.add(digest)
+        self.blobs_written += 1
+        return digest
+
+    def _load_known_hashes(self) -> Set[str]:
+        """Hashes already stored by previous runs, empty when the table cannot be read."""
+        if not self.conn:
+            return set()
+
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(f"SELECT RAW_DATA_HASH FROM {RAW_BLOBS_STREAM}")
+            return {row[0] for row in cursor.fetchall()}
+        except SnowflakeError as e:
+            singer.get_logger().warning(
+                f"Could not read {RAW_BLOBS_STREAM}, every payload will be written: {str(e)}"
+            )
+            return set()
+        finally:
+            if cursor:
+                cursor.close()
@@ -0,0 +1,236 @@
+import numpy as np                          # type: ignore
+import io
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from include.tombstones import is_delete_marker
+
+
+# Node type and key of each stream, with the columns holding the IDs of
+# related nodes: (related type, column, key of the item when the column
+# holds objects such as launch.cores[].core)
+STREAM_RELATIONS: Dict[str, Tuple[str, str, List[Tuple[str, str, Optional[str]]]]] = {
+    "STG_SPACEX_DATA_LAUNCHES": ("launch", "LAUNCH_ID", [
+        ("core", "CORES", "core"),
+        ("payload", "PAYLOADS", None),
+        ("crew", "CREW", "crew"),
+        ("ship", "SHIPS", None),
+        ("capsule", "CAPSULES", None),
+    ]),
+    "STG_SPACEX_DATA_CORES": ("core", "CORE_ID", [("launch", "LAUNCHES", None)]),
+    "STG_SPACEX_DATA_CREW": ("crew", "CREW_ID", [("launch", "LAUNCHES", None)]),
+    "STG_SPACEX_DATA_SHIPS": ("ship", "SHIP_ID", [("launch", "LAUNCHES", None)]),
+    "STG_SPACEX_DATA_CAPSULES": ("capsule", "CAPSULE_ID", [("launch", "LAUNCHES", None)]),
+    "STG_SPACEX_DATA_PAYLOADS": ("payload", "PAYLOAD_ID", [("launch", "LAUNCH", None)]),
+}
+
+
+class RelationshipGraphBuilder:
+    """
+    Collect the relationships between launches, cores, payloads, crew, ships
+    and capsules from the records of the taps.
+
+    Node IDs are interned to consecutive integers per node type and edges
+    kept as integer pairs, the same relationship seen from both sides (e.g.
+    launch.cores and core.launches) is stored once. The nodes of the delete
+    markers of a stream are left out with their edges. build() freezes them
+    into a RelationshipGraph.
+    """
+
+    def __init__(self):
+        self.node_ids: Dict[str, List[str]] = {}
+        self.node_index: Dict[str, Dict[str, int]] = {}
+        self.edges: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        self.deleted: Dict[str, Set[str]] = {}
+
+    def node(self, node_type: str, node_id: str) -> int:
+        index = self.node_index.setdefault(node_type, {})
+        position = index.get(node_id)
+        if position is None:
+            ids = self.node_ids.setdefault(node_type, [])
+            position = index[node_id] = len(ids)
+            ids.append(node_id)
+        return position
+
+    def add_edge(self, type_a: str, id_a: str, type_b: str, id_b: str) -> None:
+        # One orientation per pair of types, by name
+        if type_b < type_a:
+            type_a, id_a, type_b, id_b = type_b, id_b, type_a, id_a
+        self.edges.setdefault((type_a, type_b), []).append(
+            (self.node(type_a, id_a), self.node(type_b, id_b))
+        )
+
+    def add_record(self, stream_name: str, record: Dict[str, Any]) -> None:
+        """Add the relationships of a record of one of the STREAM_RELATIONS streams."""
+        relations = STREAM_RELATIONS.get(stream_name)
+        if relations is None or record.get(relations[1]) is None:
+            return
+        node_type, key, related = relations
+        node_id = record[key]
+        if is_delete_marker(record, [key]):
+            self.deleted.setdefault(node_type, set()).add(node_id)
+            return
+        self.node(node_type, node_id)
+
+        for related_type, column, item_key in related:
+            value = record.get(column)
+            if isinstance(value, str):
+                value = json.loads(value) if value.startswith("[") else [value]
+            for item in value or []:
+                related_id = item.get(item_key) if isinstance(item, dict) else item
+                if related_id is not None:
+                    self.add_edge(node_type, node_id, related_type, related_id)
+
+    def build(self) -> "RelationshipGraph":
+        node_ids = {}
+        # New position of each interned node, -1 for the deleted ones
+        positions = {}
+        for node_type, ids in self.node_ids.items():
+            deleted = self.deleted.get(node_type, set())
+            kept = np.array([node_id not in deleted for node_id in ids], dtype=bool)
+            node_ids[node_type] = np.array(ids, dtype=str)[kept]
+            positions[node_type] = np.where(kept, np.cumsum(kept) - 1, -1).astype(np.int32)
+        adjacency = {}
+        for (type_a, type_b), pairs in self.edges.items():
+            edges = np.array(pairs, dtype=np.int32)
+            edges = np.stack([positions[type_a][edges[:, 0]], positions[type_b][edges[:, 1]]], axis=1)
+            edges = np.unique(edges[(edges >= 0).all(axis=1)], axis=0)
+            adjacency[(type_a, type_b)] = _csr(edges[:, 0], edges[:, 1], len(node_ids[type_a]))
+            adjacency[(type_b, type_a)] = _csr(edges[:, 1], edges[:, 0], len(node_ids[type_b]))
+        return RelationshipGraph(node_ids, adjacency)
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, node_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Compressed adjacency: the neighbours of node i are indices[indptr[i]:indptr[i + 1]]."""
+    order = np.lexsort((targets, sources))
+    indptr = np.zeros(node_count + 1, dtype=np.int32)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+    return indptr, targets[order].astype(np.int32)
+
+
+class RelationshipGraph:
+    """
+    Read-only graph of the relationships between the SpaceX entities.
+
+    Each node type holds its IDs in one array (position = integer ID) and
+    each direction of a relationship two int32 arrays in compressed sparse
+    row form, so a traversal step is a dict lookup and an array slice. The
+    graph is saved to and loaded from a single .npz file.
+    """
+
+    def __init__(
+        self,
+        node_ids: Dict[str, np.ndarray],
+        adjacency: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]]
+    ):
+        self.node_ids = node_ids
+        self.adjacency = adjacency
+        self.node_index = {
+            node_type: {node_id: i for i, node_id in enumerate(ids.tolist())}
+            for node_type, ids in node_ids.items()
+        }
+        # Python copies of the ID and offset arrays, indexing numpy scalars one at a
+        # time costs more than the traversal itself
+        self._id_lists = {node_type: ids.tolist() for node_type, ids in node_ids.items()}
+        self._offsets = {relation: indptr.tolist() for relation, (indptr, _) in adjacency.items()}
+
+    def node_counts(self) -> Dict[str, int]:
+        return {node_type: len(ids) for node_type, ids in self.node_ids.items()}
+
+    def neighbors(self, node_type: str, node_id: str, related_type: str) -> List[str]:
+        """IDs of the related_type nodes linked to a node, empty when unknown."""
+        position = self.node_index.get(node_type, {}).get(node_id)
+        relation = self.adjacency.get((node_type, related_type))
+        if position is None or relation is None:
+            return []
+        offsets = self._offsets[(node_type, related_type)]
+        ids = self._id_lists[related_type]
+        return [ids[i] for i in relation[1][offsets[position]:offsets[position + 1]].tolist()]
+
+    def launch_details(self, launch_id: str) -> Dict[str, List[str]]:
+        """Cores, payloads, crew, ships and capsules of a launch."""
+        return {
+            related_type: self.neighbors("launch", launch_id, related_type)
+            for related_type in ("core", "payload", "crew", "ship", "capsule")
+        }
+
+    def launches_of(self, node_type: str, node_id: str) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Launches of a core, crew member, ship, capsule or payload with their
+        details, e.g. every launch a core flew with its payloads and
+        recovery ships.
+        """
+        return {
+            launch_id: self.launch_details(launch_id)
+            for launch_id in self.neighbors(node_type, node_id, "launch")
+        }
+
+    def save(self, path: str) -> None:
+        arrays = {f"nodes__{node_type}": ids for node_type, ids in self.node_ids.items()}
+        for (type_a, type_b), (indptr, indices) in self.adjacency.items():
+            arrays[f"indptr__{type_a}__{type_b}"] = indptr
+            arrays[f"indices__{type_a}__{type_b}"] = indices
+        # np.savez adds .npz to bare paths, write through a file object instead
+        with io.open(path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "RelationshipGraph":
+        node_ids: Dict[str, np.ndarray] = {}
+        adjacency: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        with np.load(path, allow_pickle=False) as arrays:
+            for name in arrays.files:
+                kind, *types = name.split("__")
+                if kind == "nodes":
+                    node_ids[types[0]] = arrays[name]
+                elif kind == "indptr":
+                    relation = (types[0], types[1])
+                    adjacency[relation] = (arrays[name], arrays[f"indices__{types[0]}__{types[1]}"])
+        return cls(node_ids, adjacency)
+
+    @classmethod
+    def from_records(cls, streams: Iterable[Tuple[str, Dict[str, Any]]]) -> "RelationshipGraph":
+        """Graph of (stream_name, record) pairs."""
+        builder = RelationshipGraphBuilder()
+        for stream_name, record in streams:
+            builder.add_record(stream_name, record)
+        return builder.build()
+
+
+class RelationshipGraphTee:
+    """
+    File-like object wrapping the output of the taps (sys.stdout or a
+    SingerMessageSink) that passes every Singer message through and adds the
+    RECORD messages of the STREAM_RELATIONS streams to a graph builder, so
+    the graph is built during extraction.
+    """
+
+    def __init__(self, output, builder: Optional[RelationshipGraphBuilder] = None):
+        self.output = output
+        self.builder = builder or RelationshipGraphBuilder()
+        self._pending = ""
+
+    def write(self, text: str) -> int:
+        self.output.write(text)
+        self._pending += text
+        if "\n" in text:
+            *lines, self._pending = self._pending.split("\n")
+            for line in lines:
+                self._add_line(line)
+        return len(text)
+
+    def flush(self) -> None:
+        self.output.flush()
+
+    def _add_line(self, line: str) -> None:
+        # Only decode the records of the streams holding relationships
+        if '"RECORD"' not in line or not any(stream in line for stream in STREAM_RELATIONS):
+            return
+        message = json.loads(line)
+        if message.get("type") == "RECORD":
+            self.builder.add_record(message["stream"], message["record"])
+
+    def build(self) -> RelationshipGraph:
+        if self._pending:
+            self._add_line(self._pending)
+            self._pending = ""
+        return self.builder.build()
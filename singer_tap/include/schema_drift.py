@@ -0,0 +1,91 @@
+from typing import Any, Dict, List
+from include.schema_registry import StreamSchema
+
+
+class _PathNode:
+    """Node of the key path trie, one per key seen under its parent."""
+
+    __slots__ = ("children", "leaf", "seen")
+
+    def __init__(self, leaf: bool = False):
+        self.children: Dict[str, "_PathNode"] = {}
+        # Nothing below a leaf is looked at: mapped subtrees (stored as JSON
+        # columns) and paths already reported as unmapped
+        self.leaf = leaf
+        self.seen = 0
+
+
+class SchemaDriftDetector:
+    """
+    Compare the key paths of the API payloads of a stream with its mapping.
+
+    The trie starts with the source_paths declared with the stream schema.
+    Each payload is walked against it and an unknown key becomes a new leaf,
+    so it is reported once and costs a single dict lookup on the next
+    records. Walking stops at mapped leaves, a payload costs about one
+    lookup per top-level key. List items are walked under the list key.
+    """
+
+    def __init__(self, stream_schema: StreamSchema):
+        self.stream_name = stream_schema.stream_name
+        self.source_paths = list(stream_schema.source_paths or [])
+        self.records_seen = 0
+        self.root = _PathNode()
+        self.unmapped: Dict[str, _PathNode] = {}
+
+        for path in self.source_paths:
+            node = self.root
+            for key in path.split("."):
+                node = node.children.setdefault(key, _PathNode())
+            node.leaf = True
+
+    def track(self, payload: Any) -> None:
+        """Record the key paths of one API payload."""
+        self.records_seen += 1
+        self._walk(self.root, payload, "")
+
+    def _walk(self, node: _PathNode, value: Any, prefix: str) -> None:
+        if isinstance(value, dict):
+            children = node.children
+            for key, child_value in value.items():
+                child = children.get(key)
+                if child is None:
+                    child = children[key] = _PathNode(leaf=True)
+                    self.unmapped[prefix + key] = child
+                child.seen += 1
+                if not child.leaf:
+                    self._walk(child, child_value, prefix + key + ".")
+        elif isinstance(value, list):
+            for item in value:
+                self._walk(node, item, prefix)
+
+    def missing_paths(self) -> List[str]:
+        """Declared source paths absent from every payload of the run."""
+        return [
+            path for path in self.source_paths
+            if not self._node(path).seen
+        ]
+
+    def _node(self, path: str) -> _PathNode:
+        node = self.root
+        for key in path.split("."):
+            node = node.children[key]
+        return node
+
+    def has_drift(self) -> bool:
+        return bool(self.unmapped) or (self.records_seen > 0 and bool(self.missing_paths()))
+
+    def report(self) -> Dict:
+        """
+        Compact drift report of the run.
+
+        unmapped_paths counts the payloads carrying each key the transform
+        drops, missing_paths lists the mapped keys no payload carried
+        (removed or renamed upstream).
+        """
+        return {
+            "stream": self.stream_name,
+            "records": self.records_seen,
+            "unmapped_paths": {path: node.seen for path, node in sorted(self.unmapped.items())},
+            "missing_paths": self.missing_paths() if self.records_seen else [],
+        }
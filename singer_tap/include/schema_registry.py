@@ -0,0 +1,120 @@
+from typing import Callable, Dict, List, Optional, Type
+from include.compact_records import CompactRecord, record_class
+
+try:
+    import fastjsonschema                   # type: ignore
+except ImportError:                         # pragma: no cover - fallback to jsonschema
+    fastjsonschema = None
+
+
+class SchemaValidationError(ValueError):
+    """Raised when a record does not match the schema of its stream."""
+
+
+class StreamSchema:
+    """
+    Schema and key properties of a Singer stream.
+
+    source_paths lists the dotted API payload keys the transform maps to
+    columns, a key stored as a JSON column covers everything below it.
+
+    The validator is compiled on first use and reused for every record:
+    fastjsonschema generates a plain Python function from the schema, the
+    jsonschema validator shipped with singer-python is used when it is not
+    installed. Formats are not checked, the load target casts the values.
+    """
+
+    def __init__(self, stream_name: str, schema: Dict, key_properties: List[str],
+                 source_paths: Optional[List[str]] = None):
+        self.stream_name = stream_name
+        self.schema = schema
+        self.key_properties = key_properties
+        self.source_paths = source_paths
+        self._validator: Optional[Callable[[Dict], None]] = None
+
+    @property
+    def record_class(self) -> Type[CompactRecord]:
+        """Slotted record class with one slot per schema property."""
+        return record_class(self.stream_name, list(self.schema.get("properties", {})))
+
+    @property
+    def validator(self) -> Callable[[Dict], None]:
+        if self._validator is None:
+            self._validator = self._compile()
+        return self._validator
+
+    def _compile(self) -> Callable[[Dict], None]:
+        if fastjsonschema is not None:
+            compiled = fastjsonschema.compile(self.schema, use_formats=False)
+
+            def validate(record: Dict) -> None:
+                try:
+                    compiled(record)
+                except fastjsonschema.JsonSchemaException as e:
+                    raise SchemaValidationError(f"{self.stream_name}: {e.message}") from e
+
+            return validate
+
+        from jsonschema import Draft4Validator      # type: ignore
+        compiled = Draft4Validator(self.schema)
+
+        def validate(record: Dict) -> None:
+            error = next(compiled.iter_errors(record), None)
+            if error is not None:
+                raise SchemaValidationError(f"{self.stream_name}: {error.message}")
+
+        return validate
+
+    def validate(self, record: Dict) -> None:
+        """Raise SchemaValidationError if the record does not match the schema."""
+        if isinstance(record, CompactRecord):
+            record = record.to_dict()
+        self.validator(record)
+
+
+# Stream schemas keyed on the stream name, filled when the fetch_* modules are imported
+SCHEMAS: Dict[str, StreamSchema] = {}
+
+
+def register_schema(stream_name: str, schema: Dict, key_properties: List[str],
+                    source_paths: Optional[List[str]] = None) -> StreamSchema:
+    """Register the schema of a stream and return its StreamSchema."""
+    stream_schema = StreamSchema(stream_name, schema, key_properties, source_paths)
+    SCHEMAS[stream_name] = stream_schema
+    return stream_schema
+
+
+def get_schema(stream_name: str) -> StreamSchema:
+    """Return the registered schema of a stream."""
+    try:
+        return SCHEMAS[stream_name]
+    except KeyError:
+        raise ValueError(f"No schema registered for stream '{stream_name}'")
+
+
+class RecordValidator:
+    """
+    Validate a sample of the records of a stream.
+
+    sample_rate is the share of records checked: 0 disables validation,
+    1 checks every record and 0.01 checks the 1st, 101st, 201st... record.
+    Sampling is deterministic so a rerun on the same data checks the same records.
+    """
+
+    def __init__(self, stream_schema: StreamSchema, sample_rate: float = 0):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"validation_sample_rate must be between 0 and 1, got {sample_rate}")
+
+        self.stream_schema = stream_schema
+        self.interval = round(1 / sample_rate) if sample_rate else 0
+        self.records_seen = 0
+        self.records_validated = 0
+
+    def validate(self, record: Dict) -> None:
+        """Validate the record when it falls in the sample."""
+        self.records_seen += 1
+        if not self.interval or (self.records_seen - 1) % self.interval:
+            return
+
+        self.records_validated += 1
+        self.stream_schema.validate(record)
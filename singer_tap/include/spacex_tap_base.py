@@ -1,10 +1,15 @@
 import singer                               # type: ignore                                
-import snowflake.connector                  # type: ignore
+import requests                             # type: ignore
 import json
 import pytz                                 # type: ignore
 from datetime import datetime
-from typing import Dict, Any
-from snowflake.connector.errors import DatabaseError, Error as SnowflakeError          # type: ignore
+from typing import Dict, Any, Iterable, Optional
+from snowflake.connector.errors import Error as SnowflakeError          # type: ignore
+from include.connections import get_connection_factory
+from include.raw_data_store import RawDataStore
+from include.schema_drift import SchemaDriftDetector
+from include.schema_registry import RecordValidator, StreamSchema
+from include.tracing import Tracer, get_tracer
 
 
 
@@ -13,6 +18,16 @@ class SpaceXTapBase:
         self.base_url = base_url
         self.snowflake_config = self._load_config(config_path)
         self.conn = self._create_snowflake_connection()
+        self.record_validators: Dict[str, RecordValidator] = {}
+        self.drift_detectors: Dict[str, SchemaDriftDetector] = {}
+        self.raw_data_store = RawDataStore(self.conn, self.snowflake_config.get('raw_data_store', 'inline'))
+        key_set_dir = self.snowflake_config.get('key_set_dir')
+        self.key_set_store = None
+        if key_set_dir:
+            # numpy is only needed with tombstones enabled
+            from include.tombstones import KeySetStore
+
+            self.key_set_store = KeySetStore(key_set_dir)
     
     def get_current_time(self):
         """
@@ -29,35 +44,108 @@ class SpaceXTapBase:
     def _create_snowflake_connection(self):
         """
         Create Snowflake connection.
+
+        The connection is built by the factory registered for the config "type"
+        (snowflake, duckdb or stand_in), see include.connections.
         """
-        
-        try:
-        # Establish connection
-            conn = snowflake.connector.connect(
-                user=self.snowflake_config['user'],
-                password=self.snowflake_config['password'],
-                account=self.snowflake_config['account'],
-                warehouse=self.snowflake_config['warehouse'],
-                database=self.snowflake_config['database'],
-                schema=self.snowflake_config['schema'],
-                ocsp_response_cache_filename=None,
-                validate_default_parameters=True
-            )
-            
-            # Test connection with a simple query
-            cursor = conn.cursor()
-            cursor.execute('SELECT current_version()')
-            version = cursor.fetchone()[0]
-            
-            return conn if version is not None else conn.close()
-        
-        except DatabaseError as e:
-            print(f"Failed to connect to Snowflake. Error: {str(e)}")
-            return False
-        
+        factory = get_connection_factory(self.snowflake_config)
+        return factory(self.snowflake_config)
+
+    @property
+    def tracer(self) -> Tracer:
+        """Tracer of the run, a disabled one unless the runner installed one (see include.tracing)."""
+        return get_tracer()
+
+    def fetch_json(self, stream_name: str, endpoint: str, page: int = 1) -> Any:
+        """
+        GET an endpoint of the API and decode its JSON payload, traced as the
+        http.fetch and json.parse spans of the stream.
+        """
+        url = self.base_url + endpoint
+        with self.tracer.span("http.fetch", stream=stream_name, url=url, page=page) as span:
+            response = requests.get(url)
+            span.set_attribute("http.status_code", response.status_code)
+            response.raise_for_status()
+        with self.tracer.span("json.parse", stream=stream_name, page=page) as span:
+            data = response.json()
+            span.set_attribute("records", len(data) if isinstance(data, list) else 1)
+        return data
+
+    def raw_data(self, stream_name: str, payload: Any) -> str:
+        """
+        RAW_DATA value of a record: the JSON payload, or its hash when the
+        config sets raw_data_store to blob (see include.raw_data_store).
+        """
+        return self.raw_data_store.raw_data(stream_name, payload)
+
+    def validate_record(self, stream_schema: StreamSchema, record: Dict) -> None:
+        """
+        Validate a sample of the stream records against the registered schema.
+
+        Disabled unless the config sets validation_sample_rate (0 to 1).
+        Raises SchemaValidationError for an invalid record.
+        """
+        validator = self.record_validators.get(stream_schema.stream_name)
+        if validator is None:
+            sample_rate = self.snowflake_config.get('validation_sample_rate', 0)
+            validator = RecordValidator(stream_schema, sample_rate)
+            self.record_validators[stream_schema.stream_name] = validator
+        validator.validate(record)
+
+    def track_schema_drift(self, stream_schema: StreamSchema, payload: Dict) -> None:
+        """
+        Record the key paths of an API payload for the drift report of the run.
+
+        Enabled unless the config sets detect_schema_drift to false.
+        """
+        if not self.snowflake_config.get('detect_schema_drift', True):
+            return
+        detector = self.drift_detectors.get(stream_schema.stream_name)
+        if detector is None:
+            detector = SchemaDriftDetector(stream_schema)
+            self.drift_detectors[stream_schema.stream_name] = detector
+        detector.track(payload)
+
+    def log_schema_drift(self, stream_schema: StreamSchema) -> Optional[Dict]:
+        """Log the drift report of the stream if the payloads drifted from the mapping."""
+        detector = self.drift_detectors.pop(stream_schema.stream_name, None)
+        if detector is None:
+            return None
+        report = detector.report()
+        if detector.has_drift():
+            singer.get_logger().warning(f"Schema drift detected: {json.dumps(report)}")
+        return report
+
+    def write_tombstones(self, stream_schema: StreamSchema, keys: Iterable, deleted_at: datetime) -> int:
+        """
+        Mark the records whose keys disappeared from the API since the previous
+        run as deleted (see include.tombstones).
+
+        Disabled unless the config sets key_set_dir, which the runner only
+        accepts with --target duckdb and whose key sets it commits after the
+        load. keys must be the complete key set of the stream, so call it once
+        the whole collection is written.
+        """
+        if self.key_set_store is None:
+            return 0
+        from include.tombstones import write_delete_markers
+
+        [key_property] = stream_schema.key_properties
+        return write_delete_markers(
+            self.key_set_store, stream_schema.stream_name, key_property, keys, deleted_at
+        )
 
     def log_error(self, table_name: str, error_message: str, error_data: Dict = None):
         """Log error to Snowflake STG_SPACEX_DATA_LOAD_ERRORS table."""
+        with self.tracer.span("error.log", stream=table_name, error_message=str(error_message)):
+            self._log_error(table_name, error_message, error_data)
+
+    def _log_error(self, table_name: str, error_message: str, error_data: Dict = None):
+        if not self.conn:
+            singer.get_logger().error(f"No connection to log error for {table_name}: {error_message}")
+            return
+
+        cursor = None
         try:
             cursor = self.conn.cursor()
             error_time = datetime.now(pytz.UTC).isoformat()
@@ -92,7 +180,8 @@ class SpaceXTapBase:
         except SnowflakeError as e:
             singer.get_logger().error(f"Error logging to STG_SPACEX_DATA_LOAD_ERRORS table: {str(e)}")
         finally:
-            cursor.close()
+            if cursor:
+                cursor.close()
 
     def close_connection(self):
         """Close Snowflake connection."""
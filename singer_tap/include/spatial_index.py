@@ -0,0 +1,169 @@
+import numpy as np                          # type: ignore
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Key and kind of the records of each stream, the positions are their
+# LATITUDE / LONGITUDE columns
+STREAM_KEYS = {
+    "launchpad": "LAUNCHPAD_ID",
+    "landpad": "LANDPAD_ID",
+    "starlink": "STARLINK_ID",
+}
+
+
+def unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere, shape (n, 3)."""
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def great_circle_km(vectors: np.ndarray, point: np.ndarray) -> np.ndarray:
+    """Distances along the surface from point to each of the unit vectors."""
+    return EARTH_RADIUS_KM * np.arccos(np.clip(vectors @ point, -1.0, 1.0))
+
+
+class SphericalGridIndex:
+    """
+    Spatial index of points on the Earth for radius and nearest-neighbour queries.
+
+    Points are stored as unit vectors and bucketed in a regular 3D grid of
+    cubes of cell_km (chord length), which has no seam at the antimeridian
+    and no crowding at the poles, unlike a latitude/longitude grid. The
+    points are sorted by cell key, so the cells of the box around a query
+    are found by binary search as contiguous slices of the arrays; the exact
+    great-circle distance is only computed for the points in those slices.
+    """
+
+    def __init__(
+        self,
+        ids: Iterable[str],
+        latitudes: Iterable[float],
+        longitudes: Iterable[float],
+        kinds: Optional[Iterable[str]] = None,
+        cell_km: float = 200.0
+    ):
+        if cell_km <= 0:
+            raise ValueError("cell_km must be positive")
+        ids = np.asarray(list(ids), dtype=object)
+        kinds = np.asarray(list(kinds) if kinds is not None else [""] * len(ids), dtype=object)
+        latitudes = np.asarray(list(latitudes), dtype=np.float64)
+        longitudes = np.asarray(list(longitudes), dtype=np.float64)
+
+        # Points without a position cannot be indexed
+        located = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        vectors = unit_vectors(latitudes[located], longitudes[located])
+
+        self.cell_size = cell_km / EARTH_RADIUS_KM
+        # Cells along an axis, coordinates run from -1 to 1
+        self.cells_per_axis = 2 * int(np.ceil(1 / self.cell_size)) + 1
+        keys = self._cell_keys(self._cells(vectors))
+        order = np.argsort(keys, kind="stable")
+
+        self.ids = ids[located][order]
+        self.kinds = kinds[located][order]
+        self.vectors = vectors[order]
+        self.keys = keys[order]
+        self.position = {point_id: i for i, point_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_records(cls, cell_km: float = 200.0, **streams: Iterable[Dict[str, Any]]) -> "SphericalGridIndex":
+        """
+        Index the records written by the taps, by stream kind:
+
+            SphericalGridIndex.from_records(launchpad=..., landpad=..., starlink=...)
+        """
+        ids: List[str] = []
+        kinds: List[str] = []
+        latitudes: List[Optional[float]] = []
+        longitudes: List[Optional[float]] = []
+        for kind, records in streams.items():
+            if kind not in STREAM_KEYS:
+                raise ValueError(f"Unknown stream kind '{kind}'. Expected one of: {', '.join(STREAM_KEYS)}")
+            key = STREAM_KEYS[kind]
+            for record in records:
+                ids.append(record[key])
+                kinds.append(kind)
+                latitudes.append(record.get("LATITUDE"))
+                longitudes.append(record.get("LONGITUDE"))
+        return cls(
+            ids,
+            np.array(latitudes, dtype=np.float64),
+            np.array(longitudes, dtype=np.float64),
+            kinds,
+            cell_km
+        )
+
+    def location(self, point_id: str) -> Tuple[float, float]:
+        """Latitude and longitude of an indexed point."""
+        x, y, z = self.vectors[self.position[point_id]]
+        return float(np.degrees(np.arcsin(z))), float(np.degrees(np.arctan2(y, x)))
+
+    def within(
+        self, latitude: float, longitude: float, radius_km: float, kind: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """(id, distance_km) of the points within radius_km, nearest first."""
+        point = unit_vectors([latitude], [longitude])[0]
+        candidates = self._candidates(point, radius_km)
+        if kind is not None:
+            candidates = candidates[self.kinds[candidates] == kind]
+        distances = great_circle_km(self.vectors[candidates], point)
+        inside = distances <= radius_km
+        return self._sorted(candidates[inside], distances[inside])
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int = 1, kind: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """(id, distance_km) of the k nearest points."""
+        radius_km = self.cell_size * EARTH_RADIUS_KM
+        while True:
+            # Grow the search until k points lie within the searched radius,
+            # the whole sphere is covered at half the circumference
+            found = self.within(latitude, longitude, radius_km, kind)
+            if len(found) >= k or radius_km >= np.pi * EARTH_RADIUS_KM:
+                return found[:k]
+            radius_km *= 2
+
+    def _cells(self, vectors: np.ndarray) -> np.ndarray:
+        """Integer cell coordinates of the vectors, from 0 on each axis."""
+        return np.floor(vectors / self.cell_size).astype(np.int64) + self.cells_per_axis // 2
+
+    def _cell_keys(self, cells: np.ndarray) -> np.ndarray:
+        # z varies fastest, so the cells of one (x, y) column are contiguous
+        return (cells[..., 0] * self.cells_per_axis + cells[..., 1]) * self.cells_per_axis + cells[..., 2]
+
+    def _candidates(self, point: np.ndarray, radius_km: float) -> np.ndarray:
+        """Positions of the points in the cells within the search chord."""
+        if radius_km >= np.pi * EARTH_RADIUS_KM:
+            return np.arange(len(self.ids))
+
+        chord = 2 * np.sin(radius_km / (2 * EARTH_RADIUS_KM))
+        low = np.maximum(self._cells(point - chord), 0)
+        high = np.minimum(self._cells(point + chord), self.cells_per_axis - 1)
+
+        # One key range per (x, y) column of the box, found by binary search
+        column = np.add.outer(
+            np.arange(low[0], high[0] + 1) * self.cells_per_axis,
+            np.arange(low[1], high[1] + 1)
+        ).ravel() * self.cells_per_axis
+        starts = np.searchsorted(self.keys, column + low[2], side="left")
+        ends = np.searchsorted(self.keys, column + high[2], side="right")
+
+        # Concatenate the ranges start..end without a Python loop
+        lengths = ends - starts
+        nonempty = lengths > 0
+        starts, lengths = starts[nonempty], lengths[nonempty]
+        if not len(lengths):
+            return np.empty(0, dtype=np.int64)
+        offsets = np.cumsum(lengths) - lengths
+        return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+    def _sorted(self, positions: np.ndarray, distances: np.ndarray) -> List[Tuple[str, float]]:
+        order = np.argsort(distances, kind="stable")
+        return [(self.ids[i], float(d)) for i, d in zip(positions[order], distances[order])]
@@ -0,0 +1,125 @@
+import numpy as np                          # type: ignore
+import singer                               # type: ignore
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+
+LOGGER = singer.get_logger()
+
+DELETED_AT_PROPERTY = "_sdc_deleted_at"
+PENDING_SUFFIX = ".pending"
+
+
+def is_delete_marker(record: Dict[str, Any], key_properties: Iterable[str]) -> bool:
+    """True for a delete marker: a record holding only the key properties and _sdc_deleted_at."""
+    return record.get(DELETED_AT_PROPERTY) is not None and set(record) <= {*key_properties, DELETED_AT_PROPERTY}
+
+
+def key_array(keys: Iterable) -> np.ndarray:
+    """Sorted keys of a stream as fixed-width UTF-8 bytes (24 bytes per API id)."""
+    encoded = [str(key).encode("utf-8") for key in keys if key is not None]
+    return np.sort(np.array(encoded, dtype=bytes)) if encoded else np.array([], dtype="S1")
+
+
+def vanished_keys(previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """Keys of the previous run missing from the current one, by binary search of the sorted arrays."""
+    if not len(current):
+        return previous
+    positions = np.searchsorted(current, previous)
+    # Keys past the last current key are compared with the first one, never equal
+    positions[positions == len(current)] = 0
+    return previous[current[positions] != previous]
+
+
+class KeySetStore:
+    """
+    Key sets of the full-collection streams kept between runs, one sorted
+    array per stream in <directory>/<STREAM>.npy (about 1 MB for the 44,000
+    Starlink ids), so the keys removed from the API can be found by diffing
+    the keys of a run with those of the previous one.
+
+    The taps stage the key sets of a run in <STREAM>.npy.pending files, the
+    runner commits them once the target has loaded the delete markers, so a
+    failed run is diffed again against the same previous keys.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, stream_name: str) -> str:
+        return os.path.join(self.directory, stream_name + ".npy")
+
+    def load(self, stream_name: str) -> Optional[np.ndarray]:
+        """Keys of the previous run, None before the first one."""
+        path = self._path(stream_name)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, allow_pickle=False)
+
+    def _write(self, path: str, keys: np.ndarray) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        # np.save appends .npy to a name without it
+        with open(path + ".tmp", "wb") as f:
+            np.save(f, keys, allow_pickle=False)
+        os.replace(path + ".tmp", path)
+
+    def save(self, stream_name: str, keys: np.ndarray) -> None:
+        self._write(self._path(stream_name), keys)
+
+    def stage(self, stream_name: str, keys: np.ndarray) -> None:
+        """Keep keys for the next run once commit() is called."""
+        self._write(self._path(stream_name) + PENDING_SUFFIX, keys)
+
+    def _pending_paths(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(PENDING_SUFFIX)
+        )
+
+    def commit(self) -> List[str]:
+        """Replace the key sets of the previous run with the staged ones, returns their streams."""
+        streams = []
+        for pending_path in self._pending_paths():
+            path = pending_path[:-len(PENDING_SUFFIX)]
+            os.replace(pending_path, path)
+            streams.append(os.path.basename(path)[:-len(".npy")])
+        return streams
+
+    def discard(self) -> None:
+        """Drop the key sets staged by a run that did not complete."""
+        for pending_path in self._pending_paths():
+            os.remove(pending_path)
+
+
+def write_delete_markers(store: KeySetStore, stream_name: str, key_property: str,
+                         keys: Iterable, deleted_at: datetime) -> int:
+    """
+    Write a delete marker for each key of the previous run missing from keys,
+    the complete key set of the stream in this run, and stage keys for the
+    next run. A marker is a RECORD with the key and _sdc_deleted_at, which
+    DuckDBTarget loads into _SDC_DELETED_AT of the existing row. Returns the
+    number of markers.
+
+    An empty key set after a non-empty one is taken for an API failure: no
+    markers are written and the previous keys are kept.
+    """
+    current = key_array(keys)
+    previous = store.load(stream_name)
+    if previous is not None and len(previous) and not len(current):
+        LOGGER.warning(f"No keys for {stream_name}, skipping tombstones of its {len(previous)} previous keys")
+        return 0
+
+    vanished = vanished_keys(previous, current) if previous is not None else current[:0]
+    deleted_at_str = deleted_at.isoformat()
+    for key in vanished:
+        singer.write_record(
+            stream_name=stream_name,
+            record={key_property: key.decode("utf-8"), DELETED_AT_PROPERTY: deleted_at_str},
+            time_extracted=deleted_at
+        )
+    store.stage(stream_name, current)
+    if len(vanished):
+        LOGGER.info(f"Marked {len(vanished)} records of {stream_name} deleted")
+    return len(vanished)
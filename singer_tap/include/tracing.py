@@ -0,0 +1,289 @@
+import singer                               # type: ignore
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+import requests                             # type: ignore
+
+
+LOGGER = singer.get_logger()
+
+SERVICE_NAME = "tap-spacex"
+SCOPE_NAME = "include.tracing"
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_ERROR = 2
+
+# Spans whose name starts with these are calls out of the process
+CLIENT_SPANS = ("http.", "error.log")
+
+
+class Span:
+    """A timed operation of a run, with the parent it ran under and its attributes."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """OTLP AnyValue of an attribute (the JSON encoding writes 64-bit integers as strings)."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    otlp: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": SPAN_KIND_CLIENT if span.name.startswith(CLIENT_SPANS) else SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns or span.start_ns),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    if span.error is not None:
+        otlp["status"] = {"code": STATUS_CODE_ERROR, "message": span.error}
+    return otlp
+
+
+def otlp_payload(spans: List[Span], service_name: str = SERVICE_NAME) -> Dict[str, Any]:
+    """OTLP/JSON ExportTraceServiceRequest of the spans, as accepted by a collector on /v1/traces."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [_otlp_span(span) for span in spans]}],
+        }]
+    }
+
+
+class JsonFileExporter:
+    """Write the spans of a run to a file as one OTLP/JSON request."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "w") as f:
+            json.dump(otlp_payload(spans), f)
+        LOGGER.info(f"Wrote {len(spans)} trace spans to {self.path}")
+
+
+class OtlpHttpExporter:
+    """POST the spans of a run to an OTLP/HTTP collector, e.g. http://localhost:4318/v1/traces."""
+
+    def __init__(self, endpoint: str, timeout: float = 10):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        response = requests.post(self.endpoint, json=otlp_payload(spans), timeout=self.timeout)
+        response.raise_for_status()
+        LOGGER.info(f"Exported {len(spans)} trace spans to {self.endpoint}")
+
+
+class StageTimer:
+    """
+    Time the per-record stages of a stream with laps: lap(stage) adds the
+    time since the previous lap (or start()) to the stage. One span per
+    stage is emitted by close(), starting at the first record and lasting
+    the time summed over the records, since a span per record would cost
+    more than the stages it measures.
+
+    lap_output() closes the Singer write of a record. The time the output
+    (pipe or in-process target) took is counted as singer.write, measured by
+    TracedOutput, the rest of the write_record call (message formatting,
+    JSON encoding) as serialize.
+    """
+
+    def __init__(self, tracer: "Tracer", stream_name: str):
+        self.tracer = tracer
+        self.stream_name = stream_name
+        self.totals: Dict[str, int] = {}
+        self.laps: Dict[str, int] = {}
+        self.first_start_ns: Optional[int] = None
+        self._last = 0
+        self._output_ns = 0
+
+    def start(self) -> None:
+        """Start timing a record."""
+        if self.first_start_ns is None:
+            self.first_start_ns = time.time_ns()
+        self._last = time.perf_counter_ns()
+        self._output_ns = self.tracer.output_ns
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter_ns()
+        self.totals[stage] = self.totals.get(stage, 0) + now - self._last
+        self.laps[stage] = self.laps.get(stage, 0) + 1
+        self._last = now
+        self._output_ns = self.tracer.output_ns
+
+    def lap_output(self) -> None:
+        now = time.perf_counter_ns()
+        output_ns = self.tracer.output_ns - self._output_ns
+        for stage, elapsed in (("serialize", now - self._last - output_ns), ("singer.write", output_ns)):
+            self.totals[stage] = self.totals.get(stage, 0) + elapsed
+            self.laps[stage] = self.laps.get(stage, 0) + 1
+        self._last = now
+        self._output_ns = self.tracer.output_ns
+
+    def close(self) -> None:
+        """Emit the stage spans under the current span."""
+        for stage, total_ns in self.totals.items():
+            span = self.tracer.start_span(stage, {"stream": self.stream_name, "records": self.laps[stage]})
+            span.start_ns = self.first_start_ns or span.start_ns
+            span.end_ns = span.start_ns + total_ns
+            self.tracer.finished.append(span)
+        self.totals, self.laps = {}, {}
+
+
+class _NoopStageTimer:
+    def start(self) -> None:
+        pass
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def lap_output(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+NOOP_STAGE_TIMER = _NoopStageTimer()
+
+
+class Tracer:
+    """
+    Collect the spans of a run: span(name, **attributes) times a block under
+    the span open in the same thread, all of them in one trace. The spans are
+    exported at the end of the run by export(), to an OTLP/JSON file or an
+    OTLP/HTTP collector.
+
+    A disabled tracer (the default of get_tracer()) hands out no-op spans so
+    the taps cost the same as without tracing.
+    """
+
+    def __init__(self, exporters: Optional[List[Any]] = None, enabled: bool = True):
+        self.exporters = exporters or []
+        self.enabled = enabled
+        self.trace_id = os.urandom(16).hex()
+        self.finished: List[Span] = []
+        # Nanoseconds spent writing Singer messages to the output, see TracedOutput
+        self.output_ns = 0
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> Span:
+        stack = self._stack()
+        return Span(name, self.trace_id, stack[-1].span_id if stack else None, attributes)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        span = self.start_span(name, attributes)
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            span.end_ns = time.time_ns()
+            self.finished.append(span)
+
+    def profile(self, name: str):
+        """Span of a fetch_* call, so the tracer can be one of the orchestrator's stream profilers."""
+        return self.span("stream", fetch=name)
+
+    def stages(self, stream_name: str):
+        return StageTimer(self, stream_name) if self.enabled else NOOP_STAGE_TIMER
+
+    def export(self) -> None:
+        """Export the spans with every exporter, logging the errors: a lost trace must not fail the run."""
+        for exporter in self.exporters:
+            try:
+                exporter.export(self.finished)
+            except Exception as e:
+                LOGGER.error(f"Could not export the trace with {type(exporter).__name__}: {str(e)}")
+
+
+class TracedOutput:
+    """
+    File-like object wrapping the output of the taps that adds the time spent
+    in its writes to the tracer, the singer.write stage of the records.
+    """
+
+    def __init__(self, output, tracer: Tracer):
+        self.output = output
+        self.tracer = tracer
+
+    def write(self, text: str) -> int:
+        start = time.perf_counter_ns()
+        self.output.write(text)
+        self.tracer.output_ns += time.perf_counter_ns() - start
+        return len(text)
+
+    def flush(self) -> None:
+        start = time.perf_counter_ns()
+        self.output.flush()
+        self.tracer.output_ns += time.perf_counter_ns() - start
+
+
+_tracer = Tracer(enabled=False)
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Install the tracer of the run and return the previous one."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
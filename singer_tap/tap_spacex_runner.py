@@ -1,6 +1,10 @@
+import argparse
+import contextlib
 import logging
+import sys
 import time
 from include.spacex_tap_base import SpaceXTapBase
+from include.connections import STAGING_DDL_PATH, STAGING_MIGRATION_DDL_PATHS
 from include.fetch_company import CompanyTap
 from include.fetch_capsules import CapsulesTap
 from include.fetch_cores import CoresTap
@@ -28,6 +32,15 @@ class SpaceXTapOrchestrator(SpaceXTapBase):
     def __init__(self, base_url: str, config_path: str):
         super().__init__(base_url, config_path)
         self.config_path = config_path
+        # Objects with a profile(name) context manager wrapping each fetch_* call
+        self.stream_profilers = []
+
+    def run_stream(self, func):
+        """Run a fetch_* method inside the profile() block of every stream profiler."""
+        with contextlib.ExitStack() as stack:
+            for profiler in self.stream_profilers:
+                stack.enter_context(profiler.profile(func.__name__))
+            func()
 
     # First set of functions - Core data
     def fetch_company(self):
@@ -158,7 +171,7 @@ class SpaceXTapOrchestrator(SpaceXTapBase):
 
         for func in first_set_functions:
             try:
-                func()
+                self.run_stream(func)
                 logger.info(f"Successfully completed {func.__name__}")
             except Exception as e:
                 logger.error(f"Error in {func.__name__}: {str(e)}")
@@ -180,7 +193,7 @@ class SpaceXTapOrchestrator(SpaceXTapBase):
 
         for func in second_set_functions:
             try:
-                func()
+                self.run_stream(func)
                 logger.info(f"Successfully completed {func.__name__}")
             except Exception as e:
                 logger.error(f"Error in {func.__name__}: {str(e)}")
@@ -201,7 +214,7 @@ class SpaceXTapOrchestrator(SpaceXTapBase):
 
         for func in third_set_functions:
             try:
-                func()
+                self.run_stream(func)
                 logger.info(f"Successfully completed {func.__name__}")
             except Exception as e:
                 logger.error(f"Error in {func.__name__}: {str(e)}")
@@ -209,45 +222,236 @@ class SpaceXTapOrchestrator(SpaceXTapBase):
 
         logger.info("Completed second set of functions")
 
-def main():
+BASE_URL = "https://api.spacexdata.com/v4/"
+CONFIG_PATH = "config_snowflake.json"
+FILES_DIR = "singer_files"
+
+
+def parse_args(argv=None):
+    """Parse runner command line arguments."""
+    parser = argparse.ArgumentParser(description="Run the SpaceX Singer taps.")
+    parser.add_argument("--config", default=CONFIG_PATH, help="Connection config file")
+    parser.add_argument("--base-url", default=BASE_URL, help="SpaceX API base URL")
+    parser.add_argument(
+        "--target",
+        choices=["stdout", "duckdb", "files"],
+        default="stdout",
+        help="stdout pipes Singer messages to an external target, "
+             "duckdb loads them in-process into the database of a duckdb config, "
+             "files writes them to compressed files per stream for a later replay"
+    )
+    parser.add_argument(
+        "--parallel-target",
+        action="store_true",
+        help="With --target duckdb, load each stream in a worker thread of its own fed by a "
+             "bounded queue that holds the taps back when full"
+    )
+    parser.add_argument(
+        "--files-dir",
+        default=FILES_DIR,
+        help="Directory of the run directories written by --target files"
+    )
+    parser.add_argument(
+        "--files-codec",
+        choices=["zstd", "gzip"],
+        help="Compression of the --target files output (default zstd if zstandard is installed, else gzip)"
+    )
+    parser.add_argument(
+        "--staging-ddl",
+        default=STAGING_DDL_PATH,
+        help="Staging DDL used to create the STG_SPACEX_DATA tables in duckdb mode"
+    )
+    parser.add_argument(
+        "--graph-index",
+        metavar="PATH",
+        help="Build the relationship graph of launches, cores, payloads, crew and ships "
+             "from the extracted records and save it to PATH (.npz)"
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        metavar="DIR",
+        help="Write the latest record of each key of every stream to DIR as memory-mappable "
+             "Arrow IPC files at the end of the run"
+    )
+    parser.add_argument(
+        "--profile-memory",
+        metavar="PATH",
+        help="Trace the allocations of each stream with tracemalloc and write a JSON report of "
+             "peak RSS, traced peak, bytes per record and top allocation sites to PATH"
+    )
+    parser.add_argument(
+        "--profile-cpu",
+        metavar="DIR",
+        help="Profile each stream with cProfile and a stack sampler and write its pstats and "
+             "collapsed stacks (flame graphs) to DIR, with a summary.json of time by package"
+    )
+    parser.add_argument(
+        "--profile-cpu-sampling",
+        action="store_true",
+        help="With --profile-cpu, only sample the stacks: no cProfile overhead and no pstats"
+    )
+    parser.add_argument(
+        "--trace-file",
+        metavar="PATH",
+        help="Trace the fetch, parse, transform, serialize, write and error logging stages of "
+             "every stream and write the spans to PATH as OTLP/JSON"
+    )
+    parser.add_argument(
+        "--trace-endpoint",
+        metavar="URL",
+        help="Send the trace spans to an OTLP/HTTP collector, e.g. http://localhost:4318/v1/traces"
+    )
+    return parser.parse_args(argv)
+
+
+def write_report(name, write, *args):
+    """Write a profile report, logging its error: a lost report must not lose the records of the run."""
+    try:
+        write(*args)
+    except Exception as e:
+        logger.error(f"Could not write the {name}: {str(e)}")
+
+
+def run_all_sets(orchestrator):
+    """Run the three sets of taps."""
+    # Run first set
+    logger.info("\n\n=================================================================================================\n\n")
+    logger.info("Starting execution of first set...")
+    orchestrator.run_first_set()
+    logger.info("First set completed successfully")
+
+    ## Sleep
+    logger.info("\n\n=================================================================================================\n\n")
+    time.sleep(5)
+
+    # Run second set
+    logger.info("Starting execution of second set...")
+    orchestrator.run_second_set()
+    logger.info("Second set completed successfully")
+    
+    # Sleep
+    logger.info("\n\n=================================================================================================\n\n")
+    time.sleep(5)
+    
+    # Run third set
+    logger.info("Starting execution of third set...")
+    orchestrator.run_third_set()
+    logger.info("Second set completed successfully")
+
+
+def main(argv=None):
     """Main function to run the SpaceX tap orchestrator."""
-    BASE_URL = "https://api.spacexdata.com/v4/"
-    CONFIG_PATH = "config_snowflake.json"
+    args = parse_args(argv)
+    orchestrator = sink = None
 
     try:
         # Initialize orchestrator
-        orchestrator = SpaceXTapOrchestrator(BASE_URL, CONFIG_PATH)
-
-        # Run first set
-        logger.info("\n\n=================================================================================================\n\n")
-        logger.info("Starting execution of first set...")
-        orchestrator.run_first_set()
-        logger.info("First set completed successfully")
-
-        ## Sleep
-        logger.info("\n\n=================================================================================================\n\n")
-        time.sleep(5)
-
-        # Run second set
-        logger.info("Starting execution of second set...")
-        orchestrator.run_second_set()
-        logger.info("Second set completed successfully")
-        
-        # Sleep
-        logger.info("\n\n=================================================================================================\n\n")
-        time.sleep(5)
-        
-        # Run third set
-        logger.info("Starting execution of third set...")
-        orchestrator.run_third_set()
-        logger.info("Second set completed successfully")
+        orchestrator = SpaceXTapOrchestrator(args.base_url, args.config)
+        start_time = time.perf_counter()
+
+        key_set_store = orchestrator.key_set_store
+        if key_set_store:
+            # Other targets would load a delete marker as a row with NULL columns
+            if args.target != "duckdb":
+                raise ValueError(f"key_set_dir in {args.config} requires --target duckdb")
+            key_set_store.discard()
+
+        if args.target == "duckdb":
+            if orchestrator.snowflake_config.get("type") != "duckdb":
+                raise ValueError(f"--target duckdb requires a duckdb config, got {args.config}")
+
+            # Load Singer messages in-process instead of piping them to a target
+            from include.local_duckdb import DuckDBTarget, SingerMessageSink, create_staging_tables
+
+            create_staging_tables(orchestrator.conn.raw, args.staging_ddl)
+            for ddl_path in STAGING_MIGRATION_DDL_PATHS:
+                create_staging_tables(orchestrator.conn.raw, ddl_path)
+            if args.parallel_target:
+                from include.parallel_target import ParallelTarget
+
+                sink = SingerMessageSink(ParallelTarget(orchestrator.conn.raw))
+            else:
+                sink = SingerMessageSink(DuckDBTarget(orchestrator.conn.raw))
+        elif args.target == "files":
+            from include.file_sink import FileSink, run_directory
+
+            sink = FileSink(run_directory(args.files_dir), codec=args.files_codec)
+
+        output = sink or sys.stdout
+        graph_tee = snapshot_tee = memory_profiler = None
+        if args.graph_index:
+            from include.relationship_graph import RelationshipGraphTee
+
+            output = graph_tee = RelationshipGraphTee(output)
+        if args.snapshot_dir:
+            from include.arrow_snapshot import SnapshotTee, SnapshotWriter
+
+            output = snapshot_tee = SnapshotTee(output, SnapshotWriter(args.snapshot_dir))
+        if args.profile_memory:
+            from include.memory_profile import MemoryProfiler
+
+            output = memory_profiler = MemoryProfiler(output)
+            orchestrator.stream_profilers.append(memory_profiler)
+        cpu_profiler = None
+        if args.profile_cpu:
+            from include.cpu_profile import CpuProfiler
+
+            cpu_profiler = CpuProfiler(args.profile_cpu, deterministic=not args.profile_cpu_sampling)
+            orchestrator.stream_profilers.append(cpu_profiler)
+        tracer = previous_tracer = None
+        if args.trace_file or args.trace_endpoint:
+            from include.tracing import JsonFileExporter, OtlpHttpExporter, TracedOutput, Tracer, set_tracer
+
+            exporters = []
+            if args.trace_file:
+                exporters.append(JsonFileExporter(args.trace_file))
+            if args.trace_endpoint:
+                exporters.append(OtlpHttpExporter(args.trace_endpoint))
+            tracer = Tracer(exporters)
+            previous_tracer = set_tracer(tracer)
+            # Outermost, the time the taps spend writing is their singer.write stage
+            output = TracedOutput(output, tracer)
+            orchestrator.stream_profilers.append(tracer)
+
+        try:
+            with contextlib.redirect_stdout(output), \
+                    (tracer.span("run", target=args.target) if tracer else contextlib.nullcontext()):
+                run_all_sets(orchestrator)
+        finally:
+            # Written for failed runs too, the stream that failed is in it
+            if memory_profiler:
+                write_report("memory profile", memory_profiler.write_report, args.profile_memory)
+            if cpu_profiler:
+                write_report("CPU profile summary", cpu_profiler.write_summary)
+            if tracer:
+                set_tracer(previous_tracer)
+                tracer.export()
+        if sink:
+            sink.close()
+            sink = None
+        if key_set_store:
+            # Only once the delete markers are loaded, a failed run is diffed again
+            streams = key_set_store.commit()
+            logger.info(f"Committed the key sets of {len(streams)} streams to {key_set_store.directory}")
+
+        if graph_tee:
+            graph = graph_tee.build()
+            graph.save(args.graph_index)
+            logger.info(f"Saved relationship graph of {graph.node_counts()} to {args.graph_index}")
+        if snapshot_tee:
+            snapshot_tee.write_snapshot()
 
+        logger.info(f"Run completed in {time.perf_counter() - start_time:.2f}s")
 
     except Exception as e:
         logger.error(f"Error in main execution: {str(e)}")
         raise
     
     finally:
+        # A sink left open by a failed run, e.g. the workers of ParallelTarget, is
+        # stopped before its connection is closed
+        if sink:
+            sink.abort()
         if orchestrator:
             orchestrator.close_connection()
 
@@ -1,5 +1,12 @@
 import pytest
 from datetime import datetime
+from include.connections import create_stand_in_connection, use_connection_factory
+
+@pytest.fixture(autouse=True)
+def snowflake_stand_in():
+    """Fixture routing Snowflake connections of every tap to the in-process stand-in"""
+    with use_connection_factory(create_stand_in_connection, connection_type='snowflake'):
+        yield
 
 @pytest.fixture
 def mock_current_time():
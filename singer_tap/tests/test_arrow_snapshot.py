@@ -0,0 +1,97 @@
+import pytest
+import io
+import json
+import singer
+from contextlib import redirect_stdout
+
+pa = pytest.importorskip("pyarrow")
+
+from include.arrow_snapshot import SnapshotTee, SnapshotWriter, arrow_schema, open_snapshot
+
+CAPSULES_SCHEMA = {
+    "properties": {
+        "CAPSULE_ID": {"type": ["string", "null"]},
+        "REUSE_COUNT": {"type": ["integer", "null"]},
+        "WATER_LANDINGS": {"type": "integer"},
+        "LAUNCHES": {"type": ["array", "null"]},
+        "ACTIVE": {"type": ["boolean", "null"]},
+        "LAST_UPDATE": {"type": ["string", "null"], "format": "date-time"},
+    }
+}
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    """Fixture providing a snapshot of two capsules, one of them written twice"""
+    writer = SnapshotWriter(str(tmp_path / "snapshot"))
+    writer.add_schema("STG_SPACEX_DATA_CAPSULES", CAPSULES_SCHEMA, ["CAPSULE_ID"])
+    writer.add_record("STG_SPACEX_DATA_CAPSULES", {"CAPSULE_ID": "c101", "REUSE_COUNT": 0, "LAUNCHES": ["l1"]})
+    writer.add_record("STG_SPACEX_DATA_CAPSULES", {"CAPSULE_ID": "c102", "REUSE_COUNT": 1, "ACTIVE": True})
+    writer.add_record("STG_SPACEX_DATA_CAPSULES", {"CAPSULE_ID": "c101", "REUSE_COUNT": 2, "LAUNCHES": ["l1", "l2"]})
+    writer.write()
+    return str(tmp_path / "snapshot")
+
+def test_arrow_schema_of_singer_schema():
+    """Test JSON schema types map to Arrow types, arrays and objects to JSON text"""
+    schema = arrow_schema(CAPSULES_SCHEMA)
+
+    assert schema.field("REUSE_COUNT").type == pa.int64()
+    assert schema.field("WATER_LANDINGS").type == pa.int64()
+    assert schema.field("ACTIVE").type == pa.bool_()
+    assert schema.field("LAUNCHES").type == pa.string()
+    assert schema.field("LAST_UPDATE").type == pa.string()
+
+def test_snapshot_keeps_the_last_record_of_each_key(snapshot_dir):
+    """Test the manifest and the latest version of each capsule"""
+    snapshot = open_snapshot(snapshot_dir)
+
+    assert snapshot.streams == ["STG_SPACEX_DATA_CAPSULES"]
+    assert snapshot.manifest["streams"]["STG_SPACEX_DATA_CAPSULES"]["rows"] == 2
+    records = snapshot.records("STG_SPACEX_DATA_CAPSULES")
+    assert records[0]["CAPSULE_ID"] == "c101"
+    assert records[0]["REUSE_COUNT"] == 2
+    assert json.loads(records[0]["LAUNCHES"]) == ["l1", "l2"]
+    assert records[1]["ACTIVE"] is True
+
+def test_delete_marker_drops_the_key(tmp_path):
+    """Test a delete marker removes its key from the snapshot instead of adding an empty row"""
+    writer = SnapshotWriter(str(tmp_path / "snapshot"))
+    writer.add_schema("STG_SPACEX_DATA_CAPSULES", CAPSULES_SCHEMA, ["CAPSULE_ID"])
+    writer.add_record("STG_SPACEX_DATA_CAPSULES", {"CAPSULE_ID": "c101", "REUSE_COUNT": 0})
+    writer.add_record("STG_SPACEX_DATA_CAPSULES", {"CAPSULE_ID": "c102", "REUSE_COUNT": 1})
+    writer.add_record("STG_SPACEX_DATA_CAPSULES", {"CAPSULE_ID": "c101", "_sdc_deleted_at": "2024-01-02T12:00:00+00:00"})
+    writer.write()
+
+    records = open_snapshot(str(tmp_path / "snapshot")).records("STG_SPACEX_DATA_CAPSULES")
+    assert [record["CAPSULE_ID"] for record in records] == ["c102"]
+
+def test_tables_are_memory_mapped(snapshot_dir):
+    """Test opening a table allocates no Arrow memory and survives a rewrite of the snapshot"""
+    allocated = pa.total_allocated_bytes()
+    table = open_snapshot(snapshot_dir).table("STG_SPACEX_DATA_CAPSULES")
+    assert table.num_rows == 2
+    assert pa.total_allocated_bytes() == allocated
+
+    writer = SnapshotWriter(snapshot_dir)
+    writer.add_schema("STG_SPACEX_DATA_CAPSULES", CAPSULES_SCHEMA, ["CAPSULE_ID"])
+    writer.write()
+    assert table.column("CAPSULE_ID").to_pylist() == ["c101", "c102"]
+    assert open_snapshot(snapshot_dir).table("STG_SPACEX_DATA_CAPSULES").num_rows == 0
+
+def test_unknown_stream_raises(snapshot_dir):
+    """Test asking for a stream missing from the manifest"""
+    with pytest.raises(ValueError):
+        open_snapshot(snapshot_dir).table("STG_SPACEX_DATA_CORES")
+
+def test_tee_writes_snapshot_of_singer_output(tmp_path):
+    """Test the tee passes messages through and snapshots the streams it saw"""
+    output = io.StringIO()
+    tee = SnapshotTee(output, SnapshotWriter(str(tmp_path)))
+    with redirect_stdout(tee):
+        singer.write_schema("STG_SPACEX_DATA_CAPSULES", CAPSULES_SCHEMA, ["CAPSULE_ID"])
+        singer.write_record("STG_SPACEX_DATA_CAPSULES", {"CAPSULE_ID": "c101", "WATER_LANDINGS": 1})
+        singer.write_state({"STG_SPACEX_DATA_CAPSULES": {"last_sync": "2024-01-01T00:00:00+00:00"}})
+    manifest = tee.write_snapshot()
+
+    assert len(output.getvalue().splitlines()) == 3
+    assert manifest["streams"]["STG_SPACEX_DATA_CAPSULES"]["rows"] == 1
+    assert open_snapshot(str(tmp_path)).records("STG_SPACEX_DATA_CAPSULES")[0]["WATER_LANDINGS"] == 1
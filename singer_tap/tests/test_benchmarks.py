@@ -0,0 +1,37 @@
+import pytest
+import importlib
+import os
+
+# Each benchmark with sizes small enough for the test suite, so they keep running as the modules change
+BENCHMARK_ARGS = {
+    "bench_arrow_snapshot": ["--records", "200"],
+    "bench_bridge_streams": ["--launches", "50"],
+    "bench_compact_records": ["--records", "200"],
+    "bench_cpu_profile": ["--records", "200"],
+    "bench_file_sink": ["--records", "200", "--max-records", "50"],
+    "bench_launch_costs": ["--launches", "50", "--scenarios", "2"],
+    "bench_load_paths": ["--records", "50", "--errors", "10"],
+    "bench_memory_profile": ["--records", "200", "--top", "2"],
+    "bench_orbital_elements": ["--records", "200"],
+    "bench_parallel_target": ["--records", "200"],
+    "bench_propagation": ["--satellites", "20", "--steps", "5"],
+    "bench_query_api": ["--satellites", "200", "--requests", "20", "--page-size", "50"],
+    "bench_relationship_graph": ["--launches", "50", "--queries", "10"],
+    "bench_schema_validation": ["--records", "200"],
+    "bench_spatial_index": ["--points", "500", "--queries", "10"],
+    "bench_tombstones": ["--keys", "500", "--removed", "10", "--repeat", "2"],
+    "bench_tracing": ["--records", "200"],
+}
+
+@pytest.mark.parametrize("name", sorted(BENCHMARK_ARGS))
+def test_benchmark_runs(name, capsys):
+    """Test the benchmark runs end to end on a small input and prints its results"""
+    benchmark = importlib.import_module(f"benchmarks.{name}")
+    benchmark.main(BENCHMARK_ARGS[name])
+    assert capsys.readouterr().out.strip()
+
+def test_every_benchmark_is_listed():
+    """Test a new benchmark gets its small input above"""
+    directory = os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+    names = {name[:-3] for name in os.listdir(directory) if name.startswith("bench_") and name.endswith(".py")}
+    assert names == set(BENCHMARK_ARGS)
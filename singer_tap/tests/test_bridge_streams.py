@@ -0,0 +1,76 @@
+import pytest
+import duckdb
+from include.bridge_streams import (
+    LAUNCH_CORES_SCHEMA,
+    LAUNCH_CREW_SCHEMA,
+    LAUNCH_PAYLOADS_SCHEMA,
+    LAUNCH_SHIPS_SCHEMA,
+    SURROGATE_KEY_NULL,
+    generate_surrogate_key,
+    launch_bridge_records,
+)
+
+LAUNCH = {
+    "id": "5eb87d46ffd86e000604b388",
+    "cores": [
+        {"core": "5e9e28a6f35918c0803b265c", "flight": 2, "reused": True, "landing_success": True,
+         "landing_type": "ASDS", "landpad": "5e9e3032383ecb6bb234e7ca"},
+        {"core": None, "flight": None}
+    ],
+    "crew": [{"crew": "5ebf1a6e23a9a60006e03a7a", "role": "Commander"}],
+    "ships": ["5ea6ed2e080df4000697c908"],
+    "payloads": ["5eb0e4d0b6c3bb0006eeb253", "5eb0e4d0b6c3bb0006eeb254"]
+}
+
+@pytest.fixture
+def bridge_records():
+    """Fixture providing the bridge rows of a crewed launch"""
+    return launch_bridge_records(LAUNCH, "2024-01-01T12:00:00+00:00")
+
+def dbt_surrogate_key(values):
+    """generate_surrogate_key as compiled by dbt_utils, evaluated by duckdb"""
+    fields = ", ".join(f"coalesce(cast(? as varchar), '{SURROGATE_KEY_NULL}')" for _ in values)
+    return duckdb.execute(f"select md5(cast(concat_ws('-', {fields}) as varchar))", list(values)).fetchone()[0]
+
+@pytest.mark.parametrize("values", [
+    ["5eb87d46ffd86e000604b388", "5e9e28a6f35918c0803b265c"],
+    ["5eb87d46ffd86e000604b388", None],
+    [None, None],
+    ["a-b", "c"],
+])
+def test_surrogate_key_matches_dbt_utils(values):
+    """Test the key equals the md5 dbt_utils.generate_surrogate_key computes in the warehouse"""
+    assert generate_surrogate_key(values) == dbt_surrogate_key(values)
+
+def test_one_row_per_related_id(bridge_records):
+    """Test cores without an ID are skipped and every row carries the launch ID"""
+    counts = {stream: len(records) for stream, records in bridge_records.items()}
+    assert counts == {
+        LAUNCH_CORES_SCHEMA.stream_name: 1,
+        LAUNCH_CREW_SCHEMA.stream_name: 1,
+        LAUNCH_SHIPS_SCHEMA.stream_name: 1,
+        LAUNCH_PAYLOADS_SCHEMA.stream_name: 2,
+    }
+    assert all(
+        record["LAUNCH_ID"] == LAUNCH["id"] for records in bridge_records.values() for record in records
+    )
+
+def test_rows_match_their_schema(bridge_records):
+    """Test the rows validate against their registered schemas and carry the core details"""
+    schemas = [LAUNCH_CORES_SCHEMA, LAUNCH_CREW_SCHEMA, LAUNCH_SHIPS_SCHEMA, LAUNCH_PAYLOADS_SCHEMA]
+    for schema in schemas:
+        for record in bridge_records[schema.stream_name]:
+            schema.validate(record)
+
+    core = bridge_records[LAUNCH_CORES_SCHEMA.stream_name][0]
+    assert core["LAUNCH_CORE_ID"] == generate_surrogate_key([LAUNCH["id"], "5e9e28a6f35918c0803b265c"])
+    assert (core["FLIGHT"], core["REUSED"], core["LANDING_TYPE"]) == (2, True, "ASDS")
+    assert bridge_records[LAUNCH_CREW_SCHEMA.stream_name][0]["ROLE"] == "Commander"
+
+def test_crew_as_list_of_ids():
+    """Test older launches listing crew IDs instead of objects"""
+    records = launch_bridge_records({"id": "launch", "crew": ["crew_1", "crew_2"]}, "2024-01-01T12:00:00+00:00")
+
+    crew = records[LAUNCH_CREW_SCHEMA.stream_name]
+    assert [record["CREW_ID"] for record in crew] == ["crew_1", "crew_2"]
+    assert crew[0]["ROLE"] is None
@@ -0,0 +1,68 @@
+import pytest
+from include.compact_records import CompactRecord, record_class
+from include.fetch_starlink import STARLINK_SCHEMA
+from include.orbital_elements import ORBITAL_ELEMENT_COLUMNS, add_orbital_elements
+from include.schema_registry import SchemaValidationError, StreamSchema
+from datetime import datetime
+import pytz
+
+@pytest.fixture
+def capsule_record():
+    """Fixture providing the record class of a small stream"""
+    return record_class("STG_TEST_CAPSULES", ["CAPSULE_ID", "REUSE_COUNT", "STATUS"])
+
+def test_record_class_is_slotted_and_shared(capsule_record):
+    """Test the generated class has one slot per field, no __dict__, and is created once"""
+    record = capsule_record(CAPSULE_ID="c112", REUSE_COUNT=2)
+    assert capsule_record.__name__ == "StgTestCapsulesRecord"
+    assert capsule_record.__slots__ == ("CAPSULE_ID", "REUSE_COUNT", "STATUS")
+    assert not hasattr(record, "__dict__")
+    assert record_class("STG_TEST_CAPSULES", ["CAPSULE_ID", "REUSE_COUNT", "STATUS"]) is capsule_record
+
+def test_dict_operations(capsule_record):
+    """Test the mapping operations used by the transform steps"""
+    record = capsule_record(CAPSULE_ID="c112", REUSE_COUNT=2)
+    assert record["CAPSULE_ID"] == "c112"
+    assert record.get("STATUS") is None
+    assert record.get("UNKNOWN", "default") == "default"
+    assert "REUSE_COUNT" in record and "UNKNOWN" not in record
+    record["STATUS"] = "active"
+    assert record.to_dict() == {"CAPSULE_ID": "c112", "REUSE_COUNT": 2, "STATUS": "active"}
+    assert record == {"CAPSULE_ID": "c112", "REUSE_COUNT": 2, "STATUS": "active"}
+    assert list(record.keys()) == ["CAPSULE_ID", "REUSE_COUNT", "STATUS"]
+    assert len(record) == 3
+
+def test_unknown_fields_raise(capsule_record):
+    """Test columns outside the schema are rejected instead of silently dropped"""
+    with pytest.raises(TypeError):
+        capsule_record(CAPSULE_ID="c112", WATER_LANDINGS=1)
+    record = capsule_record(CAPSULE_ID="c112")
+    with pytest.raises(KeyError):
+        record["WATER_LANDINGS"] = 1
+    with pytest.raises(KeyError):
+        record["fields"]
+
+def test_from_dict_keeps_stream_columns(capsule_record):
+    """Test from_dict fills missing columns with None and drops the others"""
+    record = capsule_record.from_dict({"CAPSULE_ID": "c112", "EXTRA": True})
+    assert record.to_dict() == {"CAPSULE_ID": "c112", "REUSE_COUNT": None, "STATUS": None}
+
+def test_schema_record_class_validates_and_takes_orbital_elements():
+    """Test the Starlink record class accepts the orbital elements and validates like a dict"""
+    StarlinkRecord = STARLINK_SCHEMA.record_class
+    assert isinstance(StarlinkRecord(), CompactRecord)
+    assert StarlinkRecord.fields == tuple(STARLINK_SCHEMA.schema["properties"])
+
+    record = StarlinkRecord(
+        STARLINK_ID="sat1", MEAN_MOTION=15.06, ECCENTRICITY=0.0001, EPOCH="2020-01-01T00:00:00"
+    )
+    add_orbital_elements([record], datetime(2020, 1, 2, tzinfo=pytz.UTC))
+    assert all(record[column] is not None for column in ORBITAL_ELEMENT_COLUMNS)
+    assert record["EPOCH_AGE_DAYS"] == pytest.approx(1.0)
+    STARLINK_SCHEMA.validate(record)
+
+    stream_schema = StreamSchema(
+        "STG_TEST_COUNTS", {"type": "object", "properties": {"COUNT": {"type": "integer"}}}, []
+    )
+    with pytest.raises(SchemaValidationError):
+        stream_schema.validate(stream_schema.record_class(COUNT="three"))
@@ -0,0 +1,87 @@
+import pytest
+import json
+from snowflake.connector.errors import DatabaseError          # type: ignore
+from include.connections import (
+    CONNECTION_FACTORIES,
+    create_stand_in_connection,
+    get_connection_factory,
+    use_connection_factory,
+)
+from include.spacex_tap_base import SpaceXTapBase
+
+@pytest.fixture
+def stand_in_tap(tmp_path):
+    """Fixture providing a tap whose config selects the stand-in connection"""
+    config_path = tmp_path / "config_stand_in.json"
+    config_path.write_text(json.dumps({"type": "stand_in", "schema": "STG_SPACEX_DATA"}))
+    tap = SpaceXTapBase(base_url="https://api.spacexdata.com/v4/", config_path=str(config_path))
+    yield tap
+    tap.close_connection()
+
+def test_get_connection_factory_by_type():
+    """Test the factory is selected from the config type, snowflake by default"""
+    assert get_connection_factory({"type": "stand_in"}) is create_stand_in_connection
+    assert get_connection_factory({}) is CONNECTION_FACTORIES["snowflake"]
+
+def test_get_connection_factory_unknown_type():
+    """Test an unknown connection type is rejected"""
+    with pytest.raises(ValueError) as exc_info:
+        get_connection_factory({"type": "oracle"})
+    assert "Unknown connection type" in str(exc_info.value)
+
+def test_use_connection_factory_restores_previous():
+    """Test the replaced factory is restored when the block exits"""
+    previous = CONNECTION_FACTORIES["snowflake"]
+    sentinel = lambda config: "connection"
+
+    with use_connection_factory(sentinel):
+        assert get_connection_factory({}) is sentinel
+
+    assert get_connection_factory({}) is previous
+
+def test_snowflake_config_uses_stand_in():
+    """Test taps built from the Snowflake config get the stand-in during tests"""
+    tap = SpaceXTapBase(base_url="https://api.spacexdata.com/v4/", config_path="config_snowflake.json")
+
+    cursor = tap.conn.cursor()
+    cursor.execute("SELECT current_version()")
+    assert cursor.fetchone()[0] is not None
+    tap.close_connection()
+
+def test_stand_in_log_error(stand_in_tap):
+    """Test error logging lands in the stand-in STG_SPACEX_DATA_LOAD_ERRORS table"""
+    stand_in_tap.log_error(
+        table_name="STG_SPACEX_DATA_CORES",
+        error_message="Data transformation error: boom",
+        error_data={"id": "core1"}
+    )
+
+    cursor = stand_in_tap.conn.cursor()
+    cursor.execute("SELECT TABLE_NAME, ERROR_MESSAGE, ERROR_DATA FROM STG_SPACEX_DATA_LOAD_ERRORS")
+    assert cursor.fetchall() == [
+        ("STG_SPACEX_DATA_CORES", "Data transformation error: boom", '{"id": "core1"}')
+    ]
+
+def test_stand_in_raises_snowflake_errors(stand_in_tap):
+    """Test failing queries raise snowflake.connector errors"""
+    cursor = stand_in_tap.conn.cursor()
+    with pytest.raises(DatabaseError):
+        cursor.execute("SELECT * FROM MISSING_TABLE")
+
+def test_log_error_survives_database_error(stand_in_tap, capfd):
+    """Test a failing error insert is reported on the logger instead of raised"""
+    cursor = stand_in_tap.conn.cursor()
+    cursor.execute("DROP TABLE STG_SPACEX_DATA_LOAD_ERRORS")
+
+    stand_in_tap.log_error(table_name="TEST_TABLE", error_message="Test error message")
+
+    assert "Error logging to STG_SPACEX_DATA_LOAD_ERRORS table" in capfd.readouterr().err
+
+def test_log_error_without_connection(stand_in_tap, capfd):
+    """Test error logging when the connection could not be established"""
+    stand_in_tap.conn.close()
+    stand_in_tap.conn = False
+
+    stand_in_tap.log_error(table_name="TEST_TABLE", error_message="Test error message")
+
+    assert "No connection to log error for TEST_TABLE" in capfd.readouterr().err
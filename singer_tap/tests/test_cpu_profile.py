@@ -0,0 +1,81 @@
+import pytest
+import json
+import os
+import inspect
+import pstats
+import threading
+import time
+from include.cpu_profile import CpuProfiler, StackSampler
+from tap_spacex_runner import SpaceXTapOrchestrator
+
+def serialize_records(seconds=0.2):
+    """Keep the CPU busy serializing records for about the given time"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        json.dumps([{"STARLINK_ID": i, "LATITUDE": i / 7} for i in range(1000)])
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    """Fixture providing the output directory of the CPU profiles"""
+    return str(tmp_path / "cpu")
+
+def test_profile_writes_pstats_and_collapsed_stacks(profile_dir):
+    """Test a stream gets a loadable pstats file and collapsed stacks rooted at its name"""
+    profiler = CpuProfiler(profile_dir, interval=0.001)
+    with profiler.profile("fetch_starlink"):
+        serialize_records()
+
+    stats = pstats.Stats(os.path.join(profile_dir, "fetch_starlink.pstats"))
+    assert any(name == "serialize_records" for _, _, name in stats.stats)
+
+    with open(os.path.join(profile_dir, "fetch_starlink.collapsed")) as f:
+        lines = f.read().splitlines()
+    stream = profiler.streams[0]
+    assert stream["samples"] > 0
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == stream["samples"]
+    assert all(line.startswith("fetch_starlink;") for line in lines)
+    assert any("serialize_records (" in line for line in lines)
+    assert "json" in stream["seconds_by_package"]
+    assert stream["top_functions"][0]["tottime"] >= stream["top_functions"][-1]["tottime"]
+
+def test_sampling_only_skips_cprofile(profile_dir):
+    """Test deterministic=False writes collapsed stacks without pstats"""
+    profiler = CpuProfiler(profile_dir, interval=0.001, deterministic=False)
+    with profiler.profile("fetch_cores"):
+        serialize_records(0.05)
+
+    assert os.listdir(profile_dir) == ["fetch_cores.collapsed"]
+    assert "pstats" not in profiler.streams[0]
+
+def test_stacks_start_below_the_profiled_block():
+    """Test the frames above the profiled block are left out and replaced by the stream name"""
+    sampler = StackSampler(threading.get_ident(), base_depth=len(inspect.stack()))
+
+    def fetch_launches():
+        sampler.sample()
+
+    fetch_launches()
+    [line] = sampler.collapsed("fetch_launches")
+    # The test function is left out, the sample was taken in fetch_launches
+    assert line.startswith("fetch_launches;fetch_launches (")
+    assert line.split(" ")[-2].startswith("(include/cpu_profile.py:")
+    assert line.count(";") == 2 and line.endswith(" 1")
+
+def test_orchestrator_profiles_each_stream(profile_dir):
+    """Test run_stream wraps a fetch_* call in the stream profilers and the summary lists it"""
+    orchestrator = SpaceXTapOrchestrator("https://api.spacexdata.com/v4/", "config_snowflake.json")
+    profiler = CpuProfiler(profile_dir, interval=0.001)
+    orchestrator.stream_profilers.append(profiler)
+
+    def fetch_dragons():
+        serialize_records(0.05)
+
+    try:
+        orchestrator.run_stream(fetch_dragons)
+    finally:
+        orchestrator.close_connection()
+    summary = profiler.write_summary()
+
+    assert [stream["stream"] for stream in summary["streams"]] == ["fetch_dragons"]
+    with open(os.path.join(profile_dir, "summary.json")) as f:
+        assert json.load(f)["streams"][0]["pstats"] == "fetch_dragons.pstats"
@@ -0,0 +1,91 @@
+import pytest
+import gzip
+import json
+import os
+from contextlib import redirect_stdout
+import singer                                           # type: ignore
+from include.file_sink import FileSink, load_manifest, replay_lines, zstandard_available
+
+STREAM = "STG_SPACEX_DATA_CREW"
+SCHEMA = {"type": "object", "properties": {"CREW_ID": {"type": ["string", "null"]}}}
+
+@pytest.fixture
+def run_dir(tmp_path):
+    """Fixture providing the run directory of the file sink"""
+    return str(tmp_path / "run")
+
+def write_stream(stream_name, count, state=True):
+    singer.write_schema(stream_name, SCHEMA, ["CREW_ID"])
+    for i in range(count):
+        singer.write_record(stream_name, {"CREW_ID": f"{stream_name}-{i}"})
+    if state:
+        singer.write_state({stream_name: {"last_sync": "2024-01-01T00:00:00+00:00"}})
+
+def messages(lines):
+    return [json.loads(line) for line in lines]
+
+def test_rotates_parts_starting_with_the_schema(run_dir):
+    """Test a stream is split into parts of max_records records, each loadable on its own"""
+    sink = FileSink(run_dir, codec="gzip", max_records=4)
+    with redirect_stdout(sink):
+        write_stream(STREAM, 10)
+    manifest = sink.close()
+
+    parts = manifest["streams"][STREAM]["parts"]
+    assert [part["records"] for part in parts] == [4, 4, 2]
+    assert manifest["streams"][STREAM]["records"] == 10
+    for part in parts:
+        with gzip.open(os.path.join(run_dir, part["path"]), "rt") as f:
+            part_messages = messages(f)
+        assert part_messages[0]["type"] == "SCHEMA"
+        assert len(part_messages) == part["messages"] == part["records"] + 1
+        assert part["compressed_bytes"] == os.path.getsize(os.path.join(run_dir, part["path"]))
+
+def test_replay_streams_independently(run_dir):
+    """Test each stream replays on its own, in order, followed by the merged state of the run"""
+    sink = FileSink(run_dir, codec="gzip", max_records=3)
+    with redirect_stdout(sink):
+        write_stream(STREAM, 5)
+        write_stream("STG_SPACEX_DATA_SHIPS", 2)
+    sink.close()
+
+    assert load_manifest(run_dir)["state"] == {
+        STREAM: {"last_sync": "2024-01-01T00:00:00+00:00"},
+        "STG_SPACEX_DATA_SHIPS": {"last_sync": "2024-01-01T00:00:00+00:00"},
+    }
+    replayed = messages(replay_lines(run_dir, ["STG_SPACEX_DATA_SHIPS"]))
+    assert [message["type"] for message in replayed] == ["SCHEMA", "RECORD", "RECORD", "STATE"]
+    records = [m["record"]["CREW_ID"] for m in messages(replay_lines(run_dir, [STREAM])) if m["type"] == "RECORD"]
+    assert records == [f"{STREAM}-{i}" for i in range(5)]
+
+def test_partial_writes_are_joined(run_dir):
+    """Test a message written in several chunks lands whole, and an unterminated last line on close"""
+    sink = FileSink(run_dir, codec="gzip")
+    line = singer.format_message(singer.RecordMessage(STREAM, {"CREW_ID": "1"}))
+    sink.write(line[:10])
+    sink.write(line[10:] + "\n" + line)
+    manifest = sink.close()
+
+    assert manifest["streams"][STREAM]["records"] == 2
+    assert messages(replay_lines(run_dir))[0]["record"] == {"CREW_ID": "1"}
+
+def test_aborted_run_has_no_manifest(run_dir):
+    """Test abort closes the part files of a failed run and leaves it incomplete"""
+    sink = FileSink(run_dir, codec="gzip")
+    with redirect_stdout(sink):
+        write_stream(STREAM, 3)
+    sink.abort()
+    assert not os.path.exists(os.path.join(run_dir, "manifest.json"))
+    with gzip.open(os.path.join(run_dir, STREAM, "part-00000.jsonl.gz"), "rt") as f:
+        assert len(f.readlines()) == 4
+    with pytest.raises(FileNotFoundError):
+        list(replay_lines(run_dir))
+
+def test_incomplete_run_and_missing_codec(run_dir):
+    """Test a run without a manifest is refused and zstd needs the zstandard package"""
+    os.makedirs(run_dir)
+    with pytest.raises(FileNotFoundError):
+        list(replay_lines(run_dir))
+    if not zstandard_available():
+        with pytest.raises(ImportError, match="pip install zstandard"):
+            FileSink(run_dir, codec="zstd")
@@ -0,0 +1,65 @@
+import pytest
+import json
+import numpy as np
+from include.launch_costs import LaunchCostEngine
+
+@pytest.fixture
+def engine():
+    """Fixture providing launches with and without reused cores and payloads"""
+    launches = [
+        {"LAUNCH_ID": "launch1", "ROCKET": "falcon9", "CORES": json.dumps([
+            {"core": "core1", "reused": True},
+            {"core": "core2", "reused": False},
+        ]), "PAYLOADS": json.dumps(["p1", "p2", "p1"])},
+        {"LAUNCH_ID": "launch2", "ROCKET": "falcon9", "CORES": json.dumps([{"core": "core3", "reused": True}]),
+         "PAYLOADS": json.dumps(["p3", "missing"])},
+        {"LAUNCH_ID": "launch3", "ROCKET": "falconheavy", "CORES": json.dumps([{"core": None}]),
+         "PAYLOADS": json.dumps(["p4"])},
+        {"LAUNCH_ID": "launch4", "ROCKET": "unknown", "CORES": None, "PAYLOADS": None},
+    ]
+    rockets = [
+        {"ROCKET_ID": "falcon9", "COST_PER_LAUNCH": 50000000},
+        {"ROCKET_ID": "falconheavy", "COST_PER_LAUNCH": 90000000},
+    ]
+    payloads = [
+        {"PAYLOAD_ID": "p1", "LAUNCH": "launch1", "MASS_KG": 1000.0},
+        {"PAYLOAD_ID": "p2", "LAUNCH": "launch1", "MASS_KG": 1500.0},
+        {"PAYLOAD_ID": "p3", "LAUNCH": "launch2", "MASS_KG": None},
+        {"PAYLOAD_ID": "p4", "LAUNCH": "launch3", "MASS_KG": 9000.0},
+        {"PAYLOAD_ID": "p5", "LAUNCH": "launch4", "MASS_KG": 42.0},
+    ]
+    return LaunchCostEngine.from_records(launches, rockets, payloads)
+
+def test_arrays_built_from_records(engine):
+    """Test cores are counted per launch and the masses of the payloads each launch lists summed"""
+    assert list(engine.core_count) == [2, 1, 0, 0]
+    assert list(engine.reused_core_count) == [1, 1, 0, 0]
+    assert list(engine.total_payload_mass_kg) == [2500.0, 0.0, 9000.0, 0.0]
+    assert np.isnan(engine.cost_per_launch[3])
+
+def test_compute_matches_fct_formula(engine):
+    """Test the default discount of 0.3 per reused core share"""
+    costs = engine.compute()
+
+    np.testing.assert_allclose(
+        costs["estimated_launch_cost"],
+        [50000000 * (1 - 0.3 * 0.5), 50000000 * 0.7, 90000000, np.nan]
+    )
+    np.testing.assert_allclose(
+        costs["cost_per_kg"],
+        [42500000 / 2500.0, np.nan, 10000.0, np.nan]
+    )
+
+def test_discount_per_rocket(engine):
+    """Test a discount mapping applies per rocket with the default for the others"""
+    costs = engine.compute(reuse_discount={"falcon9": 0.5})
+    np.testing.assert_allclose(costs["estimated_launch_cost"][:3], [37500000, 25000000, 90000000])
+
+def test_scenarios_match_compute(engine):
+    """Test every row of the scenarios equals compute with that discount"""
+    discounts = [0.0, 0.3, 0.6]
+    scenarios = engine.scenarios(discounts)
+
+    assert scenarios.shape == (3, 4)
+    for row, discount in zip(scenarios, discounts):
+        np.testing.assert_allclose(row, engine.compute(discount)["estimated_launch_cost"])
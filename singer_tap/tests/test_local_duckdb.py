@@ -0,0 +1,169 @@
+import pytest
+import json
+import os
+import contextlib
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from include.local_duckdb import (
+    DuckDBConnection,
+    DuckDBTarget,
+    SingerMessageSink,
+    create_staging_tables,
+    translate_snowflake_ddl,
+)
+from include.fetch_launches import LaunchesTap
+from include.connections import STAGING_MIGRATION_DDL_PATHS
+
+STAGING_DDL_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "db_setup", "V2_0", "V2_0__01_create_staging_tables_structure.sql"
+)
+
+SAMPLE_LAUNCH_DATA = [
+    {
+        "id": "5eb87cd9ffd86e000604b32a",
+        "flight_number": 1,
+        "name": "FalconSat",
+        "date_utc": "2006-03-24T22:30:00.000Z",
+        "window": 0,
+        "rocket": "5e9d0d95eda69955f709d1eb",
+        "cores": [{"core": "5e9e289df35918033d3b2623", "reused": False}],
+        "links": {"wikipedia": "https://en.wikipedia.org/wiki/DemoSat"}
+    }
+]
+
+@pytest.fixture
+def duckdb_config(tmp_path):
+    """Fixture providing a duckdb config file pointing at a temporary database"""
+    config_path = tmp_path / "config_duckdb.json"
+    config_path.write_text(json.dumps({
+        "type": "duckdb",
+        "database": str(tmp_path / "spacex_data_dev.duckdb"),
+        "schema": "STG_SPACEX_DATA"
+    }))
+    return str(config_path)
+
+@pytest.fixture
+def duckdb_conn(duckdb_config):
+    """Fixture providing a local mirror with the staging tables created"""
+    with open(duckdb_config) as f:
+        config = json.load(f)
+    conn = DuckDBConnection(config["database"], config["schema"])
+    create_staging_tables(conn.raw, STAGING_DDL_PATH)
+    for ddl_path in STAGING_MIGRATION_DDL_PATHS:
+        create_staging_tables(conn.raw, ddl_path)
+    yield conn
+    conn.close()
+
+def test_translate_snowflake_ddl():
+    """Test Snowflake specific statements and types are translated"""
+    ddl = """
+    USE ROLE SPACEX_DATA_DEV_SYSADMIN;
+    USE SCHEMA STG_SPACEX_DATA;
+    CREATE TABLE IF NOT EXISTS T (
+        ID VARCHAR(16777216) NOT NULL,
+        WINDOW
+            NUMBER (38, 0),
+        PAYLOAD VARIANT, -- comment
+        LOADED TIMESTAMP_NTZ (9) DEFAULT CURRENT_TIMESTAMP(),
+        primary key (ID)
+    );
+    CREATE OR REPLACE FILE FORMAT JSON_FORMAT TYPE = 'JSON';
+    """
+    statements = translate_snowflake_ddl(ddl, reserved_words=["window", "primary"])
+
+    assert statements[0] == "CREATE SCHEMA IF NOT EXISTS STG_SPACEX_DATA"
+    assert statements[1] == "USE STG_SPACEX_DATA"
+    assert len(statements) == 3
+
+    create_table = statements[2]
+    assert '"WINDOW"' in create_table
+    assert "BIGINT" in create_table
+    assert "JSON" in create_table
+    assert "DEFAULT CURRENT_TIMESTAMP," in create_table
+    assert "primary key (ID)" in create_table
+    assert "16777216" not in create_table
+
+def test_create_staging_tables(duckdb_conn):
+    """Test all staging tables from db_setup/V2_0 are created"""
+    tables = {row[0] for row in duckdb_conn.raw.execute("SHOW TABLES").fetchall()}
+
+    assert "STG_SPACEX_DATA_LAUNCHES" in tables
+    assert "STG_SPACEX_DATA_STARLINK" in tables
+    assert "STG_SPACEX_DATA_LOAD_ERRORS" in tables
+
+def test_tap_loads_into_duckdb(duckdb_config, duckdb_conn):
+    """Test Singer messages from a tap are loaded in-process and upserted"""
+    tap = LaunchesTap(base_url="https://api.spacexdata.com/v4/", config_path=duckdb_config)
+    sink = SingerMessageSink(DuckDBTarget(duckdb_conn.raw))
+
+    with patch('requests.get') as mock_get, contextlib.redirect_stdout(sink):
+        mock_response = MagicMock()
+        mock_response.json.return_value = SAMPLE_LAUNCH_DATA
+        mock_get.return_value = mock_response
+
+        # Loading twice must not duplicate rows
+        tap.fetch_launches()
+        tap.fetch_launches()
+    sink.close()
+    tap.close_connection()
+
+    rows = duckdb_conn.raw.execute(
+        'SELECT LAUNCH_ID, NAME, "WINDOW", DATE_UTC, _SDC_SEQUENCE FROM STG_SPACEX_DATA_LAUNCHES'
+    ).fetchall()
+    assert len(rows) == 1
+    assert rows[0][0] == "5eb87cd9ffd86e000604b32a"
+    assert rows[0][1] == "FalconSat"
+    assert rows[0][2] == 0
+    assert rows[0][3] == datetime(2006, 3, 24, 22, 30)
+    assert rows[0][4] is not None
+
+    bridge_rows = duckdb_conn.raw.execute(
+        "SELECT LAUNCH_CORE_ID, LAUNCH_ID, CORE_ID, REUSED FROM STG_SPACEX_DATA_LAUNCH_CORES"
+    ).fetchall()
+    assert bridge_rows == [(
+        "786f523381f869d34b545d17591ad62c", "5eb87cd9ffd86e000604b32a", "5e9e289df35918033d3b2623", False
+    )]
+
+def test_log_error_into_duckdb(duckdb_config, duckdb_conn):
+    """Test tap error logging writes to the local STG_SPACEX_DATA_LOAD_ERRORS table"""
+    tap = LaunchesTap(base_url="https://api.spacexdata.com/v4/", config_path=duckdb_config)
+    tap.log_error(
+        table_name="STG_SPACEX_DATA_LAUNCHES",
+        error_message="Test error message",
+        error_data={"id": "bad"}
+    )
+    tap.close_connection()
+
+    rows = duckdb_conn.raw.execute(
+        "SELECT TABLE_NAME, ERROR_MESSAGE, ERROR_DATA FROM STG_SPACEX_DATA_LOAD_ERRORS"
+    ).fetchall()
+    assert rows == [("STG_SPACEX_DATA_LAUNCHES", "Test error message", '{"id": "bad"}')]
+
+def test_record_before_schema_raises(duckdb_conn):
+    """Test a RECORD without a prior SCHEMA message is rejected"""
+    target = DuckDBTarget(duckdb_conn.raw)
+    with pytest.raises(ValueError):
+        target.process_line(json.dumps({
+            "type": "RECORD",
+            "stream": "STG_SPACEX_DATA_LAUNCHES",
+            "record": {"LAUNCH_ID": "1"}
+        }))
+
+def test_value_not_fitting_column_type_raises(duckdb_conn):
+    """Test a value the column type cannot hold is rejected instead of loaded as NULL"""
+    target = DuckDBTarget(duckdb_conn.raw)
+    target.process_line(json.dumps({
+        "type": "SCHEMA",
+        "stream": "STG_SPACEX_DATA_LAUNCHES",
+        "schema": {"type": "object"},
+        "key_properties": ["LAUNCH_ID"]
+    }))
+    target.process_line(json.dumps({
+        "type": "RECORD",
+        "stream": "STG_SPACEX_DATA_LAUNCHES",
+        "record": {"LAUNCH_ID": "1", "FLIGHT_NUMBER": "first"}
+    }))
+    with pytest.raises(ValueError, match="1 values of FLIGHT_NUMBER are not BIGINT"):
+        target.flush_all()
+    assert duckdb_conn.raw.execute("SELECT count(*) FROM STG_SPACEX_DATA_LAUNCHES").fetchone() == (0,)
@@ -0,0 +1,64 @@
+import pytest
+import io
+import json
+import singer
+from contextlib import redirect_stdout
+from include.memory_profile import MemoryProfiler, peak_rss_bytes
+
+def write_satellites(count):
+    """Hold count records, then write them as Singer messages"""
+    records = [{"STARLINK_ID": f"sat{i}", "PAYLOAD": "x" * 200 + str(i)} for i in range(count)]
+    singer.write_schema("STG_SPACEX_DATA_STARLINK", {"properties": {}}, ["STARLINK_ID"])
+    for record in records:
+        singer.write_record("STG_SPACEX_DATA_STARLINK", record)
+
+@pytest.fixture
+def profiler():
+    """Fixture providing a memory profiler over an in-memory output"""
+    return MemoryProfiler(io.StringIO(), top=5)
+
+def test_profile_reports_stream_memory(profiler):
+    """Test records are counted per stream and the peak is traced while the messages pass through"""
+    with redirect_stdout(profiler), profiler.profile("fetch_starlink"):
+        write_satellites(5000)
+
+    assert profiler.output.getvalue().count('"type": "RECORD"') == 5000
+    stream = profiler.streams[0]
+    assert stream["stream"] == "fetch_starlink"
+    assert stream["records"] == 5000
+    assert stream["records_by_stream"] == {"STG_SPACEX_DATA_STARLINK": 5000}
+    # Each held record is a dict and a 200+ character string
+    assert stream["bytes_per_record"] > 200
+    assert stream["traced_retained_bytes"] < stream["traced_peak_bytes"]
+    assert stream["error"] is None
+
+def test_top_allocations_are_taken_at_the_peak(profiler):
+    """Test the allocation sites are the ones holding memory at the peak, not after the stream"""
+    with redirect_stdout(profiler), profiler.profile("fetch_starlink"):
+        write_satellites(5000)
+
+    top = profiler.streams[0]["top_allocations"]
+    assert len(top) <= 5
+    assert any(site["site"].endswith("test_memory_profile.py:10") for site in top)
+
+def test_failed_stream_is_reported(profiler):
+    """Test a stream raising is still in the report with its error"""
+    with pytest.raises(ValueError):
+        with redirect_stdout(profiler), profiler.profile("fetch_cores"):
+            raise ValueError("API down")
+    assert profiler.streams[0]["records"] == 0
+    assert profiler.streams[0]["bytes_per_record"] is None
+    assert profiler.streams[0]["error"] == "API down"
+
+def test_write_report(profiler, tmp_path):
+    """Test the JSON report holds every stream in run order"""
+    for name in ("fetch_capsules", "fetch_cores"):
+        with redirect_stdout(profiler), profiler.profile(name):
+            write_satellites(10)
+    path = tmp_path / "memory.json"
+    profiler.write_report(str(path))
+
+    report = json.loads(path.read_text())
+    assert [stream["stream"] for stream in report["streams"]] == ["fetch_capsules", "fetch_cores"]
+    assert report["peak_rss_bytes"] == peak_rss_bytes()
+    assert report["tracemalloc_frames"] == 1
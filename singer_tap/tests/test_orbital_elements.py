@@ -0,0 +1,64 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+import numpy as np
+import pytz
+from include.fetch_starlink import StarlinkTap
+from include.orbital_elements import ORBITAL_ELEMENT_COLUMNS, add_orbital_elements, derive_orbital_elements
+
+AS_OF = datetime(2024, 1, 2, 10, 0, 0, tzinfo=pytz.UTC)
+
+@pytest.fixture
+def starlink_tap():
+    tap = StarlinkTap(base_url="https://api.spacexdata.com/v4/", config_path="config_snowflake.json")
+    yield tap
+    tap.close_connection()
+
+def test_elements_of_a_starlink_orbit():
+    """Test the elements of a ~550 km orbit at 15.06 revolutions per day"""
+    elements = derive_orbital_elements([15.06], [0.001], ["2024-01-01T10:00:00"], AS_OF)
+
+    np.testing.assert_allclose(elements["DERIVED_SEMI_MAJOR_AXIS_KM"], [6926.57], atol=0.01)
+    np.testing.assert_allclose(elements["APOGEE_ALTITUDE_KM"], [6926.57 * 1.001 - 6378.137], atol=0.01)
+    np.testing.assert_allclose(elements["PERIGEE_ALTITUDE_KM"], [6926.57 * 0.999 - 6378.137], atol=0.01)
+    np.testing.assert_allclose(elements["ORBITAL_PERIOD_MIN"], [1440 / 15.06])
+    np.testing.assert_allclose(elements["EPOCH_AGE_DAYS"], [1.0])
+
+def test_strings_and_missing_values():
+    """Test string values are parsed and missing ones give None"""
+    records = [
+        {"MEAN_MOTION": "15.5", "ECCENTRICITY": "0", "EPOCH": "2024-01-01T22:00:00.000Z"},
+        {"MEAN_MOTION": None, "ECCENTRICITY": None, "EPOCH": None},
+        {"MEAN_MOTION": 0, "ECCENTRICITY": 0.1, "EPOCH": "not a date"},
+    ]
+    add_orbital_elements(records, AS_OF)
+
+    assert records[0]["ORBITAL_PERIOD_MIN"] == pytest.approx(1440 / 15.5)
+    assert records[0]["APOGEE_ALTITUDE_KM"] == pytest.approx(records[0]["PERIGEE_ALTITUDE_KM"])
+    assert records[0]["EPOCH_AGE_DAYS"] == pytest.approx(0.5)
+    for record in records[1:]:
+        assert all(record[column] is None for column in ORBITAL_ELEMENT_COLUMNS)
+
+def test_fetch_writes_orbital_elements(starlink_tap):
+    """Test every written Starlink record carries the derived columns"""
+    satellites = [
+        {"id": f"sat{i}", "version": "v1.5", "spaceTrack": {"MEAN_MOTION": 15.06, "ECCENTRICITY": 0.0001,
+                                                           "EPOCH": "2024-01-01T10:00:00"}}
+        for i in range(3)
+    ]
+    with patch('requests.get') as mock_get, \
+        patch('singer.write_schema'), \
+        patch('singer.write_record') as mock_write_record, \
+        patch('singer.write_state'):
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = satellites
+        mock_get.return_value = mock_response
+
+        starlink_tap.fetch_starlink()
+
+    records = [call[1]["record"] for call in mock_write_record.call_args_list]
+    assert [record["STARLINK_ID"] for record in records] == ["sat0", "sat1", "sat2"]
+    for record in records:
+        assert record["ORBITAL_PERIOD_MIN"] == pytest.approx(1440 / 15.06)
+        assert record["EPOCH_AGE_DAYS"] > 0
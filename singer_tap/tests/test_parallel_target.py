@@ -0,0 +1,98 @@
+import pytest
+import os
+import threading
+import time
+from contextlib import redirect_stdout
+import singer                                           # type: ignore
+from include.local_duckdb import DuckDBConnection, SingerMessageSink, create_staging_tables
+from include.parallel_target import ParallelTarget
+
+STAGING_DDL_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "db_setup", "V2_0", "V2_0__01_create_staging_tables_structure.sql"
+)
+
+STREAMS = {"STG_SPACEX_DATA_CREW": "CREW_ID", "STG_SPACEX_DATA_SHIPS": "SHIP_ID"}
+
+@pytest.fixture
+def duckdb_conn(tmp_path):
+    """Fixture providing a local mirror with the staging tables created"""
+    conn = DuckDBConnection(str(tmp_path / "spacex_data_dev.duckdb"), "STG_SPACEX_DATA")
+    create_staging_tables(conn.raw, STAGING_DDL_PATH)
+    yield conn
+    conn.close()
+
+def write_interleaved(count):
+    """Write the records of the streams interleaved, like taps running at once"""
+    for stream_name, key in STREAMS.items():
+        singer.write_schema(stream_name, {"type": "object", "properties": {key: {"type": "string"}}}, [key])
+    for i in range(count):
+        for stream_name, key in STREAMS.items():
+            singer.write_record(stream_name, {key: str(i), "NAME": f"{stream_name}-{i}"})
+
+def test_loads_interleaved_streams_in_parallel(duckdb_conn):
+    """Test each stream is loaded by its own worker, the STATE kept once all rows are in"""
+    target = ParallelTarget(duckdb_conn.raw, batch_size=7, queue_size=5)
+    sink = SingerMessageSink(target)
+    with redirect_stdout(sink):
+        write_interleaved(50)
+        singer.write_state({"STG_SPACEX_DATA_SHIPS": {"last_sync": "2024-01-01T00:00:00+00:00"}})
+        # The state barrier waited for the workers to load every record
+        assert target.row_counts == {stream_name: 50 for stream_name in STREAMS}
+    sink.close()
+
+    assert target.state == {"STG_SPACEX_DATA_SHIPS": {"last_sync": "2024-01-01T00:00:00+00:00"}}
+    assert {worker.thread.name for worker in target.workers.values()} == {f"target-{s}" for s in STREAMS}
+    assert not any(worker.thread.is_alive() for worker in target.workers.values())
+    for stream_name, key in STREAMS.items():
+        rows = duckdb_conn.raw.execute(f"SELECT {key}, NAME FROM {stream_name} ORDER BY CAST({key} AS INT)").fetchall()
+        assert rows == [(str(i), f"{stream_name}-{i}") for i in range(50)]
+
+def test_full_queue_holds_the_tap_back(duckdb_conn):
+    """Test a write blocks while the queue of a slow stream is full"""
+    target = ParallelTarget(duckdb_conn.raw, queue_size=2)
+    sink = SingerMessageSink(target)
+    with redirect_stdout(sink):
+        write_interleaved(0)
+    worker = target.workers["STG_SPACEX_DATA_CREW"]
+    target.flush_all()
+    release = threading.Event()
+    process_line = worker.target.process_line
+    worker.target.process_line = lambda line: (release.wait(), process_line(line))
+
+    timer = threading.Timer(0.2, release.set)
+    timer.start()
+    start = time.perf_counter()
+    with redirect_stdout(sink):
+        for i in range(5):
+            singer.write_record("STG_SPACEX_DATA_CREW", {"CREW_ID": str(i)})
+    blocked_seconds = time.perf_counter() - start
+    sink.close()
+    timer.join()
+
+    assert blocked_seconds >= 0.15
+    assert worker.wait_seconds >= 0.15
+    assert target.row_counts["STG_SPACEX_DATA_CREW"] == 5
+
+def test_worker_error_is_raised(duckdb_conn):
+    """Test the error of a worker surfaces in the writing thread and the workers still stop"""
+    target = ParallelTarget(duckdb_conn.raw)
+    sink = SingerMessageSink(target)
+    with redirect_stdout(sink):
+        singer.write_schema("STG_SPACEX_DATA_UNKNOWN", {"type": "object"}, ["ID"])
+        singer.write_record("STG_SPACEX_DATA_UNKNOWN", {"ID": "1"})
+    with pytest.raises(ValueError, match="does not exist"):
+        sink.close()
+    assert not target.workers["STG_SPACEX_DATA_UNKNOWN"].thread.is_alive()
+
+def test_abort_stops_the_workers(duckdb_conn):
+    """Test abort stops the workers of a failed run without loading what they still hold"""
+    target = ParallelTarget(duckdb_conn.raw, batch_size=1000)
+    sink = SingerMessageSink(target)
+    with redirect_stdout(sink):
+        write_interleaved(20)
+    sink.abort()
+
+    assert not any(worker.thread.is_alive() for worker in target.workers.values())
+    for stream_name in STREAMS:
+        assert duckdb_conn.raw.execute(f"SELECT count(*) FROM {stream_name}").fetchone() == (0,)
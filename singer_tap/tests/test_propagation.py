@@ -0,0 +1,88 @@
+import pytest
+import json
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+import numpy as np
+import pytz
+
+sgp4_api = pytest.importorskip("sgp4.api")
+
+from include.fetch_starlink import StarlinkTap
+from include.propagation import ConstellationPropagator, POSITIONS_STREAM, teme_to_geodetic, time_grid
+
+START = datetime(2024, 1, 1, 10, 30, 15, tzinfo=pytz.UTC)
+
+STARLINK_SATELLITE = {
+    "id": "5eed770f096e59000698560d",
+    "spaceTrack": {
+        "TLE_LINE1": "1 44713U 20001A   24001.41666667  .00000001  00000-0  10000-3 0  9999",
+        "TLE_LINE2": "2 44713  53.0000 180.0000 0001000  90.0000 270.0000 15.06000000 12340"
+    }
+}
+
+@pytest.fixture
+def propagation_config(tmp_path):
+    """Fixture providing a Snowflake config with 4 propagation steps of 10 minutes"""
+    with open("config_snowflake.json") as f:
+        config = json.load(f)
+    config.update({"propagation_steps": 4, "propagation_step_seconds": 600})
+    config_path = tmp_path / "config_propagation.json"
+    config_path.write_text(json.dumps(config))
+    return str(config_path)
+
+def test_time_grid_matches_sgp4_jday():
+    """Test the grid starts at the Julian date of the start time"""
+    jd, fr = time_grid(START, 3, 60)
+    assert jd[0] + fr[0] == pytest.approx(sum(sgp4_api.jday(2024, 1, 1, 10, 30, 15)), abs=1e-9)
+    np.testing.assert_allclose(np.diff(fr), 60 / 86400.0)
+
+def test_geodetic_of_a_point_above_the_pole():
+    """Test a position on the z axis is at 90 degrees above the polar radius"""
+    jd, fr = time_grid(START, 1, 60)
+    latitude, _, height = teme_to_geodetic(np.array([[[0.0, 0.0, 7000.0]]]), jd, fr)
+    assert latitude[0, 0] == pytest.approx(90.0)
+    assert height[0, 0] == pytest.approx(7000.0 - 6356.752, abs=0.01)
+
+def test_propagate_constellation():
+    """Test positions of a ~550 km orbit and satellites without elements are skipped"""
+    propagator = ConstellationPropagator(START, steps=10, step_seconds=300)
+    positions = propagator.propagate([STARLINK_SATELLITE, {"id": "no_tle", "spaceTrack": {}}])
+
+    assert positions["STARLINK_ID"] == [STARLINK_SATELLITE["id"]]
+    assert positions["LATITUDE"].shape == (1, 10)
+    assert np.all(np.abs(positions["LATITUDE"]) <= 53.5)
+    assert np.all((positions["HEIGHT_KM"] > 530) & (positions["HEIGHT_KM"] < 580))
+    assert propagator.skipped == ["no_tle"]
+
+def test_records_hold_json_arrays():
+    """Test one record per satellite with one JSON value per step"""
+    propagator = ConstellationPropagator(START, steps=5, step_seconds=60)
+    records = list(propagator.records([STARLINK_SATELLITE], "2024-01-01T10:30:15+00:00"))
+
+    assert len(records) == 1
+    assert records[0]["START_TIME"] == START.isoformat()
+    for column in ("LATITUDE", "LONGITUDE", "HEIGHT_KM"):
+        assert len(json.loads(records[0][column])) == 5
+
+def test_fetch_writes_positions_stream(propagation_config):
+    """Test the positions stream is written only when propagation_steps is set"""
+    tap = StarlinkTap(base_url="https://api.spacexdata.com/v4/", config_path=propagation_config)
+    with patch('requests.get') as mock_get, \
+        patch('singer.write_schema') as mock_write_schema, \
+        patch('singer.write_record') as mock_write_record, \
+        patch('singer.write_state'):
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = [STARLINK_SATELLITE]
+        mock_get.return_value = mock_response
+
+        tap.fetch_starlink()
+    tap.close_connection()
+
+    schemas = [call[1]["stream_name"] for call in mock_write_schema.call_args_list]
+    positions = [call[1]["record"] for call in mock_write_record.call_args_list
+                 if call[1]["stream_name"] == POSITIONS_STREAM]
+    assert POSITIONS_STREAM in schemas
+    assert len(positions) == 1
+    assert positions[0]["STEP_SECONDS"] == 600
+    assert len(json.loads(positions[0]["HEIGHT_KM"])) == 4
@@ -0,0 +1,173 @@
+import pytest
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+import duckdb
+from include.connections import STAGING_DDL_PATH
+from include.local_duckdb import create_staging_tables
+from include.query_api import ExtractStore, QueryAPI, ResponseCache
+
+LAUNCHES = [
+    ("launch_1", "FalconSat", "falcon1", json.dumps([{"core": "core_1", "reused": False}]), json.dumps([]), 1),
+    ("launch_2", "Crew-1", "falcon9", json.dumps([{"core": "core_2", "reused": True}]), json.dumps(["payload_2"]), 2),
+    ("launch_3", "Starlink-1", "falcon9", json.dumps([{"core": "core_2", "reused": True}]), json.dumps([]), 3),
+]
+
+@pytest.fixture
+def extract(tmp_path):
+    """Fixture providing a duckdb extract with launches, rockets and payloads"""
+    database = str(tmp_path / "spacex_data_dev.duckdb")
+    conn = duckdb.connect(database)
+    create_staging_tables(conn, STAGING_DDL_PATH)
+    conn.executemany(
+        "INSERT INTO STG_SPACEX_DATA_LAUNCHES (LAUNCH_ID, NAME, ROCKET, CORES, PAYLOADS, _SDC_SEQUENCE) VALUES (?, ?, ?, ?, ?, ?)",
+        LAUNCHES
+    )
+    conn.execute(
+        "INSERT INTO STG_SPACEX_DATA_LAUNCHES (LAUNCH_ID, NAME, _SDC_SEQUENCE, _SDC_DELETED_AT) "
+        "VALUES ('launch_4', 'Deleted', 4, '2024-01-01')"
+    )
+    conn.execute("INSERT INTO STG_SPACEX_DATA_ROCKETS (ROCKET_ID, NAME, COST_PER_LAUNCH) VALUES "
+                 "('falcon1', 'Falcon 1', 6700000), ('falcon9', 'Falcon 9', 50000000)")
+    conn.execute("INSERT INTO STG_SPACEX_DATA_PAYLOADS (PAYLOAD_ID, LAUNCH, MASS_KG) VALUES ('payload_2', 'launch_2', 12500)")
+    conn.close()
+    return database
+
+@pytest.fixture
+def api(extract):
+    """Fixture providing the query API over the extract"""
+    store = ExtractStore(database=extract)
+    store.load()
+    return QueryAPI(store, ResponseCache(max_entries=16, ttl_seconds=60))
+
+def test_pages_skip_deleted_records(api):
+    """Test pagination over the records not marked deleted"""
+    page = api.respond("GET", "/launches?limit=2").json()
+
+    assert page["total"] == 3
+    assert [record["LAUNCH_ID"] for record in page["data"]] == ["launch_1", "launch_2"]
+    assert page["data"][1]["NAME"] == "Crew-1"
+    assert "RAW_DATA" not in page["data"][0] and "_SDC_SEQUENCE" not in page["data"][0]
+
+    next_page = api.respond("GET", page["next"]).json()
+    assert [record["LAUNCH_ID"] for record in next_page["data"]] == ["launch_3"]
+    assert next_page["next"] is None
+
+def test_filters_records_and_errors(api):
+    """Test record lookup, column filters and error statuses"""
+    assert api.respond("GET", "/launches/launch_3").json()["NAME"] == "Starlink-1"
+    assert api.respond("GET", "/launches?ROCKET=falcon9").json()["total"] == 2
+    assert api.respond("GET", "/launches/launch_4").status == 404
+    assert api.respond("GET", "/payloads").status == 404
+    assert api.respond("GET", "/launches?limit=0").status == 400
+    assert api.respond("GET", "/launches?COLOR=red").status == 400
+    assert api.respond("POST", "/launches").status == 405
+
+def test_launch_costs(api):
+    """Test the launch cost facts are computed from the extract"""
+    costs = api.respond("GET", "/launch_costs/launch_2").json()
+
+    assert costs["rocket_id"] == "falcon9"
+    assert costs["estimated_launch_cost"] == pytest.approx(50000000 * 0.7)
+    assert costs["cost_per_kg"] == pytest.approx(50000000 * 0.7 / 12500)
+    assert api.respond("GET", "/launch_costs/launch_1").json()["cost_per_kg"] is None
+
+def test_etag_and_cache(api):
+    """Test responses are cached and revalidated with If-None-Match"""
+    first = api.respond("GET", "/rockets")
+    etag = first.headers["ETag"]
+
+    assert api.respond("GET", "/rockets") is first
+    assert api.cache.hits == 1
+    assert api.respond("GET", "/rockets", {"if-none-match": etag}).status == 304
+    assert api.respond("GET", "/rockets", {"if-none-match": '"other"'}).status == 200
+
+def test_cache_expiry_and_eviction():
+    """Test entries expire after the TTL and the least recently used is evicted"""
+    now = [0.0]
+    cache = ResponseCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    now[0] = 11.0
+    assert cache.get("c") is None
+
+def test_parquet_extract_and_reload(extract, tmp_path):
+    """Test serving a directory of Parquet files, reloaded when they change"""
+    parquet_dir = tmp_path / "parquet"
+    parquet_dir.mkdir()
+    conn = duckdb.connect(extract, read_only=True)
+    conn.execute(f"COPY STG_SPACEX_DATA.STG_SPACEX_DATA_ROCKETS TO '{parquet_dir}/STG_SPACEX_DATA_ROCKETS.parquet'")
+    store = ExtractStore(parquet_dir=str(parquet_dir))
+    store.load()
+    assert [record["ROCKET_ID"] for record in store.records["rockets"]] == ["falcon1", "falcon9"]
+    assert store.records["launches"] == []
+    assert not store.refresh()
+
+    conn.execute(f"COPY (SELECT * FROM STG_SPACEX_DATA.STG_SPACEX_DATA_ROCKETS WHERE ROCKET_ID = 'falcon9') "
+                 f"TO '{parquet_dir}/STG_SPACEX_DATA_ROCKETS.parquet'")
+    conn.close()
+    os.utime(parquet_dir / "STG_SPACEX_DATA_ROCKETS.parquet", (store.version + 1, store.version + 1))
+    assert store.refresh()
+    assert len(store.records["rockets"]) == 1
+
+@pytest.fixture
+def server(api):
+    """Fixture running the HTTP server of the API on a free port in a thread"""
+    server = api.server("127.0.0.1", 0, timeout_seconds=0.5)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def exchange(server, request: bytes) -> bytes:
+    """Send raw bytes and read until the server closes the connection"""
+    with socket.create_connection(server.server_address, timeout=5) as sock:
+        sock.sendall(request)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+def test_http_keep_alive(server):
+    """Test two requests on one HTTP/1.1 connection to the server"""
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    connection.request("GET", "/cores")
+    response_1 = connection.getresponse()
+    body_1 = json.loads(response_1.read())
+    connection.request("GET", "/launches/launch_1", headers={"Connection": "close"})
+    response_2 = connection.getresponse()
+    body_2 = json.loads(response_2.read())
+    connection.close()
+
+    assert response_1.status == response_2.status == 200
+    assert response_1.getheader("Connection") is None and response_2.getheader("Connection") == "close"
+    assert body_1["total"] == 0
+    assert body_2["NAME"] == "FalconSat"
+
+def test_http_rejects_malformed_requests_and_bodies(server):
+    """Test a malformed request line and a request with a body get a 400 and the connection is closed"""
+    response = exchange(server, b"GARBAGE\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 400 ") and b"Connection: close" in response
+
+    # The body is not parsed as a second request
+    response = exchange(server, b"POST /cores HTTP/1.1\r\nHost: localhost\r\nContent-Length: 34\r\n\r\n"
+                                b"GET /launches/launch_1 HTTP/1.1\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert response.count(b"HTTP/1.1 ") == 1 and b"Connection: close" in response
+
+def test_http_closes_idle_connections(server):
+    """Test a connection that sends nothing is closed after the timeout"""
+    start = time.monotonic()
+    assert exchange(server, b"GET /cores HTTP/1.1\r\nHost: localhost\r\n") == b""
+    assert time.monotonic() - start < 4
@@ -0,0 +1,90 @@
+import pytest
+import json
+import contextlib
+from unittest.mock import patch, MagicMock
+from include.connections import RAW_BLOBS_DDL_PATH, STAGING_DDL_PATH
+from include.fetch_cores import CoresTap
+from include.local_duckdb import DuckDBConnection, DuckDBTarget, SingerMessageSink, create_staging_tables
+from include.raw_data_store import RawDataStore, raw_data_hash
+
+SAMPLE_CORE_DATA = [
+    {"id": "core1", "serial": "B1049", "block": 5, "launches": ["launch1", "launch2"]},
+    {"id": "core2", "serial": "B1051", "block": 5, "launches": []},
+]
+
+@pytest.fixture
+def blob_config(tmp_path):
+    """Fixture providing a duckdb config storing RAW_DATA in the blob table"""
+    config = {
+        "type": "duckdb",
+        "database": str(tmp_path / "spacex_data_dev.duckdb"),
+        "schema": "STG_SPACEX_DATA",
+        "raw_data_store": "blob"
+    }
+    conn = DuckDBConnection(config["database"], config["schema"])
+    create_staging_tables(conn.raw, STAGING_DDL_PATH)
+    create_staging_tables(conn.raw, RAW_BLOBS_DDL_PATH)
+    conn.close()
+
+    config_path = tmp_path / "config_duckdb.json"
+    config_path.write_text(json.dumps(config))
+    return str(config_path)
+
+def run_cores_tap(config_path, cores_data):
+    """Fetch cores into the duckdb database of the config"""
+    tap = CoresTap(base_url="https://api.spacexdata.com/v4/", config_path=config_path)
+    sink = SingerMessageSink(DuckDBTarget(tap.conn.raw))
+
+    with patch('requests.get') as mock_get, contextlib.redirect_stdout(sink):
+        mock_response = MagicMock()
+        mock_response.json.return_value = cores_data
+        mock_get.return_value = mock_response
+        tap.fetch_cores()
+    sink.close()
+    return tap
+
+def test_raw_data_hash_ignores_key_order():
+    """Test the payload hash is stable across key order"""
+    assert raw_data_hash({"a": 1, "b": [1, 2]}) == raw_data_hash({"b": [1, 2], "a": 1})
+    assert raw_data_hash({"a": 1}) != raw_data_hash({"a": 2})
+
+def test_inline_mode_keeps_json():
+    """Test the default mode stores the JSON payload"""
+    store = RawDataStore(conn=None)
+    assert store.raw_data("STG_SPACEX_DATA_CORES", {"id": "core1"}) == '{"id": "core1"}'
+
+def test_unknown_mode_is_rejected():
+    """Test an unknown raw_data_store value is rejected"""
+    with pytest.raises(ValueError):
+        RawDataStore(conn=None, mode="s3")
+
+def test_blob_mode_deduplicates_across_runs(blob_config):
+    """Test staging rows carry the hash and each payload is stored once"""
+    first_run = run_cores_tap(blob_config, SAMPLE_CORE_DATA)
+    assert first_run.raw_data_store.blobs_written == 2
+    first_run.close_connection()
+
+    # Unchanged core1, updated core2
+    updated = [SAMPLE_CORE_DATA[0], dict(SAMPLE_CORE_DATA[1], block=6)]
+    second_run = run_cores_tap(blob_config, updated)
+    assert second_run.raw_data_store.blobs_written == 1
+    assert second_run.raw_data_store.blobs_skipped == 1
+
+    cursor = second_run.conn.cursor()
+    cursor.execute("SELECT CORE_ID, RAW_DATA FROM STG_SPACEX_DATA_CORES ORDER BY CORE_ID")
+    assert cursor.fetchall() == [
+        ("core1", raw_data_hash(SAMPLE_CORE_DATA[0])),
+        ("core2", raw_data_hash(updated[1])),
+    ]
+
+    cursor.execute("""
+        SELECT b.RAW_DATA
+        FROM STG_SPACEX_DATA_CORES c
+        JOIN STG_SPACEX_DATA_RAW_BLOBS b ON b.RAW_DATA_HASH = c.RAW_DATA
+        WHERE c.CORE_ID = 'core2'
+    """)
+    assert json.loads(cursor.fetchone()[0]) == updated[1]
+
+    cursor.execute("SELECT COUNT(*) FROM STG_SPACEX_DATA_RAW_BLOBS")
+    assert cursor.fetchone()[0] == 3
+    second_run.close_connection()
@@ -0,0 +1,114 @@
+import pytest
+import io
+import json
+import singer
+from contextlib import redirect_stdout
+from include.relationship_graph import RelationshipGraph, RelationshipGraphBuilder, RelationshipGraphTee
+
+LAUNCHES = [
+    {
+        "LAUNCH_ID": "crs_20",
+        "CORES": json.dumps([{"core": "b1019", "reused": True, "landing_success": True}]),
+        "PAYLOADS": json.dumps(["dragon_crs_20"]),
+        "CREW": json.dumps([]),
+        "SHIPS": json.dumps(["ocisly", "go_searcher"]),
+        "CAPSULES": json.dumps(["c112"]),
+    },
+    {
+        "LAUNCH_ID": "demo_2",
+        "CORES": json.dumps([{"core": "b1058", "reused": False}]),
+        "PAYLOADS": json.dumps(["crew_dragon_demo_2"]),
+        "CREW": json.dumps([{"crew": "hurley", "role": "Commander"}, {"crew": "behnken", "role": "Joint Operations Commander"}]),
+        "SHIPS": json.dumps(["ocisly"]),
+        "CAPSULES": json.dumps([]),
+    },
+    {
+        "LAUNCH_ID": "anasis_2",
+        "CORES": json.dumps([{"core": "b1058", "reused": True}, {"core": None}]),
+        "PAYLOADS": json.dumps(["anasis_2"]),
+        "CREW": None,
+        "SHIPS": json.dumps([]),
+        "CAPSULES": json.dumps([]),
+    },
+]
+CORES = [
+    {"CORE_ID": "b1058", "LAUNCHES": json.dumps(["demo_2", "anasis_2"])},
+    {"CORE_ID": "b1019", "LAUNCHES": json.dumps(["crs_20"])},
+]
+PAYLOADS = [{"PAYLOAD_ID": "anasis_2", "LAUNCH": "anasis_2"}]
+CAPSULES = [{"CAPSULE_ID": "c112", "LAUNCHES": ["crs_20"]}]
+
+@pytest.fixture
+def graph():
+    """Fixture providing a graph of three launches and the streams pointing back at them"""
+    streams = (
+        [("STG_SPACEX_DATA_LAUNCHES", record) for record in LAUNCHES]
+        + [("STG_SPACEX_DATA_CORES", record) for record in CORES]
+        + [("STG_SPACEX_DATA_PAYLOADS", record) for record in PAYLOADS]
+        + [("STG_SPACEX_DATA_CAPSULES", record) for record in CAPSULES]
+        + [("STG_SPACEX_DATA_ROCKETS", {"ROCKET_ID": "falcon9"})]
+    )
+    return RelationshipGraph.from_records(streams)
+
+def test_relationships_are_stored_once(graph):
+    """Test a relationship seen from both streams is one edge and ignored streams add no nodes"""
+    assert graph.node_counts() == {
+        "launch": 3, "core": 2, "payload": 3, "crew": 2, "ship": 2, "capsule": 1
+    }
+    assert graph.neighbors("core", "b1058", "launch") == ["demo_2", "anasis_2"]
+    assert graph.neighbors("launch", "anasis_2", "core") == ["b1058"]
+    assert graph.neighbors("capsule", "c112", "launch") == ["crs_20"]
+
+def test_delete_marker_drops_the_node_and_its_edges():
+    """Test the node of a delete marker is left out with the edges of the other streams to it"""
+    streams = (
+        [("STG_SPACEX_DATA_LAUNCHES", record) for record in LAUNCHES]
+        + [("STG_SPACEX_DATA_CORES", record) for record in CORES]
+        + [("STG_SPACEX_DATA_CORES", {"CORE_ID": "b1058", "_sdc_deleted_at": "2024-01-02T12:00:00+00:00"})]
+    )
+    graph = RelationshipGraph.from_records(streams)
+
+    assert graph.node_counts()["core"] == 1
+    assert graph.neighbors("core", "b1058", "launch") == []
+    assert graph.neighbors("launch", "demo_2", "core") == []
+    assert graph.neighbors("launch", "crs_20", "core") == ["b1019"]
+    assert graph.neighbors("core", "b1019", "launch") == ["crs_20"]
+
+def test_launches_of_a_core(graph):
+    """Test all launches a core flew with their payloads and recovery ships"""
+    launches = graph.launches_of("core", "b1058")
+
+    assert list(launches) == ["demo_2", "anasis_2"]
+    assert launches["demo_2"]["payload"] == ["crew_dragon_demo_2"]
+    assert launches["demo_2"]["ship"] == ["ocisly"]
+    assert sorted(launches["demo_2"]["crew"]) == ["behnken", "hurley"]
+    assert launches["anasis_2"]["ship"] == []
+
+def test_unknown_nodes_have_no_neighbors(graph):
+    """Test unknown IDs and relationships return empty lists"""
+    assert graph.neighbors("core", "b9999", "launch") == []
+    assert graph.neighbors("crew", "hurley", "ship") == []
+    assert graph.launches_of("ship", "unknown") == {}
+
+def test_save_and_load(graph, tmp_path):
+    """Test the graph reloads from its file with the same traversals"""
+    path = tmp_path / "graph.npz"
+    graph.save(str(path))
+    loaded = RelationshipGraph.load(str(path))
+
+    assert loaded.node_counts() == graph.node_counts()
+    assert loaded.launches_of("ship", "ocisly") == graph.launches_of("ship", "ocisly")
+
+def test_tee_builds_graph_from_singer_output():
+    """Test the tee passes messages through and builds the graph from the records"""
+    output = io.StringIO()
+    tee = RelationshipGraphTee(output, RelationshipGraphBuilder())
+    with redirect_stdout(tee):
+        singer.write_schema("STG_SPACEX_DATA_CORES", {"properties": {}}, ["CORE_ID"])
+        for record in CORES:
+            singer.write_record("STG_SPACEX_DATA_CORES", record)
+        singer.write_record("STG_SPACEX_DATA_ROCKETS", {"ROCKET_ID": "falcon9"})
+    graph = tee.build()
+
+    assert len(output.getvalue().splitlines()) == 4
+    assert graph.neighbors("launch", "crs_20", "core") == ["b1019"]
@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from include.fetch_rockets import RocketsTap
+from include.fetch_starlink import STARLINK_SCHEMA
+from include.schema_drift import SchemaDriftDetector
+from include.schema_registry import StreamSchema
+
+STARLINK_PAYLOAD = {
+    "id": "5eed770f096e59000698560d",
+    "version": "v1.0",
+    "launch": "5eb87d46ffd86e000604b388",
+    "longitude": -55.0,
+    "latitude": 37.7,
+    "height_km": 550.5,
+    "velocity_kms": 7.65,
+    "spaceTrack": {"OBJECT_NAME": "STARLINK-1234", "MEAN_MOTION": 15.06}
+}
+
+@pytest.fixture
+def rockets_tap():
+    tap = RocketsTap(base_url="https://api.spacexdata.com/v4/", config_path="config_snowflake.json")
+    yield tap
+    tap.close_connection()
+
+def test_mapped_payload_has_no_drift():
+    """Test a payload matching the mapping reports nothing"""
+    detector = SchemaDriftDetector(STARLINK_SCHEMA)
+    detector.track(STARLINK_PAYLOAD)
+
+    assert not detector.has_drift()
+    assert detector.report() == {
+        "stream": "STG_SPACEX_DATA_STARLINK",
+        "records": 1,
+        "unmapped_paths": {},
+        "missing_paths": []
+    }
+
+def test_new_and_renamed_fields_are_reported():
+    """Test added keys are counted and renamed keys show as missing"""
+    detector = SchemaDriftDetector(STARLINK_SCHEMA)
+    renamed = dict(STARLINK_PAYLOAD, velocity_kmh=27540)
+    del renamed["velocity_kms"]
+
+    detector.track(renamed)
+    detector.track(dict(renamed, constellation="gen2"))
+
+    report = detector.report()
+    assert detector.has_drift()
+    assert report["unmapped_paths"] == {"constellation": 1, "velocity_kmh": 2}
+    assert report["missing_paths"] == ["velocity_kms"]
+
+def test_mapped_subtrees_are_not_walked():
+    """Test keys below a path stored as a JSON column are not drift"""
+    detector = SchemaDriftDetector(STARLINK_SCHEMA)
+    detector.track(dict(STARLINK_PAYLOAD, spaceTrack={"NEW_TLE_FIELD": 1}))
+    assert detector.report()["unmapped_paths"] == {}
+
+def test_nested_paths_and_lists():
+    """Test dotted source paths and keys of list items"""
+    stream_schema = StreamSchema(
+        "TEST", {"type": "object"}, ["ID"],
+        source_paths=["id", "height.meters", "engines.type"]
+    )
+    detector = SchemaDriftDetector(stream_schema)
+    detector.track({
+        "id": "r1",
+        "height": {"meters": 70, "feet": 229},
+        "engines": [{"type": "merlin"}, {"type": "merlin", "isp": 282}]
+    })
+
+    assert detector.report()["unmapped_paths"] == {"engines.isp": 1, "height.feet": 1}
+
+def test_fetch_logs_drift_report(rockets_tap, capfd):
+    """Test a fetch run logs one drift report for the stream"""
+    rocket = {
+        "id": "rocket1", "name": "Falcon 9", "height": {"meters": 70, "feet": 229.6},
+        "diameter": {"meters": 3.7, "feet": 12}, "mass": {"kg": 549054, "lb": 1207920},
+        "new_field": True
+    }
+    with patch('requests.get') as mock_get, \
+        patch('singer.write_schema'), \
+        patch('singer.write_record'), \
+        patch('singer.write_state'):
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = [rocket, rocket]
+        mock_get.return_value = mock_response
+
+        rockets_tap.fetch_rockets()
+
+    logged = capfd.readouterr().err
+    assert logged.count("Schema drift detected") == 1
+    assert '"unmapped_paths": {"new_field": 2}' in logged
+    assert rockets_tap.drift_detectors == {}
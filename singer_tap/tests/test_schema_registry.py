@@ -0,0 +1,92 @@
+import pytest
+import json
+from unittest.mock import patch, MagicMock
+from include.fetch_cores import CoresTap, CORES_SCHEMA
+from include.schema_registry import (
+    SCHEMAS,
+    RecordValidator,
+    SchemaValidationError,
+    StreamSchema,
+    get_schema,
+)
+
+SAMPLE_CORE_DATA = [
+    {"id": "core1", "serial": "B1049", "block": 5, "status": "active", "reuse_count": 3, "launches": []},
+    {"id": "core2", "serial": "B1051", "block": "five", "status": "active", "reuse_count": 2, "launches": []},
+]
+
+@pytest.fixture
+def validating_cores_tap(tmp_path):
+    """Fixture providing a cores tap validating every record"""
+    config_path = tmp_path / "config_stand_in.json"
+    config_path.write_text(json.dumps({"type": "stand_in", "validation_sample_rate": 1}))
+    tap = CoresTap(base_url="https://api.spacexdata.com/v4/", config_path=str(config_path))
+    yield tap
+    tap.close_connection()
+
+def test_fetch_modules_register_their_schema():
+    """Test the fetch modules register their stream schema at import"""
+    assert get_schema("STG_SPACEX_DATA_CORES") is CORES_SCHEMA
+    assert CORES_SCHEMA.key_properties == ["CORE_ID"]
+    assert "STG_SPACEX_DATA_CORES" in SCHEMAS
+
+def test_get_schema_unknown_stream():
+    """Test an unregistered stream is rejected"""
+    with pytest.raises(ValueError) as exc_info:
+        get_schema("STG_SPACEX_DATA_UNKNOWN")
+    assert "No schema registered" in str(exc_info.value)
+
+def test_validator_is_compiled_once():
+    """Test the compiled validator is cached on the stream schema"""
+    stream_schema = StreamSchema("TEST", {"type": "object", "properties": {}}, ["ID"])
+    assert stream_schema.validator is stream_schema.validator
+
+def test_validate_rejects_invalid_record():
+    """Test a record of the wrong type raises SchemaValidationError"""
+    CORES_SCHEMA.validate({"CORE_ID": "core1", "BLOCK": 5})
+
+    with pytest.raises(SchemaValidationError) as exc_info:
+        CORES_SCHEMA.validate({"CORE_ID": "core1", "BLOCK": "five"})
+    assert "STG_SPACEX_DATA_CORES" in str(exc_info.value)
+
+def test_record_validator_sampling():
+    """Test only the sampled share of records is validated"""
+    validator = RecordValidator(CORES_SCHEMA, sample_rate=0.25)
+    for _ in range(10):
+        validator.validate({"CORE_ID": "core1"})
+
+    assert validator.records_seen == 10
+    assert validator.records_validated == 3
+
+def test_record_validator_disabled_by_default():
+    """Test nothing is validated without a sample rate"""
+    validator = RecordValidator(CORES_SCHEMA)
+    validator.validate({"CORE_ID": "core1", "BLOCK": "five"})
+    assert validator.records_validated == 0
+
+def test_record_validator_rejects_bad_rate():
+    """Test sample rates outside 0..1 are rejected"""
+    with pytest.raises(ValueError):
+        RecordValidator(CORES_SCHEMA, sample_rate=2)
+
+def test_invalid_records_are_logged_and_skipped(validating_cores_tap):
+    """Test invalid records go to the load errors table instead of the target"""
+    with patch('requests.get') as mock_get, \
+        patch('singer.write_schema'), \
+        patch('singer.write_record') as mock_write_record, \
+        patch('singer.write_state'):
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = SAMPLE_CORE_DATA
+        mock_get.return_value = mock_response
+
+        validating_cores_tap.fetch_cores()
+
+    assert mock_write_record.call_count == 1
+    assert mock_write_record.call_args[1]['record']['CORE_ID'] == "core1"
+
+    cursor = validating_cores_tap.conn.cursor()
+    cursor.execute("SELECT TABLE_NAME, ERROR_MESSAGE FROM STG_SPACEX_DATA_LOAD_ERRORS")
+    [(table_name, error_message)] = cursor.fetchall()
+    assert table_name == "STG_SPACEX_DATA_CORES"
+    assert error_message.startswith("Data transformation error: STG_SPACEX_DATA_CORES")
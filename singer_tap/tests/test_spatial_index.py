@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+from include.spatial_index import SphericalGridIndex, great_circle_km, unit_vectors
+
+LAUNCHPADS = [
+    {"LAUNCHPAD_ID": "ccsfs_slc_40", "LATITUDE": 28.5618571, "LONGITUDE": -80.577366},
+    {"LAUNCHPAD_ID": "vafb_slc_4e", "LATITUDE": 34.632093, "LONGITUDE": -120.610829},
+]
+LANDPADS = [
+    {"LANDPAD_ID": "lz_1", "LATITUDE": 28.485833, "LONGITUDE": -80.544444},
+    {"LANDPAD_ID": "ocisly", "LATITUDE": None, "LONGITUDE": None},
+]
+STARLINK = [
+    {"STARLINK_ID": "over_florida", "LATITUDE": 29.0, "LONGITUDE": -80.0},
+    {"STARLINK_ID": "over_california", "LATITUDE": 35.0, "LONGITUDE": -121.0},
+    {"STARLINK_ID": "antimeridian_east", "LATITUDE": 0.0, "LONGITUDE": 179.9},
+    {"STARLINK_ID": "antimeridian_west", "LATITUDE": 0.0, "LONGITUDE": -179.9},
+    {"STARLINK_ID": "north_pole", "LATITUDE": 89.99, "LONGITUDE": 10.0},
+]
+
+@pytest.fixture
+def index():
+    """Fixture providing an index of pads and satellites"""
+    return SphericalGridIndex.from_records(launchpad=LAUNCHPADS, landpad=LANDPADS, starlink=STARLINK)
+
+def test_points_without_position_are_skipped(index):
+    """Test records without coordinates are left out of the index"""
+    assert len(index) == 8
+    assert "ocisly" not in index.position
+    assert index.location("lz_1") == pytest.approx((28.485833, -80.544444))
+
+def test_satellites_within_radius_of_a_pad(index):
+    """Test a radius query around a pad filtered on the satellites"""
+    latitude, longitude = index.location("ccsfs_slc_40")
+    found = index.within(latitude, longitude, 100, kind="starlink")
+
+    assert [point_id for point_id, _ in found] == ["over_florida"]
+    assert found[0][1] == pytest.approx(74.4, abs=0.1)
+
+def test_queries_across_the_antimeridian_and_pole(index):
+    """Test neighbours are found across the longitude seam and over the pole"""
+    found = index.within(0.0, 180.0, 50)
+    assert sorted(point_id for point_id, _ in found) == ["antimeridian_east", "antimeridian_west"]
+    assert index.nearest(89.99, -170.0)[0][0] == "north_pole"
+
+def test_nearest_is_sorted_by_distance(index):
+    """Test the k nearest points of a pad, nearest first"""
+    nearest = index.nearest(28.5618571, -80.577366, k=3)
+
+    assert [point_id for point_id, _ in nearest] == ["ccsfs_slc_40", "lz_1", "over_florida"]
+    assert [distance for _, distance in nearest] == sorted(distance for _, distance in nearest)
+
+def test_matches_brute_force():
+    """Test radius queries return exactly the points a full scan finds"""
+    rng = np.random.default_rng(7)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, 2000)))
+    longitudes = rng.uniform(-180, 180, 2000)
+    ids = [str(i) for i in range(2000)]
+    index = SphericalGridIndex(ids, latitudes, longitudes, cell_km=150)
+    vectors = unit_vectors(latitudes, longitudes)
+
+    for latitude, longitude, radius_km in [(0, 0, 800), (60, 170, 1500), (-89, 0, 500), (10, -179.5, 3000)]:
+        distances = great_circle_km(vectors, unit_vectors([latitude], [longitude])[0])
+        expected = sorted(str(i) for i in np.flatnonzero(distances <= radius_km))
+        assert sorted(point_id for point_id, _ in index.within(latitude, longitude, radius_km)) == expected
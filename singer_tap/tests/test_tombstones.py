@@ -0,0 +1,106 @@
+import pytest
+import io
+import json
+import os
+from contextlib import redirect_stdout
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+import pytz                                             # type: ignore
+import singer                                           # type: ignore
+from include.fetch_crew import CrewTap
+from include.local_duckdb import DuckDBConnection, DuckDBTarget, SingerMessageSink, create_staging_tables
+from include.tombstones import KeySetStore, key_array, vanished_keys, write_delete_markers
+
+STAGING_DDL_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "db_setup", "V2_0", "V2_0__01_create_staging_tables_structure.sql"
+)
+STREAM = "STG_SPACEX_DATA_CREW"
+DELETED_AT = datetime(2024, 1, 2, 12, 0, 0, tzinfo=pytz.UTC)
+
+@pytest.fixture
+def store(tmp_path):
+    """Fixture providing an empty key set store"""
+    return KeySetStore(str(tmp_path / "key_sets"))
+
+def markers(output):
+    return [
+        json.loads(line)["record"] for line in output.getvalue().splitlines()
+        if "_sdc_deleted_at" in line
+    ]
+
+def test_key_sets_are_sorted_and_diffed(store):
+    """Test key sets are stored as sorted arrays and diffed against the previous run"""
+    keys = key_array(["b", "a", None, "c"])
+    assert keys.tolist() == [b"a", b"b", b"c"]
+
+    store.save(STREAM, keys)
+    assert store.load(STREAM).tolist() == [b"a", b"b", b"c"]
+    assert store.load("STG_SPACEX_DATA_SHIPS") is None
+    assert vanished_keys(store.load(STREAM), key_array(["c", "d", "a"])).tolist() == [b"b"]
+    assert vanished_keys(store.load(STREAM), key_array(["0", "b"])).tolist() == [b"a", b"c"]
+
+def test_delete_markers_for_vanished_keys(store):
+    """Test a key missing from a run gets a delete marker, the first run and an empty run none"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        assert write_delete_markers(store, STREAM, "CREW_ID", ["a", "b", "c"], DELETED_AT) == 0
+        assert store.commit() == [STREAM]
+        assert write_delete_markers(store, STREAM, "CREW_ID", ["a", "c", "d"], DELETED_AT) == 1
+        assert store.commit() == [STREAM]
+        # An empty collection is an API failure, not a mass deletion
+        assert write_delete_markers(store, STREAM, "CREW_ID", [], DELETED_AT) == 0
+        assert store.commit() == []
+
+    assert markers(output) == [{"CREW_ID": "b", "_sdc_deleted_at": "2024-01-02T12:00:00+00:00"}]
+    assert store.load(STREAM).tolist() == [b"a", b"c", b"d"]
+
+def test_staged_keys_wait_for_commit(store):
+    """Test the keys of a run that failed before the commit are discarded and the next run diffs again"""
+    store.save(STREAM, key_array(["a", "b"]))
+    with redirect_stdout(io.StringIO()):
+        assert write_delete_markers(store, STREAM, "CREW_ID", ["b"], DELETED_AT) == 1
+        assert store.load(STREAM).tolist() == [b"a", b"b"]
+        store.discard()
+        assert write_delete_markers(store, STREAM, "CREW_ID", ["b"], DELETED_AT) == 1
+    assert store.commit() == [STREAM]
+    assert store.load(STREAM).tolist() == [b"b"]
+
+def test_tap_marks_removed_crew_deleted(tmp_path):
+    """Test a crew member gone from the API since the previous run is marked deleted"""
+    with open("config_snowflake.json") as f:
+        config = json.load(f)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(dict(config, key_set_dir=str(tmp_path / "key_sets"))))
+    crew_tap = CrewTap(base_url="https://api.spacexdata.com/v4/", config_path=str(config_path))
+
+    output = io.StringIO()
+    with patch("requests.get") as mock_get, redirect_stdout(output):
+        for crew in ([{"id": "a"}, {"id": "b"}], [{"id": "b"}]):
+            mock_get.return_value = MagicMock(status_code=200, **{"json.return_value": crew})
+            crew_tap.fetch_crew()
+            crew_tap.key_set_store.commit()
+
+    [marker] = markers(output)
+    assert marker["CREW_ID"] == "a"
+
+def test_duckdb_target_stamps_the_deleted_row(tmp_path):
+    """Test a delete marker sets _SDC_DELETED_AT and _SDC_EXTRACTED_AT of the row and keeps its columns"""
+    conn = DuckDBConnection(str(tmp_path / "spacex_data_dev.duckdb"), "STG_SPACEX_DATA")
+    create_staging_tables(conn.raw, STAGING_DDL_PATH)
+    sink = SingerMessageSink(DuckDBTarget(conn.raw))
+    with redirect_stdout(sink):
+        singer.write_schema(STREAM, {"type": "object"}, ["CREW_ID"])
+        singer.write_record(STREAM, {"CREW_ID": "a", "NAME": "Robert Behnken"})
+        singer.write_record(STREAM, {"CREW_ID": "b", "NAME": "Douglas Hurley"})
+        singer.write_record(
+            STREAM, {"CREW_ID": "a", "_sdc_deleted_at": DELETED_AT.isoformat()}, time_extracted=DELETED_AT
+        )
+    sink.close()
+
+    rows = conn.raw.execute(
+        f"SELECT CREW_ID, NAME, _SDC_DELETED_AT, _SDC_EXTRACTED_AT FROM {STREAM} ORDER BY CREW_ID"
+    ).fetchall()
+    conn.close()
+    assert rows[0] == ("a", "Robert Behnken", datetime(2024, 1, 2, 12, 0, 0), datetime(2024, 1, 2, 12, 0, 0))
+    assert rows[1][1:3] == ("Douglas Hurley", None)
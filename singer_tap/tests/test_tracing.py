@@ -0,0 +1,132 @@
+import pytest
+import io
+import json
+from unittest.mock import patch, MagicMock
+import singer                                           # type: ignore
+from include.fetch_crew import CrewTap
+from include.tracing import JsonFileExporter, TracedOutput, Tracer, get_tracer, otlp_payload, set_tracer
+
+SAMPLE_CREW_DATA = [
+    {"id": "5ebf1a6e23a9a60006e03a7a", "name": "Robert Behnken", "agency": "NASA", "status": "active"},
+    {"id": "5ebf1b7323a9a60006e03a7b", "name": "Douglas Hurley", "agency": "NASA", "status": "retired"},
+]
+
+@pytest.fixture
+def tracer():
+    """Fixture installing an enabled tracer for the test and restoring the previous one"""
+    tracer = Tracer()
+    previous = set_tracer(tracer)
+    yield tracer
+    set_tracer(previous)
+
+def spans_by_name(tracer):
+    return {span.name: span for span in tracer.finished}
+
+def test_spans_nest_and_record_errors(tracer):
+    """Test a span is the parent of the spans opened inside it and keeps the error that ended it"""
+    with tracer.span("stream", fetch="fetch_crew") as stream:
+        with pytest.raises(ValueError):
+            with tracer.span("http.fetch", stream="STG_SPACEX_DATA_CREW", page=1):
+                raise ValueError("boom")
+
+    spans = spans_by_name(tracer)
+    assert spans["http.fetch"].parent_id == stream.span_id
+    assert spans["http.fetch"].error == "ValueError: boom"
+    assert spans["stream"].parent_id is None and spans["stream"].error is None
+    assert spans["stream"].end_ns >= spans["http.fetch"].end_ns
+
+def test_otlp_payload_encodes_spans(tracer, tmp_path):
+    """Test the JSON file exporter writes an OTLP/JSON request a collector accepts"""
+    with pytest.raises(RuntimeError):
+        with tracer.span("http.fetch", stream="STG_SPACEX_DATA_CREW", page=1, ratio=0.5, cached=False):
+            raise RuntimeError("503")
+    path = tmp_path / "trace.json"
+    JsonFileExporter(str(path)).export(tracer.finished)
+
+    payload = json.loads(path.read_text())
+    assert payload == otlp_payload(tracer.finished)
+    resource = payload["resourceSpans"][0]
+    assert resource["resource"]["attributes"][0]["value"] == {"stringValue": "tap-spacex"}
+    [span] = resource["scopeSpans"][0]["spans"]
+    assert span["traceId"] == tracer.trace_id and len(span["traceId"]) == 32
+    assert span["kind"] == 3 and span["status"]["code"] == 2
+    assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
+    assert span["attributes"] == [
+        {"key": "stream", "value": {"stringValue": "STG_SPACEX_DATA_CREW"}},
+        {"key": "page", "value": {"intValue": "1"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "cached", "value": {"boolValue": False}},
+    ]
+
+def test_failed_export_is_logged_not_raised(tmp_path):
+    """Test an exporter that fails does not stop the others nor raise into the run"""
+    path = tmp_path / "trace.json"
+    tracer = Tracer([JsonFileExporter(str(tmp_path / "missing" / "trace.json")), JsonFileExporter(str(path))])
+    with tracer.span("run", target="duckdb"):
+        pass
+    tracer.export()
+    assert json.loads(path.read_text()) == otlp_payload(tracer.finished)
+
+def test_stage_timer_splits_serialize_and_write(tracer):
+    """Test the output time measured by TracedOutput is the singer.write stage, the rest serialize"""
+    output = TracedOutput(io.StringIO(), tracer)
+    stages = tracer.stages("STG_SPACEX_DATA_CREW")
+    with tracer.span("stream", fetch="fetch_crew") as stream:
+        for i in range(3):
+            stages.start()
+            record = {"CREW_ID": str(i)}
+            stages.lap("transform")
+            output.write(json.dumps(record) + "\n")
+            tracer.output_ns += 1_000_000
+            stages.lap_output()
+        stages.close()
+
+    spans = spans_by_name(tracer)
+    assert set(spans) == {"stream", "transform", "serialize", "singer.write"}
+    for name in ("transform", "serialize", "singer.write"):
+        assert spans[name].attributes == {"stream": "STG_SPACEX_DATA_CREW", "records": 3}
+        assert spans[name].parent_id == stream.span_id
+    assert spans["singer.write"].duration_ms >= 3
+    assert output.output.getvalue().count("\n") == 3
+
+def test_disabled_tracer_is_a_noop():
+    """Test the default tracer records nothing"""
+    tracer = get_tracer()
+    assert not tracer.enabled
+    with tracer.span("http.fetch", stream="STG_SPACEX_DATA_CREW") as span:
+        span.set_attribute("http.status_code", 200)
+    stages = tracer.stages("STG_SPACEX_DATA_CREW")
+    stages.start()
+    stages.lap("transform")
+    stages.close()
+    assert tracer.finished == []
+
+def test_tap_traces_fetch_parse_stages_and_errors(tracer):
+    """Test a tap run yields the fetch, parse, stage and error logging spans of its stream"""
+    crew_tap = CrewTap(base_url="https://api.spacexdata.com/v4/", config_path="config_snowflake.json")
+    crew_tap.conn = None
+    mock_response = MagicMock(status_code=200)
+    mock_response.json.return_value = SAMPLE_CREW_DATA
+    write_record = singer.write_record
+
+    def failing_write_record(stream_name, record, **kwargs):
+        if record["CREW_ID"] == "5ebf1b7323a9a60006e03a7b":
+            raise ValueError("bad record")
+        write_record(stream_name, record, **kwargs)
+
+    with patch("requests.get", return_value=mock_response), \
+            patch("singer.write_record", side_effect=failing_write_record), \
+            patch("sys.stdout", TracedOutput(io.StringIO(), tracer)):
+        crew_tap.fetch_crew()
+
+    spans = spans_by_name(tracer)
+    assert spans["http.fetch"].attributes == {
+        "stream": "STG_SPACEX_DATA_CREW",
+        "url": "https://api.spacexdata.com/v4/crew",
+        "page": 1,
+        "http.status_code": 200,
+    }
+    assert spans["json.parse"].attributes["records"] == 2
+    assert spans["transform"].attributes["records"] == 2
+    assert spans["singer.write"].attributes["records"] == 1
+    assert "bad record" in spans["error.log"].attributes["error_message"]
@@ -0,0 +1,48 @@
+{#
+    Post-hooks of the published marts, configured in dbt_project.yml.
+
+    Models opt in through their config:
+      - cluster_by: clustering key, the depth of the table is then logged
+        after each build
+      - search_optimization_on: ID columns getting search optimization for
+        equality lookups, applied only with --vars 'enable_search_optimization: true'
+        (Enterprise edition, billed separately)
+
+    Both are Snowflake features, the hooks do nothing on DuckDB.
+#}
+
+{% macro report_clustering_depth() -%}
+    {{ return(adapter.dispatch('report_clustering_depth', 'spacex_project')()) }}
+{%- endmacro %}
+
+{% macro default__report_clustering_depth() -%}
+    {%- set cluster_by = config.get('cluster_by') -%}
+    {%- if execute and cluster_by -%}
+        {%- set result = run_query("select system$clustering_information('" ~ this ~ "')") -%}
+        {%- set info = fromjson(result.columns[0].values()[0]) -%}
+        {{ log(
+            this ~ " clustered by (" ~ info['cluster_by_keys'] ~ "): "
+            ~ info['total_partition_count'] ~ " partitions, average depth "
+            ~ info['average_depth'] ~ ", average overlaps " ~ info['average_overlaps'],
+            info=True
+        ) }}
+    {%- endif -%}
+{%- endmacro %}
+
+{% macro duckdb__report_clustering_depth() -%}
+{%- endmacro %}
+
+
+{% macro apply_search_optimization() -%}
+    {{ return(adapter.dispatch('apply_search_optimization', 'spacex_project')()) }}
+{%- endmacro %}
+
+{% macro default__apply_search_optimization() -%}
+    {%- set columns = config.get('search_optimization_on') -%}
+    {%- if columns and var('enable_search_optimization', false) -%}
+        alter table {{ this }} add search optimization on equality({{ columns | join(', ') }})
+    {%- endif -%}
+{%- endmacro %}
+
+{% macro duckdb__apply_search_optimization() -%}
+{%- endmacro %}
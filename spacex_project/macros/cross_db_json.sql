@@ -0,0 +1,55 @@
+{#
+    Adapter dispatched helpers for the Snowflake semi-structured syntax used by
+    the models, so the project also builds against the local DuckDB mirror.
+#}
+
+{% macro parse_json(expression) -%}
+    {{ return(adapter.dispatch('parse_json', 'spacex_project')(expression)) }}
+{%- endmacro %}
+
+{% macro default__parse_json(expression) -%}
+    try_parse_json({{ expression }})
+{%- endmacro %}
+
+{% macro duckdb__parse_json(expression) -%}
+    try_cast({{ expression }} as json)
+{%- endmacro %}
+
+
+{% macro json_field(expression, field, data_type) -%}
+    {{ return(adapter.dispatch('json_field', 'spacex_project')(expression, field, data_type)) }}
+{%- endmacro %}
+
+{% macro default__json_field(expression, field, data_type) -%}
+    {{ expression }}:{{ field }}::{{ data_type }}
+{%- endmacro %}
+
+{% macro duckdb__json_field(expression, field, data_type) -%}
+    cast(json_extract_string({{ expression }}, '$.{{ field }}') as {{ data_type }})
+{%- endmacro %}
+
+
+{% macro flatten_json_array(expression, alias) -%}
+    {{ return(adapter.dispatch('flatten_json_array', 'spacex_project')(expression, alias)) }}
+{%- endmacro %}
+
+{% macro default__flatten_json_array(expression, alias) -%}
+    lateral flatten(input => {{ expression }}) as {{ alias }}
+{%- endmacro %}
+
+{% macro duckdb__flatten_json_array(expression, alias) -%}
+    unnest(cast({{ expression }} as json[])) as {{ alias }}(value)
+{%- endmacro %}
+
+
+{% macro convert_to_utc(expression) -%}
+    {{ return(adapter.dispatch('convert_to_utc', 'spacex_project')(expression)) }}
+{%- endmacro %}
+
+{% macro default__convert_to_utc(expression) -%}
+    convert_timezone('UTC', {{ expression }})
+{%- endmacro %}
+
+{% macro duckdb__convert_to_utc(expression) -%}
+    timezone('UTC', cast({{ expression }} as timestamptz))
+{%- endmacro %}
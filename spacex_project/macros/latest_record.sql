@@ -0,0 +1,20 @@
+{#
+    Keep the latest version of each key of a Singer staging table.
+
+    Targets that append instead of merging, and repeated full loads, leave
+    several rows per primary key. The latest one has the highest
+    _sdc_table_version then _sdc_sequence, nulls (rows loaded without
+    Singer metadata) rank last on every adapter.
+
+    Use it right after the from / where of the select reading the source:
+
+        from {{ source('stg_spacex_data', 'stg_spacex_data_cores') }}
+        {{ latest_record('core_id') }}
+#}
+
+{% macro latest_record(key_columns) -%}
+    qualify row_number() over (
+        partition by {{ key_columns if key_columns is string else key_columns | join(', ') }}
+        order by _sdc_table_version desc nulls last, _sdc_sequence desc nulls last
+    ) = 1
+{%- endmacro %}
@@ -7,8 +7,8 @@
 
 with launch_payloads as (
     select
-        {{ dbt_utils.generate_surrogate_key(['launch.launch_id', 'payload.payload_id']) }} as bridge_launch_payload_launch_payload_id,
-        launch.launch_id as bridge_launch_payload_launch_id,
+        launch_payload.launch_payload_id as bridge_launch_payload_launch_payload_id,
+        launch_payload.launch_payload_launch_id as bridge_launch_payload_launch_id,
         payload.payload_id as bridge_launch_payload_id,
         payload.payload_type as bridge_launch_payload_type,
         payload.payload_mass_kg as bridge_launch_payload_mass_kg,
@@ -17,9 +17,9 @@ with launch_payloads as (
         payload.payload_regime as bridge_launch_payload_regime,
         payload.payload_sdc_extracted_at as bridge_launch_payload_sdc_extracted_at
 
-    from {{ ref('stg_spacex_data__launches') }} launch
+    from {{ ref('stg_spacex_data__launch_payloads') }} launch_payload
         inner join {{ ref('stg_spacex_data__payloads') }} payload
-            on launch.launch_id = payload.payload_launch_id
+            on launch_payload.launch_payload_payload_id = payload.payload_id
     
     {% if is_incremental() %}
     where payload.payload_sdc_extracted_at > (select max(bridge_launch_payload_sdc_extracted_at) from {{ this }})
@@ -7,14 +7,14 @@
 
 with launch_ships as (
     select
-        {{ dbt_utils.generate_surrogate_key(['launch.launch_id', 'ship.ship_id']) }} as bridge_launch_ship_launch_ship_id,
-        launch.launch_id as bridge_launch_ship_launch_id,
+        launch_ship.launch_ship_id as bridge_launch_ship_launch_ship_id,
+        launch_ship.launch_ship_launch_id as bridge_launch_ship_launch_id,
         ship.ship_id as bridge_launch_ship_id,
         ship.ship_roles as bridge_launch_ship_roles,
         ship.ship_sdc_extracted_at as bridge_launch_ship_sdc_extracted_at
-    from {{ ref('stg_spacex_data__launches') }} launch
+    from {{ ref('stg_spacex_data__launch_ships') }} launch_ship
         join {{ ref('stg_spacex_data__ships') }} ship
-            on launch.launch_id = ship.ship_launch_id
+            on launch_ship.launch_ship_ship_id = ship.ship_id
 )
 
 select * from launch_ships
@@ -19,4 +19,5 @@ select
 	capsule_updated_at as capsule_updated_at
     
 from {{ ref('stg_spacex_data__capsules') }}
+where capsule_sdc_deleted_at is null
 
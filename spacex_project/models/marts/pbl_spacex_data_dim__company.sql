@@ -17,14 +17,14 @@ select
     company_coo as company_coo,
     company_cto_propulsion as company_cto_propulsion,
     company_valuation as company_valuation,
-    company_headquarters:address::string as company_hq_address,
-    company_headquarters:city::string as company_hq_city,
-    company_headquarters:state::string as company_hq_state,
-    company_headquarters:country::string as company_hq_country,
-    company_links:website::string as company_website_url,
-    company_links:flickr::string as company_flickr_url,
-    company_links:twitter::string as company_twitter_url,
-    company_links:elon_twitter::string as company_elon_twitter_url,
+    {{ json_field('company_headquarters', 'address', 'string') }} as company_hq_address,
+    {{ json_field('company_headquarters', 'city', 'string') }} as company_hq_city,
+    {{ json_field('company_headquarters', 'state', 'string') }} as company_hq_state,
+    {{ json_field('company_headquarters', 'country', 'string') }} as company_hq_country,
+    {{ json_field('company_links', 'website', 'string') }} as company_website_url,
+    {{ json_field('company_links', 'flickr', 'string') }} as company_flickr_url,
+    {{ json_field('company_links', 'twitter', 'string') }} as company_twitter_url,
+    {{ json_field('company_links', 'elon_twitter', 'string') }} as company_elon_twitter_url,
     company_sdc_extracted_at as company_sdc_extracted_at,
     company_created_at as company_created_at,
 	company_updated_at as company_updated_at
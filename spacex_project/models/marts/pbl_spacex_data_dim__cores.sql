@@ -21,3 +21,4 @@ select
 	core_updated_at as core_updated_at  
 
 from {{ ref('stg_spacex_data__cores') }}
+where core_sdc_deleted_at is null
@@ -18,9 +18,10 @@ with crew as (
 	    crew_updated_at as crew_updated_at
         
     from {{ ref('stg_spacex_data__crew') }}
+    where crew_sdc_deleted_at is null
 )
 
 select 
     *,
-    current_timestamp() as dbt_loaded_at
+    {{ dbt.current_timestamp() }} as dbt_loaded_at
 from crew
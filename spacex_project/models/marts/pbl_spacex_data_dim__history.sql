@@ -11,13 +11,14 @@ select
     history_event_date_utc as history_event_date_utc,
     history_event_date_unix as history_event_date_unix,
     history_details as history_details,
-    history_link:article::string as history_link_article_url,
-    history_link:reddit::string as history_link_reddit_url,
-    history_link:wikipedia::string as history_link_wikipedia_url,
+    {{ json_field('history_link', 'article', 'string') }} as history_link_article_url,
+    {{ json_field('history_link', 'reddit', 'string') }} as history_link_reddit_url,
+    {{ json_field('history_link', 'wikipedia', 'string') }} as history_link_wikipedia_url,
     history_flight_number as history_flight_number,
     history_sdc_extracted_at as history_sdc_extracted_at,
     history_created_at as history_created_at,
 	history_updated_at as history_updated_at
     
 from {{ ref('stg_spacex_data__history') }}
+where history_sdc_deleted_at is null
 
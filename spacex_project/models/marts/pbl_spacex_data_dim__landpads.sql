@@ -25,4 +25,5 @@ select
 	landpad_updated_at as landpad_updated_at
     
 from {{ ref('stg_spacex_data__landpads') }}
+where landpad_sdc_deleted_at is null
 
@@ -22,9 +22,10 @@ with launchpads as (
 	    launchpad_updated_at as launchpad_updated_at
         
     from {{ ref('stg_spacex_data__launchpads') }}
+    where launchpad_sdc_deleted_at is null
 )
 
 select 
     *,
-    current_timestamp() as dbt_loaded_at
+    {{ dbt.current_timestamp() }} as dbt_loaded_at
 from launchpads
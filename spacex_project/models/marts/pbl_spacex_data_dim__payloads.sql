@@ -25,3 +25,4 @@ select
 	payload_updated_at as payload_updated_at
     
 from {{ ref('stg_spacex_data__payloads') }}
+where payload_sdc_deleted_at is null
@@ -27,9 +27,10 @@ with rockets as (
 	    rocket_updated_at as rocket_updated_at
     
     from {{ ref('stg_spacex_data__rockets') }}
+    where rocket_sdc_deleted_at is null
 )
 
 select 
     *,
-    current_timestamp() as dbt_loaded_at
+    {{ dbt.current_timestamp() }} as dbt_loaded_at
 from rockets
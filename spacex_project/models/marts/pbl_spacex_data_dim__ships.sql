@@ -21,9 +21,10 @@ with ships as (
 	    ship_updated_at as ship_updated_at
         
     from {{ ref('stg_spacex_data__ships') }}
+    where ship_sdc_deleted_at is null
 )
 
 select 
     * ,
-    current_timestamp() as dbt_loaded_at
+    {{ dbt.current_timestamp() }} as dbt_loaded_at
 from ships
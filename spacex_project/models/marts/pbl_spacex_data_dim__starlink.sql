@@ -1,28 +1,37 @@
 {{
     config(
         materialized='incremental',
-        unique_key='starlink_id'
+        unique_key='starlink_id',
+        on_schema_change='append_new_columns',
+        cluster_by=['starlink_launch_id', 'starlink_satellite_version'],
+        search_optimization_on=['starlink_id'],
+        post_hook=[
+            "delete from {{ this }} where starlink_id in ("
+            "select starlink_id from {{ ref('stg_spacex_data__starlink') }} where starlink_sdc_deleted_at is not null)"
+        ]
     )
 }}
 
 select
     starlink_id as starlink_id,
     starlink_launch_id as starlink_launch_id,
+    starlink_satellite_version as starlink_satellite_version,
     starlink_longitude as starlink_longitude,
     starlink_latitude as starlink_latitude,
     starlink_height_km as starlink_height_km,
     starlink_velocity_kms as starlink_velocity_kms,
-    starlink_spaceTrack:OBJECT_NAME::string as starlink_spaceTrack_object_name,
-    starlink_spaceTrack:LATITUDE::float as starlink_spaceTrack_latitude,
-    starlink_spaceTrack:LONGITUDE::float as starlink_spaceTrack_longitude,
-    starlink_spaceTrack:HEIGHT_KM::float as starlink_spaceTrack_height_km,
-    starlink_spaceTrack:VELOCITY_KMS::float as starlink_spaceTrack_velocity_kms,
+    {{ json_field('starlink_spaceTrack', 'OBJECT_NAME', 'string') }} as starlink_spaceTrack_object_name,
+    {{ json_field('starlink_spaceTrack', 'LATITUDE', 'float') }} as starlink_spaceTrack_latitude,
+    {{ json_field('starlink_spaceTrack', 'LONGITUDE', 'float') }} as starlink_spaceTrack_longitude,
+    {{ json_field('starlink_spaceTrack', 'HEIGHT_KM', 'float') }} as starlink_spaceTrack_height_km,
+    {{ json_field('starlink_spaceTrack', 'VELOCITY_KMS', 'float') }} as starlink_spaceTrack_velocity_kms,
     starlink_sdc_extracted_at as starlink_sdc_extracted_at,
     starlink_created_at as starlink_created_at,
 	starlink_updated_at as starlink_updated_at
         
 from {{ ref('stg_spacex_data__starlink') }}
+where starlink_sdc_deleted_at is null
 
 {% if is_incremental() %}
-    where starlink_sdc_extracted_at > (select max(starlink_sdc_extracted_at) from {{ this }})
+    and starlink_sdc_extracted_at > (select max(starlink_sdc_extracted_at) from {{ this }})
 {% endif %}
@@ -2,13 +2,69 @@
     config(
         alias='pbl_spacex_data_fct_launch_costs',
         materialized='incremental',
-        unique_key='launch_id'
+        incremental_strategy='delete+insert' if target.type == 'duckdb' else 'merge',
+        unique_key='launch_id',
+        cluster_by=['launch_date_utc', 'launch_rocket_id'],
+        search_optimization_on=['launch_id'],
+        post_hook=[
+            "delete from {{ this }} where launch_id in ("
+            "select launch_id from {{ ref('stg_spacex_data__launches') }} where launch_sdc_deleted_at is not null)"
+        ]
     )
 }}
 
-with launches as (
+with
+{% if is_incremental() %}
+watermarks as (
+    select
+        coalesce(max(launch_sdc_extracted_at), cast('1900-01-01' as timestamp)) as launch_sdc_extracted_at,
+        coalesce(max(core_sdc_extracted_at), cast('1900-01-01' as timestamp)) as core_sdc_extracted_at,
+        coalesce(max(crew_sdc_extracted_at), cast('1900-01-01' as timestamp)) as crew_sdc_extracted_at,
+        coalesce(max(payload_sdc_extracted_at), cast('1900-01-01' as timestamp)) as payload_sdc_extracted_at,
+        coalesce(max(ship_sdc_extracted_at), cast('1900-01-01' as timestamp)) as ship_sdc_extracted_at
+    from {{ this }}
+),
+
+-- Launches whose row or any bridge row changed since the last build, only
+-- these are recomputed and merged
+affected_launches as (
+    select launch_id
+    from {{ ref('stg_spacex_data__launches') }}
+    where launch_sdc_extracted_at > (select launch_sdc_extracted_at from watermarks)
+
+    union
+
+    select bridge_launch_core_launch_id
+    from {{ ref('cmp_bridge__launch_cores') }}
+    where bridge_launch_core_sdc_extracted_at > (select core_sdc_extracted_at from watermarks)
+
+    union
+
+    select bridge_launch_crew_launch_id
+    from {{ ref('cmp_bridge__launch_crew') }}
+    where bridge_launch_crew_sdc_extracted_at > (select crew_sdc_extracted_at from watermarks)
+
+    union
+
+    select bridge_launch_payload_launch_id
+    from {{ ref('cmp_bridge__launch_payloads') }}
+    where bridge_launch_payload_sdc_extracted_at > (select payload_sdc_extracted_at from watermarks)
+
+    union
+
+    select bridge_launch_ship_launch_id
+    from {{ ref('cmp_bridge__launch_ships') }}
+    where bridge_launch_ship_sdc_extracted_at > (select ship_sdc_extracted_at from watermarks)
+),
+{% endif %}
+
+launches as (
     select *
     from {{ ref('stg_spacex_data__launches') }}
+    where launch_sdc_deleted_at is null
+    {% if is_incremental() %}
+    and launch_id in (select launch_id from affected_launches)
+    {% endif %}
 ),
 
 launch_cores as (
@@ -16,16 +72,24 @@ launch_cores as (
         bridge_launch_core_launch_id,
         count(distinct bridge_launch_core_id) as bridge_launch_core_count,
         sum(case when bridge_launch_core_reused then 1 else 0 end) as bridge_launch_core_reused_count,
-        sum(case when bridge_launch_core_landing_success then 1 else 0 end) as bridge_launch_core_successful_landings
+        sum(case when bridge_launch_core_landing_success then 1 else 0 end) as bridge_launch_core_successful_landings,
+        max(bridge_launch_core_sdc_extracted_at) as core_sdc_extracted_at
     from {{ ref('cmp_bridge__launch_cores') }}
+    {% if is_incremental() %}
+    where bridge_launch_core_launch_id in (select launch_id from affected_launches)
+    {% endif %}
     group by 1
 ),
 
 launch_crew as (
     select
         bridge_launch_crew_launch_id,
-        count(distinct bridge_launch_crew_id) as bridge_launch_crew_count
+        count(distinct bridge_launch_crew_id) as bridge_launch_crew_count,
+        max(bridge_launch_crew_sdc_extracted_at) as crew_sdc_extracted_at
     from {{ ref('cmp_bridge__launch_crew') }}
+    {% if is_incremental() %}
+    where bridge_launch_crew_launch_id in (select launch_id from affected_launches)
+    {% endif %}
     group by 1
 ),
 
@@ -33,16 +97,24 @@ launch_payloads as (
     select
         bridge_launch_payload_launch_id,
         count(distinct bridge_launch_payload_id) as bridge_launch_payload_count,
-        sum(bridge_launch_payload_mass_kg) as total_bridge_launch_payload_mass_kg
+        sum(bridge_launch_payload_mass_kg) as total_bridge_launch_payload_mass_kg,
+        max(bridge_launch_payload_sdc_extracted_at) as payload_sdc_extracted_at
     from {{ ref('cmp_bridge__launch_payloads') }}
+    {% if is_incremental() %}
+    where bridge_launch_payload_launch_id in (select launch_id from affected_launches)
+    {% endif %}
     group by 1
 ),
 
 launch_ships as (
     select
         bridge_launch_ship_launch_id,
-        count(distinct bridge_launch_ship_id) as bridge_launch_ship_count
+        count(distinct bridge_launch_ship_id) as bridge_launch_ship_count,
+        max(bridge_launch_ship_sdc_extracted_at) as ship_sdc_extracted_at
     from {{ ref('cmp_bridge__launch_ships') }}
+    {% if is_incremental() %}
+    where bridge_launch_ship_launch_id in (select launch_id from affected_launches)
+    {% endif %}
     group by 1
 ),
 
@@ -69,7 +141,11 @@ final as (
         coalesce(launch_payloads.total_bridge_launch_payload_mass_kg, 0) as total_payload_mass_kg,
         coalesce(launch_ships.bridge_launch_ship_count, 0) as ship_count,
         launches.launch_sdc_extracted_at as launch_sdc_extracted_at,
-        current_timestamp() as dbt_loaded_at
+        launch_cores.core_sdc_extracted_at,
+        launch_crew.crew_sdc_extracted_at,
+        launch_payloads.payload_sdc_extracted_at,
+        launch_ships.ship_sdc_extracted_at,
+        {{ dbt.current_timestamp() }} as dbt_loaded_at
         
     from launches
     left join launch_cores 
@@ -83,7 +159,3 @@ final as (
 )
 
 select * from final
-
-{% if is_incremental() %}
-    where launches.launch_sdc_extracted_at > (select max(launch_sdc_extracted_at) from {{ this }})
-{% endif %}
@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_capsules'
+    alias = 'vw_stg_spacex_data_capsules',
+    unique_key = 'capsule_id'
     ) 
 }}
 
@@ -28,6 +29,12 @@ with capsules as
         _sdc_sync_started_at as capsule_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_capsules') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(capsule_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('capsule_id') }}
 )
 
 select * from capsules
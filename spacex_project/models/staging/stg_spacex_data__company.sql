@@ -1,5 +1,6 @@
 {{ config(
-    alias = 'vw_stg_spacex_data_company'
+    alias = 'vw_stg_spacex_data_company',
+    unique_key = 'company_id'
     ) 
 }}
 
@@ -34,6 +35,12 @@ with company as
         _sdc_sync_started_at as company_sdc_sync_started_at
 
     from {{ source('stg_spacex_data', 'stg_spacex_data_company') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(company_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('id') }}
 )
 
 select * from company
@@ -1,5 +1,6 @@
 {{ config(
-    alias = 'vw_stg_spacex_data_cores'
+    alias = 'vw_stg_spacex_data_cores',
+    unique_key = 'core_id'
     ) 
 }}
 
@@ -16,7 +17,7 @@ with cores as
         asds_attempts as core_asds_attempts,
         asds_landings as core_asds_landings,
         last_update as core_last_update,
-        launches as core_launch_id,
+        {{ parse_json('launches') }} as core_launch_id,
         created_at as core_created_at,
         updated_at as core_updated_at,
         raw_data as core_raw_data,
@@ -29,6 +30,12 @@ with cores as
         _sdc_sync_started_at as core_sdc_sync_started_at
 
     from {{ source('stg_spacex_data', 'stg_spacex_data_cores') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(core_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('core_id') }}
 )
 
 select * from cores
@@ -1,5 +1,6 @@
 {{ config(
-    alias = 'vw_stg_spacex_data_crew'
+    alias = 'vw_stg_spacex_data_crew',
+    unique_key = 'crew_id'
     ) 
 }}
 
@@ -12,7 +13,7 @@ with crew as
 	    image as crew_image,
 	    wikipedia as crew_wikipedia,
 	    status as crew_status,
-	    launches as crew_launches,
+	    {{ parse_json('launches') }} as crew_launches,
 	    created_at as crew_created_at,
 	    updated_at as crew_updated_at,
 	    raw_data as crew_raw_data,
@@ -25,6 +26,12 @@ with crew as
         _sdc_sync_started_at as crew_sdc_sync_started_at
 
     from {{ source('stg_spacex_data', 'stg_spacex_data_crew') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(crew_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('crew_id') }}
 )
 
 select * from crew
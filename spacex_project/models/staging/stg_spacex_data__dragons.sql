@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_dragons'
+    alias = 'vw_stg_spacex_data_dragons',
+    unique_key = 'dragon_id'
     ) 
 }}
 
@@ -17,19 +18,19 @@ with dragons as
 	    dry_mass_kg as dragon_dry_mass_kg,
 	    dry_mass_lb as dragon_dry_mass_lb,
 	    first_flight as dragon_first_flight,
-	    try_parse_json(heat_shield) as dragon_heat_shield,
-	    thrusters as dragon_thrusters_number,
-	    launch_payload_mass as dragon_launch_payload_mass,
-	    launch_payload_vol as dragon_launch_payload_vol,
-	    return_payload_mass as dragon_return_payload_mass,
-	    return_payload_vol as dragon_return_payload_vol,
-	    pressurized_capsule as dragon_pressurized_capsule,
-	    trunk as dragon_trunk,
-	    height_w_trunk as dragon_height_w_trunk,
-	    diameter as dragon_diameter,
+	    {{ parse_json('heat_shield') }} as dragon_heat_shield,
+	    {{ parse_json('thrusters') }} as dragon_thrusters_number,
+	    {{ parse_json('launch_payload_mass') }} as dragon_launch_payload_mass,
+	    {{ parse_json('launch_payload_vol') }} as dragon_launch_payload_vol,
+	    {{ parse_json('return_payload_mass') }} as dragon_return_payload_mass,
+	    {{ parse_json('return_payload_vol') }} as dragon_return_payload_vol,
+	    {{ parse_json('pressurized_capsule') }} as dragon_pressurized_capsule,
+	    {{ parse_json('trunk') }} as dragon_trunk,
+	    {{ parse_json('height_w_trunk') }} as dragon_height_w_trunk,
+	    {{ parse_json('diameter') }} as dragon_diameter,
 	    wikipedia as dragon_wikipedia,
 	    description as dragon_description,
-	    flickr_images as dragon_flickr_images,
+	    {{ parse_json('flickr_images') }} as dragon_flickr_images,
         created_at as dragon_created_at,
 	    updated_at as dragon_updated_at,
 	    raw_data as dragon_raw_data,
@@ -42,6 +43,12 @@ with dragons as
         _sdc_sync_started_at as dragon_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_dragons') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(dragon_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('dragon_id') }}
 )
 
 select * from dragons
@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_history'
+    alias = 'vw_stg_spacex_data_history',
+    unique_key = 'history_id'
     ) 
 }}
 
@@ -12,7 +13,7 @@ with history as
 	    event_date_utc as history_event_date_utc,
 	    event_date_unix as history_event_date_unix,
 	    details as history_details,
-	    try_parse_json(links) as history_link,
+	    {{ parse_json('links') }} as history_link,
 	    flight_number as history_flight_number,
         created_at as history_created_at,
 	    updated_at as history_updated_at,
@@ -26,6 +27,12 @@ with history as
         _sdc_sync_started_at as history_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_history') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(history_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('history_id') }}
 )
 
 select * from history
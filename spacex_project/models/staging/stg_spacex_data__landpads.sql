@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_landpads'
+    alias = 'vw_stg_spacex_data_landpads',
+    unique_key = 'landpad_id'
     ) 
 }}
 
@@ -20,8 +21,8 @@ with landpads as
 	    landing_successes as landpad_landing_successes,
 	    wikipedia as landpad_wikipedia,
 	    details as landpad_details,
-	    launches as landpad_launches,
-	    images as landpad_images,
+	    {{ parse_json('launches') }} as landpad_launches,
+	    {{ parse_json('images') }} as landpad_images,
         created_at as landpad_created_at,
 	    updated_at as landpad_updated_at,
 	    raw_data as landpad_raw_data,
@@ -34,6 +35,12 @@ with landpads as
         _sdc_sync_started_at as landpad_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_landpads') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(landpad_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('landpad_id') }}
 )
 
 select * from landpads
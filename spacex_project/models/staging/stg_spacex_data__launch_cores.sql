@@ -0,0 +1,40 @@
+
+{{ config(
+    alias = 'vw_stg_spacex_data_launch_cores',
+    unique_key = 'launch_core_id'
+    ) 
+}}
+
+with launch_cores as 
+(
+    select 
+        launch_core_id as launch_core_id,
+        launch_id as launch_core_launch_id,
+        core_id as launch_core_core_id,
+        flight as launch_core_flight,
+        gridfins as launch_core_gridfins,
+        legs as launch_core_legs,
+        reused as launch_core_reused,
+        landing_attempt as launch_core_landing_attempt,
+        landing_success as launch_core_landing_success,
+        landing_type as launch_core_landing_type,
+        landpad as launch_core_landpad_id,
+        created_at as launch_core_created_at,
+        _sdc_extracted_at as launch_core_sdc_extracted_at,
+        _sdc_received_at as launch_core_sdc_received_at,
+        _sdc_batched_at as launch_core_sdc_batched_at,
+        _sdc_deleted_at as launch_core_sdc_deleted_at,
+        _sdc_sequence as launch_core_sdc_sequence,
+        _sdc_table_version as launch_core_sdc_table_version,
+        _sdc_sync_started_at as launch_core_sdc_sync_started_at
+
+    from {{ source('stg_spacex_data', 'stg_spacex_data_launch_cores') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(launch_core_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('launch_core_id') }}
+)
+
+select * from launch_cores
@@ -0,0 +1,33 @@
+
+{{ config(
+    alias = 'vw_stg_spacex_data_launch_crew',
+    unique_key = 'launch_crew_id'
+    ) 
+}}
+
+with launch_crew as 
+(
+    select 
+        launch_crew_id as launch_crew_id,
+        launch_id as launch_crew_launch_id,
+        crew_id as launch_crew_crew_id,
+        role as launch_crew_role,
+        created_at as launch_crew_created_at,
+        _sdc_extracted_at as launch_crew_sdc_extracted_at,
+        _sdc_received_at as launch_crew_sdc_received_at,
+        _sdc_batched_at as launch_crew_sdc_batched_at,
+        _sdc_deleted_at as launch_crew_sdc_deleted_at,
+        _sdc_sequence as launch_crew_sdc_sequence,
+        _sdc_table_version as launch_crew_sdc_table_version,
+        _sdc_sync_started_at as launch_crew_sdc_sync_started_at
+
+    from {{ source('stg_spacex_data', 'stg_spacex_data_launch_crew') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(launch_crew_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('launch_crew_id') }}
+)
+
+select * from launch_crew
@@ -0,0 +1,32 @@
+
+{{ config(
+    alias = 'vw_stg_spacex_data_launch_payloads',
+    unique_key = 'launch_payload_id'
+    ) 
+}}
+
+with launch_payloads as 
+(
+    select 
+        launch_payload_id as launch_payload_id,
+        launch_id as launch_payload_launch_id,
+        payload_id as launch_payload_payload_id,
+        created_at as launch_payload_created_at,
+        _sdc_extracted_at as launch_payload_sdc_extracted_at,
+        _sdc_received_at as launch_payload_sdc_received_at,
+        _sdc_batched_at as launch_payload_sdc_batched_at,
+        _sdc_deleted_at as launch_payload_sdc_deleted_at,
+        _sdc_sequence as launch_payload_sdc_sequence,
+        _sdc_table_version as launch_payload_sdc_table_version,
+        _sdc_sync_started_at as launch_payload_sdc_sync_started_at
+
+    from {{ source('stg_spacex_data', 'stg_spacex_data_launch_payloads') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(launch_payload_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('launch_payload_id') }}
+)
+
+select * from launch_payloads
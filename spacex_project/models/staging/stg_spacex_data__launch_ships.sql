@@ -0,0 +1,32 @@
+
+{{ config(
+    alias = 'vw_stg_spacex_data_launch_ships',
+    unique_key = 'launch_ship_id'
+    ) 
+}}
+
+with launch_ships as 
+(
+    select 
+        launch_ship_id as launch_ship_id,
+        launch_id as launch_ship_launch_id,
+        ship_id as launch_ship_ship_id,
+        created_at as launch_ship_created_at,
+        _sdc_extracted_at as launch_ship_sdc_extracted_at,
+        _sdc_received_at as launch_ship_sdc_received_at,
+        _sdc_batched_at as launch_ship_sdc_batched_at,
+        _sdc_deleted_at as launch_ship_sdc_deleted_at,
+        _sdc_sequence as launch_ship_sdc_sequence,
+        _sdc_table_version as launch_ship_sdc_table_version,
+        _sdc_sync_started_at as launch_ship_sdc_sync_started_at
+
+    from {{ source('stg_spacex_data', 'stg_spacex_data_launch_ships') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(launch_ship_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('launch_ship_id') }}
+)
+
+select * from launch_ships
@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_launches'
+    alias = 'vw_stg_spacex_data_launches',
+    unique_key = 'launch_id'
     ) 
 }}
 
@@ -10,27 +11,27 @@ with launches as
 	    launch_id as launch_id,
 	    flight_number as launch_flight_number,
 	    name as launch_mission_name,
-	    convert_timezone('UTC', date_utc) as launch_date_utc,
+	    {{ convert_to_utc('date_utc') }} as launch_date_utc,
 	    date_unix as launch_date_unix,
-	    convert_timezone('UTC', date_local) as launch_date_local,
+	    {{ convert_to_utc('date_local') }} as launch_date_local,
 	    date_precision as launch_date_precision,
 	    static_fire_date_utc as launch_static_fire_date_utc,
 	    static_fire_date_unix as launch_static_fire_date_unix,
 	    net as launch_net,
-	    window as launch_window,
+	    {{ adapter.quote('WINDOW') }} as launch_window,
 	    rocket as launch_rocket_id,
 	    success as launch_is_success,
-	    failures as launch_failures,
+	    {{ parse_json('failures') }} as launch_failures,
 	    upcoming as launch_is_upcoming,
 	    details as launch_mission_details,
-	    fairings as launch_fairings,
-	    try_parse_json(crew) as launch_crew,
-	    ships as launch_ships,
-	    capsules as launch_capsules,
-	    payloads as launch_payloads,
+	    {{ parse_json('fairings') }} as launch_fairings,
+	    {{ parse_json('crew') }} as launch_crew,
+	    {{ parse_json('ships') }} as launch_ships,
+	    {{ parse_json('capsules') }} as launch_capsules,
+	    {{ parse_json('payloads') }} as launch_payloads,
 	    launchpad as launch_launchpad_id,
-		try_parse_json(cores) as launch_cores,
-		try_parse_json(links) as launch_links,
+		{{ parse_json('cores') }} as launch_cores,
+		{{ parse_json('links') }} as launch_links,
 	    auto_update as launch_auto_update,
 	    launch_library_id as launch_library_id,
         created_at as launch_created_at,
@@ -45,6 +46,12 @@ with launches as
         _sdc_sync_started_at as launch_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_launches') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(launch_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('launch_id') }}
 )
 
 select * from launches
@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_launchpads'
+    alias = 'vw_stg_spacex_data_launchpads',
+    unique_key = 'launchpad_id'
     ) 
 }}
 
@@ -19,9 +20,9 @@ with launchpads as
 	    launch_attempts as launchpad_launch_attempts,
 	    launch_successes as launchpad_launch_successes,
 	    rockets as launchpad_rockets,
-	    launches as launchpad_launches,
+	    {{ parse_json('launches') }} as launchpad_launches,
 	    details as launchpad_details,
-	    images as launchpad_images,
+	    {{ parse_json('images') }} as launchpad_images,
         created_at as launchpad_created_at,
 	    updated_at as launchpad_updated_at,
 	    raw_data as launchpad_raw_data,
@@ -34,6 +35,12 @@ with launchpads as
         _sdc_sync_started_at as launchpad_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_launchpads') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(launchpad_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('launchpad_id') }}
 )
 
 select * from launchpads
@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_payloads'
+    alias = 'vw_stg_spacex_data_payloads',
+    unique_key = 'payload_id'
     ) 
 }}
 
@@ -12,10 +13,10 @@ with payloads as
 	    type as payload_type,
 	    reused as payload_reused,
 	    launch as payload_launch_id,
-	    customers as payload_customers,
-	    norad_ids as payload_norad_ids,
-	    nationalities as payload_nationalities,
-	    manufacturers as payload_manufacturers,
+	    {{ parse_json('customers') }} as payload_customers,
+	    {{ parse_json('norad_ids') }} as payload_norad_ids,
+	    {{ parse_json('nationalities') }} as payload_nationalities,
+	    {{ parse_json('manufacturers') }} as payload_manufacturers,
 	    mass_kg as payload_mass_kg,
 	    mass_lbs as payload_mass_lbs,
 	    orbit as payload_orbit,
@@ -34,7 +35,7 @@ with payloads as
 	    raan as payload_raan,
 	    arg_of_pericenter as payload_arg_of_pericenter,
 	    mean_anomaly as payload_mean_anomaly,
-	    dragon as payload_dragon,
+	    {{ parse_json('dragon') }} as payload_dragon,
         created_at as payload_created_at,
 	    updated_at as payload_updated_at,
 	    raw_data as payload_raw_data,
@@ -47,6 +48,12 @@ with payloads as
         _sdc_sync_started_at as payload_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_payloads') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(payload_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('payload_id') }}
 )
 
 select * from payloads
@@ -0,0 +1,32 @@
+
+{{ config(
+    alias = 'vw_stg_spacex_data_raw_blobs',
+    unique_key = 'raw_blob_hash'
+    ) 
+}}
+
+with raw_blobs as 
+(
+    select 
+        raw_data_hash as raw_blob_hash,
+        stream_name as raw_blob_stream_name,
+        {{ parse_json('raw_data') }} as raw_blob_data,
+        created_at as raw_blob_created_at,
+        _sdc_extracted_at as raw_blob_sdc_extracted_at,
+        _sdc_received_at as raw_blob_sdc_received_at,
+        _sdc_batched_at as raw_blob_sdc_batched_at,
+        _sdc_deleted_at as raw_blob_sdc_deleted_at,
+        _sdc_sequence as raw_blob_sdc_sequence,
+        _sdc_table_version as raw_blob_sdc_table_version,
+        _sdc_sync_started_at as raw_blob_sdc_sync_started_at
+
+    from {{ source('stg_spacex_data', 'stg_spacex_data_raw_blobs') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(raw_blob_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('raw_data_hash') }}
+)
+
+select * from raw_blobs
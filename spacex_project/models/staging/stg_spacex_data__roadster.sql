@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_roadster'
+    alias = 'vw_stg_spacex_data_roadster',
+    unique_key = 'roadster_id'
     ) 
 }}
 
@@ -32,7 +33,7 @@ with roadster as
 	    wikipedia as roadster_wikipedia,
 	    details as roadster_details,
 	    video as roadster_video,
-	    flickr_images as roadster_flickr_images,
+	    {{ parse_json('flickr_images') }} as roadster_flickr_images,
         created_at as roadster_created_at,
 	    updated_at as roadster_updated_at,
 	    raw_data as roadster_raw_data,
@@ -45,6 +46,12 @@ with roadster as
         _sdc_sync_started_at as roadster_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_roadster') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(roadster_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('roadster_id') }}
 )
 
 select * from roadster
@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_rockets'
+    alias = 'vw_stg_spacex_data_rockets',
+    unique_key = 'rocket_id'
     ) 
 }}
 
@@ -24,12 +25,12 @@ with rocket as
 	    diameter_feet as rocket_diameter_feet,
 	    mass_kg as rocket_mass_kg,
 	    mass_lbs as rocket_mass_lbs,
-	    payload_weights as rocket_payload_weights,
-	    try_parse_json(first_stage) as rocket_first_stage,
-        try_parse_json(second_stage) as rocket_second_stage,
-	    try_parse_json(engines) as rocket_engine,
+	    {{ parse_json('payload_weights') }} as rocket_payload_weights,
+	    {{ parse_json('first_stage') }} as rocket_first_stage,
+        {{ parse_json('second_stage') }} as rocket_second_stage,
+	    {{ parse_json('engines') }} as rocket_engine,
 	    landing_legs as rocket_landing_legs,
-	    flickr_images as rocket_flickr_images,
+	    {{ parse_json('flickr_images') }} as rocket_flickr_images,
 	    wikipedia as rocket_wikipedia,
 	    description as rocket_description,
         created_at as rocket_created_at,
@@ -44,6 +45,12 @@ with rocket as
         _sdc_sync_started_at as rocket_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_rockets') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(rocket_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('rocket_id') }}
 )
 
 select * from rocket
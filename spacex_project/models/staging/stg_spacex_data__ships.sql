@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_ships'
+    alias = 'vw_stg_spacex_data_ships',
+    unique_key = 'ship_id'
     ) 
 }}
 
@@ -30,7 +31,7 @@ with ships as
 	    link as ship_link,
 	    image as ship_image,
 	    launches as ship_launch_id,
-	    roles as ship_roles,
+	    {{ parse_json('roles') }} as ship_roles,
         created_at as ship_created_at,
 	    updated_at as ship_updated_at,
 	    raw_data as ship_raw_data,
@@ -43,6 +44,12 @@ with ships as
         _sdc_sync_started_at as ship_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_ships') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(ship_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('ship_id') }}
 )
 
 select * from ships
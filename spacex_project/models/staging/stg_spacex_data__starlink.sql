@@ -1,6 +1,7 @@
 
 {{ config(
-    alias = 'vw_stg_spacex_data_starlink'
+    alias = 'vw_stg_spacex_data_starlink',
+    unique_key = 'starlink_id'
     ) 
 }}
 
@@ -14,7 +15,7 @@ with starlink as
 	    latitude as starlink_latitude,
 	    height_km as starlink_height_km,
 	    velocity_kms as starlink_velocity_kms,
-	    try_parse_json(spacetrack) as starlink_spacetrack,
+	    {{ parse_json('spacetrack') }} as starlink_spacetrack,
 	    launch_date as starlink_launch_date_utc,
 	    object_name as starlink_object_name,
 	    object_id as starlink_object_id,
@@ -29,6 +30,11 @@ with starlink as
 	    arg_of_pericenter as starlink_arg_of_pericenter,
 	    raan as starlink_raan,
 	    semi_major_axis_km as starlink_semi_major_axis_km,
+	    derived_semi_major_axis_km as starlink_derived_semi_major_axis_km,
+	    apogee_altitude_km as starlink_apogee_altitude_km,
+	    perigee_altitude_km as starlink_perigee_altitude_km,
+	    orbital_period_min as starlink_orbital_period_min,
+	    epoch_age_days as starlink_epoch_age_days,
         created_at as starlink_created_at,
 	    updated_at as starlink_updated_at,
 	    raw_data as starlink_raw_data,
@@ -41,6 +47,12 @@ with starlink as
         _sdc_sync_started_at as starlink_sdc_sync_started_at
     
     from {{ source('stg_spacex_data', 'stg_spacex_data_starlink') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(starlink_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record('starlink_id') }}
 )
 
 select * from starlink
@@ -0,0 +1,36 @@
+
+{{ config(
+    alias = 'vw_stg_spacex_data_starlink_positions',
+    unique_key = ['starlink_position_starlink_id', 'starlink_position_start_time']
+    ) 
+}}
+
+with starlink_positions as 
+(
+    select 
+        starlink_id as starlink_position_starlink_id,
+        start_time as starlink_position_start_time,
+        step_seconds as starlink_position_step_seconds,
+        steps as starlink_position_steps,
+        {{ parse_json('latitude') }} as starlink_position_latitudes,
+        {{ parse_json('longitude') }} as starlink_position_longitudes,
+        {{ parse_json('height_km') }} as starlink_position_heights_km,
+        created_at as starlink_position_created_at,
+        _sdc_extracted_at as starlink_position_sdc_extracted_at,
+        _sdc_received_at as starlink_position_sdc_received_at,
+        _sdc_batched_at as starlink_position_sdc_batched_at,
+        _sdc_deleted_at as starlink_position_sdc_deleted_at,
+        _sdc_sequence as starlink_position_sdc_sequence,
+        _sdc_table_version as starlink_position_sdc_table_version,
+        _sdc_sync_started_at as starlink_position_sdc_sync_started_at
+
+    from {{ source('stg_spacex_data', 'stg_spacex_data_starlink_positions') }}
+
+    {% if is_incremental() %}
+    where _sdc_extracted_at > (select max(starlink_position_sdc_extracted_at) from {{ this }})
+    {% endif %}
+
+    {{ latest_record(['starlink_id', 'start_time']) }}
+)
+
+select * from starlink_positions
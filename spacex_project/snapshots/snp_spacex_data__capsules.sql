@@ -0,0 +1,29 @@
+{% snapshot snp_spacex_data__capsules %}
+
+{{ config(
+    unique_key = 'capsule_id',
+    strategy = 'check',
+    check_cols = ['capsule_raw_data_hash']
+    )
+}}
+
+with capsules as
+(
+    select
+        capsule_id,
+        capsule_serial,
+        capsule_status,
+        capsule_dragon_id,
+        capsule_reuse_count,
+        capsule_water_landings,
+        capsule_land_landings,
+        capsule_last_update,
+        capsule_sdc_extracted_at,
+        md5(capsule_raw_data) as capsule_raw_data_hash
+
+    from {{ ref('stg_spacex_data__capsules') }}
+)
+
+select * from capsules
+
+{% endsnapshot %}
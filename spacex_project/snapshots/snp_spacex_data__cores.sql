@@ -0,0 +1,31 @@
+{% snapshot snp_spacex_data__cores %}
+
+{{ config(
+    unique_key = 'core_id',
+    strategy = 'check',
+    check_cols = ['core_raw_data_hash']
+    )
+}}
+
+with cores as
+(
+    select
+        core_id,
+        core_serial,
+        core_block,
+        core_status,
+        core_reuse_count,
+        core_rtls_attempts,
+        core_rtls_landings,
+        core_asds_attempts,
+        core_asds_landings,
+        core_last_update,
+        core_sdc_extracted_at,
+        md5(core_raw_data) as core_raw_data_hash
+
+    from {{ ref('stg_spacex_data__cores') }}
+)
+
+select * from cores
+
+{% endsnapshot %}
@@ -0,0 +1,32 @@
+{% snapshot snp_spacex_data__ships %}
+
+{{ config(
+    unique_key = 'ship_id',
+    strategy = 'check',
+    check_cols = ['ship_raw_data_hash']
+    )
+}}
+
+with ships as
+(
+    select
+        ship_id,
+        ship_name,
+        ship_type,
+        ship_is_active,
+        ship_status,
+        ship_home_port,
+        ship_speed_kn,
+        ship_course_deg,
+        ship_latitude,
+        ship_longitude,
+        ship_last_ais_update,
+        ship_sdc_extracted_at,
+        md5(ship_raw_data) as ship_raw_data_hash
+
+    from {{ ref('stg_spacex_data__ships') }}
+)
+
+select * from ships
+
+{% endsnapshot %}
@@ -0,0 +1,29 @@
+{% snapshot snp_spacex_data__starlink %}
+
+{{ config(
+    unique_key = 'starlink_id',
+    strategy = 'check',
+    check_cols = ['starlink_raw_data_hash']
+    )
+}}
+
+with starlink as
+(
+    select
+        starlink_id,
+        starlink_satellite_version,
+        starlink_launch_id,
+        starlink_longitude,
+        starlink_latitude,
+        starlink_height_km,
+        starlink_velocity_kms,
+        starlink_epoch,
+        starlink_sdc_extracted_at,
+        md5(starlink_raw_data) as starlink_raw_data_hash
+
+    from {{ ref('stg_spacex_data__starlink') }}
+)
+
+select * from starlink
+
+{% endsnapshot %}